@@ -29,16 +29,22 @@ __status__      = "Production"
 # System imports
 import os
 import sys
+import time
 import subprocess
 
 # Append the internal modules into the system paths to avoid Blender importing conflicts
-import_paths = ['nmv/interface/cli', 'nmv/file/ops', 'nmv/slurm']
+import_paths = ['nmv/interface/cli', 'nmv/file/ops', 'nmv/file/readers/circuit', 'nmv/slurm',
+                'nmv/scheduler']
 for import_path in import_paths:
     sys.path.append(('%s/%s' %(os.path.dirname(os.path.realpath(__file__)), import_path)))
     
 # Internal imports
 import arguments_parser
+import circuit_access
+import cost_model
 import file_ops
+import job_manifest
+import local_scheduler
 import slurm
 
 
@@ -69,65 +75,174 @@ def create_shell_commands_for_local_execution(arguments,
         A list of commands to be appended to the SLURM scripts or directly executed on a local node.
     """
 
-    shell_commands = list()
-
-    # Retrieve the path to the CLIs
-    cli_interface_path = os.path.dirname(os.path.realpath(__file__)) + '/nmv/interface/cli'
-    cli_soma_reconstruction = '%s/soma_reconstruction.py' % cli_interface_path
-    cli_morphology_reconstruction = '%s/neuron_morphology_reconstruction.py' % cli_interface_path
-    cli_morphology_analysis = '%s/morphology_analysis.py' % cli_interface_path
-    cli_mesh_reconstruction = '%s/neuron_mesh_reconstruction.py' % cli_interface_path
-
-    # Morphology analysis task
-    if arguments.analyze_morphology:
-        
-        # Add this command to the list
-        shell_commands.append('%s -b --verbose 0 --python %s -- %s' %
-                              (arguments.blender, cli_morphology_analysis, arguments_string))
-                              
-    # Morphology reconstruction task: call the @cli_morphology_reconstruction interface
-    if arguments.reconstruct_morphology_skeleton or         \
-       arguments.render_neuron_morphology or                \
-       arguments.render_neuron_morphology_360 or            \
-       arguments.render_neuron_morphology_progressive or    \
-       arguments.export_morphology_swc or                   \
-       arguments.export_morphology_h5 or                    \
-       arguments.export_morphology_blend:
-
-        # Add this command to the list
-        shell_commands.append('%s -b --verbose 0 --python %s -- %s' %
-                              (arguments.blender, cli_morphology_reconstruction, arguments_string))
-
-    # Soma-related task: call the @cli_soma_reconstruction interface
-    if arguments.reconstruct_soma_mesh or                   \
-       arguments.render_soma_mesh or                        \
-       arguments.render_soma_mesh_360 or                    \
-       arguments.render_soma_mesh_progressive or            \
-       arguments.render_soma_skeleton or                    \
-       arguments.export_soma_mesh_ply or                    \
-       arguments.export_soma_mesh_obj or                    \
-       arguments.export_soma_mesh_stl or                    \
-       arguments.export_soma_mesh_blend:
-
-        # Add this command to the list
-        shell_commands.append('%s -b --verbose 0 --python %s -- %s' %
-                              (arguments.blender, cli_soma_reconstruction, arguments_string))
-
-    # Neuron mesh reconstruction related task: call the @cli_mesh_reconstruction interface
-    if arguments.reconstruct_neuron_mesh or                 \
-       arguments.render_neuron_mesh or                      \
-       arguments.render_neuron_mesh_360 or                  \
-       arguments.export_neuron_mesh_ply or                  \
-       arguments.export_neuron_mesh_obj or                  \
-       arguments.export_neuron_mesh_stl or                  \
-       arguments.export_neuron_mesh_blend:
-
-        # Add this command to the list
-        shell_commands.append('%s -b --verbose 0 --python %s -- %s' %
-                              (arguments.blender, cli_mesh_reconstruction, arguments_string))
-
-    # Return a list of commands
-    return shell_commands
+    # The commands are the same on the local node and on the cluster
+    return arguments_parser.create_shell_commands(
+        arguments=arguments, arguments_string=arguments_string)
+
+
+####################################################################################################
+# @get_circuit_gids
+####################################################################################################
+def get_circuit_gids(arguments):
+    """Gets the GIDs of the target or the GID given by the user, and caches their data in the
+    circuit in a single query.
+
+    :param arguments:
+        Command line arguments.
+    :return:
+        A list of GIDs.
+    """
+
+    # Ensure a valid blue config
+    if arguments.blue_config is None:
+        print('ERROR: Empty circuit configuration file')
+        exit(0)
+
+    # Open the circuit, a BBP circuit with brain or the JSON file of a circuit
+    circuit = circuit_access.get_circuit(arguments.blue_config)
+    if circuit is None:
+        exit(0)
+
+    # Use a specific circuit target
+    if arguments.input == 'target':
+        if arguments.target is None:
+            print('ERROR: Empty target')
+            exit(0)
+        print('Loading a target [%s] in circuit [%s]' % (arguments.target, arguments.blue_config))
+        gids = circuit.cache_target(arguments.target)
+        if len(gids) == 0:
+            print('ERROR: The target [%s] has no neurons in the circuit' % arguments.target)
+            exit(0)
+        return gids
+
+    # Use a single GID
+    if arguments.gid is None:
+        print('ERROR: Empty GID')
+        exit(0)
+    print('Loading a gid [%s] in circuit [%s]' % (str(arguments.gid), arguments.blue_config))
+    if circuit.get_neuron(int(arguments.gid)) is None:
+        print('ERROR: The GID [%s] is not in the circuit' % str(arguments.gid))
+        exit(0)
+    return [int(arguments.gid)]
+
+
+####################################################################################################
+# @run_local_jobs
+####################################################################################################
+def run_local_jobs(arguments,
+                   neurons):
+    """Runs a job per neuron on the local node, and records the completed jobs in the manifest of
+    the run.
+
+    :param arguments:
+        Command line arguments.
+    :param neurons:
+        A list of [name, input_file, arguments_string] entries, one per neuron, where the name is
+        the morphology file or the GID of the neuron.
+    :return:
+        True if all the jobs are completed, otherwise False.
+    """
+
+    # The manifest of the run, it records the completed jobs to be able to resume the run
+    manifest = job_manifest.JobManifest('%s/%s' % (arguments.output_directory,
+                                                   job_manifest.MANIFEST_FILE))
+
+    # The arguments that do not change the results of a job
+    execution_arguments = [
+        arguments_parser.Args.EXECUTION_NODE, arguments_parser.Args.NUMBER_CORES,
+        arguments_parser.Args.JOB_GRANULARITY, arguments_parser.Args.NUMBER_LOCAL_JOBS,
+        arguments_parser.Args.JOB_TIMEOUT, arguments_parser.Args.JOB_RETRIES,
+        arguments_parser.Args.NUMBER_BLENDER_WORKERS, arguments_parser.Args.RESUME,
+        arguments_parser.Args.BLENDER_EXECUTABLE, arguments_parser.Args.SLURM_ARRAY,
+        arguments_parser.Args.NEURONS_PER_ARRAY_TASK, arguments_parser.Args.SLURM_USER,
+        arguments_parser.Args.SLURM_MAX_JOBS, arguments_parser.Args.LOAD_BALANCING,
+        arguments_parser.Args.SINGLE_SESSION, arguments_parser.Args.MORPHOLOGY_CACHE_DIRECTORY,
+        arguments_parser.Args.MORPHOLOGY_CACHE_SIZE]
+
+    # A job per neuron, with all the commands of this neuron
+    jobs = list()
+    jobs_inputs = dict()
+    jobs_options_hashes = dict()
+    number_skipped_jobs = 0
+    for name, input_file, arguments_string in neurons:
+
+        # Skip the jobs that are completed and up to date
+        options_hash = job_manifest.compute_options_hash(
+            arguments_string, ignored_arguments=execution_arguments)
+        if arguments.resume and manifest.is_up_to_date(
+                name, input_file, options_hash, arguments.output_directory):
+            number_skipped_jobs += 1
+            continue
+        jobs_inputs[name] = input_file
+        jobs_options_hashes[name] = options_hash
+
+        # Construct the shell commands to run the workflow
+        shell_commands = create_shell_commands_for_local_execution(arguments, arguments_string)
+
+        # Each job has its own log file, since the jobs are running in parallel
+        log_file = '%s/%s/%s.log' % (arguments.output_directory,
+                                     file_ops.Paths.LOGS_FOLDER, name)
+        jobs.append(local_scheduler.LocalJob(
+            name=name, shell_commands=shell_commands, log_file=log_file,
+            arguments_string=arguments_string))
+
+    # Report the skipped jobs
+    if arguments.resume:
+        print('RESUMING: %d jobs are up to date, %d jobs to run' %
+              (number_skipped_jobs, len(jobs)))
+
+    # Run the most expensive jobs first, such that the workers finish at the same time
+    if arguments.load_balancing == 'cost':
+        costs = cost_model.estimate_morphology_files_costs(
+            [jobs_inputs[job.name] for job in jobs], arguments,
+            arguments_parser.get_requested_cli_interfaces(arguments))
+        jobs = [jobs[i] for i in cost_model.get_longest_first_order(costs)]
+
+    # Record every job in the manifest with its outputs as soon as it is completed
+    def record_job(job):
+        outputs = None
+        if job.status == 'DONE':
+            outputs = job_manifest.find_job_outputs(
+                label=file_ops.get_file_name_from_path(job.name),
+                output_directory=arguments.output_directory,
+                ignored_directories=[file_ops.Paths.LOGS_FOLDER, file_ops.Paths.SLURM_FOLDER])
+        manifest.record_job(job, input_file=jobs_inputs[job.name],
+                            options_hash=jobs_options_hashes[job.name], outputs=outputs)
+
+    # The timeout of every job
+    timeout = arguments.job_timeout if arguments.job_timeout > 0 else None
+    start_time = time.time()
+
+    # Run the jobs on persistent Blender workers
+    if arguments.number_blender_workers > 0:
+        local_scheduler.run_jobs_on_blender_workers(
+            jobs=jobs, blender=arguments.blender,
+            worker_script='%s/nmv/interface/cli/neuron_worker.py' %
+                          os.path.dirname(os.path.realpath(__file__)),
+            number_workers=arguments.number_blender_workers, timeout=timeout,
+            retries=arguments.job_retries,
+            logs_directory='%s/%s' % (arguments.output_directory,
+                                      file_ops.Paths.LOGS_FOLDER),
+            job_completed_callback=record_job)
+
+    # Run NeuroMorphoVis from Blender in the background mode using a pool of workers
+    else:
+        local_scheduler.run_jobs_locally(
+            jobs=jobs, number_parallel_jobs=arguments.number_local_jobs, timeout=timeout,
+            retries=arguments.job_retries, job_completed_callback=record_job)
+
+    # Report
+    local_scheduler.write_summary_report(
+        jobs=jobs, total_time=time.time() - start_time,
+        report_file='%s/%s/summary.txt' % (arguments.output_directory,
+                                           file_ops.Paths.LOGS_FOLDER))
+
+    # Verify that all the jobs are completed
+    failed_jobs = [job for job in jobs if job.status != local_scheduler.LocalJob.DONE]
+    if len(failed_jobs) > 0:
+        print('ERROR: %d out of %d jobs are NOT completed' % (len(failed_jobs), len(jobs)))
+        return False
+    return True
 
 
 ####################################################################################################
@@ -138,12 +253,18 @@ def run_local_neuromorphovis(arguments):
 
     :param arguments:
         Command line arguments.
+    :return:
+        True if all the jobs are completed, otherwise False.
     """
 
-    # Target and GID options are only available on the BBP visualization clusters
+    # Load the morphologies of a target or a GID from the circuit, a job per GID
     if arguments.input == 'target' or arguments.input == 'gid':
-        print('ERROR, Target and GID options are only available on the BBP visualization clusters')
-        exit(0)
+        gids = get_circuit_gids(arguments)
+        circuit = circuit_access.get_circuit(arguments.blue_config)
+        return run_local_jobs(arguments, [
+            [str(gid), circuit.get_morphology_uri(gid),
+             arguments_parser.get_arguments_string_for_individual_gid(arguments, gid)]
+            for gid in gids])
 
     # Load morphology files (.H5 or .SWC)
     elif arguments.input == 'file':
@@ -159,41 +280,32 @@ def run_local_neuromorphovis(arguments):
         shell_commands = create_shell_commands_for_local_execution(arguments, arguments_string)
 
         # Run NeuroMorphoVis from Blender in the background mode
+        completed = True
         for shell_command in shell_commands:
             print('RUNNING: ' + shell_command)
-            subprocess.call(shell_command, shell=True)
+            if subprocess.call(shell_command, shell=True) != 0:
+                completed = False
+        return completed
 
     # Load a directory morphology files (.H5 or .SWC)
     elif arguments.input == 'directory':
 
         # Get all the morphology files in this directory
         # TODO: Verify the installation of H5Py before running the workflow
-        # TODO: Add the support to load .SWC files from a directory at the same time
-        morphology_files = file_ops.get_files_in_directory(arguments.morphology_directory, '.h5')
+        morphology_files = file_ops.get_morphology_files_in_directory(
+            arguments.morphology_directory)
 
         # If the directory is empty, give an error message
         if len(morphology_files) == 0:
             print('ERROR: The directory [%s] does NOT contain any morphology files' %
                   arguments.morphology_directory)
 
-        # A list of all the commands to be executed
-        shell_commands = list()
-
-        # Construct the commands for every individual morphology file
-        for morphology_file in morphology_files:
-
-            # Get the argument string for an individual file
-            arguments_string = arguments_parser.get_arguments_string_for_individual_file(
-                arguments=arguments, morphology_file=morphology_file)
-
-            # Construct the shell command to run the workflow
-            shell_commands.extend(
-                create_shell_commands_for_local_execution(arguments, arguments_string))
-
-        # Run NeuroMorphoVis from Blender in the background mode
-        for shell_command in shell_commands:
-            # print('RUNNING: ' + shell_command)
-            subprocess.call(shell_command, shell=True)
+        # A job per morphology file
+        return run_local_jobs(arguments, [
+            [morphology_file, '%s/%s' % (arguments.morphology_directory, morphology_file),
+             arguments_parser.get_arguments_string_for_individual_file(
+                 arguments=arguments, morphology_file=morphology_file)]
+            for morphology_file in morphology_files])
 
     else:
         print('ERROR: Input data source, use \'file, gid, target or directory\'')
@@ -210,45 +322,14 @@ def run_cluster_neuromorphovis(arguments):
         Command line arguments.
     """
 
-    # Use a specific circuit target
-    if arguments.input == 'target':
-
-        # Log
-        print('Loading a target [%s] in circuit [%s]' % (arguments.target, arguments.blue_config))
-
-        # Ensure a valid blue config and a target
-        if arguments.blue_config is None or arguments.target is None:
-            print('ERROR: Empty circuit configuration file or target')
-            exit(0)
-
-        # Import brain
-        try:
-            import brain
-        except ImportError:
-            print('ERROR: Cannot import [brain], please load brain or install it')
-            exit(0)
-
-        # Open a circuit with a given blue config
-        bbp_circuit = brain.Circuit(arguments.blue_config)
-
-        # Create a GID-set and load the morphologies from these GIDs
-        gids = bbp_circuit.gids(arguments.target)
-
-        # Run the jobs on the cluster
-        slurm.run_gid_jobs_on_cluster(arguments=arguments, gids=gids)
-
-    # Use a single GID
-    elif arguments.input == 'gid':
-
-        print('Loading a gid [%s] in circuit [%s]' % (str(arguments.gid), arguments.blue_config))
+    # Use a specific circuit target or a single GID
+    if arguments.input == 'target' or arguments.input == 'gid':
 
-        # Ensure a valid blue config and a GID
-        if arguments.blue_config is None or arguments.gid is None:
-            print('ERROR: Empty circuit configuration file or GID')
-            exit(0)
+        # Get the GIDs from the circuit
+        gids = get_circuit_gids(arguments)
 
         # Run the jobs on the cluster
-        slurm.run_gid_jobs_on_cluster(arguments=arguments, gids=[str(arguments.gid)])
+        slurm.run_gid_jobs_on_cluster(arguments=arguments, gids=[str(gid) for gid in gids])
 
     # Use the morphology file (.H5 or .SWC)
     elif arguments.input == 'file':
@@ -264,7 +345,8 @@ def run_cluster_neuromorphovis(arguments):
     elif arguments.input == 'directory':
 
         # Get all the morphology files in this directory
-        morphology_files = file_ops.get_files_in_directory(arguments.morphology_directory, '.h5')
+        morphology_files = file_ops.get_morphology_files_in_directory(
+            arguments.morphology_directory)
 
         # Run the jobs on the cluster
         slurm.run_morphology_files_jobs_on_cluster(
@@ -283,19 +365,31 @@ if __name__ == "__main__":
     # Parse the command line arguments
     arguments = arguments_parser.parse_command_line_arguments()
 
+    # Report the states of the SLURM jobs of a previous run, without touching its output directory
+    if arguments.slurm_status:
+        if not slurm.report_submitted_jobs_states(arguments.output_directory):
+            exit(1)
+        exit(0)
+
     # Verify the output directory before screwing things !
-    file_ops.clean_and_create_directory(arguments.output_directory)
+    # If the run is resumed, the results of the previous run are kept
+    if arguments.resume:
+        file_ops.create_directory(arguments.output_directory)
+    else:
+        file_ops.clean_and_create_directory(arguments.output_directory)
     if not file_ops.path_exists(arguments.output_directory):
         print('ERROR: Please set the output directory to a valid path')
         exit(0)
 
     # Otherwise, create the output tree
     else:
-        file_ops.create_output_tree(arguments.output_directory)
+        file_ops.create_output_tree(arguments.output_directory, clean=not arguments.resume)
 
     # LOCAL EXECUTION: Compile the corresponding command and launch it on the current machine
+    # If any job is not completed, exit with an error status
     if arguments.execution_node == 'local':
-        run_local_neuromorphovis(arguments=arguments)
+        if not run_local_neuromorphovis(arguments=arguments):
+            exit(1)
 
     # BBP CLUSTER EXECUTION: Create the SLURM scripts and run them on the cluster (only @ BBP)
     else:
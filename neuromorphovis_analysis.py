@@ -0,0 +1,284 @@
+#!/usr/bin/python
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+
+# System imports
+import os
+import sys
+import time
+import argparse
+
+# Append the internal modules into the system paths, the analysis core does not need Blender
+import_paths = ['nmv/interface/cli', 'nmv/file/ops', 'nmv/analysis/core']
+for import_path in import_paths:
+    sys.path.append(('%s/%s' % (os.path.dirname(os.path.realpath(__file__)), import_path)))
+
+# Internal imports
+from args import Args
+import file_ops
+import analysis_kernels
+import analysis_plotting
+import analysis_report
+import analysis_table
+import morphology_arrays
+import population_analysis
+
+
+####################################################################################################
+# @parse_command_line_arguments
+####################################################################################################
+def parse_command_line_arguments():
+    """Parses the command line arguments of the headless analysis.
+
+    :return:
+        The parsed arguments.
+    """
+
+    app_help = 'NeuroMorphoVis: analysis of morphological skeletons without Blender \n' \
+               '\tThe reports are identical to those of the --analyze-morphology option'
+    parser = argparse.ArgumentParser(description=app_help,
+                                     formatter_class=argparse.RawTextHelpFormatter)
+
+    # Input
+    parser.add_argument(Args.MORPHOLOGY_FILE, action='store', default=None,
+                        help='A morphology file (.h5 or .swc)')
+    parser.add_argument(Args.MORPHOLOGY_DIRECTORY, action='store', default=None,
+                        help='A directory of morphology files (.h5 or .swc)')
+    parser.add_argument(Args.BLUE_CONFIG, action='store', default=None,
+                        help='A BBP circuit configuration, or the JSON file of a circuit, for the '
+                             'population analysis')
+    parser.add_argument(Args.TARGET, action='store', default=None,
+                        help='A cell target in the circuit, for the population analysis')
+    parser.add_argument(Args.GIDS_FILE, action='store', default=None,
+                        help='A file that lists the GIDs in the circuit, one GID per line, '
+                             'for the population analysis')
+    parser.add_argument(Args.MTYPES_FILE, action='store', default=None,
+                        help='A file that maps the labels of the morphologies to their mtypes, '
+                             'one label and mtype per line. \n'
+                             'By default, the mtype is the sub-directory of the morphology file, '
+                             'or read from the circuit')
+
+    # Analysis table
+    parser.add_argument(Args.ANALYSIS_TABLE_FORMAT, action='store', default=None,
+                        choices=analysis_table.TABLE_FORMATS,
+                        help='Also append the results to a single table, with one row per '
+                             'morphology and arbor and one column per variable, '
+                             '<output>/analysis/analysis.[csv, parquet or h5]. \n'
+                             'With the population analysis, the format of the morphologies table. '
+                             '\nDefault: no table, or csv for the population analysis')
+
+    # Distributions
+    parser.add_argument(Args.PLOT_DISTRIBUTIONS, action='store_true', default=False,
+                        help='Plot the per-arbor distributions of every morphology to '
+                             '<output>/analysis, or to <output>/analysis/population/distributions '
+                             'for the population analysis. \n'
+                             'The figures are plotted on all the cores of the node '
+                             '(or --number-cores)')
+    parser.add_argument(Args.PLOTS_DPI, action='store', type=int,
+                        default=analysis_plotting.DEFAULT_DPI,
+                        help='The resolution of the figures of the distributions, 0 to skip them '
+                             'and only save the previews. \n'
+                             'Default: %d' % analysis_plotting.DEFAULT_DPI)
+    parser.add_argument(Args.PLOTS_PREVIEW_DPI, action='store', type=int, default=None,
+                        help='Also save a PNG preview of every figure at this resolution. \n'
+                             'Default: no previews')
+
+    # Population analysis
+    parser.add_argument(Args.ANALYZE_POPULATION, action='store_true', default=False,
+                        help='Analyze the population in parallel and write the tables of the '
+                             'morphologies and their mtypes to <output>/analysis/population '
+                             'instead of the reports. \n'
+                             'The morphology directory is searched recursively')
+    parser.add_argument(Args.NUMBER_CORES, action='store', type=int, default=None,
+                        help='The number of processes of the population analysis and the '
+                             'plots. \n'
+                             'Default: the number of cores of the node')
+
+    # Output
+    parser.add_argument(Args.OUTPUT_DIRECTORY, action='store', default=None,
+                        help='The root output directory, the reports are written to '
+                             '<output>/analysis')
+
+    return parser.parse_args()
+
+
+####################################################################################################
+# @analyze_morphology_file
+####################################################################################################
+def analyze_morphology_file(morphology_file,
+                            analysis_directory,
+                            table_writer=None,
+                            plot_jobs=None):
+    """Analyzes a morphology file and writes its analysis report.
+
+    :param morphology_file:
+        The path to the morphology file.
+    :param analysis_directory:
+        The directory where the report will be written.
+    :param table_writer:
+        An optional analysis_table.AnalysisTableWriter where the rows of the morphology are
+        appended.
+    :param plot_jobs:
+        An optional list where the plot jobs of the distributions of the morphology are appended,
+        to plot them later with analysis_plotting.plot_jobs.
+    :return:
+        True if the morphology is analyzed, and False otherwise.
+    """
+
+    morphology = morphology_arrays.read_morphology_arrays(morphology_file)
+    if morphology is None:
+        print('ERROR: Cannot load the morphology file [%s]' % morphology_file)
+        return False
+
+    try:
+        arbors_data = analysis_kernels.collect_morphology_analysis_data(morphology)
+        analysis_results = analysis_kernels.analyze_morphology_arrays(morphology, arbors_data)
+        if table_writer is not None:
+            table_writer.append_rows(analysis_table.get_analysis_table_rows(
+                morphology.label, analysis_results,
+                analysis_kernels.analyze_morphology_arrays_globally(morphology)))
+        if plot_jobs is not None:
+            plot_jobs.extend(analysis_plotting.get_morphology_plot_jobs(
+                morphology.label,
+                analysis_kernels.compute_morphology_distributions(morphology, arbors_data),
+                analysis_directory))
+    except (ValueError, IndexError, ZeroDivisionError) as e:
+        print('ERROR: Cannot analyze the morphology file [%s]: %s' % (morphology_file, str(e)))
+        return False
+
+    analysis_report.write_analysis_report(morphology, analysis_results, analysis_directory)
+    return True
+
+
+####################################################################################################
+# @analyze_population
+####################################################################################################
+def analyze_population(arguments,
+                       analysis_directory):
+    """Analyzes a population of morphologies, from a directory or a circuit, and writes the
+    tables of the morphologies and their mtypes.
+
+    :param arguments:
+        The parsed command line arguments.
+    :param analysis_directory:
+        The analysis directory, the tables are written to <analysis_directory>/population.
+    :return:
+        The number of analyzed morphologies and the number of failures.
+    """
+
+    # The mtypes given by the user
+    mtypes = None
+    if arguments.mtypes_file is not None:
+        mtypes = population_analysis.read_mtypes_file(arguments.mtypes_file)
+
+    # Get the tasks from a circuit
+    if arguments.blue_config is not None:
+        gids = None
+        if arguments.gids_file is not None:
+            gids = population_analysis.read_gids_file(arguments.gids_file)
+        elif arguments.target is None:
+            print('ERROR: Please set the target or the GIDs file of the circuit')
+            exit(1)
+        tasks = population_analysis.get_circuit_population_tasks(
+            arguments.blue_config, target=arguments.target, gids=gids, mtypes=mtypes)
+
+    # Get the tasks from a directory
+    elif arguments.morphology_directory is not None:
+        tasks = population_analysis.get_directory_population_tasks(
+            arguments.morphology_directory, mtypes=mtypes)
+
+    else:
+        print('ERROR: Please set the morphology directory or the circuit of the population')
+        exit(1)
+
+    try:
+        return population_analysis.run_population_analysis(
+            tasks, '%s/population' % analysis_directory, number_processes=arguments.number_cores,
+            table_format=arguments.analysis_table_format or 'csv',
+            plot_distributions=arguments.plot_distributions, plots_dpi=arguments.plots_dpi,
+            plots_preview_dpi=arguments.plots_preview_dpi)
+    except ImportError as e:
+        print('ERROR: Cannot write the morphologies table: %s' % str(e))
+        exit(1)
+
+
+####################################################################################################
+# @ Run the main function if invoked from the command line.
+####################################################################################################
+if __name__ == "__main__":
+
+    # Parse the command line arguments
+    arguments = parse_command_line_arguments()
+
+    # Verify the output directory
+    if arguments.output_directory is None:
+        print('ERROR: Please set the output directory to a valid path')
+        exit(1)
+    analysis_directory = '%s/%s' % (arguments.output_directory, file_ops.Paths.ANALYSIS_FOLDER)
+    file_ops.create_directory(analysis_directory)
+
+    # Population analysis
+    if arguments.analyze_population:
+        start_time = time.time()
+        number_analyzed, number_failures = analyze_population(arguments, analysis_directory)
+        print('Analyzed [%d/%d] morphologies in %2.2f seconds' % (
+            number_analyzed, number_analyzed + number_failures, time.time() - start_time))
+        exit(1 if number_failures > 0 else 0)
+
+    # Get the morphology files
+    if arguments.morphology_file is not None:
+        morphology_files = [arguments.morphology_file]
+    elif arguments.morphology_directory is not None:
+        morphology_files = ['%s/%s' % (arguments.morphology_directory, morphology_file)
+                            for morphology_file in file_ops.get_morphology_files_in_directory(
+                                arguments.morphology_directory)]
+    else:
+        print('ERROR: Please set the morphology file or the morphology directory')
+        exit(1)
+
+    # The rows of all the morphologies are appended to a single table
+    table_writer = None
+    if arguments.analysis_table_format is not None:
+        try:
+            table_writer = analysis_table.AnalysisTableWriter(
+                '%s/analysis%s' % (
+                    analysis_directory,
+                    analysis_table.TABLE_EXTENSIONS[arguments.analysis_table_format]),
+                analysis_kernels.get_analysis_variables(), arguments.analysis_table_format)
+        except (ImportError, ValueError) as e:
+            print('ERROR: Cannot write the analysis table: %s' % str(e))
+            exit(1)
+
+    # Analyze the morphologies one by one
+    start_time = time.time()
+    number_failures = 0
+    plot_jobs = list() if arguments.plot_distributions else None
+    for morphology_file in morphology_files:
+        if not analyze_morphology_file(morphology_file, analysis_directory, table_writer,
+                                       plot_jobs):
+            number_failures += 1
+    if table_writer is not None:
+        table_writer.close()
+
+    # Plot the distributions of all the morphologies at once
+    if plot_jobs is not None:
+        analysis_plotting.plot_jobs(plot_jobs, number_processes=arguments.number_cores,
+                                    dpi=arguments.plots_dpi,
+                                    preview_dpi=arguments.plots_preview_dpi)
+
+    print('Analyzed [%d/%d] morphologies in %2.2f seconds' % (
+        len(morphology_files) - number_failures, len(morphology_files), time.time() - start_time))
+    exit(1 if number_failures > 0 else 0)
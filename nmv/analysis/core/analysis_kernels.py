@@ -0,0 +1,835 @@
+####################################################################################################
+# Copyright (c) 2016 - 2019, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import math
+import numpy
+
+
+####################################################################################################
+# @ArborAnalysisData
+####################################################################################################
+class ArborAnalysisData:
+    """The per-section, per-segment and per-sample data of an arbor that are needed by the per-arbor
+    analysis kernels.
+
+    The data are collected in the same order and with the same arithmetic of the section
+    operations in nmv.analysis, i.e. the sections are visited in depth-first order starting from
+    the root of the arbor, so the results of the kernels are identical to those of the Blender
+    analysis.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self):
+        """Constructor
+        """
+
+        # The number of samples of every section
+        self.sections_number_samples = list()
+
+        # The number of zero-radius samples of every section
+        self.sections_number_zero_radius_samples = list()
+
+        # The minimum, maximum and average radii of the samples of every section
+        self.sections_minimum_radii = list()
+        self.sections_maximum_radii = list()
+        self.sections_average_radii = list()
+
+        # The number of bifurcations and trifurcations
+        self.number_bifurcations = 0
+        self.number_trifurcations = 0
+
+        # The branching orders of the terminal sections
+        self.terminals_branching_orders = list()
+
+        # The path distance of every section
+        self.sections_paths_distances = list()
+
+        # The local and global bifurcation angles
+        self.local_bifurcation_angles = list()
+        self.global_bifurcation_angles = list()
+
+        # The lengths of all the segments
+        self.segments_lengths = list()
+
+        # The lengths, the surface areas and the volumes of every section
+        self.sections_lengths = list()
+        self.sections_surface_areas = list()
+        self.sections_volumes = list()
+
+        # The number of sections that are shorter than the sum of the diameters of their terminals
+        self.number_short_sections = 0
+
+
+####################################################################################################
+# @get_segments_samples
+####################################################################################################
+def get_segments_samples(sections_offsets):
+    """Gets the first samples of all the segments of the given sections, i.e. all the samples
+    except the last ones of the sections, and the sections of the segments.
+
+    :param sections_offsets:
+        An array of the S+1 offsets of the samples of the sections.
+    :return:
+        An array of the indices of the first samples of the segments and an array of the indices
+        of their sections, where the segments are ordered by their sections.
+    """
+
+    number_samples = numpy.diff(sections_offsets)
+    number_segments = numpy.maximum(number_samples - 1, 0)
+
+    # The segments of every section start at the first sample of the section
+    segments_sections = numpy.repeat(numpy.arange(len(number_samples)), number_segments)
+    segments_offsets = numpy.zeros(len(number_samples) + 1, dtype=numpy.int64)
+    numpy.cumsum(number_segments, out=segments_offsets[1:])
+    first_samples = numpy.arange(segments_offsets[-1]) + numpy.repeat(
+        sections_offsets[:-1] - segments_offsets[:-1], number_segments)
+    return first_samples, segments_sections
+
+
+####################################################################################################
+# @compute_segments_lengths
+####################################################################################################
+def compute_segments_lengths(points,
+                             first_samples):
+    """Computes the lengths of the given segments.
+
+    :param points:
+        An Nx3 array of the points of the samples.
+    :param first_samples:
+        An array of the indices of the first samples of the segments.
+    :return:
+        An array of the lengths of the segments.
+    """
+
+    delta = points[first_samples + 1] - points[first_samples]
+    return numpy.sqrt(delta[:, 0] * delta[:, 0] + delta[:, 1] * delta[:, 1] +
+                      delta[:, 2] * delta[:, 2])
+
+
+####################################################################################################
+# @compute_segments_surface_areas
+####################################################################################################
+def compute_segments_surface_areas(radii,
+                                   first_samples,
+                                   segments_lengths):
+    """Computes the surface areas of the given segments, where every segment is approximated by
+    a tapered cylinder with the same formula of
+    nmv.analysis.compute_segments_surface_areas_in_section.
+
+    :param radii:
+        An array of the radii of the samples.
+    :param first_samples:
+        An array of the indices of the first samples of the segments.
+    :param segments_lengths:
+        An array of the lengths of the segments.
+    :return:
+        An array of the surface areas of the segments.
+    """
+
+    r0 = radii[first_samples]
+    r1 = radii[first_samples + 1]
+    r_sum = r0 + r1
+    r_diff = r0 - r1
+    lateral_areas = math.pi * r_sum * numpy.sqrt((r_diff * r_diff) + segments_lengths)
+    return lateral_areas + math.pi * ((r0 * r0) + (r1 * r1))
+
+
+####################################################################################################
+# @compute_segments_volumes
+####################################################################################################
+def compute_segments_volumes(radii,
+                             first_samples,
+                             segments_lengths):
+    """Computes the volumes of the given segments, where every segment is approximated by a
+    tapered cylinder with the same formula of nmv.analysis.compute_segments_volumes_in_section.
+
+    :param radii:
+        An array of the radii of the samples.
+    :param first_samples:
+        An array of the indices of the first samples of the segments.
+    :param segments_lengths:
+        An array of the lengths of the segments.
+    :return:
+        An array of the volumes of the segments.
+    """
+
+    r0 = radii[first_samples]
+    r1 = radii[first_samples + 1]
+    return (1.0 / 3.0) * math.pi * segments_lengths * (r0 * r0 + r0 * r1 + r1 * r1)
+
+
+####################################################################################################
+# @sum_segments_per_section
+####################################################################################################
+def sum_segments_per_section(segments_sections,
+                             segments_values,
+                             number_sections):
+    """Sums the values of the segments of every section. The values are accumulated in the order
+    of the segments, like the loops of the section kernels.
+
+    :param segments_sections:
+        An array of the indices of the sections of the segments.
+    :param segments_values:
+        An array of the values of the segments.
+    :param number_sections:
+        The number of sections.
+    :return:
+        An array of the sums, zero for the sections without segments.
+    """
+
+    return numpy.bincount(segments_sections, weights=segments_values, minlength=number_sections)
+
+
+####################################################################################################
+# @compute_segments_data
+####################################################################################################
+def compute_segments_data(morphology):
+    """Computes the lengths, the surface areas and the volumes of all the segments and the
+    sections of the morphology at once.
+
+    :param morphology:
+        A given MorphologyArrays structure.
+    :return:
+        A list of the S+1 offsets of the segments of the sections, the lengths of the segments
+        and the lengths, the surface areas and the volumes of the sections.
+    """
+
+    number_sections = len(morphology.sections_offsets) - 1
+    first_samples, segments_sections = get_segments_samples(morphology.sections_offsets)
+    segments_offsets = numpy.zeros(number_sections + 1, dtype=numpy.int64)
+    numpy.cumsum(numpy.bincount(segments_sections, minlength=number_sections),
+                 out=segments_offsets[1:])
+
+    # The segments
+    segments_lengths = compute_segments_lengths(morphology.points, first_samples)
+    segments_surface_areas = compute_segments_surface_areas(
+        morphology.radii, first_samples, segments_lengths)
+    segments_volumes = compute_segments_volumes(morphology.radii, first_samples, segments_lengths)
+
+    # The sections
+    return [segments_offsets.tolist(), segments_lengths.tolist(),
+            sum_segments_per_section(
+                segments_sections, segments_lengths, number_sections).tolist(),
+            sum_segments_per_section(
+                segments_sections, segments_surface_areas, number_sections).tolist(),
+            sum_segments_per_section(
+                segments_sections, segments_volumes, number_sections).tolist()]
+
+
+####################################################################################################
+# @compute_angle_between_vectors
+####################################################################################################
+def compute_angle_between_vectors(vector_1,
+                                  vector_2):
+    """Computes the angle between two normalized vectors in radians, similar to Vector.angle.
+
+    :param vector_1:
+        The first vector as a list.
+    :param vector_2:
+        The second vector as a list.
+    :return:
+        The angle in radians.
+    """
+
+    length_1 = math.sqrt(sum(a * a for a in vector_1))
+    length_2 = math.sqrt(sum(a * a for a in vector_2))
+    dot = sum(a * b for a, b in zip(vector_1, vector_2))
+    return math.acos(max(-1.0, min(1.0, dot / (length_1 * length_2))))
+
+
+####################################################################################################
+# @compute_bifurcation_angle
+####################################################################################################
+def compute_bifurcation_angle(points,
+                              child_1_samples,
+                              child_2_samples):
+    """Computes the bifurcation angle between two children sections in degrees.
+
+    :param points:
+        A list of the points of all the samples.
+    :param child_1_samples:
+        The indices of the two samples that define the direction of the first child.
+    :param child_2_samples:
+        The indices of the two samples that define the direction of the second child.
+    :return:
+        The bifurcation angle in degrees, or None if any of the directions has a zero length.
+    """
+
+    vectors = list()
+    for first_sample, last_sample in [child_1_samples, child_2_samples]:
+        vector = [a - b for a, b in zip(points[last_sample], points[first_sample])]
+        length = math.sqrt(sum(a * a for a in vector))
+        if length < 1e-5:
+            return None
+        vectors.append([a / length for a in vector])
+
+    # NOTE: The same approximation of pi that is used in nmv.analysis
+    return compute_angle_between_vectors(vectors[0], vectors[1]) * 180.0 / 3.14
+
+
+####################################################################################################
+# @collect_arbor_analysis_data
+####################################################################################################
+def collect_arbor_analysis_data(morphology,
+                                root,
+                                segments_data=None):
+    """Collects the analysis data of an arbor in a single depth-first traversal.
+
+    :param morphology:
+        A given MorphologyArrays structure.
+    :param root:
+        The index of the root section of the arbor.
+    :param segments_data:
+        The segments data of the morphology from @compute_segments_data, computed if not given.
+    :return:
+        An ArborAnalysisData structure.
+    """
+
+    if segments_data is None:
+        segments_data = compute_segments_data(morphology)
+    segments_offsets, segments_lengths, sections_lengths, sections_surface_areas, \
+        sections_volumes = segments_data
+
+    # Lists of the arrays
+    points = morphology.points.tolist()
+    radii = morphology.radii.tolist()
+    offsets = morphology.sections_offsets.tolist()
+
+    data = ArborAnalysisData()
+
+    # The sections to visit with their branching orders and the path distances of their parents
+    stack = [[root, 1, None]]
+    while len(stack) > 0:
+        section, branching_order, parent_path_distance = stack.pop()
+        first_sample = offsets[section]
+        last_sample = offsets[section + 1]
+        number_samples = last_sample - first_sample
+        section_radii = radii[first_sample:last_sample]
+        section_children = morphology.get_section_children_indices(section)
+
+        # Per-sample data
+        number_zero_radius_samples = 0
+        for radius in section_radii:
+            if radius < 0.000001:
+                number_zero_radius_samples += 1
+        data.sections_number_samples.append(number_samples)
+        data.sections_number_zero_radius_samples.append(number_zero_radius_samples)
+        data.sections_minimum_radii.append(min(section_radii))
+        data.sections_maximum_radii.append(max(section_radii))
+        data.sections_average_radii.append(1.0 * sum(section_radii) / number_samples)
+
+        # Structure data
+        if len(section_children) == 2:
+            data.number_bifurcations += 1
+        if len(section_children) == 3:
+            data.number_trifurcations += 1
+        if len(section_children) == 0:
+            data.terminals_branching_orders.append(branching_order)
+
+        # Per-segment data
+        section_length = sections_lengths[section]
+        data.segments_lengths.extend(
+            segments_lengths[segments_offsets[section]:segments_offsets[section + 1]])
+        data.sections_lengths.append(section_length)
+        data.sections_surface_areas.append(sections_surface_areas[section])
+        data.sections_volumes.append(sections_volumes[section])
+
+        # Path distance
+        path_distance = section_length
+        if parent_path_distance is not None:
+            path_distance = section_length + parent_path_distance
+        data.sections_paths_distances.append(path_distance)
+
+        # Bifurcation angles
+        if len(section_children) == 2:
+            child_1_first = offsets[section_children[0]]
+            child_1_last = offsets[section_children[0] + 1] - 1
+            child_2_first = offsets[section_children[1]]
+            child_2_last = offsets[section_children[1] + 1] - 1
+            if child_1_last > child_1_first and child_2_last > child_2_first:
+                angle = compute_bifurcation_angle(
+                    points, [child_1_first, child_1_first + 1], [child_2_first, child_2_first + 1])
+                if angle is not None:
+                    data.local_bifurcation_angles.append(angle)
+                angle = compute_bifurcation_angle(
+                    points, [child_1_first, child_1_last], [child_2_first, child_2_last])
+                if angle is not None:
+                    data.global_bifurcation_angles.append(angle)
+
+        # Short sections
+        if number_samples > 1:
+            if section_length < (section_radii[0] + section_radii[-1]) * 2:
+                data.number_short_sections += 1
+
+        # Visit the children in order
+        for child in reversed(section_children):
+            stack.append([child, branching_order + 1, path_distance])
+
+    return data
+
+
+####################################################################################################
+# Per-arbor kernels, every kernel computes a single result from the ArborAnalysisData of an arbor
+####################################################################################################
+def compute_arbor_total_sum(values):
+    """Sums the values sequentially, in the same order of the kernels in nmv.analysis.
+
+    :param values:
+        A list of values.
+    :return:
+        The sum of the values.
+    """
+
+    total = 0.0
+    for value in values:
+        total += value
+    return total
+
+
+def compute_arbor_average(values):
+    """Computes the average of the values, or zero if the list is empty.
+
+    :param values:
+        A list of values.
+    :return:
+        The average of the values.
+    """
+
+    if len(values) > 0:
+        return compute_arbor_total_sum(values) / len(values)
+    return 0.0
+
+
+def kernel_number_terminal_tips(data):
+    return len(data.terminals_branching_orders)
+
+
+def kernel_number_samples(data):
+    total_number_samples = 0
+    for number_samples in data.sections_number_samples:
+        total_number_samples += number_samples - 1
+    return total_number_samples + 1
+
+
+def kernel_number_sections(data):
+    return len(data.sections_number_samples)
+
+
+def kernel_maximum_branching_order(data):
+    return max(data.terminals_branching_orders)
+
+
+def kernel_number_bifurcations(data):
+    return data.number_bifurcations
+
+
+def kernel_number_trifurcations(data):
+    return data.number_trifurcations
+
+
+def kernel_maximum_path_distance(data):
+    return max(data.sections_paths_distances)
+
+
+def kernel_minimum_number_samples_per_section(data):
+    return min(data.sections_number_samples)
+
+
+def kernel_maximum_number_samples_per_section(data):
+    return max(data.sections_number_samples)
+
+
+def kernel_average_number_samples_per_section(data):
+    total_number_samples = 0
+    for number_samples in data.sections_number_samples:
+        total_number_samples += number_samples
+    return int(total_number_samples * 1.0 / len(data.sections_number_samples))
+
+
+def kernel_minimum_sample_radius(data):
+    return min(data.sections_minimum_radii)
+
+
+def kernel_maximum_sample_radius(data):
+    return max(data.sections_maximum_radii)
+
+
+def kernel_average_sample_radius(data):
+    return (1.0 * sum(data.sections_average_radii)) / len(data.sections_average_radii)
+
+
+def kernel_number_zero_radius_samples(data):
+    total_number_zero_radius_samples = 0
+    for number_zero_radius_samples in data.sections_number_zero_radius_samples:
+        total_number_zero_radius_samples += number_zero_radius_samples
+    return total_number_zero_radius_samples
+
+
+def kernel_minimum_local_bifurcation_angle(data):
+    return min(data.local_bifurcation_angles) if len(data.local_bifurcation_angles) > 0 else 0.0
+
+
+def kernel_maximum_local_bifurcation_angle(data):
+    return max(data.local_bifurcation_angles) if len(data.local_bifurcation_angles) > 0 else 0.0
+
+
+def kernel_average_local_bifurcation_angle(data):
+    return compute_arbor_average(data.local_bifurcation_angles)
+
+
+def kernel_minimum_global_bifurcation_angle(data):
+    return min(data.global_bifurcation_angles) if len(data.global_bifurcation_angles) > 0 else 0.0
+
+
+def kernel_maximum_global_bifurcation_angle(data):
+    return max(data.global_bifurcation_angles) if len(data.global_bifurcation_angles) > 0 else 0.0
+
+
+def kernel_average_global_bifurcation_angle(data):
+    return compute_arbor_average(data.global_bifurcation_angles)
+
+
+def kernel_total_length(data):
+    return compute_arbor_total_sum(data.sections_lengths)
+
+
+def kernel_minimum_section_length(data):
+    return min(data.sections_lengths)
+
+
+def kernel_maximum_section_length(data):
+    return max(data.sections_lengths)
+
+
+def kernel_average_section_length(data):
+    return compute_arbor_total_sum(data.sections_lengths) / len(data.sections_lengths)
+
+
+def kernel_number_short_sections(data):
+    return data.number_short_sections
+
+
+def kernel_minimum_segment_length(data):
+    return min(data.segments_lengths)
+
+
+def kernel_maximum_segment_length(data):
+    return max(data.segments_lengths)
+
+
+def kernel_average_segment_length(data):
+    return compute_arbor_total_sum(data.segments_lengths) / len(data.segments_lengths)
+
+
+def kernel_number_zero_length_segments(data):
+    zero_length_segments = 0
+    for segment_length in data.segments_lengths:
+        if segment_length < 1e-5:
+            zero_length_segments += 1
+    return zero_length_segments
+
+
+def kernel_total_surface_area(data):
+    return compute_arbor_total_sum(data.sections_surface_areas)
+
+
+def kernel_minimum_section_surface_area(data):
+    return min(data.sections_surface_areas)
+
+
+def kernel_maximum_section_surface_area(data):
+    return max(data.sections_surface_areas)
+
+
+def kernel_average_section_surface_area(data):
+    return compute_arbor_total_sum(data.sections_surface_areas) / \
+        len(data.sections_surface_areas)
+
+
+def kernel_total_volume(data):
+    return compute_arbor_total_sum(data.sections_volumes)
+
+
+def kernel_minimum_section_volume(data):
+    return min(data.sections_volumes)
+
+
+def kernel_maximum_section_volume(data):
+    return max(data.sections_volumes)
+
+
+def kernel_average_section_volume(data):
+    return compute_arbor_total_sum(data.sections_volumes) / len(data.sections_volumes)
+
+
+####################################################################################################
+# Aggregation functions, every function computes the result of the morphology from the results
+# of its arbors, in the order apical dendrite, basal dendrites and axon
+####################################################################################################
+def aggregate_total(arbors_results):
+    total = 0
+    for result in arbors_results:
+        total += result
+    return total
+
+
+def aggregate_minimum(arbors_results):
+    return min(arbors_results)
+
+
+def aggregate_maximum(arbors_results):
+    return max(arbors_results)
+
+
+def aggregate_average(arbors_results):
+    average = 0
+    for result in arbors_results:
+        average += result
+    average /= len(arbors_results)
+    return average
+
+
+####################################################################################################
+# The per-arbor analysis items, in the same order of nmv.analysis.ui_per_arbor_analysis_items
+####################################################################################################
+PER_ARBOR_ANALYSIS_ITEMS = [
+    ['NumberTips', kernel_number_terminal_tips, aggregate_total],
+    ['TotalNumberSamples', kernel_number_samples, aggregate_total],
+    ['TotalNumberSections', kernel_number_sections, aggregate_total],
+    ['MaximumBranchingOrder', kernel_maximum_branching_order, aggregate_maximum],
+    ['TotalNumberBifurcations', kernel_number_bifurcations, aggregate_total],
+    ['TotalNumberTrifurcations', kernel_number_trifurcations, aggregate_total],
+    ['MaximumPathDistance', kernel_maximum_path_distance, aggregate_maximum],
+    ['MinNumberSamplePerSection', kernel_minimum_number_samples_per_section, aggregate_minimum],
+    ['MaxNumberSamplePerSection', kernel_maximum_number_samples_per_section, aggregate_maximum],
+    ['AvgNumberSamplePerSection', kernel_average_number_samples_per_section, aggregate_average],
+    ['MinSampleRadius', kernel_minimum_sample_radius, aggregate_minimum],
+    ['MaxSampleRadius', kernel_maximum_sample_radius, aggregate_maximum],
+    ['AvgSampleRadius', kernel_average_sample_radius, aggregate_average],
+    ['ZeroRadiiSamples', kernel_number_zero_radius_samples, aggregate_total],
+    ['MinimumLocalBifurcationAngle', kernel_minimum_local_bifurcation_angle, aggregate_minimum],
+    ['MaximumLocalBifurcationAngle', kernel_maximum_local_bifurcation_angle, aggregate_maximum],
+    ['AverageLocalBifurcationAngle', kernel_average_local_bifurcation_angle, aggregate_average],
+    ['MinimumGlobalBifurcationAngle', kernel_minimum_global_bifurcation_angle, aggregate_minimum],
+    ['MaximumGlobalBifurcationAngle', kernel_maximum_global_bifurcation_angle, aggregate_maximum],
+    ['AverageGlobalBifurcationAngle', kernel_average_global_bifurcation_angle, aggregate_average],
+    ['TotalLength', kernel_total_length, aggregate_total],
+    ['MinSectionLength', kernel_minimum_section_length, aggregate_minimum],
+    ['MaxSectionLength', kernel_maximum_section_length, aggregate_maximum],
+    ['AvgSectionLength', kernel_average_section_length, aggregate_average],
+    ['ShortSections', kernel_number_short_sections, aggregate_total],
+    ['MinSegmentLength', kernel_minimum_segment_length, aggregate_minimum],
+    ['MaxSegmentLength', kernel_maximum_segment_length, aggregate_maximum],
+    ['AvgSegmentLength', kernel_average_segment_length, aggregate_average],
+    ['ZeroLengthSegments', kernel_number_zero_length_segments, aggregate_total],
+    ['TotalSurfaceArea', kernel_total_surface_area, aggregate_total],
+    ['MinSectionSurfaceArea', kernel_minimum_section_surface_area, aggregate_minimum],
+    ['MaxSectionSurfaceArea', kernel_maximum_section_surface_area, aggregate_maximum],
+    ['AvgSurfaceAreaPerSection', kernel_average_section_surface_area, aggregate_average],
+    ['TotalVolume', kernel_total_volume, aggregate_total],
+    ['MinSectionVolume', kernel_minimum_section_volume, aggregate_minimum],
+    ['MaxSectionVolume', kernel_maximum_section_volume, aggregate_maximum],
+    ['AvgSectionVolume', kernel_average_section_volume, aggregate_average]]
+
+
+####################################################################################################
+# Global kernels, every kernel computes a single result from the entire morphology
+####################################################################################################
+def get_soma_possible_radii(morphology):
+    """Gets the distances of the profile points of the soma from the origin, similar to the
+    possible radii of the nmv.skeleton.Soma.
+
+    :param morphology:
+        A given MorphologyArrays structure.
+    :return:
+        A list of the possible radii of the soma.
+    """
+
+    return [math.sqrt(point[0] * point[0] + point[1] * point[1] + point[2] * point[2])
+            for point in morphology.soma_profile_points + morphology.soma_arbors_profile_points]
+
+
+def kernel_soma_reported_mean_radius(morphology):
+    return morphology.soma_mean_radius
+
+
+def kernel_soma_minimum_radius(morphology):
+    return min(get_soma_possible_radii(morphology))
+
+
+def kernel_soma_maximum_radius(morphology):
+    return max(get_soma_possible_radii(morphology))
+
+
+def kernel_soma_surface_area(morphology):
+    return 4 * 3.14 * (morphology.soma_mean_radius * morphology.soma_mean_radius)
+
+
+def kernel_soma_volume(morphology):
+    radius = morphology.soma_mean_radius
+    return (3.0 / 4.0) * 3.14 * (radius * radius * radius)
+
+
+def kernel_soma_number_profile_points(morphology):
+    return len(morphology.soma_profile_points)
+
+
+def kernel_number_apical_dendrites(morphology):
+    return 0 if morphology.apical_dendrite_root is None else 1
+
+
+def kernel_number_basal_dendrites(morphology):
+    return 0 if morphology.dendrites_roots is None else len(morphology.dendrites_roots)
+
+
+def kernel_number_axons(morphology):
+    return 0 if morphology.axon_root is None else 1
+
+
+def kernel_number_neurites(morphology):
+    return kernel_number_apical_dendrites(morphology) + \
+        kernel_number_basal_dendrites(morphology) + kernel_number_axons(morphology)
+
+
+def kernel_number_stems(morphology):
+    return morphology.number_stems
+
+
+####################################################################################################
+# The global analysis items, in the same order of nmv.analysis.ui_global_analysis_items
+####################################################################################################
+GLOBAL_ANALYSIS_ITEMS = [
+    ['SomaReportedRadius', kernel_soma_reported_mean_radius],
+    ['SomaMinimumRadius', kernel_soma_minimum_radius],
+    ['SomaMaximumRadius', kernel_soma_maximum_radius],
+    ['ReportedSomaSurfaceArea', kernel_soma_surface_area],
+    ['ReportedSomaVolume', kernel_soma_volume],
+    ['NumberProfilePoints', kernel_soma_number_profile_points],
+    ['NumberApicalDendrites', kernel_number_apical_dendrites],
+    ['NumberBasalDendrites', kernel_number_basal_dendrites],
+    ['NumberAxons', kernel_number_axons],
+    ['NumberNeurites', kernel_number_neurites],
+    ['NumberStems', kernel_number_stems]]
+
+
+####################################################################################################
+# The per-arbor distributions, in the same order of nmv.analysis.distributions
+####################################################################################################
+PER_ARBOR_DISTRIBUTIONS = [
+    ['number-of-samples-per-arbor', kernel_number_samples]]
+
+
+####################################################################################################
+# @get_analysis_variables
+####################################################################################################
+def get_analysis_variables():
+    """Gets the variables of the per-arbor and then the global analysis items.
+
+    :return:
+        An ordered list of the analysis variables.
+    """
+
+    return [variable for variable, _, _ in PER_ARBOR_ANALYSIS_ITEMS] + \
+        [variable for variable, _ in GLOBAL_ANALYSIS_ITEMS]
+
+
+####################################################################################################
+# @analyze_morphology_arrays_globally
+####################################################################################################
+def analyze_morphology_arrays_globally(morphology):
+    """Applies all the global analysis items on a given morphology.
+
+    :param morphology:
+        A given MorphologyArrays structure.
+    :return:
+        A list of [variable, result] pairs, one per global analysis item.
+    """
+
+    return [[variable, kernel(morphology)] for variable, kernel in GLOBAL_ANALYSIS_ITEMS]
+
+
+####################################################################################################
+# @collect_morphology_analysis_data
+####################################################################################################
+def collect_morphology_analysis_data(morphology):
+    """Collects the analysis data of all the arbors of a given morphology.
+
+    :param morphology:
+        A given MorphologyArrays structure.
+    :return:
+        A list of [prefix, ArborAnalysisData] pairs in the order of MorphologyArrays.get_arbors.
+    """
+
+    segments_data = compute_segments_data(morphology)
+    return [[prefix, collect_arbor_analysis_data(morphology, root, segments_data)]
+            for prefix, root in morphology.get_arbors()]
+
+
+####################################################################################################
+# @analyze_morphology_arrays
+####################################################################################################
+def analyze_morphology_arrays(morphology,
+                              arbors_data=None):
+    """Applies all the per-arbor analysis items on a given morphology.
+
+    :param morphology:
+        A given MorphologyArrays structure.
+    :param arbors_data:
+        The analysis data of the arbors from @collect_morphology_analysis_data, collected if not
+        given.
+    :return:
+        A list of [variable, results] pairs, one per analysis item, where the results are a list
+        of [prefix, result] pairs of the entire morphology ('Morphology') and then of the
+        individual arbors, for example 'ApicalDendrite', 'BasalDendrite0' or 'Axon'.
+    """
+
+    # Collect the data of every arbor only once for all the kernels
+    if arbors_data is None:
+        arbors_data = collect_morphology_analysis_data(morphology)
+
+    analysis_results = list()
+    for variable, kernel, aggregation_function in PER_ARBOR_ANALYSIS_ITEMS:
+        arbors_results = [[prefix, kernel(data)] for prefix, data in arbors_data]
+        morphology_result = aggregation_function([result for _, result in arbors_results])
+        analysis_results.append([variable, [['Morphology', morphology_result]] + arbors_results])
+    return analysis_results
+
+
+####################################################################################################
+# @compute_morphology_distributions
+####################################################################################################
+def compute_morphology_distributions(morphology,
+                                     arbors_data=None):
+    """Computes the per-arbor distributions of a given morphology.
+
+    :param morphology:
+        A given MorphologyArrays structure.
+    :param arbors_data:
+        The analysis data of the arbors from @collect_morphology_analysis_data, collected if not
+        given.
+    :return:
+        A list of [name, results] pairs, one per distribution, where the results are a list of
+        [prefix, value] pairs of the individual arbors.
+    """
+
+    if arbors_data is None:
+        arbors_data = collect_morphology_analysis_data(morphology)
+    return [[name, [[prefix, kernel(data)] for prefix, data in arbors_data]]
+            for name, kernel in PER_ARBOR_DISTRIBUTIONS]
@@ -0,0 +1,521 @@
+####################################################################################################
+# Copyright (c) 2016 - 2019, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+import sys
+import traceback
+import multiprocessing
+
+# Internal imports, this module must be importable without Blender
+sys.path.append('%s/../../consts' % os.path.dirname(os.path.realpath(__file__)))
+from arbors_consts import *
+
+
+# The directory of the fonts that are shipped with NeuroMorphoVis
+FONTS_DIRECTORY = '%s/../../../data/fonts' % os.path.dirname(os.path.realpath(__file__))
+
+# The resolution of the saved figures
+DEFAULT_DPI = 600
+
+# The extension of the saved figures
+DEFAULT_IMAGE_EXTENSION = 'TIFF'
+
+# The width of each bar, also used to scale the fonts of the figures
+BAR_WIDTH = 0.65
+
+# The style of all the figures, set only once per process
+PLOTTING_RC_PARAMS = {
+    'axes.grid': False,
+    'font.family': 'NimbusSanL',
+    'axes.linewidth': 0.0,
+    'axes.labelsize': BAR_WIDTH * 10,
+    'axes.labelweight': 'regular',
+    'xtick.labelsize': BAR_WIDTH * 10,
+    'ytick.labelsize': BAR_WIDTH * 10,
+    'legend.fontsize': 10,
+    'axes.titlesize': BAR_WIDTH * 1.25 * 10,
+    'axes.axisbelow': True,
+    'axes.edgecolor': '0.1',
+    'axes.facecolor': 'white',
+    'xtick.bottom': False,
+    'ytick.left': False}
+
+# The figures of the per-arbor distributions, in the same order of nmv.analysis.distributions.
+# Every figure has a title, a label of the independent axis and a flag to add the percentage of
+# every arbor to its bar
+DISTRIBUTIONS_FIGURES = {
+    'number-of-samples-per-arbor': ['Number of Samples / Arbor', 'Number of Samples', True]}
+
+# If the fonts and the style are set in this process
+plotting_setup_done = False
+
+# The plotter of a worker process, created by @initialize_plotting_worker
+worker_plotter = None
+
+
+####################################################################################################
+# @setup_plotting
+####################################################################################################
+def setup_plotting(fonts_directory=FONTS_DIRECTORY):
+    """Registers the fonts of NeuroMorphoVis and sets the style of the figures. The setup is only
+    done once per process, the following calls only return the pyplot module.
+
+    :param fonts_directory:
+        The directory of the fonts.
+    :return:
+        A reference to matplotlib.pyplot.
+    """
+
+    global plotting_setup_done
+
+    # Render the figures off-screen
+    import matplotlib
+    if not plotting_setup_done:
+        matplotlib.use('Agg')
+    from matplotlib import pyplot
+    from matplotlib import font_manager
+
+    if plotting_setup_done:
+        return pyplot
+
+    # Register the fonts, createFontList is removed in the recent versions of matplotlib
+    font_files = font_manager.findSystemFonts(fontpaths=[fonts_directory])
+    if hasattr(font_manager.fontManager, 'addfont'):
+        for font_file in font_files:
+            try:
+                font_manager.fontManager.addfont(font_file)
+            except (OSError, RuntimeError, ValueError):
+                continue
+    else:
+        font_manager.fontManager.ttflist.extend(font_manager.createFontList(font_files))
+
+    # The style of the figures
+    pyplot.rcParams.update(PLOTTING_RC_PARAMS)
+
+    plotting_setup_done = True
+    return pyplot
+
+
+####################################################################################################
+# @get_arbor_label
+####################################################################################################
+def get_arbor_label(prefix):
+    """Gets the label of an arbor in the figures from its prefix in the analysis results, for
+    example 'Basal Dendrite 3' for 'BasalDendrite3'.
+
+    :param prefix:
+        The prefix of the arbor.
+    :return:
+        The label of the arbor.
+    """
+
+    if prefix == Arbors.APICAL_DENDRITES_PREFIX:
+        return 'Apical Dendrite'
+    if prefix.startswith(Arbors.BASAL_DENDRITES_PREFIX):
+        return 'Basal Dendrite %s' % prefix[len(Arbors.BASAL_DENDRITES_PREFIX):]
+    return prefix
+
+
+####################################################################################################
+# @get_arbors_colors
+####################################################################################################
+def get_arbors_colors(number_arbors):
+    """Gets the colors of the arbors of a morphology, similar to the palette of
+    Morphology.create_morphology_color_palette, where the last color is reserved for the soma.
+
+    :param number_arbors:
+        The number of arbors.
+    :return:
+        A list of RGBA colors.
+    """
+
+    import numpy
+    pyplot = setup_plotting()
+    palette = pyplot.get_cmap('Spectral_r')
+    return list(palette(numpy.linspace(0, 1.0, 1 + number_arbors)))[:number_arbors]
+
+
+####################################################################################################
+# @DistributionPlotter
+####################################################################################################
+class DistributionPlotter:
+    """Plots the per-arbor distributions of the morphologies on a single figure that is cleared
+    and reused for every plot, instead of creating and destroying a figure per plot.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 image_extension=DEFAULT_IMAGE_EXTENSION,
+                 dpi=DEFAULT_DPI,
+                 preview_dpi=None,
+                 fonts_directory=FONTS_DIRECTORY):
+        """Constructor
+
+        :param image_extension:
+            The extension of the saved figures, for example 'TIFF' or 'PNG'.
+        :param dpi:
+            The resolution of the saved figures. If zero, the figures are not saved in this
+            extension, which is useful with the previews.
+        :param preview_dpi:
+            If set, every figure is also saved to a PNG preview at this resolution,
+            <figure>-preview.png.
+        :param fonts_directory:
+            The directory of the fonts.
+        """
+
+        # Output
+        self.image_extension = image_extension
+        self.dpi = dpi
+        self.preview_dpi = preview_dpi
+
+        # The figure is created once and reused
+        self.pyplot = setup_plotting(fonts_directory)
+        self.figure = self.pyplot.figure()
+        self.axes = None
+
+    ################################################################################################
+    # @prepare_axes
+    ################################################################################################
+    def prepare_axes(self,
+                     number_bars):
+        """Clears the figure and resizes it to the number of bars.
+
+        :param number_bars:
+            The number of bars, similar to the number of arbors.
+        :return:
+            The axes of the figure.
+        """
+
+        self.figure.clf()
+        self.figure.set_size_inches(BAR_WIDTH * 4, max(1, number_bars) * 0.5 * BAR_WIDTH)
+        self.axes = self.figure.add_subplot(1, 1, 1)
+        return self.axes
+
+    ################################################################################################
+    # @finalize_axes
+    ################################################################################################
+    def finalize_axes(self,
+                      labels,
+                      figure_title,
+                      figure_xlabel):
+        """Sets the labels and the title of the axes, the first arbor is on the top.
+
+        :param labels:
+            The labels of the bars.
+        :param figure_title:
+            The title of the figure.
+        :param figure_xlabel:
+            The label of the independent axis.
+        """
+
+        self.axes.set_yticks(range(len(labels)))
+        self.axes.set_yticklabels(labels)
+        self.axes.set_ylim(len(labels) - 0.5, -0.5)
+        self.axes.set(xlabel=figure_xlabel, title=figure_title)
+        self.axes.spines['left'].set_linewidth(0.5)
+        self.axes.spines['left'].set_color('black')
+
+    ################################################################################################
+    # @save_figure
+    ################################################################################################
+    def save_figure(self,
+                    figure_prefix):
+        """Saves the figure and its preview, if requested.
+
+        :param figure_prefix:
+            The path to the figure without the extension.
+        :return:
+            A list of the saved files.
+        """
+
+        figures_files = list()
+        if self.dpi:
+            figure_file = '%s.%s' % (figure_prefix, self.image_extension)
+            self.figure.savefig(figure_file, bbox_inches='tight', transparent=True, dpi=self.dpi)
+            figures_files.append(figure_file)
+        if self.preview_dpi:
+            figure_file = '%s-preview.png' % figure_prefix
+            self.figure.savefig(figure_file, bbox_inches='tight', transparent=True,
+                                dpi=self.preview_dpi)
+            figures_files.append(figure_file)
+        return figures_files
+
+    ################################################################################################
+    # @plot_per_arbor_result
+    ################################################################################################
+    def plot_per_arbor_result(self,
+                              figure_prefix,
+                              labels,
+                              values,
+                              colors,
+                              figure_title=None,
+                              figure_xlabel=None,
+                              add_percentage=False):
+        """Plots a bar per arbor with the value of the arbor next to it.
+
+        :param figure_prefix:
+            The path to the figure without the extension.
+        :param labels:
+            The labels of the arbors.
+        :param values:
+            The values of the arbors.
+        :param colors:
+            The colors of the arbors.
+        :param figure_title:
+            The title of the figure.
+        :param figure_xlabel:
+            The label of the independent axis.
+        :param add_percentage:
+            Add the percentage of every arbor to the total to its value.
+        :return:
+            A list of the saved files.
+        """
+
+        axes = self.prepare_axes(len(labels))
+        bars = axes.barh(range(len(labels)), values, height=BAR_WIDTH, color=colors,
+                         edgecolor='none')
+        self.finalize_axes(labels, figure_title, figure_xlabel)
+
+        # Add the value, and the percentage, on the right side of every bar
+        total = sum(values)
+        for bar, value in zip(bars, values):
+            if 'float' in str(type(value)):
+                text = '  %2.1f' % value
+            else:
+                text = '  %d' % value
+            if add_percentage:
+                percentage = round((value / total) * 100, 2) if total else 0.0
+                text += ' (%2.1f%%)' % percentage
+            axes.text(bar.get_width(), bar.get_y() + (BAR_WIDTH / 2.0) + (BAR_WIDTH / 8.0), text,
+                      fontsize=BAR_WIDTH * 10, color='dimgrey')
+
+        return self.save_figure(figure_prefix)
+
+    ################################################################################################
+    # @plot_per_arbor_range
+    ################################################################################################
+    def plot_per_arbor_range(self,
+                             figure_prefix,
+                             labels,
+                             minimum_values,
+                             average_values,
+                             maximum_values,
+                             colors,
+                             figure_title=None,
+                             figure_xlabel=None):
+        """Plots a bar per arbor with the average value and the range of the arbor.
+
+        :param figure_prefix:
+            The path to the figure without the extension.
+        :param labels:
+            The labels of the arbors.
+        :param minimum_values:
+            The minimum values of the arbors.
+        :param average_values:
+            The average values of the arbors.
+        :param maximum_values:
+            The maximum values of the arbors.
+        :param colors:
+            The colors of the arbors.
+        :param figure_title:
+            The title of the figure.
+        :param figure_xlabel:
+            The label of the independent axis.
+        :return:
+            A list of the saved files.
+        """
+
+        import numpy
+        minimum_values = numpy.array(minimum_values)
+        average_values = numpy.array(average_values)
+        maximum_values = numpy.array(maximum_values)
+        xerr = numpy.array([average_values - minimum_values, maximum_values - average_values])
+
+        axes = self.prepare_axes(len(labels))
+        axes.barh(range(len(labels)), average_values, height=BAR_WIDTH, color=colors,
+                  edgecolor='none', xerr=xerr, error_kw={'elinewidth': 0.75, 'capsize': 1.0})
+        self.finalize_axes(labels, figure_title, figure_xlabel)
+
+        return self.save_figure(figure_prefix)
+
+    ################################################################################################
+    # @plot_job
+    ################################################################################################
+    def plot_job(self,
+                 job):
+        """Plots a job from @get_morphology_plot_jobs.
+
+        :param job:
+            A plot job.
+        :return:
+            A list of the saved files.
+        """
+
+        return self.plot_per_arbor_result(
+            job['figure_prefix'], job['labels'], job['values'],
+            get_arbors_colors(len(job['labels'])), figure_title=job['figure_title'],
+            figure_xlabel=job['figure_xlabel'], add_percentage=job['add_percentage'])
+
+    ################################################################################################
+    # @close
+    ################################################################################################
+    def close(self):
+        """Closes the figure.
+        """
+
+        self.pyplot.close(self.figure)
+
+
+####################################################################################################
+# @get_morphology_plot_jobs
+####################################################################################################
+def get_morphology_plot_jobs(label,
+                             distributions,
+                             output_directory):
+    """Gets the plot jobs of the per-arbor distributions of a morphology, one job per figure.
+
+    The jobs only contain plain data, so they can be sent to the worker processes.
+
+    :param label:
+        The label of the morphology, used to name the figures.
+    :param distributions:
+        A list of [name, results] pairs, as returned by
+        analysis_kernels.compute_morphology_distributions.
+    :param output_directory:
+        The directory where the figures will be saved.
+    :return:
+        A list of the plot jobs.
+    """
+
+    jobs = list()
+    for name, results in distributions:
+        if name not in DISTRIBUTIONS_FIGURES or len(results) == 0:
+            continue
+        figure_title, figure_xlabel, add_percentage = DISTRIBUTIONS_FIGURES[name]
+        jobs.append({'figure_prefix': '%s/%s-%s' % (output_directory, label, name),
+                     'labels': [get_arbor_label(prefix) for prefix, _ in results],
+                     'values': [value for _, value in results],
+                     'figure_title': figure_title,
+                     'figure_xlabel': figure_xlabel,
+                     'add_percentage': add_percentage})
+    return jobs
+
+
+####################################################################################################
+# @initialize_plotting_worker
+####################################################################################################
+def initialize_plotting_worker(image_extension,
+                               dpi,
+                               preview_dpi):
+    """Sets up the fonts and the style, and creates the plotter of a worker process only once.
+
+    :param image_extension:
+        The extension of the saved figures.
+    :param dpi:
+        The resolution of the saved figures.
+    :param preview_dpi:
+        The resolution of the previews, if any.
+    """
+
+    global worker_plotter
+    worker_plotter = DistributionPlotter(image_extension, dpi, preview_dpi)
+
+
+####################################################################################################
+# @plot_job_in_worker
+####################################################################################################
+def plot_job_in_worker(job):
+    """Plots a job with the plotter of the worker process.
+
+    :param job:
+        A plot job.
+    :return:
+        A [figure_prefix, error] pair, where the error is None if the job is plotted.
+    """
+
+    try:
+        worker_plotter.plot_job(job)
+        return [job['figure_prefix'], None]
+    except Exception:
+        return [job['figure_prefix'], traceback.format_exc().strip().splitlines()[-1]]
+
+
+####################################################################################################
+# @plot_jobs
+####################################################################################################
+def plot_jobs(jobs,
+              number_processes=None,
+              image_extension=DEFAULT_IMAGE_EXTENSION,
+              dpi=DEFAULT_DPI,
+              preview_dpi=None):
+    """Plots a list of jobs, for a morphology or an entire population, on a pool of processes.
+
+    Every worker sets up the fonts and the style and creates its figure only once, and then
+    reuses it for all its jobs.
+
+    :param jobs:
+        A list of plot jobs, for example from @get_morphology_plot_jobs.
+    :param number_processes:
+        The number of worker processes, by default the number of cores of the node. If one, the
+        jobs are plotted in this process.
+    :param image_extension:
+        The extension of the saved figures.
+    :param dpi:
+        The resolution of the saved figures, zero to only save the previews.
+    :param preview_dpi:
+        The resolution of the previews, None to skip them.
+    :return:
+        The number of plotted figures and the number of failures.
+    """
+
+    if len(jobs) == 0:
+        return 0, 0
+
+    # A worker that cannot be initialized is restarted forever, verify matplotlib beforehand
+    try:
+        import matplotlib
+    except ImportError:
+        print('ERROR: Cannot import [matplotlib], please install it to plot the distributions')
+        return 0, len(jobs)
+
+    number_processes = min(number_processes or multiprocessing.cpu_count(), len(jobs))
+
+    # Plot in this process
+    if number_processes <= 1:
+        initialize_plotting_worker(image_extension, dpi, preview_dpi)
+        results = [plot_job_in_worker(job) for job in jobs]
+        worker_plotter.close()
+
+    # Plot in a pool of processes
+    else:
+        with multiprocessing.Pool(processes=number_processes,
+                                  initializer=initialize_plotting_worker,
+                                  initargs=(image_extension, dpi, preview_dpi)) as pool:
+            results = list(pool.imap_unordered(
+                plot_job_in_worker, jobs,
+                chunksize=max(1, len(jobs) // (4 * number_processes))))
+
+    number_failures = 0
+    for figure_prefix, error in results:
+        if error is not None:
+            number_failures += 1
+            print('ERROR: Cannot plot the figure [%s]: %s' % (figure_prefix, error))
+
+    return len(results) - number_failures, number_failures
@@ -0,0 +1,86 @@
+####################################################################################################
+# Copyright (c) 2016 - 2019, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+
+
+####################################################################################################
+# @get_analysis_report_string
+####################################################################################################
+def get_analysis_report_string(morphology,
+                               analysis_results):
+    """Gets the analysis report of a morphology in the same format of the report that is written
+    by export_analysis_results in the Blender interface.
+
+    :param morphology:
+        A given MorphologyArrays structure.
+    :param analysis_results:
+        The analysis results of the morphology from analyze_morphology_arrays.
+    :return:
+        The analysis report as a string.
+    """
+
+    # Header
+    report = '*' * 80 + '\n'
+    report += 'WARNING: AUTO-GENERATED FILE FROM NEUROMORPHOVIS \n'
+    report += '*' * 80 + '\n'
+    report += '* Analysis results for the morphology [%s] \n\n' % morphology.label
+
+    # Contents
+    report += '- Contents \n'
+    report += '\t* Soma: %s \n' % ('Found' if morphology.has_soma else 'Not Found')
+    report += '\t* Apical Dendrite: %d \n' % (
+        1 if morphology.apical_dendrite_root is not None else 0)
+    report += '\t* Basal Dendrites: %d \n' % (
+        len(morphology.dendrites_roots) if morphology.dendrites_roots is not None else 0)
+    report += '\t* Axon: %d \n\n' % (1 if morphology.axon_root is not None else 0)
+
+    # Analysis items
+    for variable, results in analysis_results:
+        report += '- %s \n' % variable
+        for prefix, result in results:
+            report += '\t* %s : %s\n' % (prefix, str(result))
+        report += ' \n'
+
+    return report
+
+
+####################################################################################################
+# @write_analysis_report
+####################################################################################################
+def write_analysis_report(morphology,
+                          analysis_results,
+                          directory):
+    """Writes the analysis report of a morphology to <directory>/<label>-analysis.txt.
+
+    :param morphology:
+        A given MorphologyArrays structure.
+    :param analysis_results:
+        The analysis results of the morphology from analyze_morphology_arrays.
+    :param directory:
+        The output directory where the report will be written.
+    :return:
+        The path to the report.
+    """
+
+    report_file = '%s/%s-analysis.txt' % (directory, morphology.label)
+    if not os.path.exists(directory):
+        os.makedirs(directory, exist_ok=True)
+    with open(report_file, 'w') as f:
+        f.write(get_analysis_report_string(morphology, analysis_results))
+    return report_file
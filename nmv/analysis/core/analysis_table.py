@@ -0,0 +1,388 @@
+####################################################################################################
+# Copyright (c) 2016 - 2019, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+import csv
+import math
+
+
+# The supported formats of the analysis tables
+TABLE_FORMATS = ['csv', 'parquet', 'hdf5']
+
+# The extensions of the analysis tables
+TABLE_EXTENSIONS = {'csv': '.csv', 'parquet': '.parquet', 'hdf5': '.h5'}
+
+# The key columns of every row, all the other columns are numeric
+KEY_COLUMNS = ['Label', 'MType', 'Arbor']
+
+# The number of rows that are buffered before they are written to the table
+DEFAULT_BATCH_SIZE = 1024
+
+
+####################################################################################################
+# @get_analysis_table_rows
+####################################################################################################
+def get_analysis_table_rows(label,
+                            analysis_results,
+                            global_results=None,
+                            mtype=None):
+    """Gets the rows of a morphology in an analysis table, one row for the entire morphology and
+    one row per arbor, with one column per analysis variable.
+
+    :param label:
+        The label of the morphology.
+    :param analysis_results:
+        A list of [variable, results] pairs of the per-arbor analysis items, where the results are
+        a list of [prefix, result] pairs starting with the 'Morphology' result, as returned by
+        analysis_kernels.analyze_morphology_arrays.
+    :param global_results:
+        An optional list of [variable, result] pairs of the global analysis items, that are only
+        set in the row of the entire morphology.
+    :param mtype:
+        The m-type of the morphology, if known.
+    :return:
+        A list of the rows, where every row is a dictionary keyed by the column names.
+    """
+
+    # Create the rows in the order of the analysis results
+    rows = list()
+    rows_by_prefix = dict()
+    for variable, results in analysis_results:
+        for prefix, result in results:
+            if prefix not in rows_by_prefix:
+                row = {'Label': label, 'MType': mtype, 'Arbor': prefix}
+                rows_by_prefix[prefix] = row
+                rows.append(row)
+            rows_by_prefix[prefix][variable] = result
+
+    # The global results belong to the entire morphology
+    if global_results is not None and len(rows) > 0:
+        for variable, result in global_results:
+            rows[0][variable] = result
+
+    return rows
+
+
+####################################################################################################
+# @get_table_format
+####################################################################################################
+def get_table_format(table_file):
+    """Gets the format of an analysis table from the extension of its file.
+
+    :param table_file:
+        The path to the table.
+    :return:
+        One of TABLE_FORMATS.
+    """
+
+    extension = os.path.splitext(table_file)[1].lower()
+    if extension in ['.h5', '.hdf5']:
+        return 'hdf5'
+    if extension == '.parquet':
+        return 'parquet'
+    return 'csv'
+
+
+####################################################################################################
+# @AnalysisTableWriter
+####################################################################################################
+class AnalysisTableWriter:
+    """Writes the rows of the analysis results into a columnar table in batches.
+
+    The table has the KEY_COLUMNS as strings and one numeric column per analysis variable. If the
+    table already exists, the new rows are appended to it, so the tables of several runs can be
+    accumulated into a single table.
+
+    * CSV: a single file with a header, the missing values are empty.
+    * Parquet: a directory of part files, one part per writer and one row group per batch, that
+      is read as a single dataset, e.g. with pandas.read_parquet. The missing values are nulls.
+    * HDF5: a file with a resizable one-dimensional dataset per column, the missing values are
+      NaNs.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 table_file,
+                 value_columns,
+                 table_format=None,
+                 batch_size=DEFAULT_BATCH_SIZE):
+        """Constructor
+
+        :param table_file:
+            The path to the table.
+        :param value_columns:
+            An ordered list of the names of the numeric columns, typically the analysis variables.
+        :param table_format:
+            One of TABLE_FORMATS, by default from the extension of the table file.
+        :param batch_size:
+            The number of rows that are buffered before they are written to the table.
+        """
+
+        # Table
+        self.table_file = table_file
+        self.table_format = table_format or get_table_format(table_file)
+        if self.table_format not in TABLE_FORMATS:
+            raise ValueError('Invalid analysis table format [%s]' % self.table_format)
+
+        # Columns
+        self.value_columns = list(value_columns)
+        self.columns = KEY_COLUMNS + self.value_columns
+
+        # Buffered rows
+        self.batch_size = max(1, batch_size)
+        self.rows = list()
+
+        # Number of rows written by this writer
+        self.number_rows = 0
+
+        # The Parquet writer is created with the first batch
+        self.parquet_writer = None
+
+        # Fail before the analysis if the module of the format is not installed
+        self.import_table_module()
+
+        # The rows can be only appended to a table with the same columns
+        self.verify_existing_table()
+
+    ################################################################################################
+    # @import_table_module
+    ################################################################################################
+    def import_table_module(self):
+        """Imports the module that writes the table format, pyarrow for Parquet and h5py for HDF5.
+
+        :return:
+            A reference to the module, or None for CSV tables.
+        :raise ImportError:
+            If the module is not installed.
+        """
+
+        if self.table_format == 'csv':
+            return None
+
+        module_name = 'pyarrow' if self.table_format == 'parquet' else 'h5py'
+        try:
+            if self.table_format == 'parquet':
+                import pyarrow
+                import pyarrow.parquet
+                return pyarrow
+            import h5py
+            return h5py
+        except ImportError:
+            print('ERROR: Cannot import [%s], please install it to write %s tables' %
+                  (module_name, self.table_format))
+            raise
+
+    ################################################################################################
+    # @verify_existing_table
+    ################################################################################################
+    def verify_existing_table(self):
+        """Verifies that an existing CSV or HDF5 table has the same columns of the writer.
+
+        :raise ValueError:
+            If the existing table has different columns.
+        """
+
+        if not os.path.isfile(self.table_file) or os.path.getsize(self.table_file) == 0:
+            return
+
+        # The CSV columns are ordered
+        if self.table_format == 'csv':
+            with open(self.table_file, 'r', newline='') as f:
+                matching = next(csv.reader(f), list()) == self.columns
+
+        # The HDF5 datasets are not
+        elif self.table_format == 'hdf5':
+            h5py = self.import_table_module()
+            with h5py.File(self.table_file, 'r') as f:
+                matching = sorted(f.keys()) == sorted(self.columns)
+
+        else:
+            matching = True
+
+        if not matching:
+            raise ValueError('The columns of the analysis table [%s] do not match' %
+                             self.table_file)
+
+    ################################################################################################
+    # @append_row
+    ################################################################################################
+    def append_row(self,
+                   row):
+        """Appends a row to the table.
+
+        :param row:
+            A dictionary keyed by the column names, the missing columns are empty.
+        """
+
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    ################################################################################################
+    # @append_rows
+    ################################################################################################
+    def append_rows(self,
+                    rows):
+        """Appends a list of rows to the table.
+
+        :param rows:
+            A list of dictionaries keyed by the column names.
+        """
+
+        for row in rows:
+            self.append_row(row)
+
+    ################################################################################################
+    # @get_column_values
+    ################################################################################################
+    def get_column_values(self,
+                          column):
+        """Gets the values of a column in the buffered rows, the numeric values are floats and the
+        missing ones are None.
+
+        :param column:
+            The name of the column.
+        :return:
+            A list of the values.
+        """
+
+        if column in KEY_COLUMNS:
+            return [None if row.get(column) is None else str(row[column]) for row in self.rows]
+        return [None if row.get(column) is None else float(row[column]) for row in self.rows]
+
+    ################################################################################################
+    # @write_csv_batch
+    ################################################################################################
+    def write_csv_batch(self):
+        """Appends the buffered rows to the CSV table.
+        """
+
+        write_header = not os.path.isfile(self.table_file) or \
+            os.path.getsize(self.table_file) == 0
+        with open(self.table_file, 'a', newline='') as f:
+            writer = csv.writer(f)
+            if write_header:
+                writer.writerow(self.columns)
+            for row in self.rows:
+                writer.writerow(['' if row.get(column) is None else row[column]
+                                 for column in self.columns])
+
+    ################################################################################################
+    # @write_parquet_batch
+    ################################################################################################
+    def write_parquet_batch(self):
+        """Writes the buffered rows as a row group to the part file of this writer.
+        """
+
+        pyarrow = self.import_table_module()
+        schema = pyarrow.schema([(column, pyarrow.string()) for column in KEY_COLUMNS] +
+                                [(column, pyarrow.float64()) for column in self.value_columns])
+
+        # Every writer adds a new part to the dataset
+        if self.parquet_writer is None:
+            if not os.path.exists(self.table_file):
+                os.makedirs(self.table_file, exist_ok=True)
+            part = 0
+            while os.path.exists('%s/part-%05d.parquet' % (self.table_file, part)):
+                part += 1
+            self.parquet_writer = pyarrow.parquet.ParquetWriter(
+                '%s/part-%05d.parquet' % (self.table_file, part), schema)
+
+        arrays = [pyarrow.array(self.get_column_values(column), type=schema.field(column).type)
+                  for column in self.columns]
+        self.parquet_writer.write_table(pyarrow.Table.from_arrays(arrays, schema=schema))
+
+    ################################################################################################
+    # @write_hdf5_batch
+    ################################################################################################
+    def write_hdf5_batch(self):
+        """Appends the buffered rows to the column datasets of the HDF5 table.
+        """
+
+        h5py = self.import_table_module()
+        number_rows = len(self.rows)
+        with h5py.File(self.table_file, 'a') as f:
+            for column in self.columns:
+                values = self.get_column_values(column)
+
+                # Create the column dataset
+                if column not in f:
+                    if column in KEY_COLUMNS:
+                        f.create_dataset(column, shape=(0,), maxshape=(None,), chunks=True,
+                                         dtype=h5py.string_dtype(encoding='utf-8'))
+                    else:
+                        f.create_dataset(column, shape=(0,), maxshape=(None,), chunks=True,
+                                         dtype='f8')
+
+                # Append the values
+                dataset = f[column]
+                offset = dataset.shape[0]
+                dataset.resize((offset + number_rows,))
+                if column in KEY_COLUMNS:
+                    dataset[offset:] = ['' if value is None else value for value in values]
+                else:
+                    dataset[offset:] = [math.nan if value is None else value for value in values]
+
+    ################################################################################################
+    # @flush
+    ################################################################################################
+    def flush(self):
+        """Writes the buffered rows to the table.
+        """
+
+        if len(self.rows) == 0:
+            return
+
+        if self.table_format == 'csv':
+            self.write_csv_batch()
+        elif self.table_format == 'parquet':
+            self.write_parquet_batch()
+        else:
+            self.write_hdf5_batch()
+
+        self.number_rows += len(self.rows)
+        self.rows = list()
+
+    ################################################################################################
+    # @close
+    ################################################################################################
+    def close(self):
+        """Writes the remaining rows and closes the table.
+        """
+
+        self.flush()
+        if self.parquet_writer is not None:
+            self.parquet_writer.close()
+            self.parquet_writer = None
+
+    ################################################################################################
+    # @__enter__
+    ################################################################################################
+    def __enter__(self):
+        return self
+
+    ################################################################################################
+    # @__exit__
+    ################################################################################################
+    def __exit__(self,
+                 exception_type,
+                 exception_value,
+                 traceback):
+        self.close()
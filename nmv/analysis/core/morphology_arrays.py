@@ -0,0 +1,1095 @@
+####################################################################################################
+# Copyright (c) 2016 - 2019, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+import math
+import sys
+import warnings
+import numpy
+
+# Internal imports, this module must be importable without Blender
+sys.path.append('%s/../../consts' % os.path.dirname(os.path.realpath(__file__)))
+from arbors_consts import *
+
+
+####################################################################################################
+# @MorphologyArrays
+####################################################################################################
+class MorphologyArrays:
+    """A Blender-free representation of the morphological skeleton that only stores NumPy arrays
+    (structure of arrays) rather than a graph of objects.
+
+    The samples of the section i are the rows [sections_offsets[i], sections_offsets[i + 1]) of
+    the samples arrays. Similar to the nmv.skeleton.Morphology, the first sample of a child section
+    duplicates the last sample of its parent section, and the arbors are ordered in the same way
+    the readers of NeuroMorphoVis order them. This is the base of the nmv.skeleton.ArrayMorphology
+    that adds the views and the Blender-dependent data on top of the same arrays.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 points,
+                 radii,
+                 sections_offsets,
+                 sections_types,
+                 sections_parents,
+                 sections_ids=None,
+                 samples_ids=None,
+                 samples_morphology_indices=None,
+                 samples_types=None,
+                 samples_parents_ids=None,
+                 axon_root=None,
+                 dendrites_roots=None,
+                 apical_dendrite_root=None,
+                 soma_mean_radius=None,
+                 soma_profile_points=None,
+                 soma_arbors_profile_points=None,
+                 label=None,
+                 number_stems=0):
+        """Constructor
+
+        :param points:
+            An Nx3 array of the positions of all the samples.
+        :param radii:
+            An array of the radii of all the samples.
+        :param sections_offsets:
+            An array of S+1 offsets, the samples of the section i are in the range
+            [sections_offsets[i], sections_offsets[i + 1]).
+        :param sections_types:
+            An array of the types of the sections.
+        :param sections_parents:
+            An array of the indices of the parent sections in the arrays, -1 for root sections.
+        :param sections_ids:
+            An array of the indices of the sections as reported by the reader, by default the
+            indices of the sections in the arrays.
+        :param samples_ids:
+            An array of the indices of the samples as reported by the reader, by default the
+            indices of the samples along their sections.
+        :param samples_morphology_indices:
+            An array of the indices of the samples in the morphology file, by default -1.
+        :param samples_types:
+            An array of the types of the samples, by default the types of their sections.
+        :param samples_parents_ids:
+            An array of the indices of the parent samples in the morphology file, by default -1.
+        :param axon_root:
+            The index of the root section of the axon, if available.
+        :param dendrites_roots:
+            A list of the indices of the root sections of the basal dendrites, if available.
+        :param apical_dendrite_root:
+            The index of the root section of the apical dendrite, if available.
+        :param soma_mean_radius:
+            The mean radius of the soma, None if the morphology has no soma.
+        :param soma_profile_points:
+            A list of the profile points of the soma.
+        :param soma_arbors_profile_points:
+            A list of the profile points of the soma measured from the first samples of the arbors.
+        :param label:
+            A given label to the morphology.
+        :param number_stems:
+            Number of stems as reported in the morphology file.
+        """
+
+        # Samples arrays
+        self.points = numpy.ascontiguousarray(points, dtype=numpy.float64).reshape((-1, 3))
+        self.radii = numpy.ascontiguousarray(radii, dtype=numpy.float64)
+
+        # Sections arrays
+        self.sections_offsets = numpy.ascontiguousarray(sections_offsets, dtype=numpy.int64)
+        self.sections_types = numpy.ascontiguousarray(sections_types, dtype=numpy.int32)
+        self.sections_parents = numpy.ascontiguousarray(sections_parents, dtype=numpy.int64)
+
+        # The number of samples of every section
+        number_sections = len(self.sections_offsets) - 1
+        number_section_samples = numpy.diff(self.sections_offsets)
+
+        # The indices of the sections
+        if sections_ids is None:
+            sections_ids = numpy.arange(number_sections)
+        self.sections_ids = numpy.ascontiguousarray(sections_ids, dtype=numpy.int64)
+
+        # The indices of the samples along their sections
+        if samples_ids is None:
+            samples_ids = numpy.arange(len(self.radii)) - numpy.repeat(
+                self.sections_offsets[:-1], number_section_samples)
+        self.samples_ids = numpy.ascontiguousarray(samples_ids, dtype=numpy.int64)
+
+        # The indices of the samples in the morphology file
+        if samples_morphology_indices is None:
+            samples_morphology_indices = numpy.full(len(self.radii), -1)
+        self.samples_morphology_indices = numpy.ascontiguousarray(
+            samples_morphology_indices, dtype=numpy.int64)
+
+        # The types of the samples
+        if samples_types is None:
+            samples_types = numpy.repeat(self.sections_types, number_section_samples)
+        self.samples_types = numpy.ascontiguousarray(samples_types, dtype=numpy.int32)
+
+        # The indices of the parent samples in the morphology file
+        if samples_parents_ids is None:
+            samples_parents_ids = numpy.full(len(self.radii), -1)
+        self.samples_parents_ids = numpy.ascontiguousarray(samples_parents_ids, dtype=numpy.int64)
+
+        # The children of every section in a compressed format, the children of the section i are
+        # sections_children[sections_children_offsets[i]:sections_children_offsets[i + 1]]
+        children = numpy.nonzero(self.sections_parents >= 0)[0]
+        children = children[numpy.argsort(self.sections_parents[children], kind='stable')]
+        self.sections_children = children
+        self.sections_children_offsets = numpy.zeros(number_sections + 1, dtype=numpy.int64)
+        numpy.cumsum(numpy.bincount(self.sections_parents[children], minlength=number_sections),
+                     out=self.sections_children_offsets[1:])
+
+        # The roots of the arbors
+        self.axon_root = axon_root
+        self.dendrites_roots = dendrites_roots
+        self.apical_dendrite_root = apical_dendrite_root
+
+        # Soma
+        self.has_soma = soma_mean_radius is not None
+        self.soma_mean_radius = soma_mean_radius
+        self.soma_profile_points = soma_profile_points or list()
+        self.soma_arbors_profile_points = soma_arbors_profile_points or list()
+
+        # Morphology label
+        self.label = label
+
+        # Number of stems as reported in the morphology file
+        self.number_stems = number_stems
+
+    ################################################################################################
+    # @get_number_sections
+    ################################################################################################
+    def get_number_sections(self):
+        """Returns the total number of sections in the morphology."""
+        return len(self.sections_offsets) - 1
+
+    ################################################################################################
+    # @get_number_samples
+    ################################################################################################
+    def get_number_samples(self):
+        """Returns the total number of samples in the morphology."""
+        return len(self.radii)
+
+    ################################################################################################
+    # @get_section_points
+    ################################################################################################
+    def get_section_points(self,
+                           index):
+        """Returns a view on the points of the samples of a given section.
+
+        :param index:
+            The index of the section in the arrays.
+        :return:
+            An Mx3 array view.
+        """
+        return self.points[self.sections_offsets[index]:self.sections_offsets[index + 1]]
+
+    ################################################################################################
+    # @get_section_radii
+    ################################################################################################
+    def get_section_radii(self,
+                          index):
+        """Returns a view on the radii of the samples of a given section.
+
+        :param index:
+            The index of the section in the arrays.
+        :return:
+            An array view.
+        """
+        return self.radii[self.sections_offsets[index]:self.sections_offsets[index + 1]]
+
+    ################################################################################################
+    # @get_section_children_indices
+    ################################################################################################
+    def get_section_children_indices(self,
+                                     index):
+        """Returns the indices of the children of a given section.
+
+        :param index:
+            The index of the section in the arrays.
+        :return:
+            A list of indices.
+        """
+        return self.sections_children[self.sections_children_offsets[index]:
+                                      self.sections_children_offsets[index + 1]].tolist()
+
+    ################################################################################################
+    # @get_sample_section_index
+    ################################################################################################
+    def get_sample_section_index(self,
+                                 index):
+        """Returns the index of the section where a given sample belongs.
+
+        :param index:
+            The index of the sample in the arrays.
+        :return:
+            The index of the section.
+        """
+        return int(numpy.searchsorted(self.sections_offsets, index, side='right') - 1)
+
+    ################################################################################################
+    # @has_axon
+    ################################################################################################
+    def has_axon(self):
+        """Checks if the morphology has axon reported in the data or not."""
+        return self.axon_root is not None
+
+    ################################################################################################
+    # @has_dendrites
+    ################################################################################################
+    def has_dendrites(self):
+        """Checks if the morphology has basal dendrites reported in the data or not."""
+        return self.dendrites_roots is not None
+
+    ################################################################################################
+    # @has_apical_dendrite
+    ################################################################################################
+    def has_apical_dendrite(self):
+        """Checks if the morphology has an apical dendrite reported in the data or not."""
+        return self.apical_dendrite_root is not None
+
+    ################################################################################################
+    # @get_arbors
+    ################################################################################################
+    def get_arbors(self):
+        """Gets the arbors of the morphology in the same order of the analysis results, i.e. the
+        apical dendrite, the basal dendrites and then the axon.
+
+        :return:
+            A list of [prefix, root] pairs, where the prefix identifies the arbor in the analysis
+            results, for example 'BasalDendrite0'.
+        """
+
+        arbors = list()
+        if self.apical_dendrite_root is not None:
+            arbors.append([Arbors.APICAL_DENDRITES_PREFIX, self.apical_dendrite_root])
+        if self.dendrites_roots is not None:
+            for i, root in enumerate(self.dendrites_roots):
+                arbors.append(['%s%d' % (Arbors.BASAL_DENDRITES_PREFIX, i), root])
+        if self.axon_root is not None:
+            arbors.append([Arbors.AXON_PREFIX, self.axon_root])
+        return arbors
+
+    ################################################################################################
+    # @get_arbor_sections_indices
+    ################################################################################################
+    def get_arbor_sections_indices(self,
+                                   root):
+        """Returns the indices of all the sections of an arbor in depth-first order.
+
+        :param root:
+            The index of the root section of the arbor.
+        :return:
+            A list of indices.
+        """
+
+        indices = list()
+        stack = [root]
+        while len(stack) > 0:
+            index = stack.pop()
+            indices.append(index)
+            stack.extend(reversed(self.get_section_children_indices(index)))
+        return indices
+
+
+####################################################################################################
+# @get_morphology_label
+####################################################################################################
+def get_morphology_label(morphology_file):
+    """Gets the label of the morphology from the name of its file, similar to the readers.
+
+    :param morphology_file:
+        The path to the morphology file.
+    :return:
+        The label of the morphology.
+    """
+
+    file_name = os.path.basename(morphology_file)
+    if '.' in file_name:
+        return os.path.splitext(file_name)[0]
+    return file_name
+
+
+####################################################################################################
+# @get_arbors_roots
+####################################################################################################
+def get_arbors_roots(roots,
+                     axon_type,
+                     basal_dendrite_type,
+                     apical_dendrite_type):
+    """Selects the roots of the arbors from the roots of every type. If we have more than a single
+    axon or apical dendrite, we use the principal one and add the others to the basal dendrites.
+
+    :param roots:
+        A dictionary of the lists of the roots of every type.
+    :param axon_type:
+        The type of the axon sections.
+    :param basal_dendrite_type:
+        The type of the basal dendrites sections.
+    :param apical_dendrite_type:
+        The type of the apical dendrites sections.
+    :return:
+        The root of the axon, the roots of the basal dendrites and the root of the apical dendrite.
+    """
+
+    dendrites_roots = list(roots[basal_dendrite_type])
+    axon_root = None
+    if len(roots[axon_type]) > 0:
+        axon_root = roots[axon_type][0]
+        dendrites_roots.extend(roots[axon_type][1:])
+    apical_dendrite_root = None
+    if len(roots[apical_dendrite_type]) > 0:
+        apical_dendrite_root = roots[apical_dendrite_type][0]
+        dendrites_roots.extend(roots[apical_dendrite_type][1:])
+    if len(dendrites_roots) == 0:
+        dendrites_roots = None
+    return axon_root, dendrites_roots, apical_dendrite_root
+
+
+####################################################################################################
+# @compute_points_mean_length
+####################################################################################################
+def compute_points_mean_length(points):
+    """Computes the average distance of a list of points from the origin.
+
+    :param points:
+        A list of points.
+    :return:
+        The average distance.
+    """
+
+    total_length = 0.0
+    for point in points:
+        total_length += math.sqrt(point[0] * point[0] + point[1] * point[1] + point[2] * point[2])
+    return total_length / len(points)
+
+
+####################################################################################################
+# @read_swc_samples_in_bulk
+####################################################################################################
+def read_swc_samples_in_bulk(swc_file):
+    """Reads the samples of an SWC file in a single flat pass into a NumPy array of seven columns.
+
+    The lines with comments that have '#' and the empty lines are ignored, like the line-by-line
+    parser of the SWCReader.
+
+    :param swc_file:
+        The path to the SWC file.
+    :return:
+        An Nx7 array of the samples, or None if any line does not have exactly seven numbers.
+    """
+
+    # Read the entire file at once
+    with open(swc_file, 'r') as f:
+        data = f.read()
+
+    # The lines are only filtered if the file has any comments or empty lines
+    lines = data.splitlines()
+    if '#' in data or not all(lines):
+        lines = [line for line in lines if '#' not in line and line.strip()]
+
+    # Parse all the numbers in a single flat pass, where a NaN is inserted at the end of every
+    # line to verify that every line has exactly seven columns. An invalid number stops the
+    # parsing, and then the number of the values is wrong
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            values = numpy.fromstring(' nan '.join(lines), dtype=numpy.float64, sep=' ')
+    except ValueError:
+        return None
+    if values.size != 8 * len(lines) - 1:
+        return None
+    values = numpy.append(values, numpy.nan).reshape((-1, 8))
+    if not numpy.isnan(values[:, 7]).all() or numpy.isnan(values[:, :7]).any():
+        return None
+    return values[:, :7]
+
+
+####################################################################################################
+# @parse_swc_samples
+####################################################################################################
+def parse_swc_samples(swc_file):
+    """Parses the samples of an SWC file into a NumPy array of seven columns.
+
+    The file is parsed in bulk with @read_swc_samples_in_bulk, and if any line has more columns,
+    it is parsed line by line and the first seven columns of every line are used.
+
+    :param swc_file:
+        The path to the SWC file.
+    :return:
+        An Nx7 array of the samples, or None if the file cannot be parsed.
+    """
+
+    values = read_swc_samples_in_bulk(swc_file)
+    if values is not None:
+        return values
+
+    # Parse the file line by line
+    samples = list()
+    with open(swc_file, 'r') as f:
+        for line in f:
+            if '#' in line:
+                continue
+            columns = line.split()
+            if len(columns) == 0:
+                continue
+            if len(columns) < 7:
+                print('ERROR: Invalid sample [%s] in [%s]' % (line.strip(), swc_file))
+                return None
+            try:
+                samples.append([float(column) for column in columns[:7]])
+            except ValueError:
+                print('ERROR: Invalid sample [%s] in [%s]' % (line.strip(), swc_file))
+                return None
+    return numpy.array(samples, dtype=numpy.float64).reshape((-1, 7))
+
+
+####################################################################################################
+# @get_swc_samples_arrays
+####################################################################################################
+def get_swc_samples_arrays(values):
+    """Splits the columns of the SWC samples into arrays, where the unknown types are considered
+    basal dendrites and the samples are translated like the SWCReader.
+
+    :param values:
+        An Nx7 array of the samples as parsed from the file.
+    :return:
+        The arrays of the indices, the types, the Nx3 translated points, the radii and the indices
+        of the parents of the samples.
+    """
+
+    # Split the columns
+    indices = values[:, Arbors.SWC_SAMPLE_INDEX_IDX].astype(numpy.int64)
+    types = values[:, Arbors.SWC_SAMPLE_TYPE_IDX].astype(numpy.int64)
+    points = values[:, Arbors.SWC_SAMPLE_X_COORDINATES_IDX:Arbors.SWC_SAMPLE_Z_COORDINATES_IDX + 1]
+    radii = values[:, Arbors.SWC_SAMPLE_RADIUS_IDX]
+    parents = values[:, Arbors.SWC_SAMPLE_PARENT_INDEX_IDX].astype(numpy.int64)
+
+    # If the sample type doesn't match a soma, an axon, a basal dendrite or an apical dendrite,
+    # just consider it a basal dendrite
+    types[types > 4] = Arbors.SWC_BASAL_DENDRITE_SAMPLE_TYPE
+
+    # Every sample is translated by the last root sample (with parent -1) that precedes it in the
+    # file, and the samples that precede the first root sample are not translated at all
+    rows = numpy.arange(len(parents))
+    root_rows = numpy.maximum.accumulate(
+        numpy.where(parents == Arbors.SWC_NO_PARENT_SAMPLE_TYPE, rows, -1))
+    points = points - numpy.where((root_rows >= 0)[:, None], points[root_rows], 0.0)
+
+    return indices, types, points, radii, parents
+
+
+####################################################################################################
+# @get_swc_samples_rows
+####################################################################################################
+def get_swc_samples_rows(indices,
+                         parents):
+    """Builds a lookup table from the indices of the samples to their rows in the arrays, where
+    the last sample wins if an index is repeated.
+
+    :param indices:
+        An array of the indices of the samples.
+    :param parents:
+        An array of the indices of the parents of the samples.
+    :return:
+        An array that maps every index to its row, or -1 for the missing samples.
+    """
+
+    size = int(max(indices.max(initial=0), parents.max(initial=0))) + 1
+    samples_rows = numpy.full(size, -1, dtype=numpy.int64)
+    valid = indices >= 0
+    samples_rows[indices[valid]] = numpy.arange(len(indices))[valid]
+    return samples_rows
+
+
+####################################################################################################
+# @can_use_swc_samples_tree
+####################################################################################################
+def can_use_swc_samples_tree(indices,
+                             types,
+                             parents):
+    """Verifies if the sections of an SWC morphology can be traced from the samples tree with
+    @build_swc_sections_samples, resulting in the same sections as the connected paths of
+    @build_swc_sections_paths.
+
+    The connected paths are built by walking over the consecutive indices of the samples, so they
+    differ from the samples tree when the indices have gaps or duplicates, when a soma sample is a
+    child of an arbor sample, or when the last sample is not connected to the arbor sample that
+    directly precedes it. If any sample is listed before its parent, the connected paths cannot
+    be split into valid sections, and the samples tree is always used.
+
+    :param indices:
+        An array of the indices of the samples.
+    :param types:
+        An array of the types of the samples.
+    :param parents:
+        An array of the indices of the parents of the samples.
+    :return:
+        True if the sections can be traced from the samples tree, or False if they must be built
+        from the connected paths.
+    """
+
+    # The connected paths are invalid if any sample is listed before its parent
+    if len(indices) == 0 or numpy.any(parents >= indices):
+        return True
+
+    # The indices must be unique and consecutive, starting after the dummy sample at index 0
+    first_index = int(indices.min())
+    last_index = int(indices.max())
+    if first_index < 1 or last_index - first_index + 1 != len(indices) or \
+            len(numpy.unique(indices)) != len(indices):
+        return False
+
+    # The types of the samples ordered by their indices
+    samples_types = numpy.zeros(last_index + 1, dtype=types.dtype)
+    samples_types[indices] = types
+    is_soma_sample = samples_types == Arbors.SWC_SOMA_SAMPLE_TYPE
+    is_soma_sample[1] = True
+
+    # A soma sample must not be a child of an arbor sample
+    soma_parents = parents[is_soma_sample[indices] & (parents > 0)]
+    if numpy.any(~is_soma_sample[soma_parents]):
+        return False
+
+    # The last sample, if it is a child arbor sample, must continue the sample that precedes it
+    last_parent = int(parents[numpy.argmax(indices)])
+    if not is_soma_sample[last_index] and last_parent >= 0:
+        if last_parent != last_index - 1 or is_soma_sample[last_parent]:
+            return False
+
+    # The samples tree results in the same sections
+    return True
+
+
+####################################################################################################
+# @build_swc_sections_paths
+####################################################################################################
+def build_swc_sections_paths(indices,
+                             types,
+                             parents):
+    """Builds the sections from the connected paths of the samples, similar to
+    @build_connected_paths_from_samples and @build_sections_from_paths of the SWCReader.
+
+    This is only used for the files that cannot be traced with @build_swc_sections_samples, see
+    @can_use_swc_samples_tree.
+
+    :param indices:
+        An array of the indices of the samples.
+    :param types:
+        An array of the types of the samples.
+    :param parents:
+        An array of the indices of the parents of the samples.
+    :return:
+        A list of the indices of the samples of every section, where every section starts with
+        the index of its parent sample.
+    """
+
+    # The types and the parents of the samples at their corresponding indices
+    samples = [None] * (int(indices.max(initial=0)) + 1)
+    for index, sample_type, parent in zip(indices.tolist(), types.tolist(), parents.tolist()):
+        samples[index] = (sample_type, parent)
+    last_index = len(samples) - 1
+
+    # Walk over the consecutive samples, starting after the soma at index 1, to build the paths
+    paths = list()
+    path = list()
+    index = 2
+    while index < last_index:
+        sample_i = samples[index]
+        sample_j = samples[index + 1]
+
+        # Ignore the missing samples and the soma samples
+        if sample_i is None or sample_j is None or sample_i[0] == Arbors.SWC_SOMA_SAMPLE_TYPE:
+            index += 1
+            continue
+
+        # If the two samples are connected, extend the path, otherwise close it
+        path.append(index)
+        if sample_j[1] == index:
+            if index + 1 == last_index:
+                path.append(index + 1)
+        else:
+            paths.append(path)
+            path = list()
+        index += 1
+
+    # Append the last path
+    if len(path) > 0:
+        paths.append(path)
+
+    # Add the parent sample at the beginning of every path and mark the terminals
+    terminals = set()
+    for path in paths:
+        path.insert(0, samples[path[0]][1])
+        terminals.add(path[0])
+        terminals.add(path[-1])
+
+    # Split the paths at the terminals that are located along them
+    sections_samples = list()
+    for path in paths:
+        samples_located_along_path = sorted(terminals.intersection(path))
+        for first_sample, last_sample in zip(samples_located_along_path[:-1],
+                                             samples_located_along_path[1:]):
+            sections_samples.append(path[path.index(first_sample):path.index(last_sample) + 1])
+
+    return sections_samples
+
+
+####################################################################################################
+# @build_swc_sections_samples
+####################################################################################################
+def build_swc_sections_samples(indices,
+                               types,
+                               parents):
+    """Builds the sections directly from the tree that is defined by the parent indices of the
+    samples.
+
+    The branching points and the terminals are identified from the number of children of every
+    sample, and then each section is traced from its first sample till the next branching point or
+    terminal, so the entire tree is traversed only once. The sections are identical to those of
+    @build_swc_sections_paths if @can_use_swc_samples_tree.
+
+    :param indices:
+        An array of the indices of the samples.
+    :param types:
+        An array of the types of the samples.
+    :param parents:
+        An array of the indices of the parents of the samples.
+    :return:
+        A list of the indices of the samples of every section, where every section starts with
+        the index of its parent sample, ordered by the indices of their first samples.
+    """
+
+    sections_samples = list()
+
+    # Only the arbors samples are considered, the soma samples are ignored and the sample at
+    # index 1 is always considered a soma sample
+    arbor_mask = (types != Arbors.SWC_SOMA_SAMPLE_TYPE) & (indices != 1)
+    arbor_indices = indices[arbor_mask]
+    arbor_parents = parents[arbor_mask]
+    if len(arbor_indices) == 0:
+        return sections_samples
+
+    # The samples that have a valid parent
+    size = int(max(indices.max(), parents.max())) + 1
+    has_parent = (arbor_parents >= 0) & (arbor_parents < size)
+    child_indices = arbor_indices[has_parent]
+    child_parents = arbor_parents[has_parent]
+
+    # The number of children of every sample
+    number_children = numpy.bincount(child_parents, minlength=size)
+
+    # Flag the arbors samples
+    is_arbor_sample = numpy.zeros(size, dtype=bool)
+    is_arbor_sample[arbor_indices[arbor_indices >= 0]] = True
+
+    # A sample continues the section of its parent if the parent is an arbor sample that has no
+    # other children and directly precedes it in the file, otherwise it starts a new section.
+    # Similar to the connected paths, an only child that is listed elsewhere in the file splits
+    # the section of its parent
+    continuation = is_arbor_sample[child_parents] & \
+        (number_children[child_parents] == 1) & (child_indices == child_parents + 1)
+    continues_parent = numpy.zeros(len(arbor_indices), dtype=bool)
+    continues_parent[has_parent] = continuation
+
+    # The sample that continues the section of every sample, or -1
+    only_child = numpy.full(size, -1, dtype=numpy.int64)
+    only_child[child_parents[continuation]] = child_indices[continuation]
+    only_child = only_child.tolist()
+
+    # The first samples of the sections, ordered as they appear in the file
+    first_samples = arbor_indices[~continues_parent]
+    first_samples_parents = arbor_parents[~continues_parent]
+    order = numpy.argsort(first_samples, kind='stable')
+
+    # The traced samples, to stop the tracing at the cycles of files with invalid parents
+    is_traced = [False] * size
+
+    # Trace every section from its first sample till the next branching point or terminal
+    for first_sample, parent in zip(first_samples[order].tolist(),
+                                    first_samples_parents[order].tolist()):
+
+        # Each section starts with the index of its parent sample
+        section_samples = [parent, first_sample]
+        is_traced[first_sample] = True
+
+        sample_index = first_sample
+        while only_child[sample_index] != -1 and not is_traced[only_child[sample_index]]:
+            sample_index = only_child[sample_index]
+            is_traced[sample_index] = True
+            section_samples.append(sample_index)
+
+        sections_samples.append(section_samples)
+
+    return sections_samples
+
+
+####################################################################################################
+# @build_swc_sections_arrays
+####################################################################################################
+def build_swc_sections_arrays(sections_samples,
+                              indices,
+                              types,
+                              parents,
+                              samples_rows):
+    """Lays out the sections of an SWC morphology in arrays, where the sections are grouped per
+    arbor type and the parents are resolved from the samples that the sections share, similar to
+    the SWCReader.
+
+    :param sections_samples:
+        A list of the indices of the samples of every section, where every section starts with the
+        index of its parent sample.
+    :param indices:
+        An array of the indices of the samples.
+    :param types:
+        An array of the types of the samples.
+    :param parents:
+        An array of the indices of the parents of the samples.
+    :param samples_rows:
+        The lookup table of the rows of the samples from @get_swc_samples_rows.
+    :return:
+        An array of the rows of the samples of all the sections, the S+1 offsets of the sections,
+        the types, the parents and the indices of the sections, and a dictionary of the roots of
+        every arbor type.
+    """
+
+    # Lists of the samples data
+    size = len(samples_rows)
+    samples_rows = samples_rows.tolist()
+    indices_list = indices.tolist()
+    types_list = types.tolist()
+    parents_list = parents.tolist()
+
+    # The samples and the sections data
+    rows = list()
+    sections_offsets = [0]
+    sections_types = list()
+    sections_parents = list()
+    sections_ids = list()
+    roots = dict()
+
+    # The sections are grouped per arbor type
+    for arbor_type in [Arbors.SWC_BASAL_DENDRITE_SAMPLE_TYPE,
+                       Arbors.SWC_AXON_SAMPLE_TYPE,
+                       Arbors.SWC_APICAL_DENDRITE_SAMPLE_TYPE]:
+
+        # The sections of this type, indexed by the indices of their last samples
+        sections_by_last_sample = dict()
+        roots[arbor_type] = list()
+
+        # The sections of every type are labeled starting from zero
+        first_section_index = len(sections_types)
+
+        for section_samples in sections_samples:
+
+            # The type of the section is the type of its last sample
+            if types_list[samples_rows[section_samples[-1]]] != arbor_type:
+                continue
+
+            # Ignore the missing samples, the sample at index 1 and the root samples
+            section_rows = list()
+            for sample_index in section_samples:
+                if sample_index < 0 or sample_index >= size or samples_rows[sample_index] < 0:
+                    continue
+                row = samples_rows[sample_index]
+                if sample_index == 1 or parents_list[row] == Arbors.SWC_NO_PARENT_SAMPLE_TYPE:
+                    continue
+                section_rows.append(row)
+            if len(section_rows) == 0:
+                continue
+
+            # The parent is the last section of this type that terminates at the first sample
+            section_index = len(sections_types)
+            parent_index = sections_by_last_sample.get(indices_list[section_rows[0]], -1)
+            if parent_index < 0:
+                roots[arbor_type].append(section_index)
+            sections_by_last_sample[indices_list[section_rows[-1]]] = section_index
+
+            rows.extend(section_rows)
+            sections_offsets.append(len(rows))
+            sections_types.append(arbor_type)
+            sections_parents.append(parent_index)
+            sections_ids.append(section_index - first_section_index)
+
+    return numpy.array(rows, dtype=numpy.int64), sections_offsets, sections_types, \
+        sections_parents, sections_ids, roots
+
+
+####################################################################################################
+# @get_swc_soma_data
+####################################################################################################
+def get_swc_soma_data(types,
+                      points,
+                      radii,
+                      parents,
+                      samples_rows,
+                      soma_arbors_profile_points):
+    """Gets the data of the soma from the soma samples, ordered by their indices, where the root
+    sample defines the centroid and the radius of the soma and the others are profile points.
+
+    :param types:
+        An array of the types of the samples.
+    :param points:
+        An Nx3 array of the translated points of the samples.
+    :param radii:
+        An array of the radii of the samples.
+    :param parents:
+        An array of the indices of the parents of the samples.
+    :param samples_rows:
+        The lookup table of the rows of the samples from @get_swc_samples_rows.
+    :param soma_arbors_profile_points:
+        A list of the first points of the arbors, used if the soma has no radius or profile.
+    :return:
+        The centroid, the mean radius and the list of the profile points of the soma.
+    """
+
+    soma_centroid = [0.0, 0.0, 0.0]
+    soma_radius = 0.0
+    soma_profile_points = list()
+    types_list = types.tolist()
+    parents_list = parents.tolist()
+    for row in samples_rows.tolist():
+        if row < 0 or types_list[row] != Arbors.SWC_SOMA_SAMPLE_TYPE:
+            continue
+        if parents_list[row] == Arbors.SWC_NO_PARENT_SAMPLE_TYPE:
+            soma_centroid = points[row].tolist()
+            soma_radius = float(radii[row])
+        else:
+            soma_profile_points.append(points[row].tolist())
+
+    # If the soma radius is zero, then use the average distance of the profile points
+    if soma_radius < 1e-5:
+        if len(soma_profile_points) > 0:
+            soma_radius = compute_points_mean_length(soma_profile_points)
+        elif len(soma_arbors_profile_points) > 0:
+            soma_radius = compute_points_mean_length(soma_arbors_profile_points)
+        else:
+            soma_radius = 1.0
+
+    return soma_centroid, soma_radius, soma_profile_points
+
+
+####################################################################################################
+# @read_swc_morphology_arrays
+####################################################################################################
+def read_swc_morphology_arrays(swc_file):
+    """Reads an SWC morphology file into a MorphologyArrays structure.
+
+    The samples, the sections and the arbors are identical to those built by the SWCReader.
+
+    :param swc_file:
+        The path to the SWC file.
+    :return:
+        A reference to the MorphologyArrays, or None if the file cannot be parsed.
+    """
+
+    values = parse_swc_samples(swc_file)
+    if values is None or len(values) == 0:
+        return None
+    indices, types, points, radii, parents = get_swc_samples_arrays(values)
+
+    # The number of stems, the branches that emanate from the soma directly
+    number_stems = int(numpy.count_nonzero(
+        (types != Arbors.SWC_SOMA_SAMPLE_TYPE) & (parents == 1)))
+
+    # Build the sections from the samples tree, or from the connected paths if the samples tree
+    # cannot reproduce them, similar to the SWCReader
+    if can_use_swc_samples_tree(indices, types, parents):
+        sections_samples = build_swc_sections_samples(indices, types, parents)
+    else:
+        sections_samples = build_swc_sections_paths(indices, types, parents)
+
+    # Lay out the sections per arbor type
+    samples_rows = get_swc_samples_rows(indices, parents)
+    rows, sections_offsets, sections_types, sections_parents, sections_ids, roots = \
+        build_swc_sections_arrays(sections_samples, indices, types, parents, samples_rows)
+    axon_root, dendrites_roots, apical_dendrite_root = get_arbors_roots(
+        roots, Arbors.SWC_AXON_SAMPLE_TYPE, Arbors.SWC_BASAL_DENDRITE_SAMPLE_TYPE,
+        Arbors.SWC_APICAL_DENDRITE_SAMPLE_TYPE)
+
+    # The first samples of the arbors, the extra axons and apical dendrites are counted twice
+    # similar to the SWCReader
+    arbors_roots = roots[Arbors.SWC_AXON_SAMPLE_TYPE] + \
+        roots[Arbors.SWC_APICAL_DENDRITE_SAMPLE_TYPE] + (dendrites_roots or list())
+    soma_arbors_profile_points = [
+        points[rows[sections_offsets[root]]].tolist() for root in arbors_roots]
+    _, soma_radius, soma_profile_points = get_swc_soma_data(
+        types, points, radii, parents, samples_rows, soma_arbors_profile_points)
+
+    # Construct the morphology
+    return MorphologyArrays(
+        points=points[rows], radii=radii[rows], sections_offsets=sections_offsets,
+        sections_types=sections_types, sections_parents=sections_parents,
+        sections_ids=sections_ids, samples_ids=indices[rows],
+        samples_morphology_indices=numpy.zeros(len(rows)), samples_types=types[rows],
+        samples_parents_ids=parents[rows], axon_root=axon_root, dendrites_roots=dendrites_roots,
+        apical_dendrite_root=apical_dendrite_root, soma_mean_radius=soma_radius,
+        soma_profile_points=soma_profile_points,
+        soma_arbors_profile_points=soma_arbors_profile_points,
+        label=get_morphology_label(swc_file), number_stems=number_stems)
+
+
+####################################################################################################
+# @build_h5_sections_arrays
+####################################################################################################
+def build_h5_sections_arrays(points,
+                             structures):
+    """Lays out the sections of an H5 morphology in arrays, similar to the H5Reader.
+
+    :param points:
+        An Nx4 array of the points of the morphology file.
+    :param structures:
+        An Sx3 array of the structures of the morphology file.
+    :return:
+        The Nx3 points and the radii of the samples of all the sections, the S+1 offsets of the
+        sections, the types, the parents and the indices of the sections, the indices of the
+        samples along their sections and a dictionary of the roots of every arbor type.
+    """
+
+    # Ignore the first section (soma)
+    sections_first_points_indices = structures[1:-1, 0].astype(numpy.int64)
+    sections_last_points_indices = structures[2:, 0].astype(numpy.int64)
+    sections_types = structures[1:-1, 1].astype(numpy.int64)
+    sections_parents_ids = structures[1:-1, 2].astype(numpy.int64)
+    sections_ids = numpy.arange(1, len(structures) - 1)
+
+    # Only the axons, basal dendrites and apical dendrites sections are considered
+    arbors_types = [Arbors.H5_AXON_SECTION_TYPE,
+                    Arbors.H5_BASAL_DENDRITE_SECTION_TYPE,
+                    Arbors.H5_APICAL_DENDRITE_SECTION_TYPE]
+    valid_sections = numpy.isin(sections_types, arbors_types)
+    for section_type in numpy.unique(sections_types[~valid_sections]).tolist():
+        print('ERROR: Unknown section type [%s] !' % str(section_type))
+
+    sections_first_points_indices = sections_first_points_indices[valid_sections]
+    sections_last_points_indices = sections_last_points_indices[valid_sections]
+    sections_types = sections_types[valid_sections]
+    sections_parents_ids = sections_parents_ids[valid_sections]
+    sections_ids = sections_ids[valid_sections]
+
+    # Map the parents IDs to positions in the arrays, the parent must be of the same type
+    positions = numpy.full(len(structures), -1, dtype=numpy.int64)
+    positions[sections_ids] = numpy.arange(len(sections_ids))
+    valid_parents = (sections_parents_ids >= 0) & (sections_parents_ids < len(structures))
+    sections_parents = numpy.full(len(sections_ids), -1, dtype=numpy.int64)
+    sections_parents[valid_parents] = positions[sections_parents_ids[valid_parents]]
+    same_type = sections_parents >= 0
+    same_type[same_type] = \
+        sections_types[sections_parents[same_type]] == sections_types[same_type]
+    sections_parents[~same_type] = -1
+
+    # Gather the rows of the samples of all the sections at once
+    sections_number_samples = sections_last_points_indices - sections_first_points_indices
+    sections_offsets = numpy.zeros(len(sections_ids) + 1, dtype=numpy.int64)
+    numpy.cumsum(sections_number_samples, out=sections_offsets[1:])
+    rows = numpy.arange(sections_offsets[-1]) - numpy.repeat(
+        sections_offsets[:-1] - sections_first_points_indices, sections_number_samples)
+    samples = points[rows]
+
+    # The index of each sample along its section
+    samples_ids = numpy.arange(len(rows)) - numpy.repeat(
+        sections_offsets[:-1], sections_number_samples)
+
+    # The roots of the arbors of every type, in the order of the file
+    roots = dict()
+    for section_type in arbors_types:
+        roots[section_type] = numpy.nonzero(
+            (sections_types == section_type) & (sections_parents < 0))[0].tolist()
+
+    # NOTE: What is reported in our .H5 files is the diameter unlike the .SWC files
+    return samples[:, Arbors.H5_SAMPLE_X_COORDINATES_IDX:Arbors.H5_SAMPLE_Z_COORDINATES_IDX + 1], \
+        samples[:, Arbors.H5_SAMPLE_RADIUS_IDX] / 2.0, sections_offsets, sections_types, \
+        sections_parents, sections_ids, samples_ids, roots
+
+
+####################################################################################################
+# @read_h5_morphology_arrays
+####################################################################################################
+def read_h5_morphology_arrays(h5_file):
+    """Reads an H5 morphology file into a MorphologyArrays structure.
+
+    The samples, the sections and the arbors are identical to those built by the H5Reader.
+
+    :param h5_file:
+        The path to the H5 file.
+    :return:
+        A reference to the MorphologyArrays, or None if the file cannot be read.
+    """
+
+    # Import the h5py module to read the .H5 file
+    try:
+        import h5py
+    except ImportError:
+        print('ERROR: Cannot find a compatible \'h5py\' version!')
+        return None
+
+    # Read the points and the structures
+    with h5py.File(h5_file, 'r') as data:
+        points = numpy.asarray(data[Arbors.H5_POINTS_DIRECTORY][()])
+        structures = numpy.asarray(data[Arbors.H5_STRUCTURE_DIRECTORY][()])
+
+    # Lay out the sections
+    samples_points, samples_radii, sections_offsets, sections_types, sections_parents, \
+        sections_ids, samples_ids, roots = build_h5_sections_arrays(points, structures)
+    axon_root, dendrites_roots, apical_dendrite_root = get_arbors_roots(
+        roots, Arbors.H5_AXON_SECTION_TYPE, Arbors.H5_BASAL_DENDRITE_SECTION_TYPE,
+        Arbors.H5_APICAL_DENDRITE_SECTION_TYPE)
+
+    # The soma profile points are the points of the first section
+    soma_profile_points = points[int(structures[0, 0]):int(structures[1, 0]),
+                                 Arbors.H5_SAMPLE_X_COORDINATES_IDX:
+                                 Arbors.H5_SAMPLE_Z_COORDINATES_IDX + 1].tolist()
+
+    # The mean radius of the soma is the average distance of the profile points from their centroid
+    centroid = [0.0, 0.0, 0.0]
+    for point in soma_profile_points:
+        centroid = [centroid[0] + point[0], centroid[1] + point[1], centroid[2] + point[2]]
+    centroid = [value / len(soma_profile_points) for value in centroid]
+    soma_mean_radius = compute_points_mean_length(
+        [[point[0] - centroid[0], point[1] - centroid[1], point[2] - centroid[2]]
+         for point in soma_profile_points])
+
+    return MorphologyArrays(
+        points=samples_points, radii=samples_radii, sections_offsets=sections_offsets,
+        sections_types=sections_types, sections_parents=sections_parents,
+        sections_ids=sections_ids, samples_ids=samples_ids, samples_morphology_indices=samples_ids,
+        axon_root=axon_root, dendrites_roots=dendrites_roots,
+        apical_dendrite_root=apical_dendrite_root, soma_mean_radius=soma_mean_radius,
+        soma_profile_points=soma_profile_points, label=get_morphology_label(h5_file))
+
+
+####################################################################################################
+# @read_morphology_arrays
+####################################################################################################
+def read_morphology_arrays(morphology_file):
+    """Reads a morphology file into a MorphologyArrays structure, based on its extension.
+
+    :param morphology_file:
+        The path to the .h5 or .swc morphology file.
+    :return:
+        A reference to the MorphologyArrays, or None if the file cannot be read.
+    """
+
+    extension = os.path.splitext(morphology_file)[1].lower()
+    if '.h5' in extension:
+        return read_h5_morphology_arrays(morphology_file)
+    elif '.swc' in extension:
+        return read_swc_morphology_arrays(morphology_file)
+    print('ERROR: The morphology extension [%s] is NOT SUPPORTED' % extension)
+    return None
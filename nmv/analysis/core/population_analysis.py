@@ -0,0 +1,605 @@
+####################################################################################################
+# Copyright (c) 2016 - 2019, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+import sys
+import csv
+import math
+import shutil
+import threading
+import traceback
+import multiprocessing
+
+# Internal imports, this module must be importable without Blender
+sys.path.append('%s/../../consts' % os.path.dirname(os.path.realpath(__file__)))
+sys.path.append('%s/../../file/readers/circuit' % os.path.dirname(os.path.realpath(__file__)))
+from arbors_consts import *
+import analysis_kernels
+import analysis_plotting
+import analysis_table
+import circuit_access
+import morphology_arrays
+
+
+# The m-type of the morphologies that are not assigned to any m-type
+UNKNOWN_MTYPE = 'Unknown'
+
+# A pseudo m-type that aggregates the entire population
+POPULATION_MTYPE = 'All'
+
+# The component of the results of the entire morphology
+MORPHOLOGY_COMPONENT = 'Morphology'
+
+# The arbor types, the basal dendrites of a morphology are aggregated into a single component
+ARBORS_COMPONENTS = [Arbors.APICAL_DENDRITES_PREFIX, Arbors.BASAL_DENDRITES_PREFIX,
+                     Arbors.AXON_PREFIX]
+
+# The number of morphologies that are sent to a worker process at once
+DEFAULT_CHUNK_SIZE = 8
+
+# The output files of the population analysis, the extension of the morphologies table is set
+# by its format
+MORPHOLOGIES_TABLE = 'morphologies'
+MTYPES_MORPHOMETRICS_FILE = 'mtypes-morphometrics.csv'
+MTYPES_DISTRIBUTIONS_FILE = 'mtypes-distributions.csv'
+FAILURES_FILE = 'failures.txt'
+
+# The directory of the figures of the distributions of the morphologies
+DISTRIBUTIONS_DIRECTORY = 'distributions'
+
+
+####################################################################################################
+# @get_arbor_component
+####################################################################################################
+def get_arbor_component(prefix):
+    """Gets the component of an arbor from its prefix in the analysis results, for example
+    'BasalDendrite' for 'BasalDendrite3'.
+
+    :param prefix:
+        The prefix of the arbor.
+    :return:
+        The arbor type of the prefix.
+    """
+
+    return prefix.rstrip('0123456789')
+
+
+####################################################################################################
+# @RunningStatistics
+####################################################################################################
+class RunningStatistics:
+    """The count, mean, variance, minimum and maximum of a stream of values, updated in constant
+    memory with the algorithm of Welford.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self):
+        """Constructor
+        """
+
+        # Number of values
+        self.count = 0
+
+        # Mean of the values
+        self.mean = 0.0
+
+        # Sum of the squared differences from the mean
+        self.m2 = 0.0
+
+        # Extrema
+        self.minimum = None
+        self.maximum = None
+
+    ################################################################################################
+    # @update
+    ################################################################################################
+    def update(self,
+               value):
+        """Adds a value to the statistics.
+
+        :param value:
+            A given numeric value.
+        """
+
+        value = float(value)
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    ################################################################################################
+    # @get_standard_deviation
+    ################################################################################################
+    def get_standard_deviation(self):
+        """Gets the sample standard deviation of the values.
+
+        :return:
+            The standard deviation, or 0.0 if there are less than two values.
+        """
+
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(self.m2 / (self.count - 1))
+
+
+####################################################################################################
+# @PopulationAggregator
+####################################################################################################
+class PopulationAggregator:
+    """Reduces the results of the analyzed morphologies into per m-type statistics.
+
+    Every result is added once and then discarded, so the memory of the aggregator depends only
+    on the number of m-types and not on the number of morphologies.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self):
+        """Constructor
+        """
+
+        # The statistics of the analysis items, keyed by (mtype, variable, component)
+        self.morphometrics = dict()
+
+        # The statistics of the distributions, keyed by (mtype, distribution, component)
+        self.distributions = dict()
+
+        # Number of morphologies per m-type
+        self.mtypes_counts = dict()
+
+    ################################################################################################
+    # @update_statistics
+    ################################################################################################
+    @staticmethod
+    def update_statistics(statistics,
+                          key,
+                          value):
+        """Adds a value to the statistics of a given key, ignoring the missing values.
+
+        :param statistics:
+            A dictionary of RunningStatistics.
+        :param key:
+            The key of the statistics.
+        :param value:
+            The value.
+        """
+
+        if value is None:
+            return
+        if key not in statistics:
+            statistics[key] = RunningStatistics()
+        statistics[key].update(value)
+
+    ################################################################################################
+    # @add_record
+    ################################################################################################
+    def add_record(self,
+                   record):
+        """Adds the results of an analyzed morphology to its m-type and to the entire population.
+
+        :param record:
+            A record returned by @analyze_population_morphology.
+        """
+
+        for mtype in [record['mtype'], POPULATION_MTYPE]:
+            self.mtypes_counts[mtype] = self.mtypes_counts.get(mtype, 0) + 1
+            for row in record['rows']:
+                component = get_arbor_component(row['Arbor'])
+                for variable, value in row.items():
+                    if variable in analysis_table.KEY_COLUMNS:
+                        continue
+                    self.update_statistics(self.morphometrics, (mtype, variable, component), value)
+            for name, component, value in record['distributions']:
+                self.update_statistics(self.distributions, (mtype, name, component), value)
+
+    ################################################################################################
+    # @get_mtypes
+    ################################################################################################
+    def get_mtypes(self):
+        """Gets the aggregated m-types, sorted by name and followed by the entire population.
+
+        :return:
+            A list of m-types.
+        """
+
+        return sorted([mtype for mtype in self.mtypes_counts if mtype != POPULATION_MTYPE]) + \
+            [POPULATION_MTYPE]
+
+    ################################################################################################
+    # @write_statistics_table
+    ################################################################################################
+    def write_statistics_table(self,
+                               statistics,
+                               keys,
+                               header,
+                               table_file):
+        """Writes a table of statistics to a CSV file, one row per m-type and key.
+
+        :param statistics:
+            A dictionary of RunningStatistics.
+        :param keys:
+            An ordered list of (name, component) keys.
+        :param header:
+            The header of the name column.
+        :param table_file:
+            The path to the CSV file.
+        """
+
+        with open(table_file, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['MType', 'NumberMorphologies', header, 'Component', 'Count', 'Mean',
+                             'StandardDeviation', 'Minimum', 'Maximum'])
+            for mtype in self.get_mtypes():
+                for name, component in keys:
+                    key_statistics = statistics.get((mtype, name, component))
+                    if key_statistics is None:
+                        continue
+                    writer.writerow([mtype, self.mtypes_counts[mtype], name, component,
+                                     key_statistics.count, key_statistics.mean,
+                                     key_statistics.get_standard_deviation(),
+                                     key_statistics.minimum, key_statistics.maximum])
+
+    ################################################################################################
+    # @write_tables
+    ################################################################################################
+    def write_tables(self,
+                     output_directory):
+        """Writes the per m-type tables of the analysis items and the distributions.
+
+        :param output_directory:
+            The directory where the tables will be written.
+        """
+
+        # The analysis items in the same order of the analysis reports
+        components = [MORPHOLOGY_COMPONENT] + ARBORS_COMPONENTS
+        morphometrics_keys = [(variable, component)
+                              for variable, _, _ in analysis_kernels.PER_ARBOR_ANALYSIS_ITEMS
+                              for component in components]
+        morphometrics_keys += [(variable, MORPHOLOGY_COMPONENT)
+                               for variable, _ in analysis_kernels.GLOBAL_ANALYSIS_ITEMS]
+        self.write_statistics_table(self.morphometrics, morphometrics_keys, 'Variable',
+                                    '%s/%s' % (output_directory, MTYPES_MORPHOMETRICS_FILE))
+
+        # The distributions
+        distributions_keys = [(name, component)
+                              for name, _ in analysis_kernels.PER_ARBOR_DISTRIBUTIONS
+                              for component in ARBORS_COMPONENTS]
+        self.write_statistics_table(self.distributions, distributions_keys, 'Distribution',
+                                    '%s/%s' % (output_directory, MTYPES_DISTRIBUTIONS_FILE))
+
+
+####################################################################################################
+# @analyze_population_morphology
+####################################################################################################
+def analyze_population_morphology(task):
+    """Analyzes a single morphology of the population in a worker process.
+
+    The record only contains the results, the morphology and the analysis data of its arbors are
+    released before the record is sent back to the main process.
+
+    :param task:
+        A [morphology_file, mtype] pair.
+    :return:
+        A dictionary with the label, the m-type and the file of the morphology, the error if the
+        analysis failed, the rows of the morphology in the analysis table, the list of the
+        [distribution, component, value] results of the distributions and the per-arbor
+        distributions, as returned by analysis_kernels.compute_morphology_distributions, to plot
+        them.
+    """
+
+    morphology_file, mtype = task
+    record = {'label': morphology_arrays.get_morphology_label(morphology_file),
+              'mtype': mtype, 'file': morphology_file, 'error': None,
+              'rows': list(), 'distributions': list(), 'arbors_distributions': list()}
+
+    try:
+        morphology = morphology_arrays.read_morphology_arrays(morphology_file)
+        if morphology is None:
+            record['error'] = 'Cannot load the morphology file'
+            return record
+        record['label'] = morphology.label
+
+        # Collect the data of every arbor only once for the analysis items and the distributions
+        arbors_data = analysis_kernels.collect_morphology_analysis_data(morphology)
+
+        # The per-arbor and the global analysis items, one row per arbor
+        record['rows'] = analysis_table.get_analysis_table_rows(
+            morphology.label,
+            analysis_kernels.analyze_morphology_arrays(morphology, arbors_data),
+            analysis_kernels.analyze_morphology_arrays_globally(morphology), mtype)
+
+        # Distributions
+        record['arbors_distributions'] = analysis_kernels.compute_morphology_distributions(
+            morphology, arbors_data)
+        for name, results in record['arbors_distributions']:
+            for prefix, value in results:
+                record['distributions'].append([name, get_arbor_component(prefix), value])
+
+    # A broken morphology must not stop the analysis of the population
+    except Exception:
+        record['error'] = traceback.format_exc().strip().splitlines()[-1]
+        record['rows'] = list()
+        record['distributions'] = list()
+        record['arbors_distributions'] = list()
+
+    return record
+
+
+####################################################################################################
+# @read_mtypes_file
+####################################################################################################
+def read_mtypes_file(mtypes_file):
+    """Reads a file that maps the labels of the morphologies to their m-types. Every line has a
+    label and an m-type separated by spaces, tabs or a comma, and the lines starting with # are
+    ignored.
+
+    :param mtypes_file:
+        The path to the m-types file.
+    :return:
+        A dictionary of the m-types keyed by the labels.
+    """
+
+    mtypes = dict()
+    with open(mtypes_file, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if len(line) == 0 or line.startswith('#'):
+                continue
+            items = line.replace(',', ' ').split()
+            if len(items) >= 2:
+                mtypes[items[0]] = items[1]
+    return mtypes
+
+
+####################################################################################################
+# @read_gids_file
+####################################################################################################
+def read_gids_file(gids_file):
+    """Reads a file that lists GIDs, one GID per line. The lines starting with # are ignored.
+
+    :param gids_file:
+        The path to the GIDs file.
+    :return:
+        A list of the GIDs.
+    """
+
+    gids = list()
+    with open(gids_file, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if len(line) == 0 or line.startswith('#'):
+                continue
+            gids.append(int(line.split()[0]))
+    return gids
+
+
+####################################################################################################
+# @get_directory_population_tasks
+####################################################################################################
+def get_directory_population_tasks(directory,
+                                   mtypes=None):
+    """Yields the tasks of the morphology files in a directory and its sub-directories.
+
+    The m-type of a morphology is taken from the given m-types, if it is listed there, otherwise
+    it is the relative path of its sub-directory, for example <directory>/L5_TTPC1/x.h5, or
+    UNKNOWN_MTYPE for the morphologies directly in the directory.
+
+    :param directory:
+        The directory of the morphology files.
+    :param mtypes:
+        An optional dictionary of the m-types keyed by the labels of the morphologies.
+    :return:
+        A generator of [morphology_file, mtype] pairs.
+    """
+
+    mtypes = mtypes or dict()
+    for root, directories, files in os.walk(directory):
+        directories.sort()
+        sub_directory = os.path.relpath(root, directory)
+        for file_name in sorted(files):
+            if not (file_name.lower().endswith('.h5') or file_name.lower().endswith('.swc')):
+                continue
+            morphology_file = '%s/%s' % (root, file_name)
+            label = morphology_arrays.get_morphology_label(morphology_file)
+            if label in mtypes:
+                mtype = mtypes[label]
+            elif sub_directory != '.':
+                mtype = sub_directory
+            else:
+                mtype = UNKNOWN_MTYPE
+            yield [morphology_file, mtype]
+
+
+####################################################################################################
+# @get_circuit_population_tasks
+####################################################################################################
+def get_circuit_population_tasks(blue_config,
+                                 target=None,
+                                 gids=None,
+                                 mtypes=None):
+    """Yields the tasks of the morphologies of a cell target or a list of GIDs in a circuit. The
+    m-types are read from the circuit, unless the label of the morphology is in the given m-types.
+
+    :param blue_config:
+        A BBP circuit configuration file, or the JSON file of a circuit.
+    :param target:
+        A cell target in the circuit.
+    :param gids:
+        A list of GIDs, used if the target is not given.
+    :param mtypes:
+        An optional dictionary of the m-types keyed by the labels of the morphologies.
+    :return:
+        A generator of [morphology_file, mtype] pairs.
+    """
+
+    # Open the circuit
+    circuit = circuit_access.get_circuit(blue_config)
+    if circuit is None:
+        return
+
+    # Get the GIDs
+    if target is not None:
+        gids = circuit.get_gids(target)
+    gids = sorted(int(gid) for gid in gids)
+
+    # The m-types and the morphologies of all the GIDs are read in a single query
+    mtypes = mtypes or dict()
+    for neuron in circuit.get_neurons(gids):
+        if neuron is None:
+            continue
+        label = morphology_arrays.get_morphology_label(neuron.morphology_uri)
+        yield [neuron.morphology_uri, mtypes.get(label, neuron.mtype)]
+
+
+####################################################################################################
+# @get_bounded_tasks
+####################################################################################################
+def get_bounded_tasks(tasks,
+                      semaphore):
+    """Yields the tasks only when the semaphore allows it, so the pool does not queue the entire
+    population ahead of the workers.
+
+    :param tasks:
+        An iterable of tasks.
+    :param semaphore:
+        A semaphore that is released every time a result is reduced.
+    :return:
+        A generator of the tasks.
+    """
+
+    for task in tasks:
+        semaphore.acquire()
+        yield task
+
+
+####################################################################################################
+# @run_population_analysis
+####################################################################################################
+def run_population_analysis(tasks,
+                            output_directory,
+                            number_processes=None,
+                            chunk_size=DEFAULT_CHUNK_SIZE,
+                            table_format='csv',
+                            plot_distributions=False,
+                            plots_dpi=analysis_plotting.DEFAULT_DPI,
+                            plots_preview_dpi=None):
+    """Analyzes a population of morphologies on a pool of processes and reduces the results into
+    per m-type tables.
+
+    The morphologies are analyzed in any order. The rows of every result are written to the
+    morphologies table and the results are added to the m-types statistics as soon as they are
+    received, and only a bounded number of tasks is in flight, so the memory is independent of the
+    population size. If the distributions are plotted, their plot jobs are collected during the
+    analysis and then plotted on a second pool of processes to <output_directory>/distributions.
+
+    :param tasks:
+        An iterable of [morphology_file, mtype] pairs, for example from
+        @get_directory_population_tasks.
+    :param output_directory:
+        The directory where the tables will be written.
+    :param number_processes:
+        The number of worker processes, by default the number of cores of the node.
+    :param chunk_size:
+        The number of morphologies that are sent to a worker process at once.
+    :param table_format:
+        The format of the morphologies table, one of analysis_table.TABLE_FORMATS.
+    :param plot_distributions:
+        Plot the per-arbor distributions of every morphology.
+    :param plots_dpi:
+        The resolution of the figures of the distributions, zero to only save the previews.
+    :param plots_preview_dpi:
+        The resolution of the PNG previews of the figures, None to skip them.
+    :return:
+        The number of analyzed morphologies and the number of failures.
+    """
+
+    # Create the output directory
+    if not os.path.exists(output_directory):
+        os.makedirs(output_directory, exist_ok=True)
+
+    number_processes = number_processes or multiprocessing.cpu_count()
+    chunk_size = max(1, chunk_size)
+
+    # The morphologies table is appended, remove the table of a previous run
+    table_file = '%s/%s%s' % (output_directory, MORPHOLOGIES_TABLE,
+                              analysis_table.TABLE_EXTENSIONS[table_format])
+    if os.path.isdir(table_file):
+        shutil.rmtree(table_file)
+    elif os.path.isfile(table_file):
+        os.remove(table_file)
+
+    # Keep a few chunks per worker in flight
+    semaphore = threading.BoundedSemaphore(4 * number_processes * chunk_size)
+
+    # The figures of the distributions
+    plots_directory = '%s/%s' % (output_directory, DISTRIBUTIONS_DIRECTORY)
+    if plot_distributions and not os.path.exists(plots_directory):
+        os.makedirs(plots_directory, exist_ok=True)
+    plot_jobs = list()
+
+    aggregator = PopulationAggregator()
+    number_analyzed = 0
+    number_failures = 0
+    with analysis_table.AnalysisTableWriter(
+            table_file, analysis_kernels.get_analysis_variables(), table_format) as \
+            table_writer, open('%s/%s' % (output_directory, FAILURES_FILE), 'w') as \
+            failures_file:
+
+        # The pool is terminated when leaving the block, all the results are consumed by then
+        with multiprocessing.Pool(processes=number_processes) as pool:
+            for record in pool.imap_unordered(analyze_population_morphology,
+                                              get_bounded_tasks(tasks, semaphore),
+                                              chunksize=chunk_size):
+                semaphore.release()
+
+                if record['error'] is not None:
+                    number_failures += 1
+                    failures_file.write('%s\t%s\n' % (record['file'], record['error']))
+                    print('ERROR: Cannot analyze the morphology file [%s]: %s' %
+                          (record['file'], record['error']))
+                    continue
+
+                # The rows of the morphology
+                table_writer.append_rows(record['rows'])
+
+                # Reduce the results
+                aggregator.add_record(record)
+                number_analyzed += 1
+
+                # Only the data of the figures is kept
+                if plot_distributions:
+                    plot_jobs.extend(analysis_plotting.get_morphology_plot_jobs(
+                        record['label'], record['arbors_distributions'], plots_directory))
+
+    # The per m-type tables
+    aggregator.write_tables(output_directory)
+
+    # Plot the distributions of all the morphologies
+    if plot_distributions:
+        analysis_plotting.plot_jobs(plot_jobs, number_processes=number_processes,
+                                    dpi=plots_dpi, preview_dpi=plots_preview_dpi)
+
+    return number_analyzed, number_failures
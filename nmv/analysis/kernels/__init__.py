@@ -19,4 +19,5 @@ from .arbor import *
 from .morphology import *
 from .section import *
 from .functional import *
+from .analysis_cache import *
 from .distributions import *
@@ -0,0 +1,151 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# Internal imports
+import nmv
+import nmv.analysis
+import nmv.skeleton
+
+
+####################################################################################################
+# @build_arbor_analysis_data
+####################################################################################################
+def build_arbor_analysis_data(arbor):
+    """Collects the data of all the fused section operations of a given arbor in a single
+    traversal.
+
+    The geometry of the arbor is computed on its stacked samples arrays, and the results are the
+    same results of applying every fused section operation to every section.
+
+    :param arbor:
+        A given arbor to analyze.
+    :return:
+        A dictionary of the collected lists, keyed by the section operations.
+    """
+
+    # A list for every fused operation
+    analysis_data = dict()
+    for section_operation in nmv.analysis.get_fused_section_operations():
+        analysis_data[section_operation] = list()
+
+    # Visit every section only once
+    nmv.analysis.collect_arbor_analysis_data(arbor, analysis_data)
+
+    # Return the collected data
+    return analysis_data
+
+
+####################################################################################################
+# @build_analysis_cache
+####################################################################################################
+def build_analysis_cache(morphology):
+    """Builds the analysis cache of the morphology, where the data of all the arbors are collected
+    in a single traversal and then served to all the analysis kernels.
+
+    The data of every arbor are attached to its root section, and the morphology keeps them in
+    the analysis_cache dictionary keyed by the prefix of the arbor. Any existing cache is replaced.
+
+    :param morphology:
+        A given morphology to analyze.
+    """
+
+    # Start from an empty cache
+    clear_analysis_cache(morphology)
+    morphology.analysis_cache = dict()
+
+    # Apical dendrite
+    if morphology.apical_dendrite is not None:
+        morphology.apical_dendrite.analysis_data = build_arbor_analysis_data(
+            morphology.apical_dendrite)
+        morphology.analysis_cache[morphology.apical_dendrite.get_type_prefix()] = \
+            morphology.apical_dendrite.analysis_data
+
+    # Basal dendrites
+    if morphology.dendrites is not None:
+        for i, basal_dendrite in enumerate(morphology.dendrites):
+            basal_dendrite.analysis_data = build_arbor_analysis_data(basal_dendrite)
+            morphology.analysis_cache['%s%d' % (basal_dendrite.get_type_prefix(), i)] = \
+                basal_dendrite.analysis_data
+
+    # Axon
+    if morphology.axon is not None:
+        morphology.axon.analysis_data = build_arbor_analysis_data(morphology.axon)
+        morphology.analysis_cache[morphology.axon.get_type_prefix()] = \
+            morphology.axon.analysis_data
+
+
+####################################################################################################
+# @clear_analysis_cache
+####################################################################################################
+def clear_analysis_cache(morphology):
+    """Clears the analysis cache of the morphology. This function must be called if the
+    morphology skeleton is modified after the analysis.
+
+    :param morphology:
+        A given morphology.
+    """
+
+    # Apical dendrite
+    if morphology.apical_dendrite is not None:
+        morphology.apical_dendrite.analysis_data = None
+
+    # Basal dendrites
+    if morphology.dendrites is not None:
+        for basal_dendrite in morphology.dendrites:
+            basal_dendrite.analysis_data = None
+
+    # Axon
+    if morphology.axon is not None:
+        morphology.axon.analysis_data = None
+
+    morphology.analysis_cache = None
+
+
+####################################################################################################
+# @get_arbor_analysis_data
+####################################################################################################
+def get_arbor_analysis_data(arbor,
+                            section_operation):
+    """Gets the list of the data that the given section operation collects from all the sections
+    of the arbor.
+
+    If the arbor is cached, the data are served from the cache, and the data of the operations
+    that are not fused are collected once and added to the cache. Otherwise, the operation is
+    applied to the arbor directly.
+
+    NOTE: The returned list can be shared with the cache, and must not be modified.
+
+    :param arbor:
+        A given arbor to analyze.
+    :param section_operation:
+        The section operation, for example nmv.analysis.compute_sections_lengths.
+    :return:
+        A list of the collected data.
+    """
+
+    # Cached data
+    if arbor is not None and arbor.analysis_data is not None:
+        if section_operation not in arbor.analysis_data:
+            analysis_data = list()
+            nmv.skeleton.ops.apply_operation_to_arbor(*[arbor, section_operation, analysis_data])
+            arbor.analysis_data[section_operation] = analysis_data
+        return arbor.analysis_data[section_operation]
+
+    # Apply the operation directly
+    analysis_data = list()
+    nmv.skeleton.ops.apply_operation_to_arbor(*[arbor, section_operation, analysis_data])
+    return analysis_data
@@ -23,3 +23,4 @@ from .volume_ops import *
 from .structure_ops import *
 
 
+from .geometry_ops import *
@@ -18,7 +18,6 @@
 # Internal imports
 import nmv
 import nmv.analysis
-import nmv.skeleton
 
 
 ####################################################################################################
@@ -33,14 +32,9 @@ def compute_minimum_local_bifurcation_angle_of_arbor(arbor):
         The minimum local bifurcation angle of the arbor in degrees.
     """
 
-    # A list that will contain the bifurcation angles of all the sections along the arbor
-    sections_bifurcation_angles = list()
-
     # Compute the angles of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_sections_local_bifurcation_angles,
-          sections_bifurcation_angles])
+    sections_bifurcation_angles = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_sections_local_bifurcation_angles)
 
     # Return the minimum local bifurcation angle
     if len(sections_bifurcation_angles) > 0:
@@ -60,14 +54,9 @@ def compute_maximum_local_bifurcation_angle_of_arbor(arbor):
         The maximum local bifurcation angle of the arbor in degrees.
     """
 
-    # A list that will contain the bifurcation angles of all the sections along the arbor
-    sections_bifurcation_angles = list()
-
     # Compute the angles of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_sections_local_bifurcation_angles,
-          sections_bifurcation_angles])
+    sections_bifurcation_angles = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_sections_local_bifurcation_angles)
 
     # Return the minimum local bifurcation angle
     if len(sections_bifurcation_angles) > 0:
@@ -87,14 +76,9 @@ def compute_average_local_bifurcation_angle_of_arbor(arbor):
         The average local bifurcation angle of the arbor in degrees.
     """
 
-    # A list that will contain the bifurcation angles of all the sections along the arbor
-    sections_bifurcation_angles = list()
-
     # Compute the angles of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_sections_local_bifurcation_angles,
-          sections_bifurcation_angles])
+    sections_bifurcation_angles = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_sections_local_bifurcation_angles)
 
     # Total arbor local bifurcation angle
     arbor_total_bifurcation_angle = 0.0
@@ -124,14 +108,9 @@ def compute_minimum_global_bifurcation_angle_of_arbor(arbor):
         The minimum global bifurcation angle of the arbor in degrees.
     """
 
-    # A list that will contain the bifurcation angles of all the sections along the arbor
-    sections_bifurcation_angles = list()
-
     # Compute the angles of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_sections_global_bifurcation_angles,
-          sections_bifurcation_angles])
+    sections_bifurcation_angles = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_sections_global_bifurcation_angles)
 
     # Return the minimum local bifurcation angle
     if len(sections_bifurcation_angles):
@@ -152,14 +131,9 @@ def compute_maximum_global_bifurcation_angle_of_arbor(arbor):
         The maximum local bifurcation angle of the arbor in degrees.
     """
 
-    # A list that will contain the bifurcation angles of all the sections along the arbor
-    sections_bifurcation_angles = list()
-
     # Compute the angles of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_sections_global_bifurcation_angles,
-          sections_bifurcation_angles])
+    sections_bifurcation_angles = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_sections_global_bifurcation_angles)
 
     # Return the minimum local bifurcation angle
     if len(sections_bifurcation_angles) > 0:
@@ -180,14 +154,9 @@ def compute_average_global_bifurcation_angle_of_arbor(arbor):
         The average global bifurcation angle of the arbor in degrees.
     """
 
-    # A list that will contain the bifurcation angles of all the sections along the arbor
-    sections_bifurcation_angles = list()
-
     # Compute the angles of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_sections_global_bifurcation_angles,
-          sections_bifurcation_angles])
+    sections_bifurcation_angles = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_sections_global_bifurcation_angles)
 
     # Total arbor local bifurcation angle
     arbor_total_bifurcation_angle = 0.0
@@ -18,7 +18,6 @@
 # Internal imports
 import nmv
 import nmv.analysis
-import nmv.skeleton
 
 
 ####################################################################################################
@@ -33,14 +32,9 @@ def compute_arbor_total_surface_area(arbor):
         The total surface area of the arbor in um squared.
     """
 
-    # A list that will contain the surface areas of all the sections along the arbor
-    sections_surface_areas = list()
-
     # Compute the surface area of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_sections_surface_areas_from_segments,
-          sections_surface_areas])
+    sections_surface_areas = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_sections_surface_areas_from_segments)
 
     # Total arbor length
     arbor_total_surface_area = 0.0
@@ -67,14 +61,9 @@ def compute_minimum_section_surface_area(arbor):
         The minimum surface area of the smallest section along the given arbor in um squared.
     """
 
-    # A list that will contain the surface areas of all the sections along the arbor
-    sections_surface_areas = list()
-
     # Compute the surface area of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_sections_surface_areas_from_segments,
-          sections_surface_areas])
+    sections_surface_areas = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_sections_surface_areas_from_segments)
 
     # Return the minimum section surface area
     return min(sections_surface_areas)
@@ -92,14 +81,9 @@ def compute_minimum_segment_surface_area(arbor):
         The minimum surface area of the smallest section along the given arbor in um squared.
     """
 
-    # A list that will contain the surface areas of all the sections along the arbor
-    segments_surface_areas = list()
-
     # Compute the surface area of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_segments_surface_areas_in_section,
-          segments_surface_areas])
+    segments_surface_areas = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_segments_surface_areas_in_section)
 
     # Return the minimum section surface area
     return min(segments_surface_areas)
@@ -117,14 +101,9 @@ def compute_maximum_segment_surface_area(arbor):
         The minimum surface area of the smallest section along the given arbor in um squared.
     """
 
-    # A list that will contain the surface areas of all the sections along the arbor
-    segments_surface_areas = list()
-
     # Compute the surface area of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_segments_surface_areas_in_section,
-          segments_surface_areas])
+    segments_surface_areas = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_segments_surface_areas_in_section)
 
     # Return the minimum section surface area
     return max(segments_surface_areas)
@@ -142,14 +121,9 @@ def compute_average_segment_surface_area(arbor):
         The minimum surface area of the smallest section along the given arbor in um squared.
     """
 
-    # A list that will contain the surface areas of all the sections along the arbor
-    segments_surface_areas = list()
-
     # Compute the surface area of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_segments_surface_areas_in_section,
-          segments_surface_areas])
+    segments_surface_areas = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_segments_surface_areas_in_section)
 
     # Return the minimum section surface area
     return sum(segments_surface_areas) / len(segments_surface_areas)
@@ -167,14 +141,9 @@ def compute_maximum_section_surface_area(arbor):
         The maximum surface area of the largest section along the given arbor in um squared.
     """
 
-    # A list that will contain the surface areas of all the sections along the arbor
-    sections_surface_areas = list()
-
     # Compute the surface area of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_sections_surface_areas_from_segments,
-          sections_surface_areas])
+    sections_surface_areas = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_sections_surface_areas_from_segments)
 
     # Return the maximum section surface area
     return max(sections_surface_areas)
@@ -192,14 +161,9 @@ def compute_average_section_surface_area(arbor):
         The average surface area per section of the arbor in um squared.
     """
 
-    # A list that will contain the surface areas of all the sections along the arbor
-    sections_surface_areas = list()
-
     # Compute the surface area of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_sections_surface_areas_from_segments,
-          sections_surface_areas])
+    sections_surface_areas = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_sections_surface_areas_from_segments)
 
     # Total arbor length
     arbor_total_surface_area = 0.0
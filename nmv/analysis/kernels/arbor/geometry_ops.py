@@ -0,0 +1,382 @@
+####################################################################################################
+# Copyright (c) 2016 - 2019, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import numpy
+
+# Internal imports
+import nmv
+import nmv.analysis
+import nmv.skeleton
+from nmv.analysis.core import analysis_kernels
+
+
+####################################################################################################
+# @get_arbor_sections
+####################################################################################################
+def get_arbor_sections(arbor):
+    """Gets the sections of an arbor in the same depth-first order of apply_operation_to_arbor.
+
+    :param arbor:
+        The root section of the arbor.
+    :return:
+        A list of the sections and a list of the indices of their parents in the list, where the
+        parent of the root section is -1.
+    """
+
+    sections = list()
+    sections_parents = list()
+    stack = [[arbor, -1]]
+    while len(stack) > 0:
+        section, parent_index = stack.pop()
+        section_index = len(sections)
+        sections.append(section)
+        sections_parents.append(parent_index)
+        if section.children is not None:
+            for child in reversed(section.children):
+                stack.append([child, section_index])
+    return sections, sections_parents
+
+
+####################################################################################################
+# @get_arbor_samples_arrays
+####################################################################################################
+def get_arbor_samples_arrays(sections):
+    """Stacks the points and the radii of the samples of the given sections into arrays.
+
+    The sections of an nmv.skeleton.ArrayMorphology are gathered from its arrays directly, and
+    the samples of the nmv.skeleton.Section objects are visited only once.
+
+    :param sections:
+        A list of sections.
+    :return:
+        The Nx3 array of the points, the array of the radii and the array of the S+1 offsets of
+        the samples of the sections.
+    """
+
+    # The views on an array morphology
+    if len(sections) > 0 and isinstance(sections[0], nmv.skeleton.ArraySection):
+        offsets = sections[0].morphology.sections_offsets
+        rows = [numpy.arange(offsets[section.index], offsets[section.index + 1])
+                for section in sections]
+        number_samples = [len(section_rows) for section_rows in rows]
+        rows = numpy.concatenate(rows)
+        points = sections[0].morphology.points[rows]
+        radii = sections[0].morphology.radii[rows]
+
+    # The sections objects
+    else:
+        points = list()
+        radii = list()
+        number_samples = list()
+        for section in sections:
+            for sample in section.samples:
+                points.append((sample.point[0], sample.point[1], sample.point[2]))
+                radii.append(sample.radius)
+            number_samples.append(len(section.samples))
+        points = numpy.array(points, dtype=numpy.float64).reshape((-1, 3))
+        radii = numpy.array(radii, dtype=numpy.float64)
+
+    sections_offsets = numpy.zeros(len(sections) + 1, dtype=numpy.int64)
+    sections_offsets[1:] = numpy.cumsum(number_samples)
+    return points, radii, sections_offsets
+
+
+####################################################################################################
+# @compute_segments_geometry
+####################################################################################################
+def compute_segments_geometry(arbor_geometry):
+    """Computes the lengths, the surface areas and the volumes of all the segments of the arbor.
+
+    The segments are computed with the kernels of the Blender-free analysis core, so the arbors
+    of the Blender analysis and the morphologies of the headless analysis share the same kernels.
+
+    :param arbor_geometry:
+        An ArborGeometry with the samples arrays, that is updated with the segments arrays.
+    """
+
+    first_samples, arbor_geometry.segments_sections = analysis_kernels.get_segments_samples(
+        arbor_geometry.sections_offsets)
+    arbor_geometry.segments_lengths = analysis_kernels.compute_segments_lengths(
+        arbor_geometry.points, first_samples)
+    arbor_geometry.segments_surface_areas = analysis_kernels.compute_segments_surface_areas(
+        arbor_geometry.radii, first_samples, arbor_geometry.segments_lengths)
+    arbor_geometry.segments_volumes = analysis_kernels.compute_segments_volumes(
+        arbor_geometry.radii, first_samples, arbor_geometry.segments_lengths)
+
+
+####################################################################################################
+# @compute_sections_geometry
+####################################################################################################
+def compute_sections_geometry(arbor_geometry):
+    """Computes the per-section lengths, surface areas, volumes, path distances and radii
+    statistics of the arbor from its segments arrays.
+
+    The per-section sums are accumulated in the order of the segments, like the loops of the
+    section kernels.
+
+    :param arbor_geometry:
+        An ArborGeometry with the segments arrays, that is updated with the sections arrays.
+    :raise ValueError:
+        If a section has no samples.
+    """
+
+    radii = arbor_geometry.radii
+    sections_offsets = arbor_geometry.sections_offsets
+    number_sections = len(sections_offsets) - 1
+    number_samples = numpy.diff(sections_offsets)
+    if numpy.any(number_samples == 0):
+        raise ValueError('The arbor has a section without samples')
+
+    # Sums of the segments
+    segments_sections = arbor_geometry.segments_sections
+    arbor_geometry.sections_lengths = analysis_kernels.sum_segments_per_section(
+        segments_sections, arbor_geometry.segments_lengths, number_sections)
+    arbor_geometry.sections_surface_areas = analysis_kernels.sum_segments_per_section(
+        segments_sections, arbor_geometry.segments_surface_areas, number_sections)
+    arbor_geometry.sections_volumes = analysis_kernels.sum_segments_per_section(
+        segments_sections, arbor_geometry.segments_volumes, number_sections)
+
+    # Radii statistics
+    samples_sections = numpy.repeat(numpy.arange(number_sections), number_samples)
+    arbor_geometry.sections_number_samples = number_samples
+    arbor_geometry.sections_number_zero_radius_samples = numpy.bincount(
+        samples_sections, weights=(radii < 0.000001), minlength=number_sections).astype(
+        numpy.int64)
+    arbor_geometry.sections_minimum_radii = numpy.minimum.reduceat(radii, sections_offsets[:-1])
+    arbor_geometry.sections_maximum_radii = numpy.maximum.reduceat(radii, sections_offsets[:-1])
+    arbor_geometry.sections_average_radii = 1.0 * numpy.bincount(
+        samples_sections, weights=radii, minlength=number_sections) / number_samples
+
+    # The parents are always before their children
+    sections_lengths = arbor_geometry.sections_lengths.tolist()
+    paths_distances = list()
+    for i, parent_index in enumerate(arbor_geometry.sections_parents):
+        if parent_index < 0:
+            paths_distances.append(sections_lengths[i])
+        else:
+            paths_distances.append(sections_lengths[i] + paths_distances[parent_index])
+    arbor_geometry.sections_paths_distances = numpy.array(paths_distances)
+
+
+####################################################################################################
+# @compute_angles_between_directions
+####################################################################################################
+def compute_angles_between_directions(directions_1,
+                                      directions_2):
+    """Computes the angles between pairs of directions in degrees, similar to normalizing the two
+    vectors and then calling Vector.angle.
+
+    :param directions_1:
+        An Mx3 array of the first directions.
+    :param directions_2:
+        An Mx3 array of the second directions.
+    :return:
+        An array of M angles, NaN if any of the two directions is shorter than 1e-5.
+    """
+
+    lengths_1 = numpy.sqrt(numpy.sum(directions_1 * directions_1, axis=1))
+    lengths_2 = numpy.sqrt(numpy.sum(directions_2 * directions_2, axis=1))
+    valid = (lengths_1 >= 1e-5) & (lengths_2 >= 1e-5)
+
+    angles = numpy.full(len(valid), numpy.nan)
+    if not numpy.any(valid):
+        return angles
+
+    # Normalize
+    vectors_1 = directions_1[valid] / lengths_1[valid, None]
+    vectors_2 = directions_2[valid] / lengths_2[valid, None]
+
+    # Angles
+    norms = numpy.sqrt(numpy.sum(vectors_1 * vectors_1, axis=1)) * \
+        numpy.sqrt(numpy.sum(vectors_2 * vectors_2, axis=1))
+    cosines = numpy.clip(numpy.sum(vectors_1 * vectors_2, axis=1) / norms, -1.0, 1.0)
+
+    # NOTE: The same approximation of pi that is used in the section kernels
+    angles[valid] = numpy.arccos(cosines) * 180.0 / 3.14
+    return angles
+
+
+####################################################################################################
+# @compute_bifurcation_angles
+####################################################################################################
+def compute_bifurcation_angles(arbor_geometry):
+    """Computes the local and the global bifurcation angles of all the bifurcating sections of the
+    arbor, similar to nmv.analysis.compute_sections_local_bifurcation_angles and
+    nmv.analysis.compute_sections_global_bifurcation_angles.
+
+    :param arbor_geometry:
+        An ArborGeometry with the samples arrays, that is updated with the angles arrays.
+    """
+
+    number_sections = len(arbor_geometry.sections)
+    arbor_geometry.sections_local_bifurcation_angles = numpy.full(number_sections, numpy.nan)
+    arbor_geometry.sections_global_bifurcation_angles = numpy.full(number_sections, numpy.nan)
+
+    # The children of every section in the list
+    children = [list() for _ in range(number_sections)]
+    for i, parent_index in enumerate(arbor_geometry.sections_parents):
+        if parent_index >= 0:
+            children[parent_index].append(i)
+
+    # The bifurcations where the two children have segments
+    offsets = arbor_geometry.sections_offsets
+    bifurcations = list()
+    for i in range(number_sections):
+        if len(children[i]) == 2:
+            child_1, child_2 = children[i]
+            if offsets[child_1 + 1] - offsets[child_1] >= 2 and \
+                    offsets[child_2 + 1] - offsets[child_2] >= 2:
+                bifurcations.append([i, child_1, child_2])
+    if len(bifurcations) == 0:
+        return
+    bifurcations = numpy.array(bifurcations, dtype=numpy.int64)
+
+    # The first and last samples of the children
+    points = arbor_geometry.points
+    first_1 = offsets[bifurcations[:, 1]]
+    first_2 = offsets[bifurcations[:, 2]]
+    last_1 = offsets[bifurcations[:, 1] + 1] - 1
+    last_2 = offsets[bifurcations[:, 2] + 1] - 1
+
+    # The local angles between the first segments, and the global ones between the ends
+    arbor_geometry.sections_local_bifurcation_angles[bifurcations[:, 0]] = \
+        compute_angles_between_directions(points[first_1 + 1] - points[first_1],
+                                          points[first_2 + 1] - points[first_2])
+    arbor_geometry.sections_global_bifurcation_angles[bifurcations[:, 0]] = \
+        compute_angles_between_directions(points[last_1] - points[first_1],
+                                          points[last_2] - points[first_2])
+
+
+####################################################################################################
+# @compute_arbor_geometry
+####################################################################################################
+def compute_arbor_geometry(arbor):
+    """Computes the geometry of all the sections of an arbor with a few array operations on the
+    stacked samples of the arbor.
+
+    :param arbor:
+        The root section of the arbor.
+    :return:
+        An ArborGeometry structure.
+    """
+
+    sections, sections_parents = get_arbor_sections(arbor)
+    points, radii, sections_offsets = get_arbor_samples_arrays(sections)
+    arbor_geometry = nmv.analysis.ArborGeometry(
+        sections=sections, sections_parents=sections_parents, points=points, radii=radii,
+        sections_offsets=sections_offsets)
+
+    compute_segments_geometry(arbor_geometry)
+    compute_sections_geometry(arbor_geometry)
+    compute_bifurcation_angles(arbor_geometry)
+    return arbor_geometry
+
+
+####################################################################################################
+# @collect_arbor_analysis_data
+####################################################################################################
+def collect_arbor_analysis_data(arbor,
+                                analysis_data):
+    """Collects the data of all the fused section operations of an arbor from its geometry
+    arrays.
+
+    The collected lists are the same lists that the fused section operations collect when they
+    are applied to every section of the arbor, but the per-sample and the per-segment loops are
+    replaced by array operations on the entire arbor.
+
+    :param arbor:
+        The root section of the arbor.
+    :param analysis_data:
+        A dictionary of lists to collect the analysis data, keyed by the section operations
+        returned from nmv.analysis.get_fused_section_operations.
+    """
+
+    arbor_geometry = compute_arbor_geometry(arbor)
+
+    # Convert the arrays into lists in bulk
+    number_samples = arbor_geometry.sections_number_samples.tolist()
+    sections_lengths = arbor_geometry.sections_lengths.tolist()
+    paths_distances = arbor_geometry.sections_paths_distances.tolist()
+    minimum_radii = arbor_geometry.sections_minimum_radii.tolist()
+    maximum_radii = arbor_geometry.sections_maximum_radii.tolist()
+    offsets = arbor_geometry.sections_offsets.tolist()
+    radii = arbor_geometry.radii.tolist()
+
+    # Per-sample data
+    analysis_data[nmv.analysis.compute_number_of_samples_per_section].extend(number_samples)
+    analysis_data[nmv.analysis.compute_number_of_segments_per_section].extend(
+        [count - 1 for count in number_samples])
+    analysis_data[nmv.analysis.compute_number_of_zero_radius_samples_per_section].extend(
+        arbor_geometry.sections_number_zero_radius_samples.tolist())
+    analysis_data[nmv.analysis.get_samples_radii_of_section].extend(radii)
+    analysis_data[nmv.analysis.compute_minimum_sample_radius_per_section].extend(minimum_radii)
+    analysis_data[nmv.analysis.compute_maximum_sample_radius_per_section].extend(maximum_radii)
+    analysis_data[nmv.analysis.compute_average_sample_radius_per_section].extend(
+        arbor_geometry.sections_average_radii.tolist())
+
+    # Per-segment data
+    analysis_data[nmv.analysis.compute_segments_lengths].extend(
+        arbor_geometry.segments_lengths.tolist())
+    analysis_data[nmv.analysis.compute_segments_surface_areas_in_section].extend(
+        arbor_geometry.segments_surface_areas.tolist())
+    analysis_data[nmv.analysis.compute_segments_volumes_in_section].extend(
+        arbor_geometry.segments_volumes.tolist())
+
+    # Per-section data
+    analysis_data[nmv.analysis.compute_sections_lengths].extend(sections_lengths)
+    analysis_data[nmv.analysis.compute_sections_surface_areas_from_segments].extend(
+        arbor_geometry.sections_surface_areas.tolist())
+    analysis_data[nmv.analysis.compute_sections_volumes_from_segments].extend(
+        arbor_geometry.sections_volumes.tolist())
+    analysis_data[nmv.analysis.compute_path_distance].extend(paths_distances)
+
+    # Structure data
+    for i, section in enumerate(arbor_geometry.sections):
+        number_children = 0 if section.children is None else len(section.children)
+        branching_order = section.branching_order
+        analysis_data[nmv.analysis.compute_number_of_samples_per_section_distributions].append(
+            [branching_order, number_samples[i]])
+        analysis_data[nmv.analysis.count_section].append(1)
+        if number_children == 2:
+            analysis_data[nmv.analysis.count_bifurcations].append(1)
+
+            # The bifurcation angles are computed by the section kernels, with the same vector
+            # operations, such that the reports are identical to the per-section ones
+            nmv.analysis.compute_sections_local_bifurcation_angles(
+                section, analysis_data[nmv.analysis.compute_sections_local_bifurcation_angles])
+            nmv.analysis.compute_sections_global_bifurcation_angles(
+                section, analysis_data[nmv.analysis.compute_sections_global_bifurcation_angles])
+        if number_children == 3:
+            analysis_data[nmv.analysis.count_trifurcations].append(1)
+        if section.is_leaf():
+            analysis_data[nmv.analysis.compute_terminal_tips].append(1)
+            analysis_data[nmv.analysis.get_maximum_branching_order].append(branching_order)
+
+        # Keep the lengths of the section objects, like compute_path_length does
+        if isinstance(section, nmv.skeleton.Section):
+            section.length = sections_lengths[i]
+            section.path_length = paths_distances[i]
+
+        # Short sections
+        if number_samples[i] > 1:
+            diameters_sum = (radii[offsets[i]] + radii[offsets[i + 1] - 1]) * 2
+            if sections_lengths[i] < diameters_sum:
+                analysis_data[nmv.analysis.identify_short_sections].append(
+                    'Section[%s : %d] : Length[Current : %f, Minimal : %f]' % (
+                        section.get_type_string(), section.id, sections_lengths[i],
+                        diameters_sum))
@@ -18,7 +18,6 @@
 # Internal imports
 import nmv
 import nmv.analysis
-import nmv.skeleton
 
 
 ####################################################################################################
@@ -33,14 +32,9 @@ def compute_total_length_of_arbor(arbor):
         The total length of the arbor in um.
     """
 
-    # A list that will contains the lengths of all the sections along the arbor
-    sections_lengths = list()
-
     # Compute the length of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_sections_lengths,
-          sections_lengths])
+    sections_lengths = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_sections_lengths)
 
     # Total arbor length
     arbor_total_length = 0.0
@@ -67,14 +61,9 @@ def compute_segments_lengths_of_arbor(arbor):
         An array that contains the lengths of all the segments along the arbor.
     """
 
-    # A list that will contains the lengths of all the segments along the arbor
-    segments_lengths = list()
-
     # Compute the length of each segment individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_segments_lengths,
-          segments_lengths])
+    segments_lengths = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_segments_lengths)
 
     # Return the list
     return segments_lengths
@@ -189,14 +178,9 @@ def compute_sections_lengths_of_arbor(arbor):
         An array that contains the lengths of all the sections along the arbor.
     """
 
-    # A list that will contains the lengths of all the sections along the arbor
-    sections_lengths = list()
-
     # Compute the length of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_sections_lengths,
-          sections_lengths])
+    sections_lengths = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_sections_lengths)
 
     # Return the list
     return sections_lengths
@@ -214,14 +198,9 @@ def compute_sections_contractions_of_arbor(arbor):
         An array that contains the contraction ratios of all the sections along the arbor.
     """
 
-    # A list that will contains the contraction ratios of all the sections along the arbor
-    sections_contraction_ratios = list()
-
     # Compute the length of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_sections_contraction_ratios,
-          sections_contraction_ratios])
+    sections_contraction_ratios = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_sections_contraction_ratios)
 
     # Return the list
     return sections_contraction_ratios
@@ -362,14 +341,9 @@ def compute_number_of_short_sections_of_arbor(arbor):
         An array that contains the lengths of all the sections along the arbor.
     """
 
-    # A list that will contains the lengths of all the sections along the arbor
-    short_sections = list()
-
     # Compute the length of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.identify_short_sections,
-          short_sections])
+    short_sections = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.identify_short_sections)
 
     # Return the number of short sections
     return len(short_sections)
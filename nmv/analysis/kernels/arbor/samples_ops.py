@@ -17,7 +17,6 @@
 
 import nmv
 import nmv.analysis
-import nmv.skeleton
 
 
 ####################################################################################################
@@ -35,14 +34,9 @@ def compute_number_of_samples_of_arbor(arbor):
         Total number of samples of the arbor.
     """
 
-    # A list that will contain the number of samples per section
-    sections_number_samples = list()
-
     # Compute the number of segments of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_number_of_segments_per_section,
-          sections_number_samples])
+    sections_number_samples = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_number_of_segments_per_section)
 
     # Total number of samples
     total_number_samples = 0
@@ -73,14 +67,9 @@ def compute_number_of_samples_of_arbor_distributions(arbor):
         Total number of samples of the arbor w.r.t the branching order.
     """
 
-    # A list that will be filled with the results recursively
-    analysis_data = list()
-
     # Compute the number of segments of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_number_of_samples_per_section_distributions,
-          analysis_data])
+    analysis_data = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_number_of_samples_per_section_distributions)
 
     # Aggregate the results
     aggregate_analysis_data = nmv.analysis.add_distributions(analysis_data)
@@ -101,14 +90,9 @@ def compute_total_number_of_zero_radii_samples_of_arbor(arbor):
         Total number of samples of the arbor.
     """
 
-    # A list that will contain the number of samples per section
-    sections_number_zero_radii_samples = list()
-
     # Compute the number of segments of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_number_of_zero_radius_samples_per_section,
-          sections_number_zero_radii_samples])
+    sections_number_zero_radii_samples = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_number_of_zero_radius_samples_per_section)
 
     # Total number of samples
     total_number_zero_radii_samples = 0
@@ -135,14 +119,9 @@ def compute_minimum_samples_count_of_arbor(arbor):
         Least number of samples of a section along the arbor.
     """
 
-    # A list that will contain the number of samples per section
-    sections_number_samples = list()
-
     # Compute the number of segments of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_number_of_samples_per_section,
-          sections_number_samples])
+    sections_number_samples = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_number_of_samples_per_section)
 
     # Return the minimum number of samples
     return min(sections_number_samples)
@@ -160,14 +139,9 @@ def compute_maximum_samples_count_of_arbor(arbor):
         Largest number of samples of a section along the arbor.
     """
 
-    # A list that will contain the number of samples per section
-    sections_number_samples = list()
-
     # Compute the number of segments of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_number_of_samples_per_section,
-          sections_number_samples])
+    sections_number_samples = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_number_of_samples_per_section)
 
     # Return the minimum number of samples
     return max(sections_number_samples)
@@ -185,14 +159,9 @@ def compute_average_number_samples_per_section_of_arbor(arbor):
         Average number of samples per section along the gievn arbor.
     """
 
-    # A list that will contain the number of samples per section
-    sections_number_samples = list()
-
     # Compute the number of segments of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_number_of_samples_per_section,
-          sections_number_samples])
+    sections_number_samples = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_number_of_samples_per_section)
 
     # Total number of samples
     total_number_samples = 0
@@ -219,14 +188,9 @@ def compute_number_of_zero_radius_samples_per_section_of_arbor(arbor):
         Number of zero-radius samples along the given arbor.
     """
 
-    # A list that will contain the number of samples per section
-    sections_number_zero_radius_samples = list()
-
     # Compute the number of segments of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_number_of_zero_radius_samples_per_section,
-          sections_number_zero_radius_samples])
+    sections_number_zero_radius_samples = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_number_of_zero_radius_samples_per_section)
 
     # Total number of samples
     total_number_zero_radius_samples = 0
@@ -253,14 +217,9 @@ def compute_minimum_sample_radius_of_arbor(arbor):
         Minimum sample radius along the given arbor.
     """
 
-    # A list that will contain the radii of all the samples along a given section
-    sections_samples_radii = list()
-
     # Append the radii of the samples to the list
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_minimum_sample_radius_per_section,
-          sections_samples_radii])
+    sections_samples_radii = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_minimum_sample_radius_per_section)
 
     # Return the minimum sample radius
     return min(sections_samples_radii)
@@ -268,42 +227,24 @@ def compute_minimum_sample_radius_of_arbor(arbor):
 
 def compute_minimum_daughter_ratio_of_arbor(arbor):
 
-    # A list that will contain the radii of all the samples along a given section
-    data_list = list()
-
     # Append the radii of the samples to the list
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_daughter_ratio,
-          data_list])
+    data_list = nmv.analysis.get_arbor_analysis_data(arbor, nmv.analysis.compute_daughter_ratio)
 
     return min(data_list)
 
 
 def compute_average_daughter_ratio_of_arbor(arbor):
 
-    # A list that will contain the radii of all the samples along a given section
-    data_list = list()
-
     # Append the radii of the samples to the list
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_daughter_ratio,
-          data_list])
+    data_list = nmv.analysis.get_arbor_analysis_data(arbor, nmv.analysis.compute_daughter_ratio)
 
     return sum(data_list) / len(data_list)
 
 
 def compute_maximum_daughter_ratio_of_arbor(arbor):
 
-    # A list that will contain the radii of all the samples along a given section
-    data_list = list()
-
     # Append the radii of the samples to the list
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_daughter_ratio,
-          data_list])
+    data_list = nmv.analysis.get_arbor_analysis_data(arbor, nmv.analysis.compute_daughter_ratio)
 
     return max(data_list)
 
@@ -320,14 +261,9 @@ def compute_maximum_sample_radius_of_arbor(arbor):
         Maximum sample radius along the given arbor.
     """
 
-    # A list that will contain the radii of all the samples along a given section
-    sections_samples_radii = list()
-
     # Append the radii of the samples to the list
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_maximum_sample_radius_per_section,
-          sections_samples_radii])
+    sections_samples_radii = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_maximum_sample_radius_per_section)
 
     # Return the maximum sample radius
     return max(sections_samples_radii)
@@ -345,14 +281,9 @@ def compute_average_sample_radius_of_arbor(arbor):
         Average sample radius along the given arbor.
     """
 
-    # A list that will contain the radii of all the samples along a given section
-    sections_samples_radii = list()
-
     # Append the radii of the samples to the list
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_average_sample_radius_per_section,
-          sections_samples_radii])
+    sections_samples_radii = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_average_sample_radius_per_section)
 
     # Return the maximum sample radius
     return (1.0 * sum(sections_samples_radii)) / len(sections_samples_radii)
@@ -370,14 +301,9 @@ def get_samples_radii_of_arbor(arbor):
         A list of the radii of the samples .
     """
 
-    # A list that will contain the analysis data
-    arbor_samples_radii = list()
-
     # Analyse
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.get_samples_radii_of_section,
-          arbor_samples_radii])
+    arbor_samples_radii = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.get_samples_radii_of_section)
 
     # Return the list
     return arbor_samples_radii
@@ -395,14 +321,9 @@ def get_number_of_samples_per_section_of_arbor(arbor):
         A list of the radii of the samples.
     """
 
-    # A list that will contain the analysis data
-    arbor_number_of_samples_per_section = list()
-
     # Analyse
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.get_number_of_samples_per_section_of_section,
-          arbor_number_of_samples_per_section])
+    arbor_number_of_samples_per_section = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.get_number_of_samples_per_section_of_section)
 
     # Return the list
     return arbor_number_of_samples_per_section
@@ -411,14 +332,9 @@ def get_number_of_samples_per_section_of_arbor(arbor):
 
 def compute_distribution_number_samples_per_section_of_arbor(arbor):
 
-    # A list that will contain the number of samples per section
-    data_list = list()
-
     # Compute the number of segments of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_distribution_number_of_samples_per_section,
-          data_list])
+    data_list = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_distribution_number_of_samples_per_section)
 
 
 
@@ -434,28 +350,18 @@ def get_samples_radii_data_of_arbor(arbor):
         A list of the radii of the samples.
     """
 
-    # A list that will contain the analysis data
-    analysis_data = list()
-
     # Analyse
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.get_samples_radii_data_of_section,
-          analysis_data])
+    analysis_data = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.get_samples_radii_data_of_section)
 
     # Return the list
     return analysis_data
 
 
 def get_number_of_samples_per_section_data_of_arbor(arbor):
-    # A list that will contain the analysis data
-    analysis_data = list()
-
     # Analyse
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.get_number_of_samples_per_section_data_of_section,
-          analysis_data])
+    analysis_data = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.get_number_of_samples_per_section_data_of_section)
 
     # Return the list
     return analysis_data
@@ -17,7 +17,6 @@
 
 import nmv
 import nmv.analysis
-import nmv.skeleton
 
 
 ####################################################################################################
@@ -32,14 +31,8 @@ def compute_total_number_of_sections_of_arbor(arbor):
         Total number of sections of the arbor.
     """
 
-    # A list that will be used to count the sections in the arbor
-    sections = list()
-
     # Compute the number of segments of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.count_section,
-          sections])
+    sections = nmv.analysis.get_arbor_analysis_data(arbor, nmv.analysis.count_section)
 
     # Total number of samples
     total_number_sections = 0
@@ -66,14 +59,8 @@ def compute_total_number_of_bifurcations_of_arbor(arbor):
         Total number of bifurcations of the arbor.
     """
 
-    # A list that will contain the number of bifurcations per section
-    bifurcations = list()
-
     # Apply the operation per section
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.count_bifurcations,
-          bifurcations])
+    bifurcations = nmv.analysis.get_arbor_analysis_data(arbor, nmv.analysis.count_bifurcations)
 
     # Total number of samples
     total_bifurcations = 0
@@ -100,14 +87,8 @@ def compute_total_number_of_trifurcations_of_arbor(arbor):
         Total number of trifurcations of the arbor.
     """
 
-    # A list that will contain the number of trifurcations per section
-    trifurcations = list()
-
     # Apply the operation per section
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.count_trifurcations,
-          trifurcations])
+    trifurcations = nmv.analysis.get_arbor_analysis_data(arbor, nmv.analysis.count_trifurcations)
 
     # Total number of trifurcations
     total_trifurcations = 0
@@ -134,14 +115,9 @@ def compute_maximum_branching_order_of_arbor(arbor):
         The maximum branching order of the given arbor.
     """
 
-    # A list that will collect the branching orders
-    branching_orders = list()
-
     # Apply the operation per section
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.get_maximum_branching_order,
-          branching_orders])
+    branching_orders = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.get_maximum_branching_order)
 
     # Return the maximum branching order of the arbor
     return max(branching_orders)
@@ -159,14 +135,9 @@ def compute_maximum_path_distance_of_arbor(arbor):
         The maximum path distance from the soma along all the arbors till their last sample.
     """
 
-    # A list that will collect the distances along each path on the arbor.
-    paths_distances = list()
-
     # Apply the operation per section
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_path_distance,
-          paths_distances])
+    paths_distances = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_path_distance)
 
     # Return the maximum path distance
     return max(paths_distances)
@@ -184,14 +155,9 @@ def compute_maximum_euclidean_distance_of_arbor(arbor):
         The maximum euclidean distance from the soma to the last sample along the arbor.
     """
 
-    # A list that will collect the distances along each path on the arbor.
-    euclidean_distances = list()
-
     # Apply the operation per section
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_maximum_euclidean_distance,
-          euclidean_distances])
+    euclidean_distances = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_maximum_euclidean_distance)
 
     # Return the maximum path distance
     return max(euclidean_distances)
@@ -209,14 +175,9 @@ def compute_minimum_euclidean_distance_of_arbor(arbor):
         The minimum euclidean distance from the soma to the first sample along the arbor.
     """
 
-    # A list that will collect the distances along each path on the arbor.
-    euclidean_distances = list()
-
     # Apply the operation per section
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_minimum_euclidean_distance,
-          euclidean_distances])
+    euclidean_distances = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_minimum_euclidean_distance)
 
     # Return the maximum path distance
     return min(euclidean_distances)
@@ -234,11 +195,8 @@ def compute_total_number_of_terminal_tips_of_arbor(arbor):
         The total number of tips in the arbor.
     """
 
-    # A list that will contain the number of terminal tips
-    tips = list()
-
     # Apply the operation per section
-    nmv.skeleton.ops.apply_operation_to_arbor(*[arbor, nmv.analysis.compute_terminal_tips, tips])
+    tips = nmv.analysis.get_arbor_analysis_data(arbor, nmv.analysis.compute_terminal_tips)
 
     # Calculate the total
     total_tips = 0
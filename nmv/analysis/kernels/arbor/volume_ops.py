@@ -18,7 +18,6 @@
 # Internal imports
 import nmv
 import nmv.analysis
-import nmv.skeleton
 
 
 ####################################################################################################
@@ -33,14 +32,9 @@ def compute_arbor_total_volume(arbor):
         The total volume of the arbor in um cube.
     """
 
-    # A list that will contain the volumes of all the sections along the arbor
-    sections_volumes = list()
-
     # Compute the volumes of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_sections_volumes_from_segments,
-          sections_volumes])
+    sections_volumes = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_sections_volumes_from_segments)
 
     # Total arbor length
     arbor_total_volume = 0.0
@@ -67,14 +61,9 @@ def compute_minimum_section_volume(arbor):
         The minimum section volume of the arbor in um cube.
     """
 
-    # A list that will contain the volumes of all the sections along the arbor
-    sections_volumes = list()
-
     # Compute the volumes of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_sections_volumes_from_segments,
-          sections_volumes])
+    sections_volumes = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_sections_volumes_from_segments)
 
     # Return the minimum section volume
     return min(sections_volumes)
@@ -92,14 +81,9 @@ def compute_maximum_section_volume(arbor):
         The maximum section volume of the arbor in um cube.
     """
 
-    # A list that will contain the volumes of all the sections along the arbor
-    sections_volumes = list()
-
     # Compute the volumes of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_sections_volumes_from_segments,
-          sections_volumes])
+    sections_volumes = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_sections_volumes_from_segments)
 
     # Return the minimum section volume
     return max(sections_volumes)
@@ -117,14 +101,9 @@ def compute_average_section_volume(arbor):
         The average section volume of the arbor in um cube.
     """
 
-    # A list that will contain the volumes of all the sections along the arbor
-    sections_volumes = list()
-
     # Compute the volumes of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_sections_volumes_from_segments,
-          sections_volumes])
+    sections_volumes = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_sections_volumes_from_segments)
 
     # Total arbor length
     arbor_total_volume = 0.0
@@ -151,14 +130,9 @@ def compute_minimum_segment_volume(arbor):
         The minimum section volume of the arbor in um cube.
     """
 
-    # A list that will contain the volumes of all the sections along the arbor
-    segments_volumes = list()
-
     # Compute the volumes of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_segments_volumes_in_section,
-          segments_volumes])
+    segments_volumes = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_segments_volumes_in_section)
 
     # Return the minimum section volume
     return min(segments_volumes)
@@ -176,14 +150,9 @@ def compute_maximum_segment_volume(arbor):
         The minimum section volume of the arbor in um cube.
     """
 
-    # A list that will contain the volumes of all the sections along the arbor
-    segments_volumes = list()
-
     # Compute the volumes of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_segments_volumes_in_section,
-          segments_volumes])
+    segments_volumes = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_segments_volumes_in_section)
 
     # Return the minimum section volume
     return max(segments_volumes)
@@ -201,14 +170,9 @@ def compute_average_segment_volume(arbor):
         The minimum section volume of the arbor in um cube.
     """
 
-    # A list that will contain the volumes of all the sections along the arbor
-    segments_volumes = list()
-
     # Compute the volumes of each section individually
-    nmv.skeleton.ops.apply_operation_to_arbor(
-        *[arbor,
-          nmv.analysis.compute_segments_volumes_in_section,
-          segments_volumes])
+    segments_volumes = nmv.analysis.get_arbor_analysis_data(
+        arbor, nmv.analysis.compute_segments_volumes_in_section)
 
     # Return the minimum section volume
     return sum(segments_volumes) / len(segments_volumes)
\ No newline at end of file
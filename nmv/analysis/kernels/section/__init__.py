@@ -20,4 +20,4 @@ from .area_ops import *
 from .lengths_ops import *
 from .samples_ops import *
 from .volume_ops import *
-
+from .fused_ops import *
@@ -0,0 +1,56 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# Internal imports
+import nmv
+import nmv.analysis
+
+
+####################################################################################################
+# @get_fused_section_operations
+####################################################################################################
+def get_fused_section_operations():
+    """Gets the list of the section operations whose data are collected by the fused analysis
+    pass in nmv.analysis.collect_arbor_analysis_data.
+
+    :return:
+        A list of section operations.
+    """
+
+    return [nmv.analysis.compute_number_of_samples_per_section,
+            nmv.analysis.compute_number_of_samples_per_section_distributions,
+            nmv.analysis.compute_number_of_segments_per_section,
+            nmv.analysis.compute_number_of_zero_radius_samples_per_section,
+            nmv.analysis.compute_minimum_sample_radius_per_section,
+            nmv.analysis.compute_maximum_sample_radius_per_section,
+            nmv.analysis.compute_average_sample_radius_per_section,
+            nmv.analysis.get_samples_radii_of_section,
+            nmv.analysis.count_section,
+            nmv.analysis.count_bifurcations,
+            nmv.analysis.count_trifurcations,
+            nmv.analysis.compute_terminal_tips,
+            nmv.analysis.get_maximum_branching_order,
+            nmv.analysis.compute_path_distance,
+            nmv.analysis.compute_sections_local_bifurcation_angles,
+            nmv.analysis.compute_sections_global_bifurcation_angles,
+            nmv.analysis.compute_segments_lengths,
+            nmv.analysis.compute_sections_lengths,
+            nmv.analysis.identify_short_sections,
+            nmv.analysis.compute_segments_surface_areas_in_section,
+            nmv.analysis.compute_sections_surface_areas_from_segments,
+            nmv.analysis.compute_segments_volumes_in_section,
+            nmv.analysis.compute_sections_volumes_from_segments]
@@ -15,182 +15,123 @@
 # If not, see <http://www.gnu.org/licenses/>.
 ####################################################################################################
 
+# System imports
+import os
 
+# Internal imports
 import nmv.consts
 import nmv.enums
 import nmv.utilities
 
 
+# The plotters of this session keyed by their output options, every plotter reuses its figure
+distribution_plotters = dict()
+
+
 ####################################################################################################
-# @plot_per_arbor_result
+# @get_distribution_plotter
 ####################################################################################################
-def plot_per_arbor_result(analysis_results,
-                                morphology,
-                                options,
-                                figure_name=None,
-                                figure_title=None,
-                                figure_xlabel=None,
-                                add_percentage=False,
-                                image_extension=nmv.enums.Image.Extension.TIFF):
-    # Installing dependencies
-    try:
-        import numpy
-    except ValueError:
-        print('Package *numpy* is not installed. Installing it.')
-        nmv.utilities.pip_wheel(package_name='numpy')
-
+def get_distribution_plotter(image_extension=nmv.enums.Image.Extension.TIFF,
+                             dpi=nmv.consts.Image.ANALYSIS_FIGURES_DPI,
+                             preview_dpi=None):
+    """Gets the plotter of the distributions for the given output options. The fonts and the
+    style of the figures are set when the first plotter is created, and the plotters are reused
+    for all the following figures.
+
+    :param image_extension:
+        The extension of the saved figures.
+    :param dpi:
+        The resolution of the saved figures, zero to only save the previews.
+    :param preview_dpi:
+        The resolution of the PNG previews, None to skip them.
+    :return:
+        A reference to an analysis_plotting.DistributionPlotter.
+    """
+
+    # Install matplotlib if needed
     try:
         import matplotlib
-    except ValueError:
+    except ImportError:
         print('Package *matplotlib* is not installed. Installing it.')
         nmv.utilities.pip_wheel(package_name='matplotlib')
 
-    try:
-        import seaborn
-    except ValueError:
-        print('Package *seaborn* is not installed. Installing it.')
-        nmv.utilities.pip_wheel(package_name='seaborn')
-
-    # Plotting imports
-    import numpy
-    import seaborn
-    import matplotlib.pyplot as pyplot
-    from matplotlib import font_manager
-
-    # Import the fonts
-    font_dirs = [nmv.consts.Paths.FONTS_DIRECTORY]
-    font_files = font_manager.findSystemFonts(fontpaths=font_dirs)
-    font_list = font_manager.createFontList(font_files)
-    font_manager.fontManager.ttflist.extend(font_list)
+    from nmv.analysis.core import analysis_plotting
 
-    # Clean the figure
-    pyplot.clf()
+    key = (image_extension, dpi, preview_dpi)
+    if key not in distribution_plotters:
+        distribution_plotters[key] = analysis_plotting.DistributionPlotter(
+            image_extension=image_extension, dpi=dpi, preview_dpi=preview_dpi,
+            fonts_directory=nmv.consts.Paths.FONTS_DIRECTORY)
+    return distribution_plotters[key]
 
-    # X-axis data
-    x_data = list()
 
-    # Y-axis data
-    y_data = list()
-
-    # Color palette
-    palette = []
+####################################################################################################
+# @plot_per_arbor_result
+####################################################################################################
+def plot_per_arbor_result(analysis_results,
+                          morphology,
+                          options,
+                          figure_name=None,
+                          figure_title=None,
+                          figure_xlabel=None,
+                          add_percentage=False,
+                          image_extension=nmv.enums.Image.Extension.TIFF,
+                          dpi=nmv.consts.Image.ANALYSIS_FIGURES_DPI,
+                          preview_dpi=None):
+    """Plots a bar per arbor with the result of the arbor.
+
+    :param analysis_results:
+        The analysis results of the morphology, of type @MorphologyAnalysisResult.
+    :param morphology:
+        The analyzed morphology, with its color palette.
+    :param options:
+        User defined options.
+    :param figure_name:
+        The name of the figure, used to name the file.
+    :param figure_title:
+        The title of the figure.
+    :param figure_xlabel:
+        The label of the independent axis.
+    :param add_percentage:
+        Add the percentage of every arbor to the total to its value.
+    :param image_extension:
+        The extension of the saved figure.
+    :param dpi:
+        The resolution of the saved figure, zero to only save the preview.
+    :param preview_dpi:
+        The resolution of the PNG preview, None to skip it.
+    """
+
+    # Labels, data and colors of the bars
+    labels = list()
+    values = list()
+    palette = list()
 
     # Apical dendrite
     if analysis_results.apical_dendrite_result is not None:
-        x_data.append('Apical Dendrite')
-        y_data.append(analysis_results.apical_dendrite_result)
+        labels.append('Apical Dendrite')
+        values.append(analysis_results.apical_dendrite_result)
         palette.append(morphology.apical_dendrite_color)
 
     # Basal dendrites
     if analysis_results.basal_dendrites_result is not None:
         for i, result in enumerate(analysis_results.basal_dendrites_result):
-            x_data.append('Basal Dendrite %d' % i)
-            y_data.append(result)
+            labels.append('Basal Dendrite %d' % i)
+            values.append(result)
             palette.append(morphology.basal_dendrites_colors[i])
 
     # Collecting the lists, Axon
     if analysis_results.axon_result is not None:
-        x_data.append('Axon')
-        y_data.append(analysis_results.axon_result)
+        labels.append('Axon')
+        values.append(analysis_results.axon_result)
         palette.append(morphology.axon_color)
 
-    # Total number of bars, similar to arbors
-    total_number_of_bars = len(x_data)
-
-    # The width of each bar
-    bar_width = 0.65
-
-    # Adjust seaborn configuration
-    seaborn.set_style("white")
-
-    # The color palette
-    seaborn.set_palette(palette=palette)
-
-    # Adjusting the matplotlib parameters
-    pyplot.rcParams['axes.grid'] = 'False'
-    pyplot.rcParams['font.family'] = 'NimbusSanL'
-    pyplot.rcParams['axes.linewidth'] = 0.0
-    pyplot.rcParams['axes.labelsize'] = bar_width * 10
-    pyplot.rcParams['axes.labelweight'] = 'regular'
-    pyplot.rcParams['xtick.labelsize'] = bar_width * 10
-    pyplot.rcParams['ytick.labelsize'] = bar_width * 10
-    pyplot.rcParams['legend.fontsize'] = 10
-    pyplot.rcParams['axes.titlesize'] = bar_width * 1.25 * 10
-    pyplot.rcParams['axes.axisbelow'] = True
-    pyplot.rcParams['axes.edgecolor'] = '0.1'
-
-    # numpy array from the lists
-    x = numpy.asarray(x_data)
-    y = numpy.asarray(y_data)
-
-    # Adjusting the figure size
-    pyplot.figure(figsize=(bar_width * 4, total_number_of_bars * 0.5 * bar_width))
-
-    # Plot the bar plot
-    ax = seaborn.barplot(x=y, y=x, edgecolor='none')
-
-    # Title
-    ax.set(xlabel=figure_xlabel, title=figure_title)
-    ax.spines['left'].set_linewidth(0.5)
-    ax.spines['left'].set_color('black')
-
-    # Add percentage on the right side of the bar
-    for bar in ax.patches:
-        # Current Y center
-        y = bar.get_y()
-
-        # Current bar height
-        height = bar.get_height()
-
-        # Current center
-        centre = y + height / 2.0
-
-        # Set the new center
-        bar.set_y(centre - bar_width / 2.0)
-
-        # Set the new height
-        bar.set_height(bar_width)
-
-    # Create a list to collect the plt.patches data
-    totals = []
-
-    # Find the values and append to list
-    for i in ax.patches:
-        totals.append(i.get_width())
-
-    # Set individual bar labels using above list
-    total = sum(totals)
-
-    # Set individual bar labels using above list
-    for i, patch in enumerate(ax.patches):
-        # get_width pulls left or right; get_y pushes up or down
-
-        # Get the width of the bar and then add a little increment
-        x = patch.get_width()
-        y = patch.get_y() + (bar_width / 2.0) + (bar_width / 8.0)
-
-        # Compute the percentage
-        percentage = round((patch.get_width() / total) * 100, 2)
-        if add_percentage:
-            if 'float' in str(type(y_data[i])):
-                value = '  %2.1f (%2.1f%%)' % (y_data[i], percentage)
-            else:
-                value = '  %d (%2.1f%%)' % (y_data[i], percentage)
-        else:
-            if 'float' in str(type(y_data[i])):
-                value = '  %2.1f' % y_data[i]
-            else:
-                value = '  %d' % y_data[i]
-
-        ax.text(x, y, value, fontsize=bar_width * 10, color='dimgrey')
-
-    # Save the figure
-    pyplot.savefig('%s/%s-%s.%s' % (options.io.analysis_directory, morphology.label, figure_name,
-                                    image_extension),
-                   bbox_inches='tight', transparent=True, dpi=600)
-
-    # Close the figures
-    pyplot.close()
+    # Plot and save the figure
+    plotter = get_distribution_plotter(image_extension, dpi, preview_dpi)
+    plotter.plot_per_arbor_result(
+        '%s/%s-%s' % (options.io.analysis_directory, morphology.label, figure_name),
+        labels, values, palette, figure_title=figure_title, figure_xlabel=figure_xlabel,
+        add_percentage=add_percentage)
 
 
 ####################################################################################################
@@ -204,46 +145,34 @@ def plot_per_arbor_range(minimum_results,
                          figure_name=None,
                          figure_xlabel=None,
                          figure_title=None,
-                         image_extension=nmv.enums.Image.Extension.TIFF):
-
-    # Installing dependencies
-    try:
-        import numpy
-    except ValueError:
-        print('Package *numpy* is not installed. Installing it.')
-        nmv.utilities.pip_wheel(package_name='numpy')
-
-    try:
-        import matplotlib
-    except ValueError:
-        print('Package *matplotlib* is not installed. Installing it.')
-        nmv.utilities.pip_wheel(package_name='matplotlib')
-
-    try:
-        import seaborn
-    except ValueError:
-        print('Package *seaborn* is not installed. Installing it.')
-        nmv.utilities.pip_wheel(package_name='seaborn')
-
-    try:
-        import pandas
-    except ValueError:
-        print('Package *pandas* is not installed. Installing it.')
-        nmv.utilities.pip_wheel(package_name='pandas')
-
-    import numpy
-    import seaborn
-    from matplotlib import pyplot
-    from matplotlib import font_manager
-
-    # Clear any figure
-    pyplot.clf()
-
-    # Import the fonts
-    font_dirs = [nmv.consts.Paths.FONTS_DIRECTORY]
-    font_files = font_manager.findSystemFonts(fontpaths=font_dirs)
-    font_list = font_manager.createFontList(font_files)
-    font_manager.fontManager.ttflist.extend(font_list)
+                         image_extension=nmv.enums.Image.Extension.TIFF,
+                         dpi=nmv.consts.Image.ANALYSIS_FIGURES_DPI,
+                         preview_dpi=None):
+    """Plots a bar per arbor with the average result of the arbor and its range.
+
+    :param minimum_results:
+        The minimum results of the morphology, of type @MorphologyAnalysisResult.
+    :param average_results:
+        The average results of the morphology, of type @MorphologyAnalysisResult.
+    :param maximum_results:
+        The maximum results of the morphology, of type @MorphologyAnalysisResult.
+    :param morphology:
+        The analyzed morphology, with its color palette.
+    :param options:
+        User defined options.
+    :param figure_name:
+        The name of the figure, used to name the file.
+    :param figure_xlabel:
+        The label of the independent axis.
+    :param figure_title:
+        The title of the figure.
+    :param image_extension:
+        The extension of the saved figure.
+    :param dpi:
+        The resolution of the saved figure, zero to only save the preview.
+    :param preview_dpi:
+        The resolution of the PNG preview, None to skip it.
+    """
 
     # Labels on the independent axis
     labels = list()
@@ -254,7 +183,7 @@ def plot_per_arbor_range(minimum_results,
     max_list = list()
 
     # Color palette
-    palette = []
+    palette = list()
 
     # Apical dendrite
     if minimum_results.apical_dendrite_result is not None:
@@ -266,7 +195,7 @@ def plot_per_arbor_range(minimum_results,
 
     # Basal dendrites
     if minimum_results.basal_dendrites_result is not None:
-        for i in range( len(minimum_results.basal_dendrites_result)):
+        for i in range(len(minimum_results.basal_dendrites_result)):
             labels.append('Basal Dendrite %d' % i)
             min_list.append(minimum_results.basal_dendrites_result[i])
             avg_list.append(average_results.basal_dendrites_result[i])
@@ -281,60 +210,12 @@ def plot_per_arbor_range(minimum_results,
         max_list.append(maximum_results.axon_result)
         palette.append(morphology.axon_color)
 
-    # Total number of bars, similar to arbors
-    total_number_of_bars = len(labels)
-
-    # The width of each bar
-    bar_width = 0.65
-
-    # Adjust seaborn configuration
-    seaborn.set_style("white")
-
-    # The color palette
-    # palette = seabron.cubehelix_palette(2 * total_number_of_bars)
-    # palette = seaborn.color_palette("pastel", total_number_of_bars)
-    seaborn.set_palette(palette=palette)
-
-    # Adjusting the matplotlib parameters
-    pyplot.rcParams['axes.grid'] = 'False'
-    pyplot.rcParams['font.family'] = 'NimbusSanL'
-    pyplot.rcParams['axes.linewidth'] = 0.0
-    pyplot.rcParams['axes.labelsize'] = bar_width * 10
-    pyplot.rcParams['axes.labelweight'] = 'regular'
-    pyplot.rcParams['xtick.labelsize'] = bar_width * 10
-    pyplot.rcParams['ytick.labelsize'] = bar_width * 10
-    pyplot.rcParams['legend.fontsize'] = 10
-    pyplot.rcParams['axes.titlesize'] = bar_width * 1.25 * 10
-    pyplot.rcParams['axes.axisbelow'] = True
-    pyplot.rcParams['axes.edgecolor'] = '0.1'
-
-    # Adjusting the figure size
-    pyplot.figure(figsize=(bar_width * 4, total_number_of_bars * 0.5 * bar_width))
-
-    # Compile the list
-    min_data = numpy.array(min_list)
-    avg_data = numpy.array(avg_list)
-    max_data = numpy.array(max_list)
-
-    # Compute the range
-    xerr = numpy.array([avg_data - min_data, max_data - avg_data])
-
-    # Plot the bar plot
-    ax = seaborn.barplot(x=avg_data, y=labels, xerr=xerr, edgecolor='none',
-                         error_kw={'elinewidth': 0.75, 'capsize': 1.0})
-
-    # Title
-    ax.set(xlabel=figure_xlabel, title=figure_title)
-    ax.spines['left'].set_linewidth(0.5)
-    ax.spines['left'].set_color('black')
-
-    # Save the figure
-    pyplot.savefig('%s/%s-%s.%s' % (options.io.analysis_directory, morphology.label, figure_name,
-                                    image_extension),
-                   bbox_inches='tight', transparent=True, dpi=600)
-
-    # Close the figures
-    pyplot.close()
+    # Plot and save the figure
+    plotter = get_distribution_plotter(image_extension, dpi, preview_dpi)
+    plotter.plot_per_arbor_range(
+        '%s/%s-%s' % (options.io.analysis_directory, morphology.label, figure_name),
+        labels, min_list, avg_list, max_list, palette, figure_title=figure_title,
+        figure_xlabel=figure_xlabel)
 
 
 def plot_distribution(distribution,
@@ -349,22 +230,12 @@ def plot_distribution(distribution,
     import matplotlib.pyplot as plt
 
 
-    from matplotlib import font_manager as fm, rcParams
-    fpath = '%s/%s' % (nmv.consts.Paths.FONTS_DIRECTORY, 'arial.ttf')
-
-    prop = fm.FontProperties(fname=fpath)
-
-    fm.findSystemFonts(fontpaths=nmv.consts.Paths.FONTS_DIRECTORY,
-                       fontext='ttf')
+    # The fonts are registered only once per session
+    from nmv.analysis.core import analysis_plotting
+    analysis_plotting.setup_plotting(nmv.consts.Paths.FONTS_DIRECTORY)
 
     sns.set(color_codes=True)
 
-    font_dirs = [nmv.consts.Paths.FONTS_DIRECTORY]
-    font_files = fm.findSystemFonts(fontpaths=font_dirs)
-    font_list = fm.createFontList(font_files)
-    fm.fontManager.ttflist.extend(font_list)
-
-
     sns.set_style("whitegrid")
     plt.rcParams['axes.grid'] = 'False'
     plt.rcParams['font.family'] = 'Arial'
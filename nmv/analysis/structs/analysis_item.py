@@ -325,6 +325,41 @@ class AnalysisItem:
         # Return the final string
         return results_string
 
+    ################################################################################################
+    # @get_analysis_results
+    ################################################################################################
+    def get_analysis_results(self,
+                             morphology):
+        """Gets the results of the analysis as a list, in the same order of the results string.
+
+        :param morphology:
+            A given morphology to analyze.
+        :return:
+            A list of [prefix, result] pairs of the entire morphology ('Morphology') and then of
+            the individual arbors.
+        """
+
+        # Morphology
+        results = [['Morphology', self.result.morphology_result]]
+
+        # Apical dendrite
+        if morphology.apical_dendrite is not None:
+            results.append([morphology.apical_dendrite.get_type_prefix(),
+                            self.result.apical_dendrite_result])
+
+        # Basal dendrites
+        if morphology.dendrites is not None:
+            for i, basal_dendrite in enumerate(morphology.dendrites):
+                results.append(['%s%d' % (basal_dendrite.get_type_prefix(), i),
+                                self.result.basal_dendrites_result[i]])
+
+        # Axon
+        if morphology.axon is not None:
+            results.append([morphology.axon.get_type_prefix(), self.result.axon_result])
+
+        # Return the results
+        return results
+
     ################################################################################################
     # @apply_per_arbor_analysis_kernel
     ################################################################################################
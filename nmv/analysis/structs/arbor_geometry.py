@@ -0,0 +1,82 @@
+####################################################################################################
+# Copyright (c) 2016 - 2019, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+
+####################################################################################################
+# @ArborGeometry
+####################################################################################################
+class ArborGeometry:
+    """The geometry of all the sections of an arbor, stored in stacked NumPy arrays.
+
+    The sections are ordered in the same depth-first order of apply_operation_to_arbor, the
+    samples of the section i are the rows [sections_offsets[i], sections_offsets[i + 1]) of the
+    samples arrays, and the segments arrays only contain the segments between consecutive samples
+    of the same section.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 sections,
+                 sections_parents,
+                 points,
+                 radii,
+                 sections_offsets):
+        """Constructor
+
+        :param sections:
+            A list of the sections of the arbor in depth-first order.
+        :param sections_parents:
+            An array of the indices of the parents of the sections in the list, -1 for the root.
+        :param points:
+            An Nx3 array of the positions of all the samples of the arbor.
+        :param radii:
+            An array of the radii of all the samples of the arbor.
+        :param sections_offsets:
+            An array of S+1 offsets of the samples of the sections.
+        """
+
+        # Sections
+        self.sections = sections
+        self.sections_parents = sections_parents
+
+        # Samples arrays
+        self.points = points
+        self.radii = radii
+        self.sections_offsets = sections_offsets
+
+        # Per-segment arrays and the indices of the sections of the segments
+        self.segments_sections = None
+        self.segments_lengths = None
+        self.segments_surface_areas = None
+        self.segments_volumes = None
+
+        # Per-section arrays
+        self.sections_number_samples = None
+        self.sections_number_zero_radius_samples = None
+        self.sections_minimum_radii = None
+        self.sections_maximum_radii = None
+        self.sections_average_radii = None
+        self.sections_lengths = None
+        self.sections_surface_areas = None
+        self.sections_volumes = None
+        self.sections_paths_distances = None
+
+        # Per-section bifurcation angles in degrees, NaN if the angle of the section is not defined
+        self.sections_local_bifurcation_angles = None
+        self.sections_global_bifurcation_angles = None
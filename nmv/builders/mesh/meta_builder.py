@@ -16,7 +16,7 @@
 ####################################################################################################
 
 # Syetsm imports
-import copy, os
+import os
 
 # Blender imports
 import bpy, mathutils
@@ -53,7 +53,7 @@ class MetaBuilder:
         """
 
         # Morphology
-        self.morphology = copy.deepcopy(morphology)
+        self.morphology = morphology.clone()
 
         # Loaded options from NeuroMorphoVis
         self.options = options
@@ -16,7 +16,7 @@
 ####################################################################################################
 
 # System imports
-import random, os, copy
+import random, os
 
 # Blender imports
 import bpy
@@ -57,7 +57,7 @@ class PiecewiseBuilder:
         """
 
         # Morphology
-        self.morphology = copy.deepcopy(morphology)
+        self.morphology = morphology.clone()
 
         # Loaded options from NeuroMorphoVis
         self.options = options
@@ -16,7 +16,7 @@
 ####################################################################################################
 
 # System imports
-import random, os, copy
+import random, os
 import time
 
 # Blender imports
@@ -58,7 +58,7 @@ class SkinningBuilder:
         """
 
         # Morphology
-        self.morphology = copy.deepcopy(morphology)
+        self.morphology = morphology.clone()
 
         # Loaded options from NeuroMorphoVis
         self.options = options
@@ -16,7 +16,6 @@
 ####################################################################################################
 
 # System imports
-import copy
 import math
 import os
 
@@ -58,7 +57,7 @@ class UnionBuilder:
         """
 
         # Morphology
-        self.morphology = copy.deepcopy(morphology)
+        self.morphology = morphology.clone()
 
         # Loaded options from NeuroMorphoVis
         self.options = options
@@ -113,7 +112,7 @@ class UnionBuilder:
 
             # Apply the re-sampling filter on the whole morphology skeleton
             nmv.skeleton.ops.apply_operation_to_morphology(
-                *[self.morphology, nmv.skeleton.ops.resample_section_at_fixed_step])
+                *[self.morphology, nmv.skeleton.ops.resample_section_at_fixed_step_vectorized])
 
         # Verify the connectivity of the arbors to the soma to filter the disconnected arbors,
         # for example, an axon that is emanating from a dendrite or two intersecting dendrites
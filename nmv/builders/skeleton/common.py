@@ -19,6 +19,7 @@
 import bpy
 
 # Internal imports
+import nmv.consts
 import nmv.enums
 import nmv.shading
 import nmv.skeleton
@@ -125,23 +126,118 @@ def resample_skeleton_sections(builder):
             nmv.enums.Skeleton.Resampling.ADAPTIVE_RELAXED:
         nmv.logger.detail('Relaxed Adaptive Resampling')
         nmv.skeleton.ops.apply_operation_to_morphology(
-            *[builder.morphology, nmv.skeleton.ops.resample_section_adaptively_relaxed])
+            *[builder.morphology, nmv.skeleton.ops.resample_section_adaptively_relaxed_vectorized])
     elif builder.options.morphology.resampling_method == \
             nmv.enums.Skeleton.Resampling.ADAPTIVE_PACKED:
         nmv.logger.detail('Packed (or Overlapping) Adaptive Resampling')
         nmv.skeleton.ops.apply_operation_to_morphology(
-            *[builder.morphology, nmv.skeleton.ops.resample_section_adaptively])
+            *[builder.morphology, nmv.skeleton.ops.resample_section_adaptively_vectorized])
     elif builder.options.morphology.resampling_method == \
             nmv.enums.Skeleton.Resampling.FIXED_STEP:
         nmv.logger.detail('Fixed Step Resampling with step of [%f] um' %
                           builder.options.morphology.resampling_step)
         nmv.skeleton.ops.apply_operation_to_morphology(
-            *[builder.morphology, nmv.skeleton.ops.resample_section_at_fixed_step,
+            *[builder.morphology, nmv.skeleton.ops.resample_section_at_fixed_step_vectorized,
               builder.options.morphology.resampling_step])
     else:
         pass
 
 
+####################################################################################################
+# @get_arbor_samples
+####################################################################################################
+def get_arbor_samples(root,
+                      max_branching_level=nmv.consts.Math.INFINITY):
+    """Gets the samples of an arbor up to a given branching level, section by section in the depth
+    first order of the drawing.
+
+    :param root:
+        The root section of the arbor.
+    :param max_branching_level:
+        The maximum branching level given by the user.
+    :return:
+        A list of the samples of the arbor.
+    """
+
+    samples = list()
+    sections = [[root, 1]]
+    while len(sections) > 0:
+        section, branching_level = sections.pop()
+
+        # Stop at the maximum branching level
+        if section is None or branching_level > max_branching_level:
+            continue
+        samples.extend(section.samples)
+
+        # Visit the children in their order
+        sections.extend([child, branching_level + 1] for child in reversed(section.children))
+    return samples
+
+
+####################################################################################################
+# @draw_arbors_samples_as_spheres
+####################################################################################################
+def draw_arbors_samples_as_spheres(builder,
+                                   alternate_materials=False,
+                                   name='samples'):
+    """Draws the samples of the arbors of the morphology as spheres in a single mesh object, where
+    the color of every arbor is assigned to its spheres per face with material indices.
+
+    :param builder:
+        A given skeleton builder.
+    :param alternate_materials:
+        Alternate the two materials of every arbor from one sample to the next, otherwise use the
+        first material only.
+    :param name:
+        The name of the mesh object.
+    :return:
+        A reference to the mesh object, or None if the arbors have no samples.
+    """
+
+    # The drawn arbors: a list of roots, the maximum branching level and the materials
+    morphology_options = builder.options.morphology
+    arbors = list()
+    if not morphology_options.ignore_apical_dendrite and \
+            builder.morphology.apical_dendrite is not None:
+        arbors.append([[builder.morphology.apical_dendrite],
+                       morphology_options.apical_dendrite_branch_order,
+                       builder.apical_dendrite_materials])
+    if not morphology_options.ignore_basal_dendrites and builder.morphology.dendrites is not None:
+        arbors.append([builder.morphology.dendrites,
+                       morphology_options.basal_dendrites_branch_order,
+                       builder.basal_dendrites_materials])
+    if not morphology_options.ignore_axon and builder.morphology.axon is not None:
+        arbors.append([[builder.morphology.axon],
+                       morphology_options.axon_branch_order,
+                       builder.axon_materials])
+
+    # The centers, the radii and the material indices of all the spheres
+    centers = list()
+    radii = list()
+    materials = list()
+    materials_indices = list()
+    for roots, max_branching_level, arbor_materials in arbors:
+        samples = [sample for root in roots
+                   for sample in get_arbor_samples(root, max_branching_level)]
+        centers.extend(sample.point[:] for sample in samples)
+        radii.extend(sample.radius for sample in samples)
+        if alternate_materials:
+            materials_indices.extend(len(materials) + i % len(arbor_materials)
+                                     for i in range(len(samples)))
+        else:
+            materials_indices.extend([len(materials)] * len(samples))
+        materials.extend(arbor_materials)
+
+    if len(centers) == 0:
+        return None
+
+    # Draw all the spheres in a single mesh
+    nmv.logger.detail('%d spheres' % len(centers))
+    return nmv.mesh.create_instanced_spheres(
+        centers=centers, radii=radii, subdivisions=3, materials=materials,
+        materials_indices=materials_indices, name=name)
+
+
 ####################################################################################################
 # @draw_soma_sphere
 ####################################################################################################
@@ -39,7 +39,8 @@ class SamplesBuilder:
     """Builds and draws the morphology as a series of samples where each sample is represented by
     a sphere.
 
-    NOTE: We use bmeshes to generate the spheres and then link them to the scene all at once.
+    NOTE: The spheres of all the samples are tiled from a single template sphere into a single mesh
+    that is linked to the scene at once.
     """
 
     ################################################################################################
@@ -55,7 +56,7 @@ class SamplesBuilder:
         """
 
         # Morphology
-        self.morphology = copy.deepcopy(morphology)
+        self.morphology = morphology.clone()
 
         # System options
         self.options = copy.deepcopy(options)
@@ -108,113 +109,6 @@ class SamplesBuilder:
         # Index: 6 - 7
         self.skeleton_materials.extend(self.axon_materials)
 
-    ################################################################################################
-    # @draw_section_samples_as_spheres
-    ################################################################################################
-    def draw_section_samples_as_spheres(self,
-                                        section):
-        """Draw the section samples as a set of spheres.
-
-        :param section:
-            A given section to draw.
-        :return:
-            List of spheres of the section.
-        """
-        output = list()
-        for sample in section.samples:
-            sphere = nmv.bmeshi.create_ico_sphere(
-                radius=sample.radius, location=sample.point, subdivisions=3)
-            output.append(sphere)
-        return output
-
-    ################################################################################################
-    # @draw_sections_as_spheres
-    ################################################################################################
-    def draw_sections_as_spheres(self,
-                                 root,
-                                 name,
-                                 material_list=[],
-                                 sphere_objects=[],
-                                 branching_level=0,
-                                 max_branching_level=nmv.consts.Math.INFINITY):
-        """Draw the section as a list of spheres.
-
-        :param root:
-            Root section of the tree to be drawn.
-        :param name:
-            Prefix for labeling the spheres.
-        :param material_list:
-            A list of materials specific to the type of arbor being drawn.
-        :param sphere_objects:
-            A list of the drawn spheres.
-         :param branching_level:
-            Current branching level of the arbor.
-        :param max_branching_level:
-            The maximum branching level given by the user.
-        :return:
-        """
-
-        # Ignore the drawing if the root section is None
-        if root is None:
-            return
-
-        # Increment the branching level
-        branching_level += 1
-
-        # Stop drawing at the maximum branching level
-        if branching_level > max_branching_level:
-            return
-
-        # Make sure that the arbor exist
-        if root is not None:
-
-            section_name = '%s_%d' % (name, root.id)
-            drawn_spheres = self.draw_section_samples_as_spheres(root)
-
-            # Add the drawn segments to the 'segments_objects'
-            sphere_objects.extend(drawn_spheres)
-
-            # Draw the children sections
-            for child in root.children:
-                self.draw_sections_as_spheres(
-                    root=child,
-                    branching_level=branching_level,
-                    max_branching_level=max_branching_level,
-                    name=name,
-                    material_list=material_list,
-                    sphere_objects=sphere_objects)
-
-    ################################################################################################
-    # @link_and_shade_spheres
-    ################################################################################################
-    def link_and_shade_spheres(self,
-                               sphere_list,
-                               materials_list,
-                               prefix):
-        """Links the added sphere to the scene.
-
-        :param sphere_list:
-            A list of sphere to be linked to the scene and shaded with the corresponding materials.
-        :param materials_list:
-            A list of materials to be applied to the spheres after being linked to the scene.
-        :param prefix:
-            Prefix to name each sphere object after linking it to the scene.
-        """
-
-        joint_bmesh = nmv.bmeshi.join_bmeshes_list(bmeshes_list=sphere_list)
-
-        # Link the bmesh spheres to the scene
-        sphere_mesh = nmv.bmeshi.ops.link_to_new_object_in_scene(joint_bmesh, prefix)
-
-        # Smooth shading
-        nmv.mesh.shade_smooth_object(sphere_mesh)
-
-        # Assign the material
-        nmv.shading.set_material_to_object(sphere_mesh, materials_list[0])
-
-        # Append the sphere mesh to the morphology objects
-        self.morphology_objects.append(sphere_mesh)
-
     ################################################################################################
     # @draw_morphology_skeleton
     ################################################################################################
@@ -236,58 +130,12 @@ class SamplesBuilder:
         # Resample the sections of the morphology skeleton
         nmv.builders.skeleton.resample_skeleton_sections(builder=self)
 
-        # Apical dendrite
+        # Draw the samples of all the arbors as spheres in a single mesh object
         nmv.logger.info('Constructing spheres')
-        if not self.options.morphology.ignore_apical_dendrite:
-            if self.morphology.apical_dendrite is not None:
-                nmv.logger.detail('Apical dendrite')
-                apical_dendrite_spheres = list()
-                self.draw_sections_as_spheres(
-                    self.morphology.apical_dendrite,
-                    name=nmv.consts.Arbors.APICAL_DENDRITES_PREFIX,
-                    max_branching_level=self.options.morphology.apical_dendrite_branch_order,
-                    material_list=self.apical_dendrite_materials,
-                    sphere_objects=apical_dendrite_spheres)
-
-                # Link the spheres and shade
-                self.link_and_shade_spheres(sphere_list=apical_dendrite_spheres,
-                                            materials_list=self.apical_dendrite_materials,
-                                            prefix=nmv.consts.Arbors.APICAL_DENDRITES_PREFIX)
-
-        # Axon
-        if not self.options.morphology.ignore_axon:
-            if self.morphology.axon is not None:
-                nmv.logger.detail('Axon')
-                axon_spheres = list()
-                self.draw_sections_as_spheres(
-                    self.morphology.axon,
-                    name=nmv.consts.Arbors.AXON_PREFIX,
-                    max_branching_level=self.options.morphology.axon_branch_order,
-                    material_list=self.axon_materials,
-                    sphere_objects=axon_spheres)
-
-                # Link the spheres and shade
-                self.link_and_shade_spheres(sphere_list=axon_spheres,
-                                            materials_list=self.axon_materials,
-                                            prefix=nmv.consts.Arbors.AXON_PREFIX)
-
-        # Basal dendrites
-        if not self.options.morphology.ignore_basal_dendrites:
-            if self.morphology.dendrites is not None:
-                for i, basal_dendrite in enumerate(self.morphology.dendrites):
-                    nmv.logger.detail('Basal dendrite [%d]' % i)
-                    dendrite_name = '%s_%d' % (nmv.consts.Arbors.BASAL_DENDRITES_PREFIX, i)
-                    basal_dendrites_spheres = list()
-                    self.draw_sections_as_spheres(
-                        basal_dendrite, name=dendrite_name,
-                        max_branching_level=self.options.morphology.basal_dendrites_branch_order,
-                        material_list=self.basal_dendrites_materials,
-                        sphere_objects=basal_dendrites_spheres)
-
-                    # Link the spheres and shade
-                    self.link_and_shade_spheres(sphere_list=basal_dendrites_spheres,
-                                                materials_list=self.basal_dendrites_materials,
-                                                prefix=dendrite_name)
+        spheres_object = nmv.builders.skeleton.draw_arbors_samples_as_spheres(builder=self)
+        if spheres_object is not None:
+            self.morphology_objects.append(spheres_object)
+
         # Draw the soma
         nmv.builders.skeleton.draw_soma(builder=self)
 
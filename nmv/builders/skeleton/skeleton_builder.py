@@ -30,6 +30,7 @@ import nmv.file
 import nmv.builders
 import nmv.geometry
 import nmv.mesh
+import nmv.rendering
 import nmv.scene
 import nmv.shading
 import nmv.skeleton
@@ -56,7 +57,7 @@ class SkeletonBuilder:
         """
 
         # Morphology
-        self.morphology = copy.deepcopy(morphology)
+        self.morphology = morphology.clone()
 
         # All the options of the project (an instance of MeshyOptions)
         self.options = options
@@ -134,25 +135,6 @@ class SkeletonBuilder:
         # Create an illumination specific for the given material
         nmv.shading.create_material_specific_illumination(self.options.morphology.material)
 
-    ################################################################################################
-    # @draw_section_samples_as_spheres
-    ################################################################################################
-    @staticmethod
-    def draw_section_samples_as_spheres(section):
-        """Draw the section samples as a set of spheres.
-
-        :param section:
-            A given section to draw.
-        :return:
-            List of spheres of the section.
-        """
-        output = list()
-        for sample in section.samples:
-            sphere = nmv.bmeshi.create_ico_sphere(radius=sample.radius, location=sample.point,
-                                                  subdivisions=3)
-            output.append(sphere)
-        return output
-
     ################################################################################################
     # @draw_soma_sphere
     ################################################################################################
@@ -279,58 +261,6 @@ class SkeletonBuilder:
                     child, sphere_objects=sphere_objects, material_list=material_list,
                     branching_level=branching_level, max_branching_level=max_branching_level)
 
-    ################################################################################################
-    # @draw_sections_as_spheres
-    ################################################################################################
-    def draw_sections_as_spheres(self,
-                                 root,
-                                 name,
-                                 material_list=[],
-                                 segments_objects=[],
-                                 branching_level=0,
-                                 max_branching_level=nmv.consts.Math.INFINITY):
-        """Draw the section as a list of spheres.
-
-        :param root:
-        :param name:
-        :param material_list:
-        :param segments_objects:
-        :param branching_level:
-        :param max_branching_level:
-        :param bevel_object:
-        :return:
-        """
-
-        # Ignore the drawing if the root section is None
-        if root is None:
-            return
-
-        # Increment the branching level
-        branching_level += 1
-
-        # Stop drawing at the maximum branching level
-        if branching_level > max_branching_level:
-            return
-
-        # Make sure that the arbor exist
-        if root is not None:
-
-            section_name = '%s_%d' % (name, root.id)
-            drawn_spheres = self.draw_section_samples_as_spheres(root)
-
-            # Add the drawn segments to the 'segments_objects'
-            segments_objects.extend(drawn_spheres)
-
-            # Draw the children sections
-            for child in root.children:
-                self.draw_sections_as_spheres(
-                    root=child,
-                    branching_level=branching_level,
-                    max_branching_level=max_branching_level,
-                    name=name,
-                    material_list=material_list,
-                    segments_objects=segments_objects)
-
     ################################################################################################
     # @draw_section_as_disconnected_segments
     ################################################################################################
@@ -512,105 +442,22 @@ class SkeletonBuilder:
     # @draw_morphology_as_spheres
     ################################################################################################
     def draw_morphology_as_spheres(self):
-        """Draws the morphology as a set of spheres.
+        """Draws the morphology as a set of spheres, a sphere per sample, all in a single mesh.
 
         :return:
             A list of spheres.
         """
 
-        # Morphology objects
-        morphology_objects = list()
+        # Remove the samples and sections that are invisible at the resolution of the image
+        self.simplify_morphology_for_rendering()
 
-        # Draw the axon
-        if not self.options.morphology.ignore_axon:
-            if self.morphology.axon is not None:
-                nmv.logger.info('Axon')
-
-                axon_segments_objects = []
-                self.draw_sections_as_spheres(
-                    self.morphology.axon,
-                    name=nmv.consts.Arbors.AXON_PREFIX,
-                    max_branching_level=self.options.morphology.axon_branch_order,
-                    material_list=self.axon_materials,
-                    segments_objects=axon_segments_objects)
-
-                # Convert the objects to something and add them to the scene
-                for i, item in enumerate(axon_segments_objects):
-                    sphere_mesh = nmv.bmeshi.ops.link_to_new_object_in_scene(
-                        item, '%s_%d' % ('axon', i))
-
-                    # Smooth shading
-                    nmv.mesh.shade_smooth_object(sphere_mesh)
-
-                    # Assign the material
-                    nmv.shading.set_material_to_object(sphere_mesh, self.axon_materials[i % 2])
-
-                    # Append the sphere mesh to the morphology objects
-                    morphology_objects.append(sphere_mesh)
-
-        # Draw the basal dendrites
-        if not self.options.morphology.ignore_basal_dendrites:
-
-            # Ensure tha existence of basal dendrites
-            if self.morphology.dendrites is not None:
-                basal_dendrites_segments_objects = []
-
-                for i, basal_dendrite in enumerate(self.morphology.dendrites):
-                    nmv.logger.info('Basal dendrite [%d]' % i)
-                    dendrite_name = '%s_%d' % (nmv.consts.Arbors.BASAL_DENDRITES_PREFIX, i)
-                    self.draw_sections_as_spheres(
-                        basal_dendrite, name=dendrite_name,
-                        max_branching_level=self.options.morphology.basal_dendrites_branch_order,
-                        material_list=self.basal_dendrites_materials,
-                        segments_objects=basal_dendrites_segments_objects)
-
-                # Convert the objects to something and add them to the scene
-                for i, item in enumerate(basal_dendrites_segments_objects):
-                    sphere_mesh = nmv.bmeshi.ops.link_to_new_object_in_scene(
-                        item, '%s_%d' % ('basal_dendrite', i))
-
-                    # Smooth shading
-                    nmv.mesh.shade_smooth_object(sphere_mesh)
-
-                    # Assign the material
-                    nmv.shading.set_material_to_object(sphere_mesh,
-                                                       self.basal_dendrites_materials[i % 2])
-
-                    # Append the sphere mesh to the morphology objects
-                    morphology_objects.append(sphere_mesh)
-
-        # Draw the apical dendrite
-        if not self.options.morphology.ignore_apical_dendrite:
-
-            # Draw the apical dendrite, if exists
-            if self.morphology.apical_dendrite is not None:
-                nmv.logger.info('Apical dendrite')
-
-                apical_dendrite_segments_objects = []
-                self.draw_sections_as_spheres(
-                    self.morphology.apical_dendrite,
-                    name=nmv.consts.Arbors.APICAL_DENDRITES_PREFIX,
-                    max_branching_level=self.options.morphology.apical_dendrite_branch_order,
-                    material_list=self.apical_dendrite_materials,
-                    segments_objects=apical_dendrite_segments_objects)
-
-                # Convert the objects to something and add them to the scene
-                for i, item in enumerate(apical_dendrite_segments_objects):
-                    sphere_mesh = nmv.bmeshi.ops.link_to_new_object_in_scene(
-                        item, '%s_%d' % ('apical_dendrite', i))
-
-                    # Smooth shading
-                    nmv.mesh.shade_smooth_object(sphere_mesh)
-
-                    # Assign the material
-                    nmv.shading.set_material_to_object(sphere_mesh,
-                                                       self.apical_dendrite_materials[i % 2])
-
-                    # Append the sphere mesh to the morphology objects
-                    morphology_objects.append(sphere_mesh)
+        # Draw the samples of all the arbors in a single mesh object
+        nmv.logger.info('Samples')
+        spheres_object = nmv.builders.skeleton.draw_arbors_samples_as_spheres(
+            builder=self, alternate_materials=True)
 
         # Return a list of the morphology objects
-        return morphology_objects
+        return [] if spheres_object is None else [spheres_object]
 
     ################################################################################################
     # @draw_morphology_as_disconnected_segments
@@ -625,6 +472,9 @@ class SkeletonBuilder:
             A list of all the drawn objects
         """
 
+        # Remove the samples and sections that are invisible at the resolution of the image
+        self.simplify_morphology_for_rendering()
+
         # A list of objects (references to drawn segments) that compose the morphology
         morphology_objects = []
 
@@ -696,15 +546,17 @@ class SkeletonBuilder:
         if self.options.morphology.resampling_method == \
                 nmv.enums.Skeleton.Resampling.ADAPTIVE_RELAXED:
             nmv.skeleton.ops.apply_operation_to_morphology(
-                *[self.morphology, nmv.skeleton.ops.resample_section_adaptively])
+                *[self.morphology, nmv.skeleton.ops.resample_section_adaptively_vectorized])
         elif self.options.morphology.resampling_method == \
                 nmv.enums.Skeleton.Resampling.FIXED_STEP:
             nmv.skeleton.ops.apply_operation_to_morphology(
-                *[self.morphology, nmv.skeleton.ops.resample_section_at_fixed_step,
+                *[self.morphology, nmv.skeleton.ops.resample_section_at_fixed_step_vectorized,
                   self.options.morphology.resampling_step])
         else:
             pass
 
+        # Remove the samples and sections that are invisible at the resolution of the image
+        self.simplify_morphology_for_rendering()
 
         # A list of objects (references to drawn segments) that compose the morphology
         morphology_objects = []
@@ -866,7 +718,10 @@ class SkeletonBuilder:
 
             # The adaptive resampling is quite important to prevent breaking the structure
             nmv.skeleton.ops.apply_operation_to_morphology(
-                *[self.morphology, nmv.skeleton.ops.resample_section_adaptively])
+                *[self.morphology, nmv.skeleton.ops.resample_section_adaptively_vectorized])
+
+        # Remove the samples and sections that are invisible at the resolution of the image
+        self.simplify_morphology_for_rendering()
 
         # Verify the connectivity of the arbors of the morphology to the soma
         nmv.skeleton.ops.update_arbors_connection_to_soma(morphology=self.morphology)
@@ -924,7 +779,7 @@ class SkeletonBuilder:
                 # Draw the apical dendrite as a set connected sections
                 apical_dendrite_sections_objects = []
                 nmv.skeleton.ops.draw_connected_sections(
-                    section=copy.deepcopy(self.morphology.apical_dendrite),
+                    section=self.morphology.apical_dendrite.clone(),
                     max_branching_level=self.options.morphology.apical_dendrite_branch_order,
                     name=nmv.consts.Arbors.APICAL_DENDRITES_PREFIX,
                     material_list=self.apical_dendrite_materials,
@@ -950,7 +805,7 @@ class SkeletonBuilder:
                 # Draw the axon as a set connected sections
                 axon_sections_objects = []
                 nmv.skeleton.ops.draw_connected_sections(
-                    section=copy.deepcopy(self.morphology.axon),
+                    section=self.morphology.axon.clone(),
                     max_branching_level=self.options.morphology.axon_branch_order,
                     name=nmv.consts.Arbors.AXON_PREFIX, material_list=self.axon_materials,
                     bevel_object=bevel_object,
@@ -993,7 +848,10 @@ class SkeletonBuilder:
 
             # The adaptive resampling is quite important to prevent breaking the structure
             nmv.skeleton.ops.apply_operation_to_morphology(
-                *[self.morphology, nmv.skeleton.ops.resample_section_adaptively])
+                *[self.morphology, nmv.skeleton.ops.resample_section_adaptively_vectorized])
+
+        # Remove the samples and sections that are invisible at the resolution of the image
+        self.simplify_morphology_for_rendering()
 
         # Verify the connectivity of the arbors of the morphology to the soma
         nmv.skeleton.ops.update_arbors_connection_to_soma(morphology=self.morphology)
@@ -1027,7 +885,7 @@ class SkeletonBuilder:
 
                 # Build the arbor as a single object
                 nmv.skeleton.ops.build_arbor_as_single_object(
-                    section=copy.deepcopy(self.morphology.axon),
+                    section=self.morphology.axon.clone(),
                     name=nmv.consts.Arbors.AXON_PREFIX,
                     poly_line_data=arbor_poly_line_data,
                     poly_lines_data=morphology_poly_lines_data,
@@ -1069,7 +927,7 @@ class SkeletonBuilder:
 
                 # Build the arbor as a single object
                 nmv.skeleton.ops.build_arbor_as_single_object(
-                    section=copy.deepcopy(self.morphology.apical_dendrite),
+                    section=self.morphology.apical_dendrite.clone(),
                     name=nmv.consts.Arbors.APICAL_DENDRITES_PREFIX,
                     poly_line_data=arbor_poly_line_data,
                     poly_lines_data=morphology_poly_lines_data,
@@ -1115,6 +973,9 @@ class SkeletonBuilder:
             # Repair the short sections
             # morphology_repair_ops.repair_short_sections_of_morphology(self.morphology)
 
+        # Remove the samples and sections that are invisible at the resolution of the image
+        self.simplify_morphology_for_rendering()
+
         # Verify the connectivity of the arbors of the morphology to the soma
         nmv.skeleton.ops.update_arbors_connection_to_soma(self.morphology)
 
@@ -1140,7 +1001,7 @@ class SkeletonBuilder:
         if not self.options.morphology.ignore_axon:
             axon_sections_objects = []
             nmv.skeleton.ops.draw_connected_sections(
-                section=copy.deepcopy(self.morphology.axon),
+                section=self.morphology.axon.clone(),
                 max_branching_level=self.options.morphology.axon_branch_order,
                 name=nmv.consts.Arbors.AXON_PREFIX,
                 material_list=self.axon_materials,
@@ -1190,7 +1051,7 @@ class SkeletonBuilder:
         if not self.options.morphology.ignore_apical_dendrite:
             apical_dendrite_sections_objects = []
             nmv.skeleton.ops.draw_connected_sections(
-                section=copy.deepcopy(self.morphology.apical_dendrite),
+                section=self.morphology.apical_dendrite.clone(),
                 max_branching_level=self.options.morphology.apical_dendrite_branch_order,
                 name=nmv.consts.Arbors.APICAL_DENDRITES_PREFIX,
                 material_list=self.apical_dendrite_materials,
@@ -1236,6 +1097,55 @@ class SkeletonBuilder:
                 soma_mesh=None, arbors_list=arbors, blue_config=self.options.morphology.blue_config,
                 gid=self.options.morphology.gid)
 
+    ################################################################################################
+    # @simplify_morphology_for_rendering
+    ################################################################################################
+    def simplify_morphology_for_rendering(self):
+        """Simplifies the morphology for the resolution of the rendered wide-shot image, where the
+        samples and sub-trees that are smaller than the level of detail threshold in pixels are
+        removed. It must be called after the skeleton is resampled or repaired, which would insert
+        the removed samples again, and before it is drawn.
+        """
+
+        # The level of detail is only valid for the whole morphology, other views are zoomed in
+        if self.options.morphology.lod_pixel_threshold <= 0.0 or \
+                self.options.morphology.rendering_view != \
+                nmv.enums.Skeleton.Rendering.View.WIDE_SHOT_VIEW:
+            return
+
+        # The rendered image is framed to the bounding box of the whole morphology
+        bounding_box = nmv.skeleton.compute_full_morphology_bounding_box(
+            morphology=self.morphology)
+
+        # The size of a pixel for the fixed resolution or the scale of the image
+        camera_view = nmv.enums.Camera.View.FRONT
+        if self.options.morphology.resolution_basis == \
+                nmv.enums.Skeleton.Rendering.Resolution.FIXED_RESOLUTION:
+            pixel_size = nmv.rendering.Camera.get_pixel_size(
+                bounding_box=bounding_box, camera_view=camera_view,
+                image_resolution=self.options.morphology.full_view_resolution)
+        else:
+            pixel_size = nmv.rendering.Camera.get_pixel_size(
+                bounding_box=bounding_box, camera_view=camera_view,
+                scale_factor=self.options.morphology.resolution_scale_factor)
+
+        # The 360 and progressive sequences see the skeleton from different directions, then
+        # use the actual distances that are valid for all the views
+        view_direction = None
+        if not self.options.morphology.render_360 and \
+                not self.options.morphology.render_progressive:
+            view_direction = nmv.rendering.Camera.get_view_direction(
+                bounding_box=bounding_box, camera_view=camera_view)
+
+        # Simplify the morphology
+        number_removed_sections, number_removed_samples = \
+            nmv.skeleton.ops.simplify_morphology_for_pixel_size(
+                morphology=self.morphology, pixel_size=pixel_size,
+                pixel_threshold=self.options.morphology.lod_pixel_threshold,
+                view_direction=view_direction)
+        nmv.logger.info('Level of detail: removed [%d] sections and [%d] samples' %
+                        (number_removed_sections, number_removed_samples))
+
     ################################################################################################
     # @draw_morphology_skeleton
     ################################################################################################
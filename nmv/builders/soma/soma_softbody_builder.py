@@ -20,6 +20,7 @@ import random
 
 # Blender imports
 import bpy
+import bmesh
 
 import nmv
 import nmv.bmeshi
@@ -42,6 +43,10 @@ class SomaSoftBodyBuilder:
     Blender.
     """
 
+    # The geometry of the last reconstructed soma mesh, reused if the option
+    # reuse_reconstructed_mesh is set, [key, vertices, faces]
+    reconstructed_mesh_geometry = None
+
     ################################################################################################
     # @__init__
     ################################################################################################
@@ -935,6 +940,98 @@ class SomaSoftBodyBuilder:
         # Return the reconstructed soma object
         return soma_mesh
 
+    ################################################################################################
+    # @get_reconstructed_soma_mesh_key
+    ################################################################################################
+    def get_reconstructed_soma_mesh_key(self):
+        """Gets a key that identifies the soft body soma mesh of the morphology with the current
+        options, such that the mesh is only reused if it is going to be identical.
+
+        :return:
+            A tuple of the morphology and soma parameters that control the reconstruction.
+        """
+
+        return (self.morphology.label,
+                tuple(self.morphology.soma.centroid),
+                self.morphology.soma.mean_radius,
+                self.options.soma.radius_scale_factor,
+                self.options.soma.stiffness,
+                self.options.soma.subdivision_level,
+                self.options.soma.simulation_steps,
+                self.options.soma.full_volume_extrusion,
+                self.options.morphology.ignore_axon,
+                self.options.morphology.ignore_basal_dendrites,
+                self.options.morphology.ignore_apical_dendrite,
+                self.options.morphology.axon_branch_order > 0,
+                self.options.morphology.basal_dendrites_branch_order > 0,
+                self.options.morphology.apical_dendrite_branch_order > 0)
+
+    ################################################################################################
+    # @save_reconstructed_soma_mesh
+    ################################################################################################
+    def save_reconstructed_soma_mesh(self,
+                                     soma_mesh):
+        """Keeps the geometry of a reconstructed soma mesh to reuse it for the same morphology.
+
+        :param soma_mesh:
+            A reference to the reconstructed soma mesh.
+        """
+
+        vertices = [vertex.co[:] for vertex in soma_mesh.data.vertices]
+        faces = [polygon.vertices[:] for polygon in soma_mesh.data.polygons]
+        SomaSoftBodyBuilder.reconstructed_mesh_geometry = \
+            [self.get_reconstructed_soma_mesh_key(), vertices, faces]
+
+    ################################################################################################
+    # @load_reconstructed_soma_mesh
+    ################################################################################################
+    def load_reconstructed_soma_mesh(self,
+                                     apply_shader=True):
+        """Creates the soma mesh from the geometry of a previously reconstructed soma mesh of the
+        same morphology without running the soft body simulation.
+
+        :param apply_shader:
+            Apply the given soma shader in the configuration.
+        :return:
+            A reference to the soma mesh, or None if there is no soma mesh to reuse.
+        """
+
+        # Verify that the saved geometry belongs to this morphology and options
+        geometry = SomaSoftBodyBuilder.reconstructed_mesh_geometry
+        if geometry is None or geometry[0] != self.get_reconstructed_soma_mesh_key():
+            return None
+
+        # Log
+        nmv.logger.header('Reusing the reconstructed soma mesh')
+
+        # Build the soma bmesh from the saved geometry
+        soma_bmesh = bmesh.new()
+        bmesh_vertices = [soma_bmesh.verts.new(vertex) for vertex in geometry[1]]
+        for face in geometry[2]:
+            soma_bmesh.faces.new([bmesh_vertices[i] for i in face])
+
+        # Link the soma to the scene
+        soma_mesh = nmv.bmeshi.ops.link_to_new_object_in_scene(soma_bmesh, 'soma')
+
+        # Smoothing the soma via shade smoothing
+        nmv.mesh.ops.shade_smooth_object(soma_mesh)
+
+        # Apply the soma shader
+        if apply_shader:
+
+            # Create the soma material and assign it to the soma
+            soma_material = nmv.shading.create_material(
+                name='soma', color=self.options.soma.soma_color,
+                material_type=self.options.soma.soma_material)
+            nmv.shading.set_material_to_object(
+                mesh_object=soma_mesh, material_reference=soma_material)
+
+            # Create an illumination specific for the given material
+            nmv.shading.create_material_specific_illumination(self.options.soma.soma_material)
+
+        # Return a reference to the soma mesh
+        return soma_mesh
+
     ################################################################################################
     # @reconstruct_soma_mesh
     ################################################################################################
@@ -950,6 +1047,12 @@ class SomaSoftBodyBuilder:
             A reference to the reconstructed mesh of the soma.
         """
 
+        # Reuse the soma mesh that was reconstructed before for the same morphology, if possible
+        if self.options.soma.reuse_reconstructed_mesh:
+            soma_mesh = self.load_reconstructed_soma_mesh(apply_shader=apply_shader)
+            if soma_mesh is not None:
+                return soma_mesh
+
         # Build the soft body of the soma
         soma_soft_body = self.build_soma_soft_body(apply_shader=apply_shader)
 
@@ -974,6 +1077,10 @@ class SomaSoftBodyBuilder:
         # Add noise to the soma surface to make it more realistic
         self.add_noise_to_soma_surface(reconstructed_soma_mesh)
 
+        # Keep the geometry of the reconstructed soma to reuse it later
+        if self.options.soma.reuse_reconstructed_mesh:
+            self.save_reconstructed_soma_mesh(reconstructed_soma_mesh)
+
         # Return a reference to the reconstructed soma
         return reconstructed_soma_mesh
 
@@ -52,3 +52,6 @@ class Image:
 
     # Default value for the image scale factor
     DEFAULT_IMAGE_SCALE_FACTOR = 1.0
+
+    # The resolution of the figures of the analysis distributions
+    ANALYSIS_FIGURES_DPI = 600
@@ -43,3 +43,18 @@ class Morphology:
 
     # The scale factor of the radius of the last sample along a branch
     LAST_SAMPLE_RADIUS_SCALE_FACTOR = 0.5
+
+    # The extension of the files in the morphology cache
+    CACHE_EXTENSION = '.npz'
+
+    # The extension of the temporary files that are written before they are moved into the cache
+    CACHE_TEMPORARY_EXTENSION = '.npz.tmp'
+
+    # The age in seconds after which a temporary file in the cache is considered orphaned
+    CACHE_TEMPORARY_FILE_TIMEOUT = 3600
+
+    # The version of the morphology cache format, entries of other versions are ignored
+    CACHE_VERSION = 1
+
+    # The default maximum size of the morphology cache in bytes (1 GB)
+    DEFAULT_CACHE_SIZE = 1024 * 1024 * 1024
@@ -62,6 +62,15 @@ class Paths:
     # The folder where SLURM log files will be generated
     SLURM_LOGS_FOLDER = '%s/logs' % SLURM_FOLDER
 
+    # The folder where the scripts of the tasks of SLURM job arrays will be generated
+    SLURM_ARRAY_TASKS_FOLDER = '%s/array-tasks' % SLURM_JOBS_FOLDER
+
+    # The log of the submitted SLURM jobs and their IDs
+    SLURM_SUBMISSION_LOG = '%s/submissions.log' % SLURM_FOLDER
+
+    # The folder where the log files of the local jobs will be generated
+    LOGS_FOLDER = 'logs'
+
     # Keep a reference to the current directory
     current_directory = os.path.dirname(os.path.realpath(__file__))
 
@@ -17,14 +17,23 @@
 
 # System imports
 import copy
+import numpy
+
+# Blender imports
+from mathutils import Vector
 
 # Internal modules
 import nmv
+import nmv.analysis
 import nmv.bmeshi
 import nmv.mesh
 import nmv.scene
 
 
+# Build the skeleton mesh and read its coordinates back in bulk, otherwise vertex by vertex
+BULK_SKELETON_EDITING = True
+
+
 ####################################################################################################
 # @MorphologyGlobalEditor
 ####################################################################################################
@@ -247,6 +256,90 @@ class MorphologyEditor:
             nmv.logger.info('Axon')
             self.extrude_arbor(arbor=self.morphology.axon)
 
+    ################################################################################################
+    # @get_arbors
+    ################################################################################################
+    def get_arbors(self):
+        """Gets the arbors of the morphology in the order of the samples indices.
+        :return:
+            A list of the arbors, the apical dendrite, the basal dendrites and then the axon.
+        """
+
+        # Apical dendrite
+        arbors = list()
+        if self.morphology.apical_dendrite is not None:
+            arbors.append(self.morphology.apical_dendrite)
+
+        # Basal dendrites
+        if self.morphology.dendrites is not None:
+            arbors.extend(self.morphology.dendrites)
+
+        # Axon
+        if self.morphology.axon is not None:
+            arbors.append(self.morphology.axon)
+
+        # Return the list
+        return arbors
+
+    ################################################################################################
+    # @get_skeleton_samples_and_edges
+    ################################################################################################
+    def get_skeleton_samples_and_edges(self):
+        """Gets all the samples of the morphology and the edges of the skeleton mesh between them,
+        where every sample is represented by the vertex of index sample.morphology_idx.
+        :return:
+            A list of all the samples and a list of the edges as pairs of vertex indices.
+        """
+
+        # All the samples and edges
+        samples = list()
+        edges = list()
+
+        # Arbor by arbor
+        for arbor in self.get_arbors():
+
+            # The auxiliary segment from the soma center (vertex 0) to the first sample
+            edges.append((0, arbor.samples[0].morphology_idx))
+
+            # Section by section, in the same order of the recursive extrusion
+            sections = [arbor]
+            while sections:
+                section = sections.pop()
+                samples.extend(section.samples)
+                for i in range(len(section.samples) - 1):
+                    edges.append((section.samples[i].morphology_idx,
+                                  section.samples[i + 1].morphology_idx))
+                sections.extend(reversed(section.children))
+
+        # Return the lists
+        return samples, edges
+
+    ################################################################################################
+    # @extrude_morphology_skeleton_in_bulk
+    ################################################################################################
+    def extrude_morphology_skeleton_in_bulk(self):
+        """Creates the skeleton of the morphology as a single mesh object in bulk, where the vertex
+        of every sample is located at the index sample.morphology_idx like in the extruded skeleton.
+        :return:
+            A reference to the created skeleton mesh object.
+        """
+
+        # Header
+        nmv.logger.header('Creating Morphology Skeleton for Repair')
+
+        # Get all the samples and the edges between them
+        samples, edges = self.get_skeleton_samples_and_edges()
+
+        # Place the vertices at the indices of the samples, the vertex 0 is the soma center
+        indices = numpy.array([sample.morphology_idx for sample in samples], dtype=int)
+        vertices = numpy.zeros((indices.max() + 1 if len(indices) > 0 else 1, 3))
+        if len(indices) > 0:
+            vertices[indices] = [[sample.point[0], sample.point[1], sample.point[2]]
+                                 for sample in samples]
+
+        # Create the mesh
+        return nmv.mesh.create_edges_mesh(vertices=vertices, edges=edges, name='Skeleton')
+
     ################################################################################################
     # @sketch_morphology_skeleton
     ################################################################################################
@@ -259,15 +352,22 @@ class MorphologyEditor:
         # Updating the samples indices along the entire morphology
         self.update_samples_indices_per_morphology_of_morphology()
 
-        # Create an initial proxy mesh at the origin (reflecting the soma)
-        # self.skeleton_mesh = nmv.geometry.create_vertex_mesh(name=self.morphology.label)
-        self.skeleton_mesh = nmv.bmeshi.create_vertex()
+        # Create the skeleton mesh with all its vertices and edges at once
+        if BULK_SKELETON_EDITING:
+            self.skeleton_mesh = self.extrude_morphology_skeleton_in_bulk()
+
+        # Or extrude it vertex by vertex
+        else:
+
+            # Create an initial proxy mesh at the origin (reflecting the soma)
+            # self.skeleton_mesh = nmv.geometry.create_vertex_mesh(name=self.morphology.label)
+            self.skeleton_mesh = nmv.bmeshi.create_vertex()
 
-        # Extrude the morphology skeleton
-        self.extrude_morphology_skeleton()
+            # Extrude the morphology skeleton
+            self.extrude_morphology_skeleton()
 
-        # Convert the skeleton to a mesh
-        self.skeleton_mesh = nmv.bmeshi.convert_bmesh_to_mesh(self.skeleton_mesh, 'Skeleton')
+            # Convert the skeleton to a mesh
+            self.skeleton_mesh = nmv.bmeshi.convert_bmesh_to_mesh(self.skeleton_mesh, 'Skeleton')
 
         # Select the skeleton mesh for the edit
         nmv.scene.set_active_object(self.skeleton_mesh)
@@ -307,13 +407,52 @@ class MorphologyEditor:
             self.update_arbor_coordinates(child)
 
     ################################################################################################
-    # @update_arbor_coordinates
+    # @update_skeleton_coordinates_in_bulk
+    ################################################################################################
+    def update_skeleton_coordinates_in_bulk(self):
+        """Updates the coordinates of all the samples of the morphology from the skeleton object,
+        where the coordinates of all the vertices are read at once and scattered to the samples
+        by their sample.morphology_idx.
+        """
+
+        # Read the coordinates of all the vertices at once
+        vertices = self.skeleton_mesh.data.vertices
+        coordinates = numpy.empty(len(vertices) * 3, dtype=numpy.float32)
+        vertices.foreach_get('co', coordinates)
+        coordinates = coordinates.reshape(-1, 3)
+
+        # Get all the samples
+        samples = self.get_skeleton_samples_and_edges()[0]
+        indices = numpy.array([sample.morphology_idx for sample in samples], dtype=int)
+
+        # If vertices were deleted during the edit, the samples cannot be mapped to them
+        if len(indices) > 0 and indices.max() >= len(coordinates):
+            nmv.logger.error('The skeleton has [%d] vertices, expected [%d] at least' %
+                             (len(coordinates), indices.max() + 1))
+            return
+
+        # Scatter the coordinates to the samples
+        for sample, coordinate in zip(samples, coordinates[indices].tolist()):
+            sample.point = Vector(coordinate)
+
+    ################################################################################################
+    # @update_skeleton_coordinates
     ################################################################################################
     def update_skeleton_coordinates(self):
+        """Updates the coordinates of all the samples of the morphology from the skeleton object.
+        """
 
         # Header
         nmv.logger.header('Updating Morphology Skeleton Coordinates')
 
+        # Read all the coordinates at once
+        if BULK_SKELETON_EDITING:
+            self.update_skeleton_coordinates_in_bulk()
+
+            # The analysis data of the morphology are no longer valid
+            nmv.analysis.clear_analysis_cache(morphology=self.morphology)
+            return
+
         # Apical dendrite
         if self.morphology.apical_dendrite is not None:
 
@@ -333,3 +472,6 @@ class MorphologyEditor:
 
             nmv.logger.info('Axon')
             self.update_arbor_coordinates(root=self.morphology.axon)
+
+        # The analysis data of the morphology are no longer valid
+        nmv.analysis.clear_analysis_cache(morphology=self.morphology)
@@ -42,6 +42,22 @@ def clean_and_create_directory(path):
         print('ERROR: cannot create directory %s' % path)
 
 
+####################################################################################################
+# @create_directory
+####################################################################################################
+def create_directory(path):
+    """Creates a new directory if it does not exist, and keeps its contents otherwise.
+
+    :param path :
+        The path of the directory to be created.
+    """
+
+    try:
+        os.makedirs(path, exist_ok=True)
+    except OSError:
+        print('ERROR: cannot create directory %s' % path)
+
+
 ####################################################################################################
 # @get_files_in_directory
 ####################################################################################################
@@ -76,6 +92,28 @@ def get_files_in_directory(directory,
     return files
 
 
+####################################################################################################
+# @get_morphology_files_in_directory
+####################################################################################################
+def get_morphology_files_in_directory(directory):
+    """Gets all the morphology files (.h5 and .swc) in a directory.
+
+    :param directory:
+        Given directory.
+    :return:
+        A sorted list of the morphology files.
+    """
+
+    # A list of all the morphology files that exist in a directory
+    files = list()
+    for i_file in os.listdir(directory):
+        if i_file.lower().endswith('.h5') or i_file.lower().endswith('.swc'):
+            files.append(i_file)
+
+    # Return the sorted list
+    return sorted(files)
+
+
 ####################################################################################################
 # @write_batch_job_string_to_file
 ####################################################################################################
@@ -108,51 +146,66 @@ def write_batch_job_string_to_file(output_directory,
 ####################################################################################################
 # @create_output_tree
 ####################################################################################################
-def create_output_tree(output_directory):
+def create_output_tree(output_directory,
+                       clean=True):
     """Creates the output directories tree.
 
     :param output_directory:
         The path where the project tree will be created.
+    :param clean:
+        If True, the existing directories are removed and created again, otherwise the missing
+        directories are created and the existing results are kept.
     """
 
+    # Remove the existing directories or keep them
+    make_directory = clean_and_create_directory if clean else create_directory
+
     # Output directory
-    clean_and_create_directory(output_directory)
+    make_directory(output_directory)
 
     # SLURM directory
     slurm_directory = '%s/%s' % (output_directory, Paths.SLURM_FOLDER)
-    clean_and_create_directory(slurm_directory)
+    make_directory(slurm_directory)
 
     # SLURM jobs directory
     slurm_jobs_directory = '%s/%s' % (output_directory, Paths.SLURM_JOBS_FOLDER)
-    clean_and_create_directory(slurm_jobs_directory)
+    make_directory(slurm_jobs_directory)
 
     # SLURM logs directory
     slurm_logs_directory = '%s/%s' % (output_directory, Paths.SLURM_LOGS_FOLDER)
-    clean_and_create_directory(slurm_logs_directory)
+    make_directory(slurm_logs_directory)
+
+    # SLURM array tasks directory
+    slurm_array_tasks_directory = '%s/%s' % (output_directory, Paths.SLURM_ARRAY_TASKS_FOLDER)
+    make_directory(slurm_array_tasks_directory)
+
+    # Logs directory
+    logs_directory = '%s/%s' % (output_directory, Paths.LOGS_FOLDER)
+    make_directory(logs_directory)
 
     # Analysis directory
     analysis_directory = '%s/%s' % (output_directory, Paths.ANALYSIS_FOLDER)
-    clean_and_create_directory(analysis_directory)
+    make_directory(analysis_directory)
 
     # Morphologies directory
     meshes_directory = '%s/%s' % (output_directory, Paths.MORPHOLOGIES_FOLDER)
-    clean_and_create_directory(meshes_directory)
+    make_directory(meshes_directory)
 
     # Meshes directory
     meshes_directory = '%s/%s' % (output_directory, Paths.MESHES_FOLDER)
-    clean_and_create_directory(meshes_directory)
+    make_directory(meshes_directory)
 
     # Images directory
     images_directory = '%s/%s' % (output_directory, Paths.IMAGES_FOLDER)
-    clean_and_create_directory(images_directory)
+    make_directory(images_directory)
 
     # Sequences directory
     sequences_directory = '%s/%s' % (output_directory, Paths.SEQUENCES_FOLDER)
-    clean_and_create_directory(sequences_directory)
+    make_directory(sequences_directory)
 
     # Stats directory
     stats_directory = '%s/%s' % (output_directory, Paths.STATS_FOLDER)
-    clean_and_create_directory(stats_directory)
+    make_directory(stats_directory)
 
 
 ####################################################################################################
@@ -15,6 +15,7 @@
 # If not, see <http://www.gnu.org/licenses/>.
 ####################################################################################################
 
+from .circuit import *
 from .mesh import *
 from .morphology import *
 from .nuclei import *
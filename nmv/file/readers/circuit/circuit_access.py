@@ -0,0 +1,645 @@
+####################################################################################################
+# Copyright (c) 2016 - 2019, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+import json
+import math
+
+
+# The circuits that are opened in this process, keyed by their configuration files
+OPENED_CIRCUITS = dict()
+
+
+####################################################################################################
+# @get_transform_from_position_and_orientation
+####################################################################################################
+def get_transform_from_position_and_orientation(position,
+                                                orientation):
+    """Composes the local to global transformation of a neuron from its position and orientation.
+
+    :param position:
+        The [x, y, z] position of the soma of the neuron in the circuit.
+    :param orientation:
+        The [w, x, y, z] unit quaternion of the rotation of the neuron.
+    :return:
+        The 4x4 transformation matrix as a list of rows.
+    """
+
+    w, x, y, z = orientation
+    return [[1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w), position[0]],
+            [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w), position[1]],
+            [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y), position[2]],
+            [0.0, 0.0, 0.0, 1.0]]
+
+
+####################################################################################################
+# @get_orientation_from_transform
+####################################################################################################
+def get_orientation_from_transform(transform):
+    """Gets the orientation of a neuron from the rotation of its local to global transformation.
+
+    :param transform:
+        The 4x4 transformation matrix as a list of rows.
+    :return:
+        The [w, x, y, z] unit quaternion of the rotation.
+    """
+
+    m = transform
+    trace = m[0][0] + m[1][1] + m[2][2]
+    if trace > 0:
+        s = 2.0 * math.sqrt(trace + 1.0)
+        return [0.25 * s, (m[2][1] - m[1][2]) / s, (m[0][2] - m[2][0]) / s,
+                (m[1][0] - m[0][1]) / s]
+    elif m[0][0] > m[1][1] and m[0][0] > m[2][2]:
+        s = 2.0 * math.sqrt(1.0 + m[0][0] - m[1][1] - m[2][2])
+        return [(m[2][1] - m[1][2]) / s, 0.25 * s, (m[0][1] + m[1][0]) / s,
+                (m[0][2] + m[2][0]) / s]
+    elif m[1][1] > m[2][2]:
+        s = 2.0 * math.sqrt(1.0 + m[1][1] - m[0][0] - m[2][2])
+        return [(m[0][2] - m[2][0]) / s, (m[0][1] + m[1][0]) / s, 0.25 * s,
+                (m[1][2] + m[2][1]) / s]
+    s = 2.0 * math.sqrt(1.0 + m[2][2] - m[0][0] - m[1][1])
+    return [(m[1][0] - m[0][1]) / s, (m[0][2] + m[2][0]) / s, (m[1][2] + m[2][1]) / s, 0.25 * s]
+
+
+####################################################################################################
+# @CircuitNeuron
+####################################################################################################
+class CircuitNeuron:
+    """The data of a neuron in a circuit, without its morphology.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 gid,
+                 mtype,
+                 morphology_uri,
+                 transform):
+        """Constructor
+
+        :param gid:
+            The GID of the neuron.
+        :param mtype:
+            The name of the morphological type of the neuron.
+        :param morphology_uri:
+            The path to the morphology file of the neuron.
+        :param transform:
+            The 4x4 local to global transformation matrix of the neuron, as a list of rows.
+        """
+
+        # GID
+        self.gid = gid
+
+        # Morphological type
+        self.mtype = mtype
+
+        # Morphology file
+        self.morphology_uri = morphology_uri
+
+        # Local to global transformation
+        self.transform = transform
+
+    ################################################################################################
+    # @get_position
+    ################################################################################################
+    def get_position(self):
+        """Gets the position of the soma of the neuron in the circuit.
+
+        :return:
+            The [x, y, z] position.
+        """
+
+        return [self.transform[0][3], self.transform[1][3], self.transform[2][3]]
+
+    ################################################################################################
+    # @get_orientation
+    ################################################################################################
+    def get_orientation(self):
+        """Gets the orientation of the neuron in the circuit.
+
+        :return:
+            The [w, x, y, z] unit quaternion of the rotation of the neuron.
+        """
+
+        return get_orientation_from_transform(self.transform)
+
+    ################################################################################################
+    # @get_morphology_label
+    ################################################################################################
+    def get_morphology_label(self):
+        """Gets the label of the morphology of the neuron, the name of its file.
+
+        :return:
+            The label of the morphology.
+        """
+
+        return os.path.splitext(os.path.basename(self.morphology_uri))[0]
+
+
+####################################################################################################
+# @CircuitAccess
+####################################################################################################
+class CircuitAccess:
+    """The access to the data of a circuit, opened once per process.
+
+    The data of the neurons are read in bulk, for all the GIDs of a query at once, and cached, such
+    that the following queries of the same neurons do not access the circuit again. A backend
+    implements the bulk readers of the data of the neurons, and optionally of their morphologies.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 circuit_config):
+        """Constructor
+
+        :param circuit_config:
+            The configuration file of the circuit.
+        """
+
+        # Configuration
+        self.circuit_config = circuit_config
+
+        # The cached GIDs of the targets
+        self.targets = dict()
+
+        # The cached data of the neurons, keyed by their GIDs
+        self.neurons = dict()
+
+        # The prefetched morphologies, keyed by their GIDs
+        self.morphologies = dict()
+
+    ################################################################################################
+    # @read_target_gids
+    ################################################################################################
+    def read_target_gids(self,
+                         target):
+        """Reads the GIDs of a target from the circuit, implemented by the backend.
+
+        :param target:
+            The name of the target.
+        :return:
+            A list of GIDs.
+        """
+
+        raise NotImplementedError
+
+    ################################################################################################
+    # @read_neurons
+    ################################################################################################
+    def read_neurons(self,
+                     gids):
+        """Reads the data of a list of neurons from the circuit, implemented by the backend.
+
+        :param gids:
+            A sorted list of GIDs.
+        :return:
+            A dictionary of CircuitNeuron's keyed by their GIDs.
+        """
+
+        raise NotImplementedError
+
+    ################################################################################################
+    # @read_morphologies
+    ################################################################################################
+    def read_morphologies(self,
+                          gids):
+        """Reads the morphologies of a list of neurons from the circuit.
+
+        By default, the morphologies are not loaded by the circuit, and they are read from the
+        files of their URIs.
+
+        :param gids:
+            A sorted list of GIDs.
+        :return:
+            A dictionary of the morphologies of the backend keyed by their GIDs.
+        """
+
+        return dict()
+
+    ################################################################################################
+    # @get_gids
+    ################################################################################################
+    def get_gids(self,
+                 target):
+        """Gets the GIDs of a target, where the target a<GID> is the single neuron GID.
+
+        :param target:
+            The name of the target.
+        :return:
+            A sorted list of GIDs.
+        """
+
+        if target not in self.targets:
+            if target.startswith('a') and target[1:].isdigit():
+                self.targets[target] = [int(target[1:])]
+            else:
+                self.targets[target] = sorted(int(gid) for gid in self.read_target_gids(target))
+        return self.targets[target]
+
+    ################################################################################################
+    # @cache_neurons
+    ################################################################################################
+    def cache_neurons(self,
+                      gids):
+        """Reads the data of the neurons that are not cached yet in a single query.
+
+        :param gids:
+            A list of GIDs.
+        """
+
+        missing_gids = sorted(set(int(gid) for gid in gids) - set(self.neurons.keys()))
+        if len(missing_gids) > 0:
+            self.neurons.update(self.read_neurons(missing_gids))
+
+    ################################################################################################
+    # @cache_target
+    ################################################################################################
+    def cache_target(self,
+                     target):
+        """Reads the data of all the neurons of a target in a single query. The GIDs of the target
+        that are not in the circuit are reported and ignored.
+
+        :param target:
+            The name of the target.
+        :return:
+            The sorted list of the GIDs of the target that are in the circuit.
+        """
+
+        gids = self.get_gids(target)
+        self.cache_neurons(gids)
+
+        # Ignore the GIDs that are missing from the circuit
+        missing_gids = [gid for gid in gids if gid not in self.neurons]
+        if len(missing_gids) > 0:
+            print('WARNING: %d GIDs of the target [%s] are not in the circuit [%s] and ignored: %s'
+                  % (len(missing_gids), target, self.circuit_config,
+                     ' '.join(str(gid) for gid in missing_gids)))
+            gids = [gid for gid in gids if gid in self.neurons]
+        return gids
+
+    ################################################################################################
+    # @get_neuron
+    ################################################################################################
+    def get_neuron(self,
+                   gid):
+        """Gets the data of a neuron.
+
+        :param gid:
+            The GID of the neuron.
+        :return:
+            The CircuitNeuron, or None if the GID is not in the circuit.
+        """
+
+        self.cache_neurons([gid])
+        return self.neurons.get(int(gid))
+
+    ################################################################################################
+    # @get_neurons
+    ################################################################################################
+    def get_neurons(self,
+                    gids):
+        """Gets the data of a list of neurons, with a single query for the neurons that are not
+        cached.
+
+        :param gids:
+            A list of GIDs.
+        :return:
+            A list of the CircuitNeuron's in the order of the GIDs, None for the missing GIDs.
+        """
+
+        self.cache_neurons(gids)
+        return [self.neurons.get(int(gid)) for gid in gids]
+
+    ################################################################################################
+    # @get_position
+    ################################################################################################
+    def get_position(self,
+                     gid):
+        """Gets the position of the soma of a neuron.
+
+        :param gid:
+            The GID of the neuron.
+        :return:
+            The [x, y, z] position.
+        """
+
+        return self.get_neuron(gid).get_position()
+
+    ################################################################################################
+    # @get_orientation
+    ################################################################################################
+    def get_orientation(self,
+                        gid):
+        """Gets the orientation of a neuron.
+
+        :param gid:
+            The GID of the neuron.
+        :return:
+            The [w, x, y, z] unit quaternion of the rotation of the neuron.
+        """
+
+        return self.get_neuron(gid).get_orientation()
+
+    ################################################################################################
+    # @get_transform
+    ################################################################################################
+    def get_transform(self,
+                      gid):
+        """Gets the local to global transformation of a neuron.
+
+        :param gid:
+            The GID of the neuron.
+        :return:
+            The 4x4 transformation matrix as a list of rows.
+        """
+
+        return self.get_neuron(gid).transform
+
+    ################################################################################################
+    # @get_mtype
+    ################################################################################################
+    def get_mtype(self,
+                  gid):
+        """Gets the morphological type of a neuron.
+
+        :param gid:
+            The GID of the neuron.
+        :return:
+            The name of the morphological type.
+        """
+
+        return self.get_neuron(gid).mtype
+
+    ################################################################################################
+    # @get_morphology_uri
+    ################################################################################################
+    def get_morphology_uri(self,
+                           gid):
+        """Gets the path to the morphology file of a neuron.
+
+        :param gid:
+            The GID of the neuron.
+        :return:
+            The path to the morphology file.
+        """
+
+        return self.get_neuron(gid).morphology_uri
+
+    ################################################################################################
+    # @prefetch_morphologies
+    ################################################################################################
+    def prefetch_morphologies(self,
+                              gids):
+        """Loads the morphologies of a batch of neurons in a single query, if the backend loads
+        the morphologies.
+
+        :param gids:
+            A list of GIDs.
+        """
+
+        missing_gids = sorted(set(int(gid) for gid in gids) - set(self.morphologies.keys()))
+        if len(missing_gids) > 0:
+            self.morphologies.update(self.read_morphologies(missing_gids))
+
+    ################################################################################################
+    # @get_morphology
+    ################################################################################################
+    def get_morphology(self,
+                       gid):
+        """Gets the morphology of a neuron that is loaded by the backend. A prefetched morphology
+        is handed over only once, and removed from the cache.
+
+        :param gid:
+            The GID of the neuron.
+        :return:
+            The morphology of the backend, or None if the morphology must be read from the file of
+            its URI.
+        """
+
+        if int(gid) not in self.morphologies:
+            self.prefetch_morphologies([gid])
+        return self.morphologies.pop(int(gid), None)
+
+
+####################################################################################################
+# @BrainCircuit
+####################################################################################################
+class BrainCircuit(CircuitAccess):
+    """The access to a BBP circuit with the brain library.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 circuit_config):
+        """Constructor
+
+        :param circuit_config:
+            The BBP circuit configuration (BlueConfig) of the circuit.
+        """
+
+        CircuitAccess.__init__(self, circuit_config)
+
+        # Import brain, raises an ImportError if not installed
+        import brain
+        self.brain = brain
+
+        # Open the circuit only once
+        self.circuit = brain.Circuit(circuit_config)
+
+    ################################################################################################
+    # @read_target_gids
+    ################################################################################################
+    def read_target_gids(self,
+                         target):
+        """Reads the GIDs of a target from the circuit.
+
+        :param target:
+            The name of the target.
+        :return:
+            A list of GIDs.
+        """
+
+        return [int(gid) for gid in self.circuit.gids(target)]
+
+    ################################################################################################
+    # @read_neurons
+    ################################################################################################
+    def read_neurons(self,
+                     gids):
+        """Reads the data of a list of neurons from the circuit.
+
+        :param gids:
+            A sorted list of GIDs.
+        :return:
+            A dictionary of CircuitNeuron's keyed by their GIDs.
+        """
+
+        # A single query per attribute for all the GIDs
+        mtypes_names = self.circuit.mtype_names()
+        mtypes = self.circuit.mtypes(gids)
+        uris = self.circuit.morphology_uris(gids)
+        transforms = self.circuit.transforms(gids)
+
+        neurons = dict()
+        for gid, mtype, uri, transform in zip(gids, mtypes, uris, transforms):
+            morphology_uri = str(uri)
+            if morphology_uri.startswith('file://'):
+                morphology_uri = morphology_uri[len('file://'):]
+            neurons[gid] = CircuitNeuron(
+                gid=gid, mtype=mtypes_names[int(mtype)], morphology_uri=morphology_uri,
+                transform=[[float(transform[i][j]) for j in range(4)] for i in range(4)])
+        return neurons
+
+    ################################################################################################
+    # @read_morphologies
+    ################################################################################################
+    def read_morphologies(self,
+                          gids):
+        """Loads the morphologies of a list of neurons in their local coordinates.
+
+        :param gids:
+            A sorted list of GIDs.
+        :return:
+            A dictionary of the brain.neuron.Morphology's keyed by their GIDs.
+        """
+
+        morphologies = self.circuit.load_morphologies(gids, self.circuit.Coordinates.local)
+        return dict(zip(gids, morphologies))
+
+
+####################################################################################################
+# @FileCircuit
+####################################################################################################
+class FileCircuit(CircuitAccess):
+    """The access to a circuit that is described in a local JSON file, such that the GID and target
+    inputs can be used without the BBP libraries.
+
+    The file lists the neurons keyed by their GIDs and the targets, for example:
+
+        {"neurons": {"1": {"mtype": "L5_TTPC1", "morphology": "morphologies/C010398B.h5",
+                           "position": [10.0, 1200.0, 5.0], "orientation": [1.0, 0.0, 0.0, 0.0]}},
+         "targets": {"Column": [1]}}
+
+    where the morphology paths are relative to the directory of the file, and the orientation is a
+    [w, x, y, z] unit quaternion, identity if not given.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 circuit_config):
+        """Constructor
+
+        :param circuit_config:
+            The JSON file of the circuit.
+        """
+
+        CircuitAccess.__init__(self, circuit_config)
+
+        # Read the file only once
+        with open(circuit_config, 'r') as f:
+            data = json.load(f)
+        self.data_neurons = data.get('neurons', dict())
+        self.data_targets = data.get('targets', dict())
+        self.directory = os.path.dirname(os.path.abspath(circuit_config))
+
+    ################################################################################################
+    # @read_target_gids
+    ################################################################################################
+    def read_target_gids(self,
+                         target):
+        """Reads the GIDs of a target from the file, where the target All has all the GIDs of the
+        circuit.
+
+        :param target:
+            The name of the target.
+        :return:
+            A list of GIDs.
+        """
+
+        if target in self.data_targets:
+            return self.data_targets[target]
+        elif target == 'All':
+            return [int(gid) for gid in self.data_neurons.keys()]
+        print('ERROR: The target [%s] is not in the circuit [%s]' % (target, self.circuit_config))
+        return list()
+
+    ################################################################################################
+    # @read_neurons
+    ################################################################################################
+    def read_neurons(self,
+                     gids):
+        """Reads the data of a list of neurons from the file.
+
+        :param gids:
+            A sorted list of GIDs.
+        :return:
+            A dictionary of CircuitNeuron's keyed by their GIDs.
+        """
+
+        neurons = dict()
+        for gid in gids:
+            data = self.data_neurons.get(str(gid))
+            if data is None:
+                continue
+            neurons[gid] = CircuitNeuron(
+                gid=gid, mtype=data.get('mtype', ''),
+                morphology_uri=os.path.join(self.directory, data['morphology']),
+                transform=get_transform_from_position_and_orientation(
+                    data.get('position', [0.0, 0.0, 0.0]),
+                    data.get('orientation', [1.0, 0.0, 0.0, 0.0])))
+        return neurons
+
+
+####################################################################################################
+# @get_circuit
+####################################################################################################
+def get_circuit(circuit_config):
+    """Gets the access to a circuit, which is opened only once per process. The JSON files are
+    opened as FileCircuit's, and the other configurations with the brain library.
+
+    :param circuit_config:
+        The configuration file of the circuit.
+    :return:
+        A reference to the CircuitAccess, or None if the circuit cannot be opened.
+    """
+
+    if circuit_config in OPENED_CIRCUITS:
+        return OPENED_CIRCUITS[circuit_config]
+
+    try:
+        if os.path.splitext(circuit_config)[1].lower() == '.json':
+            circuit = FileCircuit(circuit_config)
+        else:
+            circuit = BrainCircuit(circuit_config)
+    except ImportError:
+        print('ERROR: Cannot import [brain], please load brain or install it')
+        return None
+    except (IOError, ValueError) as e:
+        print('ERROR: Cannot open the circuit [%s]: %s' % (circuit_config, str(e)))
+        return None
+
+    OPENED_CIRCUITS[circuit_config] = circuit
+    return circuit
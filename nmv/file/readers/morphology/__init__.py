@@ -18,4 +18,5 @@
 from .h5_reader import *
 from .swc_reader import *
 from .bbp_reader import *
+from .morphology_cache import *
 from .morphology_reader import *
\ No newline at end of file
@@ -57,21 +57,13 @@ class BBPReader:
             A list of GIDs composing the target.
         """
 
-        # Import brain
-        try:
-            import brain
-        except ImportError:
-            print('ERROR: Cannot import brain')
+        # Open the circuit only once per process
+        circuit = nmv.file.get_circuit(blue_config)
+        if circuit is None:
             return None
 
-        # Open a circuit with a given blue config
-        bbp_circuit = brain.Circuit(blue_config)
-
-        # Create a GID-set and load the morphologies from these GIDs
-        gids = bbp_circuit.gids(target)
-
         # Return a list of all the GIDs
-        return gids
+        return circuit.get_gids(target)
 
     ################################################################################################
     # @load_bbp_morphology_from_gid
@@ -89,27 +81,13 @@ class BBPReader:
             A reference to a BBP morphology structure
         """
 
-        # Import brain
-        try:
-            import brain
-        except ImportError:
-            print('ERROR: Cannot import brain')
+        # Open the circuit only once per process
+        circuit = nmv.file.get_circuit(blue_config)
+        if circuit is None:
             return None
 
-        # Load the circuit
-        bbp_circuit = brain.Circuit(blue_config)
-
-        # Create a GID-set and load the morphology corresponding to the given GID
-        gids_set = bbp_circuit.gids('a' + str(gid))
-
-        loaded = bbp_circuit.load_morphologies(gids_set, bbp_circuit.Coordinates.local)
-        uris_set = bbp_circuit.morphology_uris(gids_set)
-
-        # Get a BBP morphology object loaded from the circuit
-        bbp_morphology_object = brain.neuron.Morphology(uris_set[0])
-
-        # Return a reference to the morphology
-        return bbp_morphology_object
+        # Return a reference to the morphology, prefetched with its batch or loaded alone
+        return circuit.get_morphology(gid)
 
     ################################################################################################
     # @load_morphologies_from_target
@@ -127,21 +105,15 @@ class BBPReader:
             A reference to all the BBP morphologies loaded from the target and their GIDs
         """
 
-        # Import brain
-        try:
-            import brain
-        except ImportError:
-            print('ERROR: Cannot import brain')
+        # Open the circuit only once per process
+        circuit = nmv.file.get_circuit(blue_config)
+        if circuit is None:
             return None
 
-        # Open a circuit with a given blue config
-        bbp_circuit = brain.Circuit(blue_config)
-
-        # Create a GID-set and load the morphologies from these GIDs
-        gids = bbp_circuit.gids(target)
-        uris = bbp_circuit.morphology_uris(gids)[0]
-        brain.neuron.Morphology(uris)
-        bbp_morphologies = bbp_circuit.load_morphologies(gids, bbp_circuit.Coordinates.local)
+        # Load the morphologies of all the GIDs of the target in a single query
+        gids = circuit.cache_target(target)
+        circuit.prefetch_morphologies(gids)
+        bbp_morphologies = [circuit.get_morphology(gid) for gid in gids]
 
         # Return a reference to the morphologies and their GIDs
         return bbp_morphologies, gids
@@ -204,12 +176,13 @@ class BBPReader:
             Cartesian coordinates of the position of the neuron (soma position)
         """
 
-        # Load the neuron from the BBP-SDK
-        neuron = BBPReader.get_neuron_from_gid(blue_config, gid)
+        # Open the circuit only once per process, the positions are cached
+        circuit = nmv.file.get_circuit(blue_config)
+        if circuit is None:
+            return None
 
         # Return the position of the neuron
-        for data in neuron:
-            return data.position()
+        return circuit.get_position(gid)
 
     ################################################################################################
     # @get_neuron_orientation_from_gid
@@ -224,15 +197,16 @@ class BBPReader:
         :param gid:
             BBP neuron GID.
         :return:
-            The orientation of the neuron.
+            The orientation of the neuron, a [w, x, y, z] unit quaternion.
         """
 
-        # Load the neuron from the BBP-SDK
-        neuron = BBPReader.get_neuron_from_gid(blue_config, gid)
+        # Open the circuit only once per process, the orientations are cached
+        circuit = nmv.file.get_circuit(blue_config)
+        if circuit is None:
+            return None
 
-        # Return the orientation of he neuron
-        for data in neuron:
-            return data.orientation()
+        # Return the orientation of the neuron
+        return circuit.get_orientation(gid)
 
     ################################################################################################
     # @get_neuron_mtype_name_from_gid
@@ -250,12 +224,13 @@ class BBPReader:
             Neuron morphological type name.
         """
 
-        # Load the neuron from the BBP-SDK
-        neuron = BBPReader.get_neuron_from_gid(blue_config, gid)
+        # Open the circuit only once per process, the mtypes are cached
+        circuit = nmv.file.get_circuit(blue_config)
+        if circuit is None:
+            return None
 
         # Return the mtype name
-        for data in neuron:
-            return data.morphology_type().name()
+        return circuit.get_mtype(gid)
 
     ################################################################################################
     # @get_neuron_morphology_label_from_gid
@@ -273,12 +248,13 @@ class BBPReader:
             Neuron morphology label.
         """
 
-        # Load the neuron from the BBP-SDK
-        neuron = BBPReader.get_neuron_from_gid(blue_config, gid)
+        # Open the circuit only once per process, the morphology URIs are cached
+        circuit = nmv.file.get_circuit(blue_config)
+        if circuit is None:
+            return None
 
         # Return morphology label
-        for data in neuron:
-            return data.morphology_label()
+        return circuit.get_neuron(gid).get_morphology_label()
 
     ################################################################################################
     # @get_section_from_id
@@ -676,42 +652,28 @@ class BBPReader:
             A list of exemplars to all the mtypes that exist in the circuit.
         """
 
-        # Import bbp
-        try:
-            import bbp
-        except ImportError:
-            print('ERROR: Cannot import brain')
+        # Open the circuit only once per process
+        circuit = nmv.file.get_circuit(blue_config)
+        if circuit is None:
             return None
 
-        # Create an experiment
-        bbp_experiment = bbp.Experiment()
-
-        # Open the blue config
-        bbp_experiment.open(blue_config)
+        # Read the m-types of the entire mc2_Column in a single query, without the morphologies
+        gids = circuit.cache_target('mc2_Column')
 
-        # Load the entire mc2_Column in the micro-circuit
-        bbp_microcircuit = bbp_experiment.microcircuit()
-        bbp_cell_target = bbp_experiment.cell_target('mc2_Column')
-        bbp_microcircuit.load(bbp_cell_target, bbp.Loading_Flags.NEURONS)
-
-        # retrieve a list of all the neurons in the circuit
-        bbp_neurons = bbp_microcircuit.neurons()
+        # Group the cells by their m-types
+        m_types_cells = dict()
+        for gid in gids:
+            m_type = circuit.get_mtype(gid)
+            m_types_cells.setdefault(m_type, []).append([gid, m_type])
 
         # create a list of selected exemplars
         exemplars_list = []
         for m_type in nmv.consts.MTYPES:
 
             # All the cells with that specific m-type
-            m_type_cells = []
-
-            # Get all the cells with that specific m-type
-            for neuron in bbp_neurons:
-
-                # Get BBP neuron data from the BBP-SDK
-                neuron_gid = neuron.gid()
-                neuron_m_type = neuron.morphology_type().name()
-                if neuron_m_type == m_type:
-                    m_type_cells.append([neuron_gid, neuron_m_type])
+            m_type_cells = m_types_cells.get(m_type, [])
+            if len(m_type_cells) == 0:
+                continue
 
             # Select a random cell and add it to the exemplars list, otherwise, use the first m-type
             if random_selection:
@@ -951,9 +913,25 @@ class BBPReader:
             A reference to a BBP morphology structure
         """
 
+        # Open the circuit only once per process
+        circuit = nmv.file.get_circuit(blue_config)
+        if circuit is None:
+            return False, None
+
         # Load the BBP morphology object
-        bbp_morphology_object = BBPReader.load_bbp_morphology_from_gid(
-            blue_config=blue_config, gid=gid)
+        bbp_morphology_object = circuit.get_morphology(gid)
+
+        # The circuit does not load the morphologies, read the morphology file of the neuron
+        if bbp_morphology_object is None:
+            neuron = circuit.get_neuron(gid)
+            if neuron is None:
+                return False, None
+            loading_flag, morphology_object = \
+                nmv.file.readers.read_morphology_from_file_naively(neuron.morphology_uri)
+            if loading_flag:
+                morphology_object.gid = gid
+                morphology_object.label = str(gid)
+            return loading_flag, morphology_object
 
         # Convert the BBP morphology object to a skeleton
         morphology_object = BBPReader.convert_morphology_to_skeleton(
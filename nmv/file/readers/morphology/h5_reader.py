@@ -15,6 +15,9 @@
 # If not, see <http://www.gnu.org/licenses/>.
 ####################################################################################################
 
+# System imports
+import numpy
+
 # Blender imports
 from mathutils import Vector
 
@@ -24,6 +27,7 @@ import nmv.consts
 import nmv.file
 import nmv.skeleton
 import nmv.utilities
+from nmv.analysis.core import morphology_arrays
 
 
 ####################################################################################################
@@ -67,32 +71,30 @@ class H5Reader:
             A linear list of sections of a specific type to be converted to a tree.
         """
 
+        # Index the sections by their IDs to find the children and the parents in a single pass
+        sections_by_id = dict()
+        for i_section in sections_list:
+            sections_by_id[i_section.id] = i_section
+
         # For each section, get the IDs of the children nodes, then find and append them to the
         # children lists.
         # Also find the ID of the parent node and update the parent accordingly.
-        branching_order = 0
         for i_section in sections_list:
 
             # First round
             for child_id in i_section.children_ids:
 
-                # For each section
-                for j_section in sections_list:
+                # Is it a child
+                if child_id in sections_by_id:
 
-                    # Is it a child
-                    if child_id == j_section.id:
-
-                        # Append it to the list
-                        i_section.children.append(j_section)
+                    # Append it to the list
+                    i_section.children.append(sections_by_id[child_id])
 
             # Second round
-            for k_section in sections_list:
-
-                # Is it parent
-                if i_section.parent_id == k_section.id:
+            if i_section.parent_id in sections_by_id:
 
-                    # Set it to be a parent
-                    i_section.parent = k_section
+                # Set it to be a parent
+                i_section.parent = sections_by_id[i_section.parent_id]
 
     ################################################################################################
     # @get_arbors_profile_points
@@ -282,53 +284,50 @@ class H5Reader:
         # Parse the sections and add them to a linear list [index, parent, type, samples]
         sections_list = list()
 
-        for i_section in range(1, len(self.structure_list) - 1):
+        # Get the points and the structures as arrays, the sections are then sliced as views
+        points = numpy.asarray(self.points_list)
+        structures = numpy.asarray(self.structure_list)
+
+        # The first point, the type and the parent of every section
+        sections_first_points_indices = structures[:, 0].tolist()
+        sections_types = structures[:, 1].tolist()
+        sections_parents_indices = structures[:, 2].tolist()
+
+        for i_section in range(1, len(structures) - 1):
 
             # Get the index of the starting point of the section
-            section_first_point_index = self.structure_list[i_section][0]
+            section_first_point_index = sections_first_points_indices[i_section]
 
             # Get the index of the last point of the section
-            section_last_point_index = self.structure_list[i_section + 1][0]
+            section_last_point_index = sections_first_points_indices[i_section + 1]
 
             # Section index
             section_index = i_section
 
             # Get section type
             # 1: soma, 2: axon, 3: basal dendrite, 4: apical dendrite.
-            section_type = self.structure_list[i_section][1]
+            section_type = sections_types[i_section]
 
             # Get the section parent index
-            section_parent_index = int(self.structure_list[i_section][2])
-
-            # Get the positions and radii of each sample along the section
-            samples = list()
-
-            # Sample index
-            sample_index = 0
-
-            # Reconstruct the samples
-            for i_sample in range(section_first_point_index, section_last_point_index):
+            section_parent_index = int(sections_parents_indices[i_section])
 
-                # Position
-                x = self.points_list[i_sample][nmv.consts.Arbors.H5_SAMPLE_X_COORDINATES_IDX]
-                y = self.points_list[i_sample][nmv.consts.Arbors.H5_SAMPLE_Y_COORDINATES_IDX]
-                z = self.points_list[i_sample][nmv.consts.Arbors.H5_SAMPLE_Z_COORDINATES_IDX]
-                point = Vector((x, y, z))
+            # A view on the points of the section
+            section_points = points[section_first_point_index:section_last_point_index]
 
-                # Radius
-                # NOTE: What is reported in our .H5 files is the diameter unlike the .SWC files
-                radius = self.points_list[i_sample][nmv.consts.Arbors.H5_SAMPLE_RADIUS_IDX] / 2.0
+            # Positions
+            positions = section_points[:, nmv.consts.Arbors.H5_SAMPLE_X_COORDINATES_IDX:
+                                          nmv.consts.Arbors.H5_SAMPLE_Z_COORDINATES_IDX + 1]
 
-                # Build a NeuroMorphoVis sample
-                nmv_sample = nmv.skeleton.Sample(
-                    point=point, radius=radius, id=sample_index, morphology_id=sample_index,
-                    type=section_type)
+            # Radii
+            # NOTE: What is reported in our .H5 files is the diameter unlike the .SWC files
+            radii = section_points[:, nmv.consts.Arbors.H5_SAMPLE_RADIUS_IDX] / 2.0
 
-                # Add the sample to the list
-                samples.append(nmv_sample)
-
-                # Next sample
-                sample_index += 1
+            # Build the NeuroMorphoVis samples of the section
+            samples = [nmv.skeleton.Sample(
+                point=Vector(position), radius=radius, id=sample_index,
+                morphology_id=sample_index, type=section_type)
+                for sample_index, (position, radius) in enumerate(
+                    zip(positions.tolist(), radii.tolist()))]
 
             # Build a section list until all the sections are parsed
             section = [section_index, section_parent_index, section_type, samples]
@@ -364,6 +363,11 @@ class H5Reader:
         # A linear list of the apical dendrites sections
         apical_dendrites_sections = list()
 
+        # Get the children IDs of every section from the parents IDs in a single pass
+        children_ids = dict()
+        for i_section in sections_list:
+            children_ids.setdefault(i_section[1], list()).append(i_section[0])
+
         # Construct a tree of sections and filter them based on their type
         for i_section in sections_list:
 
@@ -374,16 +378,7 @@ class H5Reader:
             section_parent_id = i_section[1]
 
             # Section children IDs, if exist
-            section_children_ids = list()
-
-            for j_section in sections_list:
-
-                # If the parent ID of another section is equivalent to the ID of this section, then
-                # it is a child
-                if section_id == j_section[1]:
-
-                    # Append it
-                    section_children_ids.append(j_section[0])
+            section_children_ids = children_ids.get(section_id, list())
 
             # Section type
             section_type = i_section[2]
@@ -485,3 +480,51 @@ class H5Reader:
 
         # Return a reference to the reconstructed morphology skeleton
         return nmv_morphology
+
+    ################################################################################################
+    # @read_file_as_array_morphology
+    ################################################################################################
+    def read_file_as_array_morphology(self):
+        """Read a morphology skeleton given in .H5 file into a NeuroMorphoVis ArrayMorphology
+        without building any sample or section objects.
+
+        The arbors, the sections and the samples are identical to those of @read_file.
+
+        :return:
+            Returns a reference to a NeuroMorphoVis ArrayMorphology as read from the file.
+        """
+
+        # Read the content of the .H5 file
+        self.read_points_and_structures()
+
+        # Get the points and the structures as arrays
+        points = numpy.asarray(self.points_list)
+        structures = numpy.asarray(self.structure_list)
+
+        # Lay out the sections with the Blender-free analysis core, similar to
+        # @build_sections_from_points_and_structures the first section (soma) is ignored
+        samples_points, samples_radii, sections_offsets, sections_types, sections_parents, \
+            sections_ids, samples_ids, roots = morphology_arrays.build_h5_sections_arrays(
+                points, structures)
+
+        # Build the arbors, if we have more than a single axon or apical dendrite, we use the
+        # principal one and add the others to the basal dendrites list
+        axon_root, dendrites_roots, apical_dendrite_root = morphology_arrays.get_arbors_roots(
+            roots, nmv.consts.Arbors.H5_AXON_SECTION_TYPE,
+            nmv.consts.Arbors.H5_BASAL_DENDRITE_SECTION_TYPE,
+            nmv.consts.Arbors.H5_APICAL_DENDRITE_SECTION_TYPE)
+
+        # Build the soma
+        nmv_soma = self.build_soma(self.points_list, self.structure_list)
+
+        # Update the morphology label
+        label = nmv.file.ops.get_file_name_from_path(self.morphology_file)
+
+        # Construct the morphology skeleton
+        return nmv.skeleton.ArrayMorphology(
+            points=samples_points, radii=samples_radii, sections_offsets=sections_offsets,
+            sections_types=sections_types, sections_parents=sections_parents,
+            sections_ids=sections_ids, samples_ids=samples_ids,
+            samples_morphology_indices=samples_ids, axon_root=axon_root,
+            dendrites_roots=dendrites_roots, apical_dendrite_root=apical_dendrite_root,
+            soma=nmv_soma, label=label)
@@ -0,0 +1,372 @@
+####################################################################################################
+# Copyright (c) 2016 - 2019, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+import time
+import json
+import hashlib
+import tempfile
+import zipfile
+import numpy
+
+# Blender imports
+from mathutils import Vector
+
+# Internal imports
+import nmv
+import nmv.consts
+import nmv.skeleton
+
+
+####################################################################################################
+# @MorphologyCache
+####################################################################################################
+class MorphologyCache:
+    """A disk cache of the parsed morphologies.
+
+    Every morphology file is stored in a single binary .npz file that contains the arrays of an
+    nmv.skeleton.ArrayMorphology, the soma data and the meta-data of the source file. The entry
+    is named after the hash of the absolute path of the morphology file, and it is only valid
+    if the source file has the same modification time and size, or the same content hash, that
+    were recorded when the entry was created. The least recently used entries are evicted when
+    the total size of the cache exceeds the given limit.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 cache_directory,
+                 maximum_size=nmv.consts.Morphology.DEFAULT_CACHE_SIZE):
+        """Constructor
+
+        :param cache_directory:
+            The directory where the cached morphologies are stored.
+        :param maximum_size:
+            The maximum size of the cache in bytes.
+        """
+
+        # The directory where the cache entries are stored
+        self.cache_directory = cache_directory
+
+        # The maximum size of the cache in bytes
+        self.maximum_size = maximum_size
+
+        # Create the cache directory, if it does not exist
+        if not os.path.exists(self.cache_directory):
+            os.makedirs(self.cache_directory, exist_ok=True)
+
+    ################################################################################################
+    # @compute_file_hash
+    ################################################################################################
+    @staticmethod
+    def compute_file_hash(file_path):
+        """Computes the SHA1 hash of the content of a given file.
+
+        :param file_path:
+            The path to the file.
+        :return:
+            The hexadecimal digest of the content of the file.
+        """
+
+        file_hash = hashlib.sha1()
+        with open(file_path, 'rb') as file_handle:
+            for chunk in iter(lambda: file_handle.read(1 << 20), b''):
+                file_hash.update(chunk)
+        return file_hash.hexdigest()
+
+    ################################################################################################
+    # @get_entry_path
+    ################################################################################################
+    def get_entry_path(self,
+                       morphology_file_path):
+        """Gets the path of the cache entry of a given morphology file.
+
+        :param morphology_file_path:
+            The path to the morphology file.
+        :return:
+            The path to the cache entry.
+        """
+
+        key = hashlib.sha1(os.path.abspath(morphology_file_path).encode('utf-8')).hexdigest()
+        return '%s/%s%s' % (self.cache_directory, key, nmv.consts.Morphology.CACHE_EXTENSION)
+
+    ################################################################################################
+    # @load
+    ################################################################################################
+    def load(self,
+             morphology_file_path):
+        """Loads the cached morphology of a given morphology file.
+
+        :param morphology_file_path:
+            The path to the morphology file.
+        :return:
+            A reference to the nmv.skeleton.ArrayMorphology, or None if the morphology is not
+            cached or the cache entry is out of date.
+        """
+
+        # Get the cache entry
+        entry_path = self.get_entry_path(morphology_file_path)
+        if not os.path.isfile(entry_path):
+            return None
+
+        # A corrupted entry, or an entry that misses the meta-data, is a cache miss, remove it
+        try:
+            with numpy.load(entry_path, allow_pickle=False) as data:
+                arrays = {key: data[key] for key in data.files}
+            meta_data = json.loads(str(arrays.pop('meta_data')))
+            version = meta_data['version']
+            size, mtime, file_hash = meta_data['size'], meta_data['mtime'], meta_data['hash']
+        except (IOError, OSError, ValueError, KeyError, zipfile.BadZipFile):
+            self.remove_entry(entry_path)
+            return None
+
+        # The cache was written by a different version, ignore it
+        if version != nmv.consts.Morphology.CACHE_VERSION:
+            self.remove_entry(entry_path)
+            return None
+
+        # Validate the entry against the source file
+        stat = os.stat(morphology_file_path)
+        if stat.st_size != size:
+            return None
+
+        # If the modification time has changed, verify the content
+        if stat.st_mtime_ns != mtime:
+            if self.compute_file_hash(morphology_file_path) != file_hash:
+                return None
+
+            # The content is the same, record the new modification time to avoid hashing the
+            # file again in the next loads, the rewrite also updates the access time of the entry
+            meta_data['mtime'] = stat.st_mtime_ns
+            self.write_entry(entry_path, meta_data, arrays)
+
+        # Update the access time of the entry for the eviction, the entry might have been evicted
+        # or replaced by another process in the meanwhile
+        else:
+            try:
+                os.utime(entry_path, None)
+            except OSError:
+                pass
+
+        # Build the morphology from the arrays, an entry that misses any of them is a cache miss
+        try:
+
+            # Soma
+            soma = None
+            if meta_data['has_soma']:
+                arbors_profile_points = None
+                if meta_data['has_arbors_profile_points']:
+                    arbors_profile_points = [
+                        Vector(point) for point in arrays['soma_arbors_profile_points'].tolist()]
+                soma = nmv.skeleton.Soma(
+                    centroid=Vector(arrays['soma_centroid'].tolist()),
+                    mean_radius=float(arrays['soma_mean_radius']),
+                    profile_points=[
+                        Vector(point) for point in arrays['soma_profile_points'].tolist()],
+                    arbors_profile_points=arbors_profile_points)
+
+            # Morphology
+            array_morphology = nmv.skeleton.ArrayMorphology(
+                points=arrays['points'], radii=arrays['radii'],
+                sections_offsets=arrays['sections_offsets'],
+                sections_types=arrays['sections_types'],
+                sections_parents=arrays['sections_parents'], sections_ids=arrays['sections_ids'],
+                samples_ids=arrays['samples_ids'],
+                samples_morphology_indices=arrays['samples_morphology_indices'],
+                samples_types=arrays['samples_types'],
+                samples_parents_ids=arrays['samples_parents_ids'],
+                axon_root=meta_data['axon_root'], dendrites_roots=meta_data['dendrites_roots'],
+                apical_dendrite_root=meta_data['apical_dendrite_root'], soma=soma,
+                gid=meta_data['gid'], mtype=meta_data['mtype'], label=meta_data['label'],
+                number_stems=meta_data['number_stems'])
+            array_morphology.label = meta_data['label']
+        except KeyError:
+            self.remove_entry(entry_path)
+            return None
+
+        # Return a reference to the morphology
+        return array_morphology
+
+    ################################################################################################
+    # @store
+    ################################################################################################
+    def store(self,
+              morphology_file_path,
+              morphology):
+        """Stores a parsed morphology in the cache.
+
+        :param morphology_file_path:
+            The path to the morphology file.
+        :param morphology:
+            A reference to the parsed morphology, either an nmv.skeleton.Morphology or an
+            nmv.skeleton.ArrayMorphology.
+        """
+
+        # Convert the morphology into arrays
+        if isinstance(morphology, nmv.skeleton.ArrayMorphology):
+            array_morphology = morphology
+        else:
+            array_morphology = nmv.skeleton.ArrayMorphology.from_morphology(morphology)
+
+        # Meta-data of the source file and the morphology
+        stat = os.stat(morphology_file_path)
+        soma = array_morphology.soma
+        meta_data = {
+            'version': nmv.consts.Morphology.CACHE_VERSION,
+            'path': os.path.abspath(morphology_file_path),
+            'mtime': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'hash': self.compute_file_hash(morphology_file_path),
+            'axon_root': array_morphology.axon_root,
+            'dendrites_roots': array_morphology.dendrites_roots,
+            'apical_dendrite_root': array_morphology.apical_dendrite_root,
+            'gid': array_morphology.gid,
+            'mtype': array_morphology.mtype,
+            'label': array_morphology.label,
+            'number_stems': array_morphology.number_stems,
+            'has_soma': soma is not None,
+            'has_arbors_profile_points':
+                soma is not None and soma.arbors_profile_points is not None}
+
+        # Soma arrays
+        soma_arrays = dict()
+        if soma is not None:
+            soma_arrays['soma_centroid'] = numpy.array(soma.centroid[:], dtype=numpy.float64)
+            soma_arrays['soma_mean_radius'] = numpy.array(soma.mean_radius, dtype=numpy.float64)
+            soma_arrays['soma_profile_points'] = numpy.array(
+                [point[:] for point in soma.profile_points], dtype=numpy.float64).reshape((-1, 3))
+            if soma.arbors_profile_points is not None:
+                soma_arrays['soma_arbors_profile_points'] = numpy.array(
+                    [point[:] for point in soma.arbors_profile_points],
+                    dtype=numpy.float64).reshape((-1, 3))
+
+        # Write the entry
+        if not self.write_entry(
+                self.get_entry_path(morphology_file_path), meta_data, dict(
+                    points=array_morphology.points,
+                    radii=array_morphology.radii,
+                    sections_offsets=array_morphology.sections_offsets,
+                    sections_types=array_morphology.sections_types,
+                    sections_parents=array_morphology.sections_parents,
+                    sections_ids=array_morphology.sections_ids,
+                    samples_ids=array_morphology.samples_ids,
+                    samples_morphology_indices=array_morphology.samples_morphology_indices,
+                    samples_types=array_morphology.samples_types,
+                    samples_parents_ids=array_morphology.samples_parents_ids,
+                    **soma_arrays)):
+            nmv.logger.log('WARNING: Cannot cache the morphology [%s]' % morphology_file_path)
+            return
+
+        # Keep the cache within its size limit
+        self.evict()
+
+    ################################################################################################
+    # @write_entry
+    ################################################################################################
+    def write_entry(self,
+                    entry_path,
+                    meta_data,
+                    arrays):
+        """Writes a cache entry to a temporary file first, and then moves it to avoid partial
+        entries.
+
+        :param entry_path:
+            The path to the cache entry.
+        :param meta_data:
+            A dictionary with the meta-data of the entry.
+        :param arrays:
+            A dictionary of the arrays of the entry, keyed by their names.
+        :return:
+            True if the entry is written, otherwise False.
+        """
+
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            suffix=nmv.consts.Morphology.CACHE_TEMPORARY_EXTENSION, dir=self.cache_directory)
+        try:
+            with os.fdopen(file_descriptor, 'wb') as file_handle:
+                numpy.savez(file_handle, meta_data=numpy.array(json.dumps(meta_data)), **arrays)
+            os.replace(temporary_path, entry_path)
+        except (IOError, OSError):
+            self.remove_entry(temporary_path)
+            return False
+        return True
+
+    ################################################################################################
+    # @remove_entry
+    ################################################################################################
+    @staticmethod
+    def remove_entry(entry_path):
+        """Removes a cache entry, if it exists.
+
+        :param entry_path:
+            The path to the cache entry.
+        """
+
+        try:
+            os.remove(entry_path)
+        except OSError:
+            pass
+
+    ################################################################################################
+    # @evict
+    ################################################################################################
+    def evict(self):
+        """Removes the least recently used entries until the size of the cache is within the
+        limit, and the orphaned temporary files of the writes that were interrupted.
+        """
+
+        # Collect the entries with their access times and sizes
+        entries = list()
+        for file_name in os.listdir(self.cache_directory):
+            entry_path = '%s/%s' % (self.cache_directory, file_name)
+            try:
+                stat = os.stat(entry_path)
+            except OSError:
+                continue
+
+            # The temporary files that are still written by other processes are kept
+            if file_name.endswith(nmv.consts.Morphology.CACHE_TEMPORARY_EXTENSION):
+                if time.time() - stat.st_mtime > \
+                        nmv.consts.Morphology.CACHE_TEMPORARY_FILE_TIMEOUT:
+                    self.remove_entry(entry_path)
+                continue
+
+            if not file_name.endswith(nmv.consts.Morphology.CACHE_EXTENSION):
+                continue
+            entries.append([stat.st_mtime, stat.st_size, entry_path])
+
+        # Remove the oldest entries first
+        total_size = sum(entry[1] for entry in entries)
+        for _, size, entry_path in sorted(entries):
+            if total_size <= self.maximum_size:
+                break
+            self.remove_entry(entry_path)
+            total_size -= size
+
+    ################################################################################################
+    # @clear
+    ################################################################################################
+    def clear(self):
+        """Removes all the entries and the temporary files in the cache.
+        """
+
+        for file_name in os.listdir(self.cache_directory):
+            if file_name.endswith(nmv.consts.Morphology.CACHE_EXTENSION) or \
+                    file_name.endswith(nmv.consts.Morphology.CACHE_TEMPORARY_EXTENSION):
+                self.remove_entry('%s/%s' % (self.cache_directory, file_name))
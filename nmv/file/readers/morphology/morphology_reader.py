@@ -19,6 +19,7 @@
 import sys, os
 
 import nmv
+import nmv.consts
 import nmv.file
 
 
@@ -99,6 +100,13 @@ def read_morphology_from_file(options):
     # The morphology file path is available from the system options
     morphology_file_path = options.morphology.morphology_file_path
 
+    # If the cache is enabled, load the morphology from the cache
+    if options.morphology.cache_directory is not None:
+        return read_morphology_from_cache(
+            morphology_file_path=morphology_file_path,
+            cache_directory=options.morphology.cache_directory,
+            cache_size=options.morphology.cache_size)
+
     # Get the extension from the file path
     morphology_prefix, morphology_extension = os.path.splitext(morphology_file_path)
 
@@ -170,6 +178,122 @@ def read_morphology_from_file_naively(morphology_file_path):
     return True, morphology_object
 
 
+####################################################################################################
+# @read_morphology_from_cache
+####################################################################################################
+def read_morphology_from_cache(morphology_file_path,
+                               cache_directory,
+                               cache_size=nmv.consts.Morphology.DEFAULT_CACHE_SIZE):
+    """Loads a morphology object from the morphology cache. If the morphology is not cached, or
+    the cached entry is out of date, the morphology file is parsed and then added to the cache.
+
+    :param morphology_file_path:
+        The path where the morphology is.
+    :param cache_directory:
+        The directory of the morphology cache.
+    :param cache_size:
+        The maximum size of the morphology cache in bytes.
+    :return:
+        Morphology object and True (if the morphology is loaded) or False (if the something is
+        wrong).
+    """
+
+    # If the path is not valid
+    if not os.path.isfile(morphology_file_path):
+
+        # Issue an error
+        nmv.logger.log('ERROR: The morphology path [%s] is invalid' % morphology_file_path)
+        return False, None
+
+    # Look up the morphology in the cache
+    cache = nmv.file.readers.MorphologyCache(
+        cache_directory=cache_directory, maximum_size=cache_size)
+    array_morphology = cache.load(morphology_file_path)
+
+    # Cache hit, build the morphology from the arrays
+    if array_morphology is not None:
+        return True, array_morphology.to_morphology()
+
+    # Cache miss, parse the morphology file
+    loading_flag, morphology_object = read_morphology_from_file_naively(morphology_file_path)
+
+    # Add the parsed morphology to the cache
+    if loading_flag:
+        cache.store(morphology_file_path, morphology_object)
+
+    # Return the morphology
+    return loading_flag, morphology_object
+
+
+####################################################################################################
+# @read_array_morphology_from_file
+####################################################################################################
+def read_array_morphology_from_file(morphology_file_path,
+                                    cache_directory=None,
+                                    cache_size=nmv.consts.Morphology.DEFAULT_CACHE_SIZE):
+    """Loads a compact array-based morphology object (nmv.skeleton.ArrayMorphology) from file
+    without building the samples and sections objects. This loader mainly supports .h5 or .swc
+    file formats.
+
+    :param morphology_file_path:
+        The path where the morphology is.
+    :param cache_directory:
+        The directory of the morphology cache, None to parse the file without the cache.
+    :param cache_size:
+        The maximum size of the morphology cache in bytes.
+    :return:
+        ArrayMorphology object and True (if the morphology is loaded) or False (if the something is
+        wrong).
+    """
+
+    # If the path is not valid
+    if not os.path.isfile(morphology_file_path):
+
+        # Issue an error
+        nmv.logger.log('ERROR: The morphology path [%s] is invalid' % morphology_file_path)
+        return False, None
+
+    # Look up the morphology in the cache, if enabled
+    cache = None
+    if cache_directory is not None:
+        cache = nmv.file.readers.MorphologyCache(
+            cache_directory=cache_directory, maximum_size=cache_size)
+        morphology_object = cache.load(morphology_file_path)
+        if morphology_object is not None:
+            return True, morphology_object
+
+    # Get the extension from the file path
+    morphology_prefix, morphology_extension = os.path.splitext(morphology_file_path)
+
+    # If it is a .h5 file, use the h5 loader
+    if '.h5' in morphology_extension:
+        reader = nmv.file.readers.H5Reader(h5_file=morphology_file_path)
+
+    elif '.swc' in morphology_extension:
+        reader = nmv.file.readers.SWCReader(swc_file=morphology_file_path)
+
+    else:
+
+        # Issue an error
+        nmv.logger.log('ERROR: The morphology extension [%s] is NOT SUPPORTED' %
+                       morphology_extension)
+        return False, None
+
+    # Load the morphology
+    morphology_object = reader.read_file_as_array_morphology()
+
+    # If the morphology object is None, return False
+    if morphology_object is None:
+        return False, None
+
+    # Add the parsed morphology to the cache
+    if cache is not None:
+        cache.store(morphology_file_path, morphology_object)
+
+    # The morphology file was loaded successfully
+    return True, morphology_object
+
+
 ####################################################################################################
 # @load_from_circuit
 ####################################################################################################
@@ -182,13 +306,11 @@ def load_from_circuit(options):
     wrong)
     """
 
-    morphology_object = None
-
-    morphology_object = nmv.file.BBPReader.load_morphology_from_circuit(
+    loading_flag, morphology_object = nmv.file.BBPReader.load_morphology_from_circuit(
         blue_config=options.morphology.blue_config, gid=options.morphology.gid)
 
     # If the morphology object is None, return False
-    if morphology_object is None:
+    if not loading_flag or morphology_object is None:
         return False, None
 
     # The morphology file was loaded successfully
@@ -16,7 +16,9 @@
 ####################################################################################################
 
 # System imports
+import gc
 import copy
+import numpy
 
 # Blender imports
 from mathutils import Vector
@@ -26,6 +28,7 @@ import nmv
 import nmv.consts
 import nmv.file
 import nmv.skeleton
+from nmv.analysis.core import morphology_arrays
 
 
 ####################################################################################################
@@ -37,16 +40,30 @@ class SWCReader:
     # @__init__
     ################################################################################################
     def __init__(self,
-                 swc_file):
+                 swc_file,
+                 use_vectorized_parser=True,
+                 use_samples_tree=True):
         """Constructor
 
         :param swc_file:
             A given .SWC morphology file.
+        :param use_vectorized_parser:
+            If True, the samples are parsed in bulk into NumPy arrays, otherwise the file is parsed
+            line by line.
+        :param use_samples_tree:
+            If True, the sections are built in linear time from the tree defined by the parent
+            indices of the samples, otherwise they are built from the connected paths.
         """
 
         # Set the path to the given h5 file
         self.morphology_file = swc_file
 
+        # Use the vectorized (NumPy) parser to read the samples
+        self.use_vectorized_parser = use_vectorized_parser
+
+        # Build the sections from the samples tree rather than from the connected paths
+        self.use_samples_tree = use_samples_tree
+
         # The samples list parsed from the morphology file
         self.parsed_samples_list = list()
 
@@ -209,6 +226,47 @@ class SWCReader:
 
                 self.sections_samples_indices_list.append(section_indices)
 
+    ################################################################################################
+    # @build_sections_from_samples_tree
+    ################################################################################################
+    def build_sections_from_samples_tree(self):
+        """Builds a list of sections directly from the tree that is defined by the parent indices
+        of the samples.
+
+        The branching points and the terminals are identified from the number of children of every
+        sample, and then each section is traced from its first sample till the next branching
+        point or terminal, so the entire tree is traversed only once. The resulting
+        sections_samples_indices_list is identical to the one built by
+        @build_connected_paths_from_samples and @build_sections_from_paths. For the files whose
+        samples are not consecutive, for example with gaps in the indices, the sections are built
+        from the same connected paths with the Blender-free analysis core.
+        """
+
+        # Ignore the dummy sample at index 0
+        if len(self.parsed_samples_list) < 2:
+            return
+        indices, types, _, _, parents = self.get_samples_arrays()
+
+        # The samples tree cannot reproduce the connected paths of non-consecutive samples
+        if not morphology_arrays.can_use_swc_samples_tree(indices, types, parents):
+            nmv.logger.log('WARNING: The samples of [%s] are not consecutive, building the '
+                           'sections from the connected paths' % self.morphology_file)
+            self.sections_samples_indices_list = morphology_arrays.build_swc_sections_paths(
+                indices, types, parents)
+
+        # Trace the sections with the samples tree of the Blender-free analysis core
+        else:
+            self.sections_samples_indices_list = morphology_arrays.build_swc_sections_samples(
+                indices, types, parents)
+
+        # Marking the terminals by adding the indices of the first and last samples
+        for section_indices in self.sections_samples_indices_list:
+            self.sections_terminal_samples_indices.append(section_indices[0])
+            self.sections_terminal_samples_indices.append(section_indices[-1])
+
+        # Filter the repeated entries in the sections_terminal_samples_indices list
+        self.sections_terminal_samples_indices = list(set(self.sections_terminal_samples_indices))
+
     ################################################################################################
     # @read_samples
     ################################################################################################
@@ -313,6 +371,78 @@ class SWCReader:
         for i_sample in self.parsed_samples_list:
             self.samples_list[i_sample[0]] = i_sample
 
+    ################################################################################################
+    # @read_samples_vectorized
+    ################################################################################################
+    def read_samples_vectorized(self):
+        """Reads an SWC file in a single bulk pass into NumPy arrays and returns a list of all the
+        samples in the file.
+
+        The resulting samples lists are identical to those constructed by @read_samples, however,
+        the parsing and the translation of the samples are done with array operations rather than
+        line by line. If the file cannot be parsed into seven columns, this function falls back to
+        @read_samples.
+        """
+
+        # Parse the file in a single flat pass with the parser of the Blender-free analysis core
+        values = morphology_arrays.read_swc_samples_in_bulk(self.morphology_file)
+
+        # If the lines have more or less than seven columns, use the line-by-line parser, which
+        # reads the first seven columns of every line
+        if values is None:
+            nmv.logger.log('WARNING: Cannot parse [%s] in bulk, parsing line by line' %
+                           self.morphology_file)
+            self.read_samples()
+            return
+
+        # Split the columns, the unknown types are basal dendrites and the samples are translated
+        indices, types, points, radii, parents = morphology_arrays.get_swc_samples_arrays(values)
+
+        # Add a dummy sample to the list at index 0 to match the indices
+        # The zeroth sample always defines the soma parameters, and it is parsed independently
+        self.parsed_samples_list.append([0, 0, 0.0, 0.0, 0.0, 0.0, 0])
+
+        # Convert the arrays back to python lists in bulk, the garbage collector is paused since
+        # the new lists cannot have cycles and it would scan them repeatedly while they are created
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self.parsed_samples_list.extend(map(list, zip(
+                indices.tolist(), types.tolist(),
+                points[:, 0].tolist(), points[:, 1].tolist(), points[:, 2].tolist(),
+                radii.tolist(), parents.tolist())))
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        # Create the actual samples list, and take into consideration the added soma sample
+        largest_index = int(indices.max()) if len(indices) > 0 else 0
+        self.samples_list = [None] * (max(largest_index, 0) + 1)
+
+        # Set the samples at their corresponding indices to make it easy to index them, and keep
+        # the rest to Null and double check them later
+        for i_sample in self.parsed_samples_list:
+            self.samples_list[i_sample[0]] = i_sample
+
+    ################################################################################################
+    # @get_samples_arrays
+    ################################################################################################
+    def get_samples_arrays(self):
+        """Gets the parsed samples, except the dummy sample at index 0, as NumPy arrays.
+
+        :return:
+            The arrays of the indices, the types, the Nx3 points, the radii and the indices of the
+            parents of the samples.
+        """
+
+        samples = numpy.array(self.parsed_samples_list[1:], dtype=numpy.float64).reshape((-1, 7))
+        return samples[:, nmv.consts.Arbors.SWC_SAMPLE_INDEX_IDX].astype(numpy.int64), \
+            samples[:, nmv.consts.Arbors.SWC_SAMPLE_TYPE_IDX].astype(numpy.int64), \
+            samples[:, nmv.consts.Arbors.SWC_SAMPLE_X_COORDINATES_IDX:
+                       nmv.consts.Arbors.SWC_SAMPLE_Z_COORDINATES_IDX + 1], \
+            samples[:, nmv.consts.Arbors.SWC_SAMPLE_RADIUS_IDX], \
+            samples[:, nmv.consts.Arbors.SWC_SAMPLE_PARENT_INDEX_IDX].astype(numpy.int64)
+
     ################################################################################################
     # @get_number_stems_from_samples_list
     ################################################################################################
@@ -604,9 +734,7 @@ class SWCReader:
             section.type = arbor_type
 
         # Updates the sections parenting
-        for section in sections_list:
-
-            nmv.skeleton.ops.update_section_parenting(section, sections_list)
+        nmv.skeleton.ops.update_sections_parenting(sections_list)
 
         # Return a list of all the disconnected sections
         return sections_list
@@ -647,13 +775,22 @@ class SWCReader:
         """
 
         # Read all the samples from the morphology file an store them into a list
-        self.read_samples()
+        if self.use_vectorized_parser:
+            self.read_samples_vectorized()
+        else:
+            self.read_samples()
+
+        # Construct the individual sections from the samples tree in a single pass
+        if self.use_samples_tree:
+            self.build_sections_from_samples_tree()
 
-        # Construct the connected paths from the samples list
-        self.build_connected_paths_from_samples()
+        else:
 
-        # Construct the individual sections from the paths
-        self.build_sections_from_paths()
+            # Construct the connected paths from the samples list
+            self.build_connected_paths_from_samples()
+
+            # Construct the individual sections from the paths
+            self.build_sections_from_paths()
 
         # Build the basal dendrites
         basal_dendrites_arbors = self.build_arbors_from_samples(
@@ -728,3 +865,69 @@ class SWCReader:
 
         # Return a reference to the reconstructed morphology skeleton
         return nmv_morphology
+
+    ################################################################################################
+    # @read_file_as_array_morphology
+    ################################################################################################
+    def read_file_as_array_morphology(self):
+        """Reads an SWC morphology file into a NeuroMorphoVis ArrayMorphology without building any
+        sample or section objects.
+
+        The arbors, the sections and the samples are identical to those of @read_file.
+
+        :return:
+            Returns a reference to a NeuroMorphoVis ArrayMorphology that contains the skeleton.
+        """
+
+        # Read all the samples from the morphology file an store them into a list
+        if self.use_vectorized_parser:
+            self.read_samples_vectorized()
+        else:
+            self.read_samples()
+
+        # Construct the individual sections
+        if self.use_samples_tree:
+            self.build_sections_from_samples_tree()
+        else:
+            self.build_connected_paths_from_samples()
+            self.build_sections_from_paths()
+
+        # Lay out the sections per arbor type with the Blender-free analysis core
+        indices, types, points, radii, parents = self.get_samples_arrays()
+        samples_rows = morphology_arrays.get_swc_samples_rows(indices, parents)
+        rows, sections_offsets, sections_types, sections_parents, sections_ids, roots = \
+            morphology_arrays.build_swc_sections_arrays(
+                self.sections_samples_indices_list, indices, types, parents, samples_rows)
+
+        # Build the arbors, if we have more than a single axon or apical dendrite, we use the
+        # principal one and add the others to the basal dendrites list
+        axon_root, dendrites_roots, apical_dendrite_root = morphology_arrays.get_arbors_roots(
+            roots, nmv.consts.Arbors.SWC_AXON_SAMPLE_TYPE,
+            nmv.consts.Arbors.SWC_BASAL_DENDRITE_SAMPLE_TYPE,
+            nmv.consts.Arbors.SWC_APICAL_DENDRITE_SAMPLE_TYPE)
+
+        # Build the soma, similar to @build_soma the first samples of the extra axons and apical
+        # dendrites are counted twice in the arbors profile points
+        arbors_roots = roots[nmv.consts.Arbors.SWC_AXON_SAMPLE_TYPE] + \
+            roots[nmv.consts.Arbors.SWC_APICAL_DENDRITE_SAMPLE_TYPE] + (dendrites_roots or list())
+        arbors_profile_points = [points[rows[sections_offsets[root]]].tolist()
+                                 for root in arbors_roots]
+        soma_centroid, soma_radius, soma_profile_points = morphology_arrays.get_swc_soma_data(
+            types, points, radii, parents, samples_rows, arbors_profile_points)
+        soma = nmv.skeleton.Soma(
+            centroid=Vector(soma_centroid), mean_radius=soma_radius,
+            profile_points=[Vector(point) for point in soma_profile_points],
+            arbors_profile_points=[Vector(point) for point in arbors_profile_points])
+
+        # Update the morphology label
+        label = nmv.file.ops.get_file_name_from_path(self.morphology_file)
+
+        # Construct the morphology skeleton
+        return nmv.skeleton.ArrayMorphology(
+            points=points[rows], radii=radii[rows], sections_offsets=sections_offsets,
+            sections_types=sections_types, sections_parents=sections_parents,
+            sections_ids=sections_ids, samples_ids=indices[rows],
+            samples_morphology_indices=numpy.zeros(len(rows)), samples_types=types[rows],
+            samples_parents_ids=parents[rows], axon_root=axon_root,
+            dendrites_roots=dendrites_roots, apical_dendrite_root=apical_dendrite_root,
+            soma=soma, label=label, number_stems=self.get_number_stems_from_samples_list())
@@ -138,25 +138,10 @@ def append_poly_line_to_base_object(base_object,
         The type of the poly-line: ['POLY', 'BEZIER', 'BSPLINE', 'CARDINAL', 'NURBS']
     """
 
-    # Create a new poly-line object integrated into the base object
-    poly_line_object = base_object.splines.new(poly_line_type)
-
-    # Define the number of samples of the poly-line object
-    # NOTE: Use n-1 points because once the poly-line is created it has already one point added
-
-    poly_line_object.points.add(len(poly_line.samples) - 1)
-
-    # Define the material for this poly-line
-    poly_line_object.material_index = poly_line.material_index
-
-    # Add the points (or the samples) and their radii to the poly-line curve object
-    for i, poly_line_sample in enumerate(poly_line.samples):
-
-        # Sample coordinates
-        poly_line_object.points[i].co = poly_line_sample[0]
-
-        # Sample radius
-        poly_line_object.points[i].radius = poly_line_sample[1]
+    # Create a new poly-line object integrated into the base object, its points are added in bulk
+    nmv.geometry.ops.poly_line_ops.append_poly_lines_to_base_object(
+        base_object=base_object, samples_lists=[poly_line.samples],
+        poly_line_type=poly_line_type, materials_indices=[poly_line.material_index])
 
 
 ####################################################################################################
@@ -387,20 +372,9 @@ def draw_poly_lines_as_single_object(poly_lines_data,
             line_material.diffuse_color = color
             line_data.materials.append(line_material)
 
-    for poly_line_data in poly_lines_data:
-
-        # Add the points along the poly-line
-        # NOTE: add n-1 points to the array, becuase once the poly-line is created it has already
-        # one point added.
-        # Options: ['POLY', 'BEZIER', 'BSPLINE', 'CARDINAL', 'NURBS']
-        poly_line_strip = line_data.splines.new('POLY')
-        poly_line_strip.points.add(len(poly_line_data) - 1)
-
-        # Add the points (or the samples) and their radii to the poly-line curve
-        for i, point in enumerate(poly_line_data):
-
-            poly_line_strip.points[i].co = point[0]
-            poly_line_strip.points[i].radius = point[1]
+    # Add the points (or the samples) and their radii of all the poly-lines in bulk
+    nmv.geometry.ops.poly_line_ops.append_poly_lines_to_base_object(
+        base_object=line_data, samples_lists=poly_lines_data, poly_line_type='POLY')
 
     # Create a curve that uses the curve_data.
     line_strip = bpy.data.objects.new(str(name), line_data)
@@ -16,6 +16,9 @@
 # MA 02110-1301 USA.
 ####################################################################################################
 
+# System imports
+import numpy
+
 # Blender imports
 import bpy
 from mathutils import Vector, Matrix
@@ -27,6 +30,11 @@ import nmv.geometry
 import nmv.enums
 
 
+# Write the points of the poly-lines in bulk with foreach_set, otherwise point by point through the
+# RNA layer, which is only kept to benchmark the bulk construction
+BULK_CURVE_CONSTRUCTION = True
+
+
 ####################################################################################################
 # @sample_to_point
 ####################################################################################################
@@ -114,6 +122,88 @@ def compute_poly_line_length(poly_line):
     return poly_line_length
 
 
+####################################################################################################
+# @flatten_poly_lines_samples
+####################################################################################################
+def flatten_poly_lines_samples(samples_lists):
+    """Flattens the samples of a list of poly-lines into contiguous arrays of coordinates and radii.
+
+    :param samples_lists:
+        A list of the samples of every poly-line, where every sample is a [(x, y, z, w), radius].
+    :return:
+        The [x, y, z, w] coordinates of all the samples in a flat float32 array, their radii in
+        another float32 array and a list of the number of samples of every poly-line.
+    """
+
+    # The number of samples of every poly-line
+    numbers_samples = [len(samples) for samples in samples_lists]
+    total_number_samples = sum(numbers_samples)
+
+    # The coordinates and the radii of all the samples, in the order of the poly-lines
+    coordinates = numpy.fromiter(
+        (value for samples in samples_lists for sample in samples for value in sample[0]),
+        dtype=numpy.float32, count=4 * total_number_samples)
+    radii = numpy.fromiter(
+        (sample[1] for samples in samples_lists for sample in samples),
+        dtype=numpy.float32, count=total_number_samples)
+
+    return coordinates, radii, numbers_samples
+
+
+####################################################################################################
+# @append_poly_lines_to_base_object
+####################################################################################################
+def append_poly_lines_to_base_object(base_object,
+                                     samples_lists,
+                                     poly_line_type='POLY',
+                                     materials_indices=None):
+    """Appends a list of poly-lines to a previously created poly-lines object, a spline per
+    poly-line. The samples of all the poly-lines are flattened once, and the points of every spline
+    are written with two foreach_set calls instead of an RNA assignment per point.
+
+    :param base_object:
+        A previously created poly-lines object (curve data).
+    :param samples_lists:
+        A list of the samples of every poly-line, where every sample is a [(x, y, z, w), radius].
+    :param poly_line_type:
+        The type of the poly-lines: ['POLY', 'BEZIER', 'BSPLINE', 'CARDINAL', 'NURBS']
+    :param materials_indices:
+        An optional list of the material index of every poly-line.
+    """
+
+    # Flatten all the samples into contiguous arrays
+    coordinates, radii, numbers_samples = flatten_poly_lines_samples(samples_lists)
+
+    # The index of the first sample of the current poly-line in the flat arrays
+    offset = 0
+    for i, number_samples in enumerate(numbers_samples):
+
+        # Create a new spline integrated into the base object
+        poly_line_object = base_object.splines.new(poly_line_type)
+
+        # NOTE: Use n-1 points because once the spline is created it has already one point added
+        poly_line_object.points.add(number_samples - 1)
+
+        # Define the material for this poly-line
+        if materials_indices is not None:
+            poly_line_object.material_index = materials_indices[i]
+
+        # Add the points (or the samples) and their radii to the spline in bulk
+        if BULK_CURVE_CONSTRUCTION:
+            poly_line_object.points.foreach_set(
+                'co', coordinates[4 * offset:4 * (offset + number_samples)])
+            poly_line_object.points.foreach_set(
+                'radius', radii[offset:offset + number_samples])
+
+        # Or point by point
+        else:
+            for j, poly_line_sample in enumerate(samples_lists[i]):
+                poly_line_object.points[j].co = poly_line_sample[0]
+                poly_line_object.points[j].radius = poly_line_sample[1]
+
+        offset += number_samples
+
+
 ####################################################################################################
 # @append_poly_line_to_base_object
 ####################################################################################################
@@ -133,24 +223,9 @@ def append_poly_line_to_base_object(base_object,
         The type of the poly-line: ['POLY', 'BEZIER', 'BSPLINE', 'CARDINAL', 'NURBS']
     """
 
-    # Create a new poly-line object integrated into the base object
-    poly_line_object = base_object.splines.new(poly_line_type)
-
-    # Define the number of samples of the poly-line object
-    # NOTE: Use n-1 points because once the poly-line is created it has already one point added
-
-    poly_line_object.points.add(len(poly_line.samples) - 1)
-
-    # Define the material for this poly-line
-    poly_line_object.material_index = poly_line.material_index
-
-    # Add the points (or the samples) and their radii to the poly-line curve object
-    for i, poly_line_sample in enumerate(poly_line.samples):
-        # Sample coordinates
-        poly_line_object.points[i].co = poly_line_sample[0]
-
-        # Sample radius
-        poly_line_object.points[i].radius = poly_line_sample[1]
+    append_poly_lines_to_base_object(
+        base_object=base_object, samples_lists=[poly_line.samples],
+        poly_line_type=poly_line_type, materials_indices=[poly_line.material_index])
 
 
 ####################################################################################################
@@ -236,17 +311,10 @@ def draw_poly_line(poly_line_data,
             line_material.diffuse_color = color
             line_data.materials.append(line_material)
 
-    # Add the points along the poly-line
-    # NOTE: add n-1 points to the array, because once the poly-line is created it has already one
-    # point added.
+    # Add the points (or the samples) and their radii along the poly-line
     # Options: ['POLY', 'BEZIER', 'BSPLINE', 'CARDINAL', 'NURBS']
-    poly_line_strip = line_data.splines.new(curve_style)
-    poly_line_strip.points.add(len(poly_line_data) - 1)
-
-    # Add the points (or the samples) and their radii to the poly-line curve
-    for i, point in enumerate(poly_line_data):
-        poly_line_strip.points[i].co = point[0]
-        poly_line_strip.points[i].radius = point[1]
+    append_poly_lines_to_base_object(
+        base_object=line_data, samples_lists=[poly_line_data], poly_line_type=curve_style)
 
     # Create a curve that uses the curve_data.
     line_strip = bpy.data.objects.new(str(name), line_data)
@@ -334,10 +402,12 @@ def draw_poly_lines_in_single_object(poly_lines,
     else:
         poly_line_type = 'NURBS'
 
-    # Append the poly-lines
-    for poly_line in poly_lines:
-        append_poly_line_to_base_object(
-            base_object=poly_lines_object, poly_line=poly_line, poly_line_type=poly_line_type)
+    # Append all the poly-lines at once
+    append_poly_lines_to_base_object(
+        base_object=poly_lines_object,
+        samples_lists=[poly_line.samples for poly_line in poly_lines],
+        poly_line_type=poly_line_type,
+        materials_indices=[poly_line.material_index for poly_line in poly_lines])
 
     # Create the aggregate object to be linked to the scene later
     aggregate_poly_lines_object = bpy.data.objects.new(
@@ -21,4 +21,6 @@ from .morphology_analysis import *
 from .neuron_mesh_reconstruction import *
 from .neuron_morphology_reconstruction import *
 from .soma_reconstruction import *
+from .neuron_workflow import *
+from .neuron_worker import *
 from .options_parser import *
@@ -56,6 +56,18 @@ class Args:
     # A path to a blue config or circuit file
     BLUE_CONFIG = '--blue-config'
 
+    # A file that lists multiple GIDs, one GID per line
+    GIDS_FILE = '--gids-file'
+
+    # A file that maps the labels of the morphologies to their morphological types (mtypes)
+    MTYPES_FILE = '--mtypes-file'
+
+    # A directory where the parsed morphologies are cached between the runs
+    MORPHOLOGY_CACHE_DIRECTORY = '--morphology-cache-directory'
+
+    # The maximum size of the morphology cache in MB
+    MORPHOLOGY_CACHE_SIZE = '--morphology-cache-size'
+
     ################################################################################################
     # Output arguments
     ################################################################################################
@@ -67,7 +79,22 @@ class Args:
     ################################################################################################
     # Analyze morphology
     ANALYZE_MORPHOLOGY = '--analyze-morphology'
-    
+
+    # Analyze a population of morphologies and aggregate the results per mtype
+    ANALYZE_POPULATION = '--analyze-population'
+
+    # The format of the analysis table, one row per morphology and arbor and one column per variable
+    ANALYSIS_TABLE_FORMAT = '--analysis-table-format'
+
+    # Plot the per-arbor distributions of the analyzed morphologies
+    PLOT_DISTRIBUTIONS = '--plot-distributions'
+
+    # The resolution of the figures of the distributions, zero to skip them
+    PLOTS_DPI = '--plots-dpi'
+
+    # The resolution of the PNG previews of the figures of the distributions
+    PLOTS_PREVIEW_DPI = '--plots-preview-dpi'
+
     ################################################################################################
     # Soma reconstruction arguments
     ################################################################################################
@@ -284,6 +311,9 @@ class Args:
     # Scale factor for increasing the resolution of the to-scale images
     RESOLUTION_SCALE_FACTOR = '--resolution-scale-factor'
 
+    # The threshold of the level of detail of the skeleton in pixels
+    LOD_PIXEL_THRESHOLD = '--lod-pixel-threshold'
+
     ################################################################################################
     # Execution arguments
     ################################################################################################
@@ -295,3 +325,39 @@ class Args:
 
     # Job granularity
     JOB_GRANULARITY = '--job-granularity'
+
+    # Run all the tasks of a neuron in a single Blender session
+    SINGLE_SESSION = '--single-session'
+
+    # Number of jobs running in parallel on the local node
+    NUMBER_LOCAL_JOBS = '--number-local-jobs'
+
+    # The timeout of every local job in seconds
+    JOB_TIMEOUT = '--job-timeout'
+
+    # The number of times a failed local job is executed again
+    JOB_RETRIES = '--job-retries'
+
+    # Number of persistent Blender workers processing the local jobs
+    NUMBER_BLENDER_WORKERS = '--number-blender-workers'
+
+    # Resume a previous run, and skip the completed jobs
+    RESUME = '--resume'
+
+    # Submit the neurons to the cluster as a single SLURM job array
+    SLURM_ARRAY = '--slurm-array'
+
+    # The number of neurons processed by every task of the SLURM job array
+    NEURONS_PER_ARRAY_TASK = '--neurons-per-array-task'
+
+    # The user name of the SLURM jobs
+    SLURM_USER = '--slurm-user'
+
+    # The maximum number of pending and running SLURM jobs of the user
+    SLURM_MAX_JOBS = '--slurm-max-jobs'
+
+    # Report the states of the SLURM jobs of a previous run in the output directory
+    SLURM_STATUS = '--slurm-status'
+
+    # The order of the neurons on the local workers and in the tasks of the SLURM job arrays
+    LOAD_BALANCING = '--load-balancing'
@@ -85,26 +85,42 @@ def parse_command_line_arguments():
         help=arg_help)
 
     # Cell GID, requires a circuit configuration
-    arg_help = 'Cell GID (requires BBP circuit).'
+    arg_help = 'Cell GID (requires a circuit).'
     input_args.add_argument(
         Args.GID,
         action='store', default=None,
         help=arg_help)
 
     # Cell target
-    arg_help = 'Cell target in target file (requires BBP circuit).'
+    arg_help = 'Cell target in target file (requires a circuit).'
     input_args.add_argument(
         Args.TARGET,
         action='store', default=None,
         help=arg_help)
 
     # Circuit configuration
-    arg_help = 'BBP circuit configuration'
+    arg_help = 'BBP circuit configuration, or the JSON file of a circuit'
     input_args.add_argument(
         Args.BLUE_CONFIG,
         action='store', default=None,
         help=arg_help)
 
+    # Morphology cache directory
+    arg_help = 'A directory where the parsed morphologies are cached to skip parsing them \n' \
+               'again in the next runs. Default: None, the cache is disabled.'
+    input_args.add_argument(
+        Args.MORPHOLOGY_CACHE_DIRECTORY,
+        action='store', default=None,
+        help=arg_help)
+
+    # Morphology cache size
+    arg_help = 'The maximum size of the morphology cache in MB. \n' \
+               'Default 1024.'
+    input_args.add_argument(
+        Args.MORPHOLOGY_CACHE_SIZE,
+        action='store', type=int, default=1024,
+        help=arg_help)
+
     ################################################################################################
     # Output arguments
     ################################################################################################
@@ -682,6 +698,16 @@ def parse_command_line_arguments():
         action='store', type=float, default=1.0,
         help=arg_help)
 
+    # Level of detail of the skeleton for the wide-shot images
+    arg_help = 'Simplify the skeleton for the rendered image, where the samples and sub-trees \n' \
+               'whose projections are smaller than this threshold in pixels are not drawn. \n' \
+               'Valid only for wide-shot images. \n' \
+               'Default 0 (draw the whole skeleton).'
+    rendering_args.add_argument(
+        Args.LOD_PIXEL_THRESHOLD,
+        action='store', type=float, default=0.0,
+        help=arg_help)
+
     ################################################################################################
     # Execution arguments
     ################################################################################################
@@ -713,6 +739,111 @@ def parse_command_line_arguments():
         action='store', default='low',
         help=arg_help)
 
+    # Single session
+    arg_help = 'Run all the requested tasks of a neuron in a single Blender session that \n' \
+               'loads the morphology only once, instead of a session per task.'
+    execution_args.add_argument(
+        Args.SINGLE_SESSION,
+        action='store_true', default=False,
+        help=arg_help)
+
+    # Number of local jobs
+    arg_help = 'Number of jobs running in parallel on the local node, when the input is a \n' \
+               'directory. Default 0, use all the cores of the node.'
+    execution_args.add_argument(
+        Args.NUMBER_LOCAL_JOBS,
+        action='store', type=int, default=0,
+        help=arg_help)
+
+    # Job timeout
+    arg_help = 'The timeout of every local job in seconds, the job is killed afterwards. \n' \
+               'Default 0, no timeout.'
+    execution_args.add_argument(
+        Args.JOB_TIMEOUT,
+        action='store', type=float, default=0,
+        help=arg_help)
+
+    # Job retries
+    arg_help = 'The number of times a failed or timed out local job is executed again. \n' \
+               'Default 0.'
+    execution_args.add_argument(
+        Args.JOB_RETRIES,
+        action='store', type=int, default=0,
+        help=arg_help)
+
+    # Blender workers
+    arg_help = 'Number of persistent Blender workers that process the local jobs of a \n' \
+               'directory without restarting Blender for every morphology. \n' \
+               'Default 0, a Blender process is started for every job.'
+    execution_args.add_argument(
+        Args.NUMBER_BLENDER_WORKERS,
+        action='store', type=int, default=0,
+        help=arg_help)
+
+    # Resume
+    arg_help = 'Resume a previous run in the same output directory without removing its \n' \
+               'results. The jobs recorded as completed in the manifest of the run, with \n' \
+               'the same input and options, are skipped.'
+    execution_args.add_argument(
+        Args.RESUME,
+        action='store_true', default=False,
+        help=arg_help)
+
+    # SLURM job array
+    arg_help = 'Submit all the neurons to the cluster as a single SLURM job array, where \n' \
+               'every array task processes several neurons, instead of a job per neuron.'
+    execution_args.add_argument(
+        Args.SLURM_ARRAY,
+        action='store_true', default=False,
+        help=arg_help)
+
+    # Neurons per array task
+    arg_help = 'The number of neurons processed by every task of the SLURM job array. \n' \
+               'Default 0, derived from the estimated time of the requested tasks per \n' \
+               'neuron and the session time of the array tasks.'
+    execution_args.add_argument(
+        Args.NEURONS_PER_ARRAY_TASK,
+        action='store', type=int, default=0,
+        help=arg_help)
+
+    # SLURM user
+    arg_help = 'The user name of the SLURM jobs, to count the jobs on the cluster. \n' \
+               'Default $USER.'
+    execution_args.add_argument(
+        Args.SLURM_USER,
+        action='store', default=None,
+        help=arg_help)
+
+    # Maximum number of SLURM jobs
+    arg_help = 'The maximum number of pending and running SLURM jobs, or array tasks, of \n' \
+               'the user. Default 500.'
+    execution_args.add_argument(
+        Args.SLURM_MAX_JOBS,
+        action='store', type=int, default=500,
+        help=arg_help)
+
+    # SLURM status
+    arg_help = 'Report the state of every job submitted to the cluster by a previous run in \n' \
+               'the output directory from the accounting of SLURM, and exit without \n' \
+               'running any job.'
+    execution_args.add_argument(
+        Args.SLURM_STATUS,
+        action='store_true', default=False,
+        help=arg_help)
+
+    # Load balancing
+    arg_options = ['cost', 'order']
+    arg_help = 'The order of the neurons of a directory on the local workers and in the \n' \
+               'tasks of the SLURM job arrays. \n' \
+               'Options: %s \n' \
+               'Default cost, the cost of every neuron is estimated from the size of its \n' \
+               'morphology and the requested tasks, and the most expensive neurons are \n' \
+               'processed first, otherwise the neurons are processed in their order.' % arg_options
+    execution_args.add_argument(
+        Args.LOAD_BALANCING,
+        action='store', default='cost', choices=arg_options,
+        help=arg_help)
+
     # Parse the arguments, and return a list of them
     return parser.parse_args()
 
@@ -857,36 +988,23 @@ def get_arguments_string_for_individual_gid(arguments,
 
 
 ####################################################################################################
-# @create_shell_commands
+# @get_requested_cli_interfaces
 ####################################################################################################
-def create_shell_commands(arguments,
-                          arguments_string):
-    """Creates a list of all the shell commands that are needed to run the different tasks set
-    in the configuration file.
+def get_requested_cli_interfaces(arguments):
+    """Gets the names of the CLI interfaces that are needed to run the different tasks set in the
+    configuration file, in the order of their execution.
 
     :param arguments:
         Input arguments.
-    :param arguments_string:
-        A string that will be given to each CLI command.
     :return:
-        A list of commands to be appended to the SLURM scripts or directly executed on a local node.
+        A list of the names of the CLI interfaces, without the .py extension.
     """
 
-    shell_commands = list()
-
-    # Retrieve the path to the CLIs
-    cli_interface_path = os.path.dirname(os.path.realpath(__file__))
-    cli_soma_reconstruction = '%s/soma_reconstruction.py' % cli_interface_path
-    cli_morphology_reconstruction = '%s/neuron_morphology_reconstruction.py' % cli_interface_path
-    cli_morphology_analysis = '%s/morphology_analysis.py' % cli_interface_path
-    cli_mesh_reconstruction = '%s/neuron_mesh_reconstruction.py' % cli_interface_path
+    cli_interfaces = list()
 
     # Morphology analysis task: call the @cli_morphology_analysis interface
     if arguments.analyze_morphology:
-
-        # Add this command to the list
-        shell_commands.append('%s -b --verbose 0 --python %s -- %s' %
-                              (arguments.blender, cli_morphology_analysis, arguments_string))
+        cli_interfaces.append('morphology_analysis')
 
     # Morphology reconstruction task: call the @cli_morphology_reconstruction interface
     if arguments.reconstruct_morphology_skeleton or         \
@@ -896,10 +1014,7 @@ def create_shell_commands(arguments,
        arguments.export_morphology_swc or                   \
        arguments.export_morphology_h5 or                    \
        arguments.export_morphology_blend:
-
-        # Add this command to the list
-        shell_commands.append('%s -b --verbose 0 --python %s -- %s' %
-                              (arguments.blender, cli_morphology_reconstruction, arguments_string))
+        cli_interfaces.append('neuron_morphology_reconstruction')
 
     # Soma-related task: call the @cli_soma_reconstruction interface
     if arguments.reconstruct_soma_mesh or                   \
@@ -911,10 +1026,7 @@ def create_shell_commands(arguments,
        arguments.export_soma_mesh_obj or                    \
        arguments.export_soma_mesh_stl or                    \
        arguments.export_soma_mesh_blend:
-
-        # Add this command to the list
-        shell_commands.append('%s -b --verbose 0 --python %s -- %s' %
-                              (arguments.blender, cli_soma_reconstruction, arguments_string))
+        cli_interfaces.append('soma_reconstruction')
 
     # Neuron mesh reconstruction related task: call the @cli_mesh_reconstruction interface
     if arguments.reconstruct_neuron_mesh or                 \
@@ -924,10 +1036,52 @@ def create_shell_commands(arguments,
        arguments.export_neuron_mesh_obj or                  \
        arguments.export_neuron_mesh_stl or                  \
        arguments.export_neuron_mesh_blend:
+        cli_interfaces.append('neuron_mesh_reconstruction')
+
+    # Return a list of the interfaces
+    return cli_interfaces
+
 
-        # Add this command to the list
-        shell_commands.append('%s -b --verbose 0 --python %s -- %s' %
-                              (arguments.blender, cli_mesh_reconstruction, arguments_string))
+####################################################################################################
+# @create_shell_commands
+####################################################################################################
+def create_shell_commands(arguments,
+                          arguments_string):
+    """Creates a list of all the shell commands that are needed to run the different tasks set
+    in the configuration file.
+
+    If the single session option is set, all the tasks are executed by the @cli_neuron_workflow
+    interface in a single Blender session.
+
+    Notes:
+        # -b : Blender background mode
+        # --verbose : Turn off all the verbose messages
+        # -- : Separate the framework arguments from those given to Blender
+    :param arguments:
+        Input arguments.
+    :param arguments_string:
+        A string that will be given to each CLI command.
+    :return:
+        A list of commands to be appended to the SLURM scripts or directly executed on a local node.
+    """
+
+    # Retrieve the path to the CLIs
+    cli_interface_path = os.path.dirname(os.path.realpath(__file__))
+
+    # Get the interfaces of the requested tasks
+    cli_interfaces = get_requested_cli_interfaces(arguments)
+
+    # Run all the tasks in a single session, if more than one task is requested
+    if arguments.single_session and len(cli_interfaces) > 1:
+        cli_interfaces = ['neuron_workflow']
+
+    # Create a command for every interface, where an exception in the Python script makes Blender
+    # exit with a non-zero code to mark the job as failed
+    shell_commands = list()
+    for cli_interface in cli_interfaces:
+        shell_commands.append('%s -b --verbose 0 --python-exit-code 1 --python %s/%s.py -- %s' %
+                              (arguments.blender, cli_interface_path, cli_interface,
+                               arguments_string))
 
     # Return a list of commands
     return shell_commands
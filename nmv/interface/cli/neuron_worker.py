@@ -0,0 +1,170 @@
+####################################################################################################
+# Copyright (c) 2016 - 2019, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import sys
+import json
+import socket
+import time
+import traceback
+
+# Blender imports
+import bpy
+
+import os
+
+# Append the internal modules into the system paths to avoid Blender importing conflicts
+import_paths = ['neuromorphovis']
+for import_path in import_paths:
+    sys.path.append(('%s/../../..' % (os.path.dirname(os.path.realpath(__file__)))))
+
+# Internal imports
+import nmv
+import nmv.file
+import nmv.interface
+import nmv.options
+import nmv.scene
+
+
+####################################################################################################
+# @send_worker_message
+####################################################################################################
+def send_worker_message(connection_file,
+                        message):
+    """Sends a message from the worker to the driver as a single JSON line.
+
+    :param connection_file:
+        A file object of the connection to the driver.
+    :param message:
+        A dictionary with the message.
+    """
+
+    connection_file.write(json.dumps(message) + '\n')
+    connection_file.flush()
+
+
+####################################################################################################
+# @process_worker_job
+####################################################################################################
+def process_worker_job(job,
+                       connection_file):
+    """Runs a single job in a cleared scene and reports its result to the driver.
+
+    :param job:
+        A dictionary with the name of the job and the list of its command line arguments, that are
+        the same arguments given to the other CLI interfaces.
+    :param connection_file:
+        A file object of the connection to the driver.
+    """
+
+    start_time = time.time()
+    send_worker_message(connection_file, {'event': 'started', 'job': job['job']})
+
+    status = 'DONE'
+    error = None
+    try:
+
+        # Parse the arguments of the job
+        sys.argv = ['neuron_worker.py'] + job['arguments']
+        arguments = nmv.interface.cli.parse_command_line_arguments()
+
+        # Get the options from the arguments
+        cli_options = nmv.options.NeuroMorphoVisOptions()
+        cli_options.consume_arguments(arguments=arguments)
+
+        # Every job starts with an empty scene
+        nmv.scene.clear_scene()
+
+        # Read the morphology
+        cli_morphology = nmv.interface.cli.load_cli_morphology(
+            arguments=arguments, cli_options=cli_options)
+
+        if cli_morphology is None:
+            status = 'FAILED'
+            error = 'Cannot load the morphology'
+
+        # Run all the tasks
+        else:
+            nmv.interface.cli.run_neuron_workflow(
+                arguments=arguments, cli_morphology=cli_morphology, cli_options=cli_options)
+
+    # The argument parser exits on invalid arguments, the worker must keep running
+    except SystemExit:
+        status = 'FAILED'
+        error = 'Invalid arguments'
+
+    except Exception:
+        status = 'FAILED'
+        error = traceback.format_exc()
+
+    send_worker_message(connection_file, {'event': 'finished', 'job': job['job'],
+                                          'status': status, 'error': error,
+                                          'duration': time.time() - start_time})
+
+
+####################################################################################################
+# @run_worker
+####################################################################################################
+def run_worker(host,
+               port):
+    """Connects to the driver and processes the jobs it sends until it asks the worker to quit or
+    it closes the connection.
+
+    :param host:
+        The host of the driver, typically the local host.
+    :param port:
+        The port where the driver listens to this worker.
+    """
+
+    connection = socket.create_connection((host, port))
+    connection_file = connection.makefile('rw')
+
+    # Tell the driver that the worker is ready, after Blender and NeuroMorphoVis are loaded
+    send_worker_message(connection_file, {'event': 'ready', 'pid': os.getpid()})
+
+    for line in connection_file:
+        request = json.loads(line)
+        if request['command'] == 'quit':
+            break
+        process_worker_job(request, connection_file)
+
+    connection_file.close()
+    connection.close()
+
+
+####################################################################################################
+# @ Run the main function if invoked from the command line.
+####################################################################################################
+if __name__ == "__main__":
+
+    # Ignore blender extra arguments required to launch blender given to the command line interface
+    args = sys.argv
+    sys.argv = args[args.index("--") + 1:]
+
+    # The address of the driver, given as --address=host:port
+    address = None
+    for argument in sys.argv:
+        if argument.startswith('--address='):
+            address = argument.split('=', 1)[1]
+
+    if address is None:
+        nmv.logger.log('ERROR: Please set the address of the driver, --address=host:port')
+        exit(1)
+
+    # Process the jobs
+    worker_host, worker_port = address.rsplit(':', 1)
+    run_worker(host=worker_host, port=int(worker_port))
@@ -0,0 +1,194 @@
+####################################################################################################
+# Copyright (c) 2016 - 2019, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import sys
+
+# Blender imports
+import bpy
+
+import os
+
+# Append the internal modules into the system paths to avoid Blender importing conflicts
+import_paths = ['neuromorphovis']
+for import_path in import_paths:
+    sys.path.append(('%s/../../..' % (os.path.dirname(os.path.realpath(__file__)))))
+
+# Internal imports
+import nmv
+import nmv.builders
+import nmv.consts
+import nmv.enums
+import nmv.file
+import nmv.interface
+import nmv.options
+import nmv.rendering
+import nmv.scene
+
+
+####################################################################################################
+# @load_cli_morphology
+####################################################################################################
+def load_cli_morphology(arguments,
+                        cli_options):
+    """Loads the morphology given to the command line interface (CLI), either from a circuit or
+    from a morphology file.
+
+    :param arguments:
+        Parsed command line arguments.
+    :param cli_options:
+        System options parsed from the command line interface (CLI).
+    :return:
+        A reference to the loaded morphology, or None if the morphology cannot be loaded.
+    """
+
+    # If the input is a GID, then open the circuit and read it
+    if arguments.input == 'gid':
+
+        # Load the morphology from the file
+        loading_flag, cli_morphology = nmv.file.BBPReader.load_morphology_from_circuit(
+            blue_config=cli_options.morphology.blue_config,
+            gid=cli_options.morphology.gid)
+
+        if not loading_flag:
+            nmv.logger.log('ERROR: Cannot load the GID [%s] from the circuit [%s]' %
+                           (str(cli_options.morphology.gid), cli_options.morphology.blue_config))
+            return None
+
+    # If the input is a morphology file, then use the parser to load it directly
+    elif arguments.input == 'file':
+
+        # Read the morphology file
+        loading_flag, cli_morphology = nmv.file.read_morphology_from_file(options=cli_options)
+
+        if not loading_flag:
+            nmv.logger.log('ERROR: Cannot load the morphology file [%s]' %
+                           str(cli_options.morphology.morphology_file_path))
+            return None
+
+    else:
+        nmv.logger.log('ERROR: Invalid input option')
+        return None
+
+    # Return a reference to the morphology
+    return cli_morphology
+
+
+####################################################################################################
+# @run_neuron_workflow
+####################################################################################################
+def run_neuron_workflow(arguments,
+                        cli_morphology,
+                        cli_options):
+    """Runs all the requested tasks of a neuron in the current Blender session.
+
+    The tasks are executed in the same order of the separate CLI interfaces. The morphology is
+    loaded only once and shared between the tasks, and the soft body soma mesh is reconstructed
+    only once and reused by the tasks that need it.
+
+    :param arguments:
+        Parsed command line arguments.
+    :param cli_morphology:
+        The morphology loaded from the command line interface (CLI).
+    :param cli_options:
+        System options parsed from the command line interface (CLI).
+    """
+
+    # Reuse the soma mesh between the different tasks
+    cli_options.soma.reuse_reconstructed_mesh = True
+
+    # Get the requested tasks
+    cli_interfaces = nmv.interface.cli.get_requested_cli_interfaces(arguments)
+
+    # Morphology analysis
+    if 'morphology_analysis' in cli_interfaces:
+        nmv.logger.header('Morphology analysis')
+        nmv.interface.cli.analyze_morphology_skeleton(
+            cli_morphology=cli_morphology, cli_options=cli_options)
+
+    # Neuron morphology reconstruction and visualization
+    if 'neuron_morphology_reconstruction' in cli_interfaces:
+        nmv.logger.header('Morphology reconstruction')
+        nmv.interface.cli.reconstruct_neuron_morphology(
+            cli_morphology=cli_morphology, cli_options=cli_options)
+
+    # Soma mesh reconstruction and visualization
+    if 'soma_reconstruction' in cli_interfaces:
+        nmv.logger.header('Soma reconstruction')
+        nmv.interface.cli.reconstruct_soma_three_dimensional_profile_mesh(
+            cli_morphology=cli_morphology, cli_options=cli_options)
+
+    # Neuron mesh reconstruction and visualization
+    if 'neuron_mesh_reconstruction' in cli_interfaces:
+        nmv.logger.header('Mesh reconstruction')
+        nmv.interface.cli.reconstruct_neuron_mesh(
+            cli_morphology=cli_morphology, cli_options=cli_options)
+
+        # Saving the mesh
+        if cli_options.mesh.export_ply or cli_options.mesh.export_obj or \
+           cli_options.mesh.export_stl or cli_options.mesh.export_blend:
+            nmv.interface.cli.export_neuron_mesh(
+                cli_morphology=cli_morphology, cli_options=cli_options)
+
+        # Render the mesh
+        if cli_options.mesh.render:
+            nmv.interface.cli.render_neuron_mesh_to_static_frame(
+                cli_options=cli_options, cli_morphology=cli_morphology)
+
+        # Render 360 of the mesh
+        if cli_options.mesh.render_360:
+            nmv.interface.cli.render_neuron_mesh_360(
+                cli_options=cli_options, cli_morphology=cli_morphology)
+
+    # Leave the scene empty
+    nmv.scene.ops.clear_scene()
+
+
+####################################################################################################
+# @ Run the main function if invoked from the command line.
+####################################################################################################
+if __name__ == "__main__":
+
+    # Ignore blender extra arguments required to launch blender given to the command line interface
+    args = sys.argv
+    sys.argv = args[args.index("--") + 1:]
+
+    # Parse the command line arguments, filter them and report the errors
+    arguments = nmv.interface.cli.parse_command_line_arguments()
+
+    # Verify the output directory before screwing things !
+    if not nmv.file.ops.path_exists(arguments.output_directory):
+        nmv.logger.log('ERROR: Please set the output directory to a valid path')
+        exit(1)
+    else:
+        print('Output: [%s]' % arguments.output_directory)
+
+    # Get the options from the arguments
+    cli_options = nmv.options.NeuroMorphoVisOptions()
+
+    # Convert the CLI arguments to system options
+    cli_options.consume_arguments(arguments=arguments)
+
+    # Read the morphology only once for all the tasks
+    cli_morphology = load_cli_morphology(arguments=arguments, cli_options=cli_options)
+    if cli_morphology is None:
+        exit(1)
+
+    # Run all the tasks
+    run_neuron_workflow(arguments=arguments, cli_morphology=cli_morphology,
+                        cli_options=cli_options)
+    nmv.logger.log('NMV Done')
@@ -79,7 +79,7 @@ def reconstruct_soma_three_dimensional_profile_mesh(cli_morphology,
     nmv.scene.ops.clear_scene()
 
     # Create a soma builder object
-    soma_softbody_builder = nmv.builders.SomaSoftBodyBuilder(cli_morphology, cli_options)
+    soma_builder = nmv.builders.SomaSoftBodyBuilder(cli_morphology, cli_options)
 
     # Reconstruct the three-dimensional profile of the soma mesh
     soma_mesh = soma_builder.reconstruct_soma_mesh()
@@ -192,7 +192,7 @@ if __name__ == "__main__":
     # Verify the output directory before screwing things !
     if not nmv.file.ops.path_exists(arguments.output_directory):
         nmv.logger.log('ERROR: Please set the output directory to a valid path')
-        exit(0)
+        exit(1)
     else:
         print('Output: [%s]' % arguments.output_directory)
 
@@ -216,7 +216,7 @@ if __name__ == "__main__":
         if not loading_flag:
             nmv.logger.log('ERROR: Cannot load the GID [%s] from the circuit [%s]' %
                            cli_options.morphology.blue_config, str(cli_options.morphology.gid))
-            exit(0)
+            exit(1)
 
     # If the input is a morphology file, then use the parser to load it directly
     elif arguments.input == 'file':
@@ -227,11 +227,11 @@ if __name__ == "__main__":
         if not loading_flag:
             nmv.logger.log('ERROR: Cannot load the morphology file [%s]' %
                            str(cli_options.morphology.morphology_file_path))
-            exit(0)
+            exit(1)
 
     else:
         nmv.logger.log('ERROR: Invalid input option')
-        exit(0)
+        exit(1)
 
     # TODO: Implement the render_soma_two_dimensional_profile() function
     # render_soma_two_dimensional_profile(cli_morphology=cli_morphology, cli_options=cli_options)
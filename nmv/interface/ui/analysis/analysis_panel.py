@@ -128,6 +128,14 @@ class ExportAnalysisResults(bpy.types.Operator):
             morphology=nmv.interface.ui_morphology,
             directory=nmv.interface.ui_options.io.analysis_directory)
 
+        # Append the results to the analysis table of all the exported morphologies
+        try:
+            nmv.interface.ui.export_analysis_table(
+                morphology=nmv.interface.ui_morphology,
+                table_file='%s/analysis.csv' % nmv.interface.ui_options.io.analysis_directory)
+        except ValueError as e:
+            self.report({'WARNING'}, str(e))
+
         return {'FINISHED'}
 
 
@@ -24,6 +24,7 @@ import nmv
 import nmv.analysis
 import nmv.builders
 import nmv.scene
+from nmv.analysis.core import analysis_table
 
 
 ####################################################################################################
@@ -312,6 +313,9 @@ def analyze_morphology(morphology,
     """
 
     try:
+        # Collect the data of all the arbors in a single pass, to be served to all the kernels
+        nmv.analysis.build_analysis_cache(morphology=morphology)
+
         # Register the different analysis groups
         register_analysis_groups(morphology=morphology)
 
@@ -408,6 +412,10 @@ def export_analysis_results(morphology,
     else:
         analysis_results_string += '\t* Axon: 0 \n\n'
 
+    # The kernels are served from the analysis cache, build it if the morphology is not analyzed
+    if morphology.analysis_cache is None:
+        nmv.analysis.build_analysis_cache(morphology=morphology)
+
     # Register the morphology variables to be able to show and update them on the UI
     for item in nmv.analysis.ui_per_arbor_analysis_items:
         analysis_results_string += item.write_analysis_results_to_string(morphology=morphology)
@@ -416,3 +424,41 @@ def export_analysis_results(morphology,
     analysis_results_file = open('%s/%s-analysis.txt' % (directory, morphology.label), 'w')
     analysis_results_file.write(analysis_results_string)
     analysis_results_file.close()
+
+
+####################################################################################################
+# @export_analysis_table
+####################################################################################################
+def export_analysis_table(morphology,
+                          table_file):
+    """Appends the analysis results of the morphology to a table, with one row for the entire
+    morphology and one row per arbor and one column per analysis variable.
+
+    :param morphology:
+        The morphology that is analysed.
+    :param table_file:
+        The path to the table, the format is set by the extension (.csv, .parquet or .h5).
+    """
+
+    # The kernels are served from the analysis cache, build it if the morphology is not analyzed
+    if morphology.analysis_cache is None:
+        nmv.analysis.build_analysis_cache(morphology=morphology)
+
+    # The per-arbor results
+    analysis_results = list()
+    for item in nmv.analysis.ui_per_arbor_analysis_items:
+        if item.kernel is not None:
+            item.result = item.kernel(morphology)
+            analysis_results.append([item.variable, item.get_analysis_results(morphology)])
+
+    # The global results
+    global_results = list()
+    for item in nmv.analysis.ui_global_analysis_items:
+        if item.kernel is not None:
+            global_results.append([item.variable, item.kernel(morphology)])
+
+    # Append the rows to the table
+    variables = [variable for variable, _ in analysis_results + global_results]
+    with analysis_table.AnalysisTableWriter(table_file, variables) as table_writer:
+        table_writer.append_rows(analysis_table.get_analysis_table_rows(
+            morphology.label, analysis_results, global_results, morphology.mtype))
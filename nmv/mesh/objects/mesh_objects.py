@@ -15,11 +15,15 @@
 # If not, see <http://www.gnu.org/licenses/>.
 ####################################################################################################
 
+# System imports
+import numpy
+
 # Blender modules
 import bpy
 
 # Internal modules
 import nmv
+import nmv.bmeshi
 import nmv.scene
 import nmv.utilities
 
@@ -256,3 +260,123 @@ def create_cube(radius=1,
 
     # Return a reference to it
     return cube_mesh
+
+
+####################################################################################################
+# @create_instanced_spheres
+####################################################################################################
+def create_instanced_spheres(centers,
+                             radii,
+                             subdivisions=3,
+                             materials=None,
+                             materials_indices=None,
+                             name='spheres'):
+    """Creates a list of spheres in a single smooth-shaded mesh object that is linked to the scene.
+    The vertices and the faces of a single template ico-sphere are tiled per sphere with numpy and
+    written to the mesh with foreach_set, instead of creating an object per sphere.
+
+    :param centers:
+        A list of the XYZ-coordinates of the centers of the spheres.
+    :param radii:
+        A list of the radii of the spheres.
+    :param subdivisions:
+        Number of subdivisions of the ico-sphere, by default 3.
+    :param materials:
+        An optional list of the materials of the mesh.
+    :param materials_indices:
+        An optional list of the index of the material of every sphere in the materials list.
+    :param name:
+        The name of the mesh object, by default 'spheres'.
+    :return:
+        A reference to the created mesh object.
+    """
+
+    # The vertices and the triangles of a template ico-sphere of a unit radius at the origin
+    template = nmv.bmeshi.create_ico_sphere(radius=1.0, subdivisions=subdivisions)
+    template.verts.index_update()
+    template_vertices = numpy.array([vertex.co[:] for vertex in template.verts],
+                                    dtype=numpy.float32)
+    template_faces = numpy.array([[vertex.index for vertex in face.verts]
+                                  for face in template.faces], dtype=numpy.int32)
+    template.free()
+
+    # Scale and translate the template vertices per sphere
+    number_spheres = len(radii)
+    centers = numpy.asarray(centers, dtype=numpy.float32).reshape(number_spheres, 3)
+    radii = numpy.asarray(radii, dtype=numpy.float32)
+    vertices = template_vertices[None, :, :] * radii[:, None, None] + centers[:, None, :]
+
+    # Offset the template faces by the first vertex of every sphere
+    offsets = numpy.arange(number_spheres, dtype=numpy.int32) * len(template_vertices)
+    faces = template_faces[None, :, :] + offsets[:, None, None]
+    number_faces = number_spheres * len(template_faces)
+
+    # Create the mesh in bulk
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(number_spheres * len(template_vertices))
+    mesh.vertices.foreach_set('co', vertices.ravel())
+    mesh.loops.add(3 * number_faces)
+    mesh.loops.foreach_set('vertex_index', faces.ravel())
+    mesh.polygons.add(number_faces)
+    mesh.polygons.foreach_set('loop_start', numpy.arange(0, 3 * number_faces, 3, dtype=numpy.int32))
+    mesh.polygons.foreach_set('loop_total', numpy.full(number_faces, 3, dtype=numpy.int32))
+
+    # Smooth shading
+    mesh.polygons.foreach_set('use_smooth', numpy.ones(number_faces, dtype=bool))
+
+    # Assign the materials per face
+    if materials is not None:
+        for material in materials:
+            mesh.materials.append(material)
+    if materials_indices is not None:
+        mesh.polygons.foreach_set('material_index', numpy.repeat(
+            numpy.asarray(materials_indices, dtype=numpy.int32), len(template_faces)))
+
+    # Compute the edges and the normals
+    mesh.update(calc_edges=True)
+
+    # Create a blender object, link it to the scene
+    spheres_object = bpy.data.objects.new(name, mesh)
+    nmv.scene.link_object_to_scene(spheres_object)
+
+    # Return a reference to it
+    return spheres_object
+
+
+####################################################################################################
+# @create_edges_mesh
+####################################################################################################
+def create_edges_mesh(vertices,
+                      edges,
+                      name='edges'):
+    """Creates a mesh object that has only vertices and edges (no faces) in bulk, for example to
+    represent a skeleton.
+
+    :param vertices:
+        An Nx3 array of the coordinates of the vertices.
+    :param edges:
+        An Mx2 array of the indices of the vertices of every edge.
+    :param name:
+        The name of the object.
+    :return:
+        A reference to the created object.
+    """
+
+    # Flatten the arrays
+    vertices = numpy.asarray(vertices, dtype=numpy.float32).reshape(-1, 3)
+    edges = numpy.asarray(edges, dtype=numpy.int32).reshape(-1, 2)
+
+    # Create the mesh in bulk
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(vertices))
+    mesh.vertices.foreach_set('co', vertices.ravel())
+    mesh.edges.add(len(edges))
+    mesh.edges.foreach_set('vertices', edges.ravel())
+    mesh.update()
+
+    # Create a blender object, link it to the scene
+    edges_object = bpy.data.objects.new(name, mesh)
+    nmv.scene.link_object_to_scene(edges_object)
+
+    # Return a reference to it
+    return edges_object
@@ -59,6 +59,12 @@ class MorphologyOptions:
         # Morphology label (based on the GID or the morphology file name)
         self.label = None
 
+        # A directory where the parsed morphologies are cached, None to disable the cache
+        self.cache_directory = None
+
+        # The maximum size of the morphology cache in bytes
+        self.cache_size = nmv.consts.Morphology.DEFAULT_CACHE_SIZE
+
         # Soma reconstruction technique (IGNORE, SPHERE, or SOFT_BODY, or META_BALLS by default)
         self.soma_representation = nmv.enums.Soma.Representation.META_BALLS
 
@@ -175,6 +181,10 @@ class MorphologyOptions:
         # The scale factor used to scale the morphology rendering frame, default 1.0
         self.resolution_scale_factor = 1.0
 
+        # Level of detail, where the samples and sections whose projections are smaller than this
+        # threshold (in pixels) are not drawn, 0.0 to draw the whole morphology
+        self.lod_pixel_threshold = 0.0
+
         # Render the morphology to a transparent image
         self.transparent_film = True
 
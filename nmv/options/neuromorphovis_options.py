@@ -134,6 +134,12 @@ class NeuroMorphoVisOptions:
             # Update the morphology label
             self.morphology.label = nmv.file.ops.get_file_name_from_path(arguments.morphology_file)
 
+        # Morphology cache, the unset directory is passed as 'None' to the CLI instances
+        if arguments.morphology_cache_directory is not None and \
+                arguments.morphology_cache_directory != 'None':
+            self.morphology.cache_directory = arguments.morphology_cache_directory
+            self.morphology.cache_size = arguments.morphology_cache_size * 1024 * 1024
+
         # Soma reconstruction
         self.morphology.soma_representation = \
             nmv.enums.Soma.Representation.get_enum(arguments.soma_representation)
@@ -229,6 +235,9 @@ class NeuroMorphoVisOptions:
         # Resolution scale factor
         self.morphology.resolution_scale_factor = arguments.resolution_scale_factor
 
+        # Level of detail threshold in pixels
+        self.morphology.lod_pixel_threshold = arguments.lod_pixel_threshold
+
         # Close up image resolution
         self.morphology.close_up_resolution = arguments.close_up_resolution
 
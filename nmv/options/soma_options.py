@@ -53,6 +53,10 @@ class SomaOptions:
         # Simulation steps
         self.simulation_steps = nmv.consts.SoftBody.SIMULATION_STEPS_DEFAULT
 
+        # Reuse the soft body soma mesh reconstructed for the same morphology in the same session
+        # instead of running the simulation again, for example in the combined CLI workflow
+        self.reuse_reconstructed_mesh = False
+
         # Soma color
         self.soma_color = nmv.enums.Color.SOMA
 
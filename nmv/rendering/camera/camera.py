@@ -199,6 +199,85 @@ class Camera:
         # Return a vector for the camera position for XYZ locations
         return [camera_location_x, camera_location_y, camera_location_z]
 
+    ################################################################################################
+    # @get_view_direction
+    ################################################################################################
+    @staticmethod
+    def get_view_direction(bounding_box,
+                           camera_view=nmv.enums.Camera.View.FRONT):
+        """Computes the direction of an orthographic camera that looks at the given bounding box.
+
+        :param bounding_box:
+            Scene bounding box.
+        :param camera_view:
+            The view of the camera FRONT, FRONT_360, SIDE or TOP, by default FRONT.
+        :return:
+            A unit vector pointing from the center of the bounding box to the camera.
+        """
+
+        # Use the same locations that are used to setup the camera for the scene
+        camera_locations = Camera.get_camera_positions(bounding_box=bounding_box)
+
+        # Side view, along the x-axis
+        if camera_view == nmv.enums.Camera.View.SIDE:
+            camera_location = camera_locations[0]
+
+        # Top view, along the y-axis
+        elif camera_view == nmv.enums.Camera.View.TOP:
+            camera_location = camera_locations[1]
+
+        # Front view (or 360) along the z-axis, and by default
+        else:
+            camera_location = camera_locations[2]
+
+        # Return the normalized direction
+        return (camera_location - bounding_box.center).normalized()
+
+    ################################################################################################
+    # @get_pixel_size
+    ################################################################################################
+    @staticmethod
+    def get_pixel_size(bounding_box,
+                       camera_view=nmv.enums.Camera.View.FRONT,
+                       image_resolution=None,
+                       scale_factor=None):
+        """Computes the size of a single pixel in the scene units (microns) for the orthographic
+        camera that is set by the update_camera_resolution or update_camera_resolution_to_scale
+        methods.
+
+        Note: The film is set to twice the requested resolution, and therefore the returned size is
+        that of a pixel of this film, which is always smaller than that of the final image.
+
+        :param bounding_box:
+            Scene bounding box.
+        :param camera_view:
+            The view of the camera FRONT, FRONT_360, SIDE or TOP, by default FRONT.
+        :param image_resolution:
+            The 'base' resolution of the image, if the image is rendered to a fixed resolution.
+        :param scale_factor:
+            The scale factor of the image, if the image is rendered to scale.
+        :return:
+            The size of a pixel in microns.
+        """
+
+        # To scale, every micron is mapped to twice the scale factor in pixels
+        if scale_factor is not None:
+            return 1.0 / (2.0 * scale_factor)
+
+        # The orthographic scale is the largest of the two dimensions that are seen by the camera
+        bounds = bounding_box.bounds
+        if camera_view == nmv.enums.Camera.View.SIDE:
+            orthographic_scale = max(bounds[1], bounds[2])
+        elif camera_view == nmv.enums.Camera.View.TOP:
+            orthographic_scale = max(bounds[2], bounds[0])
+        else:
+            orthographic_scale = max(bounds[0], bounds[1])
+
+        # The largest dimension of the film has twice the resolution in pixels
+        if image_resolution is None:
+            image_resolution = nmv.consts.Image.FULL_VIEW_RESOLUTION
+        return orthographic_scale / (2.0 * image_resolution)
+
     ################################################################################################
     # @get_camera_positions_for_perspective_projection
     ################################################################################################
@@ -0,0 +1,350 @@
+####################################################################################################
+# Copyright (c) 2016 - 2019, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+import sys
+import heapq
+import numpy
+
+# Internal imports, this module must be importable without Blender
+sys.path.append('%s/../analysis/core' % os.path.dirname(os.path.realpath(__file__)))
+import morphology_arrays
+
+
+# The load balancing methods, by the estimated cost of the neurons or in the order of the input
+LOAD_BALANCING_METHODS = ['cost', 'order']
+
+# The cost of starting a Blender session and loading NeuroMorphoVis, in seconds
+BLENDER_SESSION_COST = 10.0
+
+# The cost of building the scene of every CLI interface, in seconds: the fixed cost, the cost per
+# sample and the cost per section of the morphology
+INTERFACES_COSTS = {
+    'morphology_analysis': [0.5, 2e-5, 0.0],
+    'neuron_morphology_reconstruction': [1.0, 2e-4, 5e-3],
+    'soma_reconstruction': [20.0, 0.0, 0.0],
+    'neuron_mesh_reconstruction': [10.0, 2e-3, 5e-2]}
+
+# The rendering tasks: the argument of the task, its CLI interface and the number of frames
+RENDERING_TASKS = [
+    ['render_neuron_morphology', 'neuron_morphology_reconstruction', 1],
+    ['render_neuron_morphology_360', 'neuron_morphology_reconstruction', 360],
+    ['render_neuron_morphology_progressive', 'neuron_morphology_reconstruction', 100],
+    ['render_soma_skeleton', 'soma_reconstruction', 1],
+    ['render_soma_mesh', 'soma_reconstruction', 1],
+    ['render_soma_mesh_360', 'soma_reconstruction', 360],
+    ['render_soma_mesh_progressive', 'soma_reconstruction', 200],
+    ['render_neuron_mesh', 'neuron_mesh_reconstruction', 1],
+    ['render_neuron_mesh_360', 'neuron_mesh_reconstruction', 360]]
+
+# The cost of rendering a frame, in seconds: the cost per mega pixel and the cost per sample
+FRAME_COSTS = [1.0, 1e-5]
+
+# The number of points of an H5 morphology that are read at once to compute its bounding box
+H5_POINTS_CHUNK_SIZE = 1 << 16
+
+
+####################################################################################################
+# @MorphologyStatistics
+####################################################################################################
+class MorphologyStatistics:
+    """The statistics of a morphology that are cheap to read without building the morphology, to
+    estimate the cost of its tasks.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 number_samples,
+                 number_sections,
+                 bounding_box_min,
+                 bounding_box_max):
+        """Constructor
+
+        :param number_samples:
+            The number of samples of the arbors, without the soma.
+        :param number_sections:
+            The number of sections of the arbors.
+        :param bounding_box_min:
+            The [x, y, z] minimum of the bounding box of the morphology.
+        :param bounding_box_max:
+            The [x, y, z] maximum of the bounding box of the morphology.
+        """
+
+        # Samples and sections
+        self.number_samples = number_samples
+        self.number_sections = number_sections
+
+        # Bounding box
+        self.bounding_box_min = bounding_box_min
+        self.bounding_box_max = bounding_box_max
+
+    ################################################################################################
+    # @get_bounding_box_size
+    ################################################################################################
+    def get_bounding_box_size(self):
+        """Gets the size of the bounding box of the morphology.
+
+        :return:
+            The [x, y, z] size of the bounding box in microns.
+        """
+
+        return [self.bounding_box_max[i] - self.bounding_box_min[i] for i in range(3)]
+
+
+####################################################################################################
+# @read_swc_statistics
+####################################################################################################
+def read_swc_statistics(swc_file):
+    """Reads the statistics of an SWC morphology file from its samples, which are parsed with the
+    vectorized parser of the analysis core.
+
+    A section starts at every sample that is connected to the soma, and at every child of a
+    branching sample.
+
+    :param swc_file:
+        The path to the SWC file.
+    :return:
+        The MorphologyStatistics of the morphology, or None if the file cannot be parsed.
+    """
+
+    try:
+        values = morphology_arrays.parse_swc_samples(swc_file)
+    except (IOError, OSError) as e:
+        print('WARNING: Cannot read the statistics of [%s]: %s' % (swc_file, str(e)))
+        return None
+    if values is None or len(values) == 0:
+        return None
+
+    # The soma samples are not part of the arbors
+    is_soma_sample = values[:, 1] == morphology_arrays.Arbors.SWC_SOMA_SAMPLE_TYPE
+    arbors_parents = values[~is_soma_sample, 6]
+
+    # The roots of the arbors, and the number of the arbors children of every other sample
+    is_root = (arbors_parents < 0) | numpy.isin(arbors_parents, values[is_soma_sample, 0])
+    _, number_children = numpy.unique(arbors_parents[~is_root], return_counts=True)
+
+    # Every child of a branching sample starts a new section
+    number_sections = int(numpy.count_nonzero(is_root)) + \
+        int(number_children[number_children > 1].sum())
+    return MorphologyStatistics(len(arbors_parents), number_sections,
+                                [float(value) for value in values[:, 2:5].min(axis=0)],
+                                [float(value) for value in values[:, 2:5].max(axis=0)])
+
+
+####################################################################################################
+# @read_h5_statistics
+####################################################################################################
+def read_h5_statistics(h5_file):
+    """Reads the statistics of an H5 morphology file from the shapes of its datasets, and its
+    bounding box from its points in chunks, without loading the entire datasets.
+
+    :param h5_file:
+        The path to the H5 file.
+    :return:
+        The MorphologyStatistics of the morphology, or None if the file cannot be read.
+    """
+
+    # Import the h5py module to read the .H5 file
+    try:
+        import h5py
+    except ImportError:
+        return None
+
+    try:
+        with h5py.File(h5_file, 'r') as data:
+            points = data['points']
+            structure = data['structure']
+            number_points = points.shape[0]
+            number_structures = structure.shape[0]
+            if number_points == 0 or number_structures == 0:
+                return None
+
+            # The first section is the soma, it ends where the second section starts
+            number_soma_samples = int(structure[1, 0]) if number_structures > 1 else number_points
+
+            # The bounding box
+            bounding_box_min = numpy.full(3, numpy.inf)
+            bounding_box_max = numpy.full(3, -numpy.inf)
+            for start in range(0, number_points, H5_POINTS_CHUNK_SIZE):
+                chunk = points[start:start + H5_POINTS_CHUNK_SIZE, 0:3]
+                bounding_box_min = numpy.minimum(bounding_box_min, chunk.min(axis=0))
+                bounding_box_max = numpy.maximum(bounding_box_max, chunk.max(axis=0))
+    except (IOError, OSError, KeyError) as e:
+        print('WARNING: Cannot read the statistics of [%s]: %s' % (h5_file, str(e)))
+        return None
+
+    return MorphologyStatistics(
+        number_points - number_soma_samples, number_structures - 1,
+        [float(value) for value in bounding_box_min],
+        [float(value) for value in bounding_box_max])
+
+
+####################################################################################################
+# @read_morphology_statistics
+####################################################################################################
+def read_morphology_statistics(morphology_file):
+    """Reads the statistics of a morphology file, based on its extension.
+
+    :param morphology_file:
+        The path to the .h5 or .swc morphology file.
+    :return:
+        The MorphologyStatistics of the morphology, or None if the file cannot be read.
+    """
+
+    extension = os.path.splitext(morphology_file)[1].lower()
+    if '.h5' in extension:
+        return read_h5_statistics(morphology_file)
+    elif '.swc' in extension:
+        return read_swc_statistics(morphology_file)
+    return None
+
+
+####################################################################################################
+# @estimate_neuron_cost
+####################################################################################################
+def estimate_neuron_cost(statistics,
+                         arguments,
+                         cli_interfaces):
+    """Estimates the time to run the requested tasks of a neuron from the statistics of its
+    morphology.
+
+    The estimate is only used to compare the neurons with each other: every Blender session pays a
+    fixed cost, building the scene of every interface scales with the number of samples and
+    sections, and every rendered frame scales with its number of pixels, which depends on the
+    bounding box of the morphology for the images that are rendered to scale.
+
+    :param statistics:
+        The MorphologyStatistics of the neuron.
+    :param arguments:
+        Command line arguments.
+    :param cli_interfaces:
+        The names of the CLI interfaces of the requested tasks, without the single session.
+    :return:
+        The estimated cost of the neuron in seconds.
+    """
+
+    # The Blender sessions
+    number_sessions = 1 if arguments.single_session else len(cli_interfaces)
+    cost = BLENDER_SESSION_COST * number_sessions
+
+    # Building the scenes
+    for cli_interface in cli_interfaces:
+        fixed_cost, sample_cost, section_cost = INTERFACES_COSTS.get(cli_interface, [0, 0, 0])
+        cost += fixed_cost + sample_cost * statistics.number_samples + \
+            section_cost * statistics.number_sections
+
+    # The number of pixels of every frame
+    if arguments.render_to_scale:
+        size = statistics.get_bounding_box_size()
+        number_pixels = size[0] * size[1] * arguments.resolution_scale_factor ** 2
+    else:
+        number_pixels = arguments.full_view_resolution ** 2
+    frame_cost = FRAME_COSTS[0] * number_pixels * 1e-6 + \
+        FRAME_COSTS[1] * statistics.number_samples
+
+    # Rendering the frames
+    for task, cli_interface, number_frames in RENDERING_TASKS:
+        if getattr(arguments, task, False) and cli_interface in cli_interfaces:
+            cost += frame_cost * number_frames
+
+    return cost
+
+
+####################################################################################################
+# @estimate_morphology_files_costs
+####################################################################################################
+def estimate_morphology_files_costs(morphology_files,
+                                    arguments,
+                                    cli_interfaces):
+    """Estimates the costs of the requested tasks of a list of morphology files.
+
+    The files that cannot be read are given the median cost of the others, or a unit cost if none
+    of the files can be read.
+
+    :param morphology_files:
+        A list of the paths to the morphology files.
+    :param arguments:
+        Command line arguments.
+    :param cli_interfaces:
+        The names of the CLI interfaces of the requested tasks.
+    :return:
+        A list of the estimated costs of the morphology files, in their order.
+    """
+
+    costs = list()
+    for morphology_file in morphology_files:
+        statistics = read_morphology_statistics(morphology_file)
+        costs.append(None if statistics is None else
+                     estimate_neuron_cost(statistics, arguments, cli_interfaces))
+
+    # The unknown costs
+    known_costs = sorted(cost for cost in costs if cost is not None)
+    default_cost = known_costs[len(known_costs) // 2] if len(known_costs) > 0 else 1.0
+    return [default_cost if cost is None else cost for cost in costs]
+
+
+####################################################################################################
+# @get_longest_first_order
+####################################################################################################
+def get_longest_first_order(costs):
+    """Gets the order of a list of jobs that runs the most expensive jobs first, such that a pool
+    of workers does not wait for a single expensive job at the end.
+
+    :param costs:
+        A list of the costs of the jobs.
+    :return:
+        The indices of the jobs from the most to the least expensive, the jobs with the same
+        costs remain in their order.
+    """
+
+    return sorted(range(len(costs)), key=lambda i: -costs[i])
+
+
+####################################################################################################
+# @pack_into_bins
+####################################################################################################
+def pack_into_bins(costs,
+                   number_bins):
+    """Packs a list of jobs into a number of bins with balanced total costs, using the longest
+    processing time first rule, where every job is added to the least loaded bin.
+
+    :param costs:
+        A list of the costs of the jobs.
+    :param number_bins:
+        The number of bins, for example the tasks of a job array.
+    :return:
+        A list of the bins, each is a list of the indices of its jobs from the most to the least
+        expensive. The bins are ordered by their total costs, the most expensive first.
+    """
+
+    number_bins = max(1, min(number_bins, len(costs)))
+
+    # A heap of the loads of the bins
+    bins = [list() for _ in range(number_bins)]
+    loads = [[0.0, i] for i in range(number_bins)]
+    for job_index in get_longest_first_order(costs):
+        load = heapq.heappop(loads)
+        bins[load[1]].append(job_index)
+        load[0] += costs[job_index]
+        heapq.heappush(loads, load)
+
+    # The most loaded bins first, such that they start first
+    bins_costs = [sum(costs[i] for i in bin_jobs) for bin_jobs in bins]
+    return [bins[i] for i in get_longest_first_order(bins_costs)]
@@ -0,0 +1,273 @@
+####################################################################################################
+# Copyright (c) 2016 - 2019, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+
+
+# The name of the manifest file in the output directory
+MANIFEST_FILE = 'manifest.jsonl'
+
+
+####################################################################################################
+# @compute_options_hash
+####################################################################################################
+def compute_options_hash(arguments_string,
+                         ignored_arguments=None):
+    """Computes a hash of the arguments of a job, ignoring the arguments that do not change the
+    results, for example the execution arguments.
+
+    :param arguments_string:
+        The arguments string of the job, as given to the CLI interfaces.
+    :param ignored_arguments:
+        A list of the names of the ignored arguments, for example ['--job-timeout'].
+    :return:
+        The hexadecimal digest of the arguments.
+    """
+
+    ignored_arguments = ignored_arguments or list()
+    arguments = list()
+    for argument in arguments_string.split():
+        if argument.split('=', 1)[0] in ignored_arguments:
+            continue
+        arguments.append(argument)
+    return hashlib.sha1(' '.join(sorted(arguments)).encode('utf-8')).hexdigest()
+
+
+####################################################################################################
+# @compute_file_hash
+####################################################################################################
+def compute_file_hash(file_path):
+    """Computes the SHA1 hash of the content of a given file.
+
+    :param file_path:
+        The path to the file.
+    :return:
+        The hexadecimal digest of the content of the file.
+    """
+
+    file_hash = hashlib.sha1()
+    with open(file_path, 'rb') as file_handle:
+        for chunk in iter(lambda: file_handle.read(1 << 20), b''):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+####################################################################################################
+# @find_job_outputs
+####################################################################################################
+def find_job_outputs(label,
+                     output_directory,
+                     ignored_directories=None):
+    """Finds the output files of a job. The outputs of a job are the files and directories in the
+    output directory whose names contain the label of the job, followed by a separator ('-' or
+    '_'), the extension of the file or nothing, e.g. MESH_FRONT_<label>.png or <label>-analysis.txt.
+    The label X therefore never matches the outputs of a job labelled X.CNG.
+
+    :param label:
+        The label of the job, i.e. the name of its morphology file without the extension.
+    :param output_directory:
+        The output directory of the run.
+    :param ignored_directories:
+        A list of the directories in the output directory that are not searched for outputs,
+        for example the logs directory.
+    :return:
+        A sorted list of the paths of the outputs relative to the output directory.
+    """
+
+    # The exact label between the separators of the output names
+    label_pattern = re.compile(
+        '(?<![A-Za-z0-9])%s(?=[-_]|\\.[A-Za-z0-9]+$|$)' % re.escape(label))
+
+    outputs = list()
+    for root, directories, files in os.walk(output_directory):
+
+        # Skip the ignored directories
+        if root == output_directory and ignored_directories is not None:
+            directories[:] = [d for d in directories if d not in ignored_directories]
+
+        for name in directories + files:
+            if label_pattern.search(name) is None:
+                continue
+            outputs.append(os.path.relpath(os.path.join(root, name), output_directory))
+
+            # Do not list the frames of a sequence directory
+            if name in directories:
+                directories.remove(name)
+
+    # Return the outputs
+    return sorted(outputs)
+
+
+####################################################################################################
+# @JobManifest
+####################################################################################################
+class JobManifest:
+    """An append-only JSONL manifest of the jobs of a batch run.
+
+    Every line records the input file, the hash of the options, the status and the outputs of a
+    job. The last record of a job is the valid one, so the manifest is never rewritten and a run
+    that crashes loses at most the line that was being written.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 manifest_file):
+        """Constructor, loads the existing records, if any.
+
+        :param manifest_file:
+            The path to the manifest file.
+        """
+
+        # Manifest file
+        self.manifest_file = manifest_file
+
+        # The last record of every job
+        self.records = dict()
+
+        # The records are appended from the threads of the scheduler
+        self.lock = threading.Lock()
+
+        # Load the existing records
+        if os.path.isfile(manifest_file):
+            with open(manifest_file, 'r') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+
+                        # A partial line written during a crash
+                        continue
+                    if record['job'] in self.records:
+                        self.records[record['job']].update(record)
+                    else:
+                        self.records[record['job']] = record
+
+    ################################################################################################
+    # @append_record
+    ################################################################################################
+    def append_record(self,
+                      record):
+        """Appends a record to the manifest.
+
+        :param record:
+            A dictionary with the record, that must have a 'job' key.
+        """
+
+        with self.lock:
+            if record['job'] in self.records:
+                self.records[record['job']].update(record)
+            else:
+                self.records[record['job']] = dict(record)
+            with open(self.manifest_file, 'a') as f:
+                f.write(json.dumps(record) + '\n')
+                f.flush()
+
+    ################################################################################################
+    # @record_job
+    ################################################################################################
+    def record_job(self,
+                   job,
+                   input_file,
+                   options_hash,
+                   outputs=None):
+        """Records a completed job.
+
+        :param job:
+            A LocalJob after its execution.
+        :param input_file:
+            The input morphology file of the job.
+        :param options_hash:
+            The hash of the options of the job.
+        :param outputs:
+            A list of the paths of the outputs of the job relative to the output directory.
+        """
+
+        stat = os.stat(input_file)
+        self.append_record({
+            'job': job.name,
+            'input': os.path.abspath(input_file),
+            'input_mtime': stat.st_mtime_ns,
+            'input_size': stat.st_size,
+            'input_hash': compute_file_hash(input_file),
+            'options_hash': options_hash,
+            'status': job.status,
+            'attempts': job.attempts,
+            'duration': job.duration,
+            'outputs': outputs if outputs is not None else list(),
+            'time': time.strftime('%Y-%m-%d %H:%M:%S')})
+
+    ################################################################################################
+    # @is_up_to_date
+    ################################################################################################
+    def is_up_to_date(self,
+                      job_name,
+                      input_file,
+                      options_hash,
+                      output_directory):
+        """Checks if a job is completed with the same input and options, and that its outputs still
+        exist, such that it can be skipped when the run is resumed. A job without recorded outputs,
+        for example one that was interrupted before its outputs were recorded, is never skipped.
+
+        :param job_name:
+            The name of the job.
+        :param input_file:
+            The input morphology file of the job.
+        :param options_hash:
+            The hash of the options of the job.
+        :param output_directory:
+            The output directory of the run.
+        :return:
+            True if the job is up to date, and False if it has to be executed again.
+        """
+
+        record = self.records.get(job_name)
+        if record is None or record['status'] != 'DONE':
+            return False
+
+        # The options have changed
+        if record['options_hash'] != options_hash:
+            return False
+
+        # The input has changed
+        if not os.path.isfile(input_file):
+            return False
+        stat = os.stat(input_file)
+        if stat.st_size != record['input_size']:
+            return False
+        if stat.st_mtime_ns != record['input_mtime'] and \
+                compute_file_hash(input_file) != record['input_hash']:
+            return False
+
+        # The outputs were never recorded
+        if len(record.get('outputs', list())) == 0:
+            return False
+
+        # Some outputs were removed
+        for output in record['outputs']:
+            if not os.path.exists(os.path.join(output_directory, output)):
+                return False
+
+        # The job is up to date
+        return True
@@ -0,0 +1,599 @@
+####################################################################################################
+# Copyright (c) 2016 - 2019, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+import json
+import queue
+import shlex
+import signal
+import socket
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+####################################################################################################
+# @LocalJob
+####################################################################################################
+class LocalJob:
+    """A job that runs a list of shell commands, for example the Blender commands of a single
+    morphology, one after another on the local node.
+    """
+
+    # The job has not been executed yet
+    PENDING = 'PENDING'
+
+    # All the commands of the job have returned zero
+    DONE = 'DONE'
+
+    # One of the commands of the job has returned a non-zero code
+    FAILED = 'FAILED'
+
+    # The job has exceeded its timeout and was killed
+    TIMEOUT = 'TIMEOUT'
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 name,
+                 shell_commands,
+                 log_file=None,
+                 arguments_string=None):
+        """Constructor
+
+        :param name:
+            The name of the job, typically the morphology file name.
+        :param shell_commands:
+            A list of the shell commands of the job.
+        :param log_file:
+            A file where the output of the commands is written. If None, the output is written to
+            the standard output.
+        :param arguments_string:
+            The arguments string of the CLI interfaces, used when the job is sent to a Blender
+            worker instead of running the shell commands.
+        """
+
+        # Job name
+        self.name = name
+
+        # The shell commands of the job
+        self.shell_commands = shell_commands
+
+        # Log file
+        self.log_file = log_file
+
+        # The arguments of the CLI interfaces
+        self.arguments_string = arguments_string
+
+        # Job status
+        self.status = LocalJob.PENDING
+
+        # The number of times the job was executed
+        self.attempts = 0
+
+        # The return code of the last executed command
+        self.return_code = None
+
+        # The duration of the last attempt in seconds
+        self.duration = 0.0
+
+
+####################################################################################################
+# @run_shell_command
+####################################################################################################
+def run_shell_command(shell_command,
+                      timeout=None,
+                      output=None):
+    """Runs a shell command in its own process group, such that the command and all its child
+    processes can be killed if the timeout is exceeded.
+
+    :param shell_command:
+        The shell command.
+    :param timeout:
+        The timeout in seconds, or None to wait until the command finishes.
+    :param output:
+        A file handle where the output of the command is written, or None for the standard output.
+    :return:
+        The return code of the command, or None if the command has been killed.
+    """
+
+    process = subprocess.Popen(shell_command, shell=True, start_new_session=True,
+                               stdout=output, stderr=subprocess.STDOUT if output else None)
+    try:
+        return process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except OSError:
+            pass
+        process.wait()
+        return None
+
+
+####################################################################################################
+# @run_job
+####################################################################################################
+def run_job(job,
+            timeout=None):
+    """Runs all the shell commands of a job one after another. The job fails as soon as one of
+    its commands fails.
+
+    :param job:
+        A given LocalJob.
+    :param timeout:
+        The timeout of the whole job in seconds, or None.
+    :return:
+        A reference to the job, with its status updated.
+    """
+
+    job.attempts += 1
+    start_time = time.time()
+
+    # Write the output to the log file of the job, if given
+    output = None
+    if job.log_file is not None:
+        output = open(job.log_file, 'a')
+
+    try:
+        job.status = LocalJob.DONE
+        for shell_command in job.shell_commands:
+
+            # The remaining time for the job
+            remaining_time = None
+            if timeout is not None:
+                remaining_time = timeout - (time.time() - start_time)
+                if remaining_time <= 0:
+                    job.status = LocalJob.TIMEOUT
+                    break
+
+            if output is not None:
+                output.write('RUNNING: %s\n' % shell_command)
+                output.flush()
+
+            job.return_code = run_shell_command(shell_command, remaining_time, output)
+
+            # Killed
+            if job.return_code is None:
+                job.status = LocalJob.TIMEOUT
+                break
+
+            # Failed
+            if job.return_code != 0:
+                job.status = LocalJob.FAILED
+                break
+    finally:
+        if output is not None:
+            output.close()
+
+    job.duration = time.time() - start_time
+    return job
+
+
+####################################################################################################
+# @run_jobs_locally
+####################################################################################################
+def run_jobs_locally(jobs,
+                     number_parallel_jobs=None,
+                     timeout=None,
+                     retries=0,
+                     job_completed_callback=None):
+    """Runs a list of jobs on the local node using a bounded pool of workers, each of them runs a
+    single job at a time. The failed or timed out jobs are executed again up to a given number of
+    retries.
+
+    :param jobs:
+        A list of LocalJob's.
+    :param number_parallel_jobs:
+        The maximum number of jobs that run at the same time. If None, the number of cores of the
+        local node is used.
+    :param timeout:
+        The timeout of every job in seconds, or None.
+    :param retries:
+        The number of times a failed job is executed again.
+    :param job_completed_callback:
+        A function called with every job after its last attempt, for example to record it in a
+        manifest.
+    :return:
+        The list of the jobs with their status updated.
+    """
+
+    # Use all the cores by default
+    if number_parallel_jobs is None or number_parallel_jobs < 1:
+        number_parallel_jobs = os.cpu_count() or 1
+
+    # Progress
+    lock = threading.Lock()
+    number_completed_jobs = [0]
+
+    def run_job_with_retries(job):
+        while True:
+            run_job(job, timeout)
+            if job.status == LocalJob.DONE or job.attempts > retries:
+                break
+            with lock:
+                print('RETRYING: [%s] after %s' % (job.name, job.status))
+        with lock:
+            number_completed_jobs[0] += 1
+            print('[%d/%d] %s: [%s] in %2.2f seconds (attempts: %d)' % (
+                number_completed_jobs[0], len(jobs), job.status, job.name, job.duration,
+                job.attempts))
+            if job_completed_callback is not None:
+                job_completed_callback(job)
+        return job
+
+    # Run the jobs in the pool
+    with ThreadPoolExecutor(max_workers=number_parallel_jobs) as executor:
+        futures = [executor.submit(run_job_with_retries, job) for job in jobs]
+        for future in as_completed(futures):
+            future.result()
+
+    # Return the jobs
+    return jobs
+
+
+####################################################################################################
+# @BlenderWorker
+####################################################################################################
+class BlenderWorker:
+    """A long-lived Blender process running in the background that executes the jobs sent to it
+    over a local socket, such that the jobs do not pay the cost of starting Blender and loading
+    NeuroMorphoVis.
+    """
+
+    # The maximum time in seconds to wait for a worker to start
+    STARTUP_TIMEOUT = 300
+
+    # The interval in seconds to check if a starting worker has exited
+    STARTUP_POLL_INTERVAL = 0.5
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 blender,
+                 worker_script,
+                 log_file=None):
+        """Constructor, starts the worker and waits until it is ready.
+
+        :param blender:
+            The Blender executable.
+        :param worker_script:
+            The path to the worker CLI interface (nmv/interface/cli/neuron_worker.py).
+        :param log_file:
+            A file where the output of the worker is written, or None for the standard output.
+        """
+
+        # Every worker listens on its own port, so the connection is always from this worker
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(('127.0.0.1', 0))
+        server.listen(1)
+        server.settimeout(BlenderWorker.STARTUP_POLL_INTERVAL)
+
+        self.process = None
+        self.output = None
+        self.connection = None
+        self.connection_file = None
+        try:
+
+            # Launch the worker, an invalid Blender executable only marks the worker as dead
+            self.output = open(log_file, 'a') if log_file is not None else None
+            self.process = subprocess.Popen(
+                [blender, '-b', '--verbose', '0', '--python-exit-code', '1',
+                 '--python', worker_script, '--',
+                 '--address=127.0.0.1:%d' % server.getsockname()[1]],
+                start_new_session=True, stdout=self.output,
+                stderr=subprocess.STDOUT if self.output else None)
+
+            # Wait for the worker to connect
+
+            # Stop waiting as soon as the worker exits, e.g. if Blender cannot start
+            start_time = time.time()
+            while self.connection is None:
+                try:
+                    self.connection, _ = server.accept()
+                except socket.timeout:
+                    if self.process.poll() is not None or \
+                            time.time() - start_time > BlenderWorker.STARTUP_TIMEOUT:
+                        raise
+            self.connection_file = self.connection.makefile('rw')
+            self.connection.settimeout(BlenderWorker.STARTUP_TIMEOUT)
+            self.alive = json.loads(self.connection_file.readline())['event'] == 'ready'
+        except (OSError, ValueError):
+            self.alive = False
+        finally:
+            server.close()
+
+        # Kill the worker if it has not started
+        if not self.alive:
+            self.kill()
+
+    ################################################################################################
+    # @run
+    ################################################################################################
+    def run(self,
+            job,
+            timeout=None):
+        """Runs a job on the worker, and updates the status of the job.
+
+        If the job exceeds its timeout or the worker crashes, the worker is killed and it cannot
+        be used anymore.
+
+        :param job:
+            A given LocalJob.
+        :param timeout:
+            The timeout of the job in seconds, or None.
+        :return:
+            A reference to the job, with its status updated.
+        """
+
+        job.attempts += 1
+        start_time = time.time()
+        job.status = LocalJob.FAILED
+        try:
+            self.connection.settimeout(timeout)
+            self.connection_file.write(json.dumps(
+                {'command': 'run', 'job': job.name,
+                 'arguments': shlex.split(job.arguments_string)}) + '\n')
+            self.connection_file.flush()
+
+            # Read the messages of the worker until the job is finished
+            while True:
+                if timeout is not None:
+                    self.connection.settimeout(max(timeout - (time.time() - start_time), 0.001))
+                line = self.connection_file.readline()
+
+                # The worker has crashed
+                if not line:
+                    self.kill()
+                    break
+
+                message = json.loads(line)
+                if message['event'] == 'finished':
+                    job.status = message['status']
+                    job.return_code = 0 if job.status == LocalJob.DONE else 1
+                    if message['error'] is not None and self.output is not None:
+                        self.output.write('ERROR in [%s]: %s\n' % (job.name, message['error']))
+                        self.output.flush()
+                    break
+
+        # The job has exceeded its timeout
+        except socket.timeout:
+            job.status = LocalJob.TIMEOUT
+            self.kill()
+
+        except (OSError, ValueError):
+            self.kill()
+
+        job.duration = time.time() - start_time
+        return job
+
+    ################################################################################################
+    # @stop
+    ################################################################################################
+    def stop(self):
+        """Asks the worker to quit, and waits for it.
+        """
+
+        if self.alive:
+            try:
+                self.connection_file.write(json.dumps({'command': 'quit'}) + '\n')
+                self.connection_file.flush()
+                self.process.wait(timeout=60)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+        self.kill()
+
+    ################################################################################################
+    # @kill
+    ################################################################################################
+    def kill(self):
+        """Kills the worker process and closes its connection.
+        """
+
+        self.alive = False
+        if self.process is not None:
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except OSError:
+                pass
+            self.process.wait()
+        for handle in [self.connection_file, self.connection, self.output]:
+            if handle is not None:
+                try:
+                    handle.close()
+                except OSError:
+                    pass
+
+
+####################################################################################################
+# @run_jobs_on_blender_workers
+####################################################################################################
+def run_jobs_on_blender_workers(jobs,
+                                blender,
+                                worker_script,
+                                number_workers,
+                                timeout=None,
+                                retries=0,
+                                logs_directory=None,
+                                job_completed_callback=None):
+    """Runs a list of jobs on a pool of persistent Blender workers. A worker that crashes or
+    exceeds the timeout of a job is replaced by a new one.
+
+    :param jobs:
+        A list of LocalJob's, with their arguments strings.
+    :param blender:
+        The Blender executable.
+    :param worker_script:
+        The path to the worker CLI interface (nmv/interface/cli/neuron_worker.py).
+    :param number_workers:
+        The number of workers. If less than one, the number of cores of the local node is used.
+    :param timeout:
+        The timeout of every job in seconds, or None.
+    :param retries:
+        The number of times a failed job is executed again.
+    :param logs_directory:
+        A directory where the logs of the workers are written, or None for the standard output.
+    :param job_completed_callback:
+        A function called with every job after its last attempt, for example to record it in a
+        manifest.
+    :return:
+        The list of the jobs with their status updated.
+    """
+
+    # Use all the cores by default
+    if number_workers is None or number_workers < 1:
+        number_workers = os.cpu_count() or 1
+
+    # The pending jobs
+    jobs_queue = queue.Queue()
+    for job in jobs:
+        jobs_queue.put(job)
+
+    # Progress
+    lock = threading.Lock()
+    number_completed_jobs = [0]
+
+    def run_worker(worker_index):
+        log_file = None
+        if logs_directory is not None:
+            log_file = '%s/worker-%d.log' % (logs_directory, worker_index)
+        worker = None
+        while True:
+            job = jobs_queue.get()
+
+            # No more jobs
+            if job is None:
+                jobs_queue.task_done()
+                break
+
+            # The job is always completed, otherwise jobs_queue.join() would never return
+            attempts = job.attempts
+            try:
+
+                # Start a new worker, if needed
+                if worker is None or not worker.alive:
+                    worker = BlenderWorker(blender, worker_script, log_file)
+
+                if worker.alive:
+                    worker.run(job, timeout)
+                else:
+                    job.attempts += 1
+                    job.status = LocalJob.FAILED
+            except Exception as e:
+                print('ERROR: [%s] failed on worker [%d]: %s' % (job.name, worker_index, str(e)))
+                job.attempts = attempts + 1
+                job.status = LocalJob.FAILED
+                if worker is not None:
+                    worker.kill()
+                worker = None
+
+            try:
+                with lock:
+                    if job.status != LocalJob.DONE and job.attempts <= retries:
+                        print('RETRYING: [%s] after %s' % (job.name, job.status))
+                        jobs_queue.put(job)
+                    else:
+                        number_completed_jobs[0] += 1
+                        print('[%d/%d] %s: [%s] in %2.2f seconds (attempts: %d)' % (
+                            number_completed_jobs[0], len(jobs), job.status, job.name,
+                            job.duration, job.attempts))
+                        if job_completed_callback is not None:
+                            job_completed_callback(job)
+            finally:
+                jobs_queue.task_done()
+
+        if worker is not None:
+            worker.stop()
+
+    # Start the workers
+    threads = [threading.Thread(target=run_worker, args=(i,)) for i in range(number_workers)]
+    for thread in threads:
+        thread.start()
+
+    # Wait for all the jobs, including the retried ones, and then stop the workers
+    jobs_queue.join()
+    for _ in threads:
+        jobs_queue.put(None)
+    for thread in threads:
+        thread.join()
+
+    # Return the jobs
+    return jobs
+
+
+####################################################################################################
+# @create_summary_report
+####################################################################################################
+def create_summary_report(jobs,
+                          total_time):
+    """Creates a summary report of the executed jobs.
+
+    :param jobs:
+        A list of the executed jobs.
+    :param total_time:
+        The total execution time of all the jobs in seconds.
+    :return:
+        The report as a string.
+    """
+
+    report = '*' * 80 + '\n'
+    report += '* Jobs Summary \n'
+    report += '*' * 80 + '\n'
+
+    # Count the jobs per status
+    for status in [LocalJob.DONE, LocalJob.FAILED, LocalJob.TIMEOUT]:
+        report += '* %s: %d \n' % (status, len([job for job in jobs if job.status == status]))
+    report += '* Total time: %2.2f seconds \n' % total_time
+
+    # Durations
+    if len(jobs) > 0:
+        durations = [job.duration for job in jobs]
+        report += '* Job time: min %2.2f, max %2.2f, mean %2.2f seconds \n' % (
+            min(durations), max(durations), sum(durations) / len(durations))
+    report += '*' * 80 + '\n'
+
+    # Per-job details, the slowest first
+    for job in sorted(jobs, key=lambda j: j.duration, reverse=True):
+        report += '%-8s %10.2f s  %d attempt(s)  %s \n' % (
+            job.status, job.duration, job.attempts, job.name)
+
+    return report
+
+
+####################################################################################################
+# @write_summary_report
+####################################################################################################
+def write_summary_report(jobs,
+                         total_time,
+                         report_file):
+    """Writes the summary report of the executed jobs to a file and prints it.
+
+    :param jobs:
+        A list of the executed jobs.
+    :param total_time:
+        The total execution time of all the jobs in seconds.
+    :param report_file:
+        The path to the report file.
+    """
+
+    report = create_summary_report(jobs=jobs, total_time=total_time)
+    print(report)
+    with open(report_file, 'w') as f:
+        f.write(report)
@@ -24,9 +24,11 @@ from .skeleton_dendrogram_ops import *
 from .skeleton_drawing_ops import *
 from .skeleton_geometry_ops import *
 from .skeleton_intersection_ops import *
+from .skeleton_lod_ops import *
 from .skeleton_polylines_ops import *
 from .skeleton_repair_ops import *
 from .skeleton_resampling_ops import *
 from .skeleton_generic_ops import *
 from .skeleton_style_ops import *
 from .skeleton_verification_ops import *
+from .skeleton_vectorized_resampling_ops import *
@@ -71,6 +71,64 @@ def update_section_parenting(section,
             section.parent_id = i_section.id
 
 
+####################################################################################################
+# @update_sections_parenting
+####################################################################################################
+def update_sections_parenting(sections_list):
+    """Updates the parents' and children references of all the sections in a given list.
+
+    This function gives the same result as calling @update_section_parenting for every section in
+    the list, however, it uses lookup tables for the first and last samples of the sections and
+    therefore runs in linear time rather than in quadratic time.
+
+    :param sections_list:
+        A list of all the sections in the morphology.
+    """
+
+    # The sections indexed by the indices of their first samples, in the order of the list
+    sections_by_first_sample = dict()
+
+    # The sections indexed by the indices of their last samples, in the order of the list
+    sections_by_last_sample = dict()
+
+    for section in sections_list:
+        sections_by_first_sample.setdefault(section.samples[0].id, list()).append(section)
+        sections_by_last_sample.setdefault(section.samples[-1].id, list()).append(section)
+
+    for section in sections_list:
+
+        # Detect if the section has no parent, then set it as a root
+        # Use the first sample to identify if this section is a root or not
+        if str(section.samples[0].parent_id) == str(-1):
+
+            # This section is a root
+            section.parent = None
+            section.parent_id = None
+
+        # The sections that start at the last sample of this section are its children
+        for child in sections_by_first_sample.get(section.samples[-1].id, list()):
+
+            # Skip the section itself
+            if child.id == section.id:
+                continue
+
+            # Add the auxiliary section as a child to the parent section
+            section.children.append(child)
+            section.children_ids.append(child.id)
+
+        # The last section that terminates at the first sample of this section is its parent
+        for parent in reversed(sections_by_last_sample.get(section.samples[0].id, list())):
+
+            # Skip the section itself
+            if parent.id == section.id:
+                continue
+
+            # Set the auxiliary section to be a parent to this child section
+            section.parent = parent
+            section.parent_id = parent.id
+            break
+
+
 ####################################################################################################
 # @build_arbors_from_sections
 ####################################################################################################
@@ -186,17 +186,13 @@ def get_transformation_matrix(blue_config,
         Transformation matrix.
 
     """
-    # To load the circuit, 'brain' must be imported
-    try:
-        import brain
-    except ImportError:
-        raise ImportError('ERROR: Cannot import \'brain\'')
-
-    # Load the circuit data from the blue configuration
-    circuit = brain.Circuit(blue_config)
+    # Open the circuit only once per process, the transformations are cached
+    circuit = nmv.file.get_circuit(blue_config)
+    if circuit is None:
+        raise ImportError('ERROR: Cannot open the circuit [%s]' % blue_config)
 
     # Get the local to global transformation
-    origin_to_circuit_transform = circuit.transforms({int(gid)})[0]
+    origin_to_circuit_transform = circuit.get_transform(gid)
 
     # Initialize the transformation matrix to I
     transformation_matrix = Matrix()
@@ -0,0 +1,276 @@
+####################################################################################################
+# Copyright (c) 2016 - 2019, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import numpy
+
+# Internal imports
+import nmv
+import nmv.skeleton
+
+
+####################################################################################################
+# @get_section_projected_samples
+####################################################################################################
+def get_section_projected_samples(section,
+                                  view_direction=None):
+    """Gets the points and the radii of the samples of a given section as numpy arrays, where the
+    points are projected on the image plane of an orthographic camera.
+
+    :param section:
+        A given section.
+    :param view_direction:
+        A unit vector along the direction of the camera. If None, the points are not projected,
+        and the distances between them are the actual ones, which can never be smaller than the
+        projected ones in any view.
+    :return:
+        An Nx3 array of the (projected) points and an array of the N radii.
+    """
+
+    # Flatten the samples
+    points, radii = nmv.skeleton.ops.get_section_samples_arrays(section)
+
+    # Remove the component along the view direction
+    if view_direction is not None:
+        direction = numpy.array([view_direction[0], view_direction[1], view_direction[2]])
+        points -= numpy.outer(points.dot(direction), direction)
+
+    # Return the arrays
+    return points, radii
+
+
+####################################################################################################
+# @simplify_poly_line
+####################################################################################################
+def simplify_poly_line(points,
+                       radii,
+                       tolerance):
+    """Simplifies a poly-line with radii using the Douglas-Peucker algorithm, where a sample is kept
+    if its distance to the simplified poly-line or the difference between its radius and the
+    interpolated one is larger than the tolerance.
+
+    :param points:
+        An Nx3 array of the points of the poly-line.
+    :param radii:
+        An array of the N radii of the poly-line.
+    :param tolerance:
+        The maximum error allowed in the simplified poly-line.
+    :return:
+        A boolean mask of the samples that must be kept. The first and last samples are always
+        kept.
+    """
+
+    # The first and last samples are always kept
+    number_samples = len(points)
+    mask = numpy.zeros(number_samples, dtype=bool)
+    mask[0] = True
+    mask[-1] = True
+
+    # Use a stack instead of the recursion, long axons have thousands of samples
+    stack = [(0, number_samples - 1)]
+    while stack:
+        first, last = stack.pop()
+
+        # No samples in between
+        if last - first < 2:
+            continue
+
+        # The parametric location of the inner samples along the segment [first, last]
+        segment = points[last] - points[first]
+        segment_length = segment.dot(segment)
+        inner_points = points[first + 1:last] - points[first]
+        if segment_length > 0.0:
+            t = numpy.clip(inner_points.dot(segment) / segment_length, 0.0, 1.0)
+        else:
+            t = numpy.zeros(last - first - 1)
+
+        # The distances between the inner samples and the segment
+        distances = numpy.linalg.norm(inner_points - numpy.outer(t, segment), axis=1)
+
+        # The differences between the radii and the interpolated ones
+        radii_errors = numpy.abs(radii[first + 1:last] -
+                                 (radii[first] + t * (radii[last] - radii[first])))
+
+        # Keep the sample with the largest error, if it is not within the tolerance
+        errors = numpy.maximum(distances, radii_errors)
+        index = int(numpy.argmax(errors))
+        if errors[index] > tolerance:
+            index += first + 1
+            mask[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+
+    # Return the mask
+    return mask
+
+
+####################################################################################################
+# @prune_sub_pixel_sections
+####################################################################################################
+def prune_sub_pixel_sections(section,
+                             tolerance,
+                             view_direction=None):
+    """Removes the sub-trees that are not visible in the image recursively, i.e. the sub-trees
+    that are contained in a disk around their branching point whose radius is the tolerance or the
+    radius of the branching point. The root section of the arbor is never removed.
+
+    :param section:
+        A given section.
+    :param tolerance:
+        The radius of the disk in microns below which the sub-trees are removed.
+    :param view_direction:
+        A unit vector along the direction of the camera, or None for all the views.
+    :return:
+        An upper bound of the extent of the sub-tree around the first sample of the section and
+        the number of the removed sections.
+    """
+
+    # The number of the removed sections
+    number_removed_sections = 0
+
+    # The extent of the samples of the section around its first sample, including their radii
+    points, radii = get_section_projected_samples(section, view_direction)
+    extent = float(numpy.max(numpy.linalg.norm(points - points[0], axis=1) + radii))
+
+    # The children are processed first, and the visible ones are kept
+    children = list()
+    for child in section.children:
+        child_extent, child_removed_sections = prune_sub_pixel_sections(
+            child, tolerance, view_direction)
+        number_removed_sections += child_removed_sections
+
+        # Remove the child if it is hidden in its branching point or smaller than the tolerance
+        if child_extent <= max(tolerance, radii[-1]):
+            number_removed_sections += 1 + count_sub_tree_sections(child)
+            continue
+        children.append(child)
+
+        # The triangle inequality gives an upper bound for the extent of the child around the
+        # first sample of the section
+        extent = max(extent, child_extent + float(numpy.linalg.norm(points[-1] - points[0])))
+
+    # Update the children
+    if len(children) < len(section.children):
+        section.children = children
+        section.children_ids = [child.id for child in children]
+
+    # Return the extent and the number of the removed sections
+    return extent, number_removed_sections
+
+
+####################################################################################################
+# @count_sub_tree_sections
+####################################################################################################
+def count_sub_tree_sections(section):
+    """Counts the sections of the sub-tree of a given section excluding the section itself.
+
+    :param section:
+        A given section.
+    :return:
+        The number of the descendants of the section.
+    """
+
+    # Count the children recursively
+    number_sections = 0
+    for child in section.children:
+        number_sections += 1 + count_sub_tree_sections(child)
+    return number_sections
+
+
+####################################################################################################
+# @simplify_section_for_pixel_size
+####################################################################################################
+def simplify_section_for_pixel_size(section,
+                                    tolerance,
+                                    view_direction=None):
+    """Removes the samples of a given section and its children recursively if they do not change
+    the projection of the section by more than the tolerance.
+
+    :param section:
+        A given section.
+    :param tolerance:
+        The maximum error in microns.
+    :param view_direction:
+        A unit vector along the direction of the camera, or None for all the views.
+    :return:
+        The number of the removed samples.
+    """
+
+    # The number of the removed samples
+    number_removed_samples = 0
+
+    # Only the sections that have inner samples can be simplified
+    if len(section.samples) > 2:
+        points, radii = get_section_projected_samples(section, view_direction)
+        mask = simplify_poly_line(points, radii, tolerance)
+        number_removed_samples += len(section.samples) - int(numpy.count_nonzero(mask))
+        section.samples = [sample for sample, keep in zip(section.samples, mask) if keep]
+
+    # Simplify the children
+    for child in section.children:
+        number_removed_samples += simplify_section_for_pixel_size(child, tolerance, view_direction)
+
+    # Return the number of the removed samples
+    return number_removed_samples
+
+
+####################################################################################################
+# @simplify_morphology_for_pixel_size
+####################################################################################################
+def simplify_morphology_for_pixel_size(morphology,
+                                       pixel_size,
+                                       pixel_threshold=1.0,
+                                       view_direction=None):
+    """Simplifies the arbors of a morphology for a given pixel size, where the sub-trees that are
+    smaller than the threshold are removed and the samples that are within the threshold from the
+    simplified poly-lines of the sections are removed.
+
+    :param morphology:
+        A given morphology, which is modified in place.
+    :param pixel_size:
+        The size of a pixel in microns.
+    :param pixel_threshold:
+        The threshold in pixels, by default 1.0.
+    :param view_direction:
+        A unit vector along the direction of an orthographic camera. If None, the simplification
+        is valid for all the views.
+    :return:
+        The number of the removed sections and the number of the removed samples.
+    """
+
+    # The tolerance in microns
+    tolerance = pixel_size * pixel_threshold
+
+    # Collect the arbors
+    arbors = list()
+    if morphology.apical_dendrite is not None:
+        arbors.append(morphology.apical_dendrite)
+    if morphology.dendrites is not None:
+        arbors.extend(morphology.dendrites)
+    if morphology.axon is not None:
+        arbors.append(morphology.axon)
+
+    # Remove the invisible sub-trees, and then simplify the sections that are kept
+    number_removed_sections = 0
+    number_removed_samples = 0
+    for arbor in arbors:
+        number_removed_sections += prune_sub_pixel_sections(arbor, tolerance, view_direction)[1]
+        number_removed_samples += simplify_section_for_pixel_size(
+            arbor, tolerance, view_direction)
+
+    # Return the statistics
+    return number_removed_sections, number_removed_samples
@@ -0,0 +1,323 @@
+####################################################################################################
+# Copyright (c) 2016 - 2019, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import numpy
+
+# Blender imports
+from mathutils import Vector
+
+# Internal import
+import nmv
+import nmv.skeleton
+
+
+# The smallest step used by the adaptive resampling, to avoid the samples with zero radii
+MINIMUM_ADAPTIVE_SAMPLING_STEP = 0.05
+
+
+####################################################################################################
+# @get_section_samples_arrays
+####################################################################################################
+def get_section_samples_arrays(section):
+    """Gets the points and the radii of the samples of a given section as numpy arrays.
+
+    :param section:
+        A given section.
+    :return:
+        An Nx3 array of the points and an array of the N radii.
+    """
+
+    # Flatten the samples
+    points = numpy.array([[sample.point[0], sample.point[1], sample.point[2]]
+                          for sample in section.samples], dtype=float)
+    radii = numpy.array([sample.radius for sample in section.samples], dtype=float)
+    return points, radii
+
+
+####################################################################################################
+# @compute_arc_lengths
+####################################################################################################
+def compute_arc_lengths(points):
+    """Computes the arc length of every sample along a poly-line measured from its first sample.
+
+    :param points:
+        An Nx3 array of the points of the poly-line.
+    :return:
+        An array of the N arc lengths, where the first one is zero and the last one is the length
+        of the poly-line.
+    """
+
+    # Accumulate the lengths of the segments
+    arc_lengths = numpy.zeros(len(points))
+    numpy.cumsum(numpy.linalg.norm(numpy.diff(points, axis=0), axis=1), out=arc_lengths[1:])
+    return arc_lengths
+
+
+####################################################################################################
+# @compute_fixed_step_arc_lengths
+####################################################################################################
+def compute_fixed_step_arc_lengths(section_length,
+                                   sampling_step):
+    """Computes the arc lengths of the new inner samples of a section resampled at a fixed step.
+
+    :param section_length:
+        The length of the section.
+    :param sampling_step:
+        The sampling step.
+    :return:
+        An array of the arc lengths of the inner samples, all strictly smaller than the length
+        of the section.
+    """
+
+    # The last sample of the section is kept, therefore the last step can be shorter
+    arc_lengths = numpy.arange(1, int(numpy.ceil(section_length / sampling_step))) * sampling_step
+    return arc_lengths[arc_lengths < section_length - 1e-6 * sampling_step]
+
+
+####################################################################################################
+# @compute_adaptive_arc_lengths
+####################################################################################################
+def compute_adaptive_arc_lengths(arc_lengths,
+                                 radii,
+                                 radius_scale=1.0):
+    """Computes the arc lengths of the new inner samples of a section resampled adaptively, where
+    the sampling step at any point along the section is its radius scaled by a given factor.
+
+    The radius is linearly interpolated between the samples, and the number of steps to reach a
+    point is the integral of 1 / step along the arc length, which has a closed form per segment
+    and can be inverted per segment as well.
+
+    :param arc_lengths:
+        An array of the N arc lengths of the samples of the section.
+    :param radii:
+        An array of the N radii of the samples of the section.
+    :param radius_scale:
+        The ratio between the sampling step and the radius, by default 1.0.
+    :return:
+        An array of the arc lengths of the inner samples, all strictly smaller than the length
+        of the section.
+    """
+
+    # The steps at the samples, and their values at the start and end of every segment
+    steps = numpy.maximum(radii * radius_scale, MINIMUM_ADAPTIVE_SAMPLING_STEP)
+    steps_start = steps[:-1]
+    steps_end = steps[1:]
+    lengths = numpy.diff(arc_lengths)
+
+    # The number of steps per segment, where the step is constant along the segment or not
+    differences = steps_end - steps_start
+    constant = numpy.abs(differences) < 1e-9 * steps_start
+    safe_differences = numpy.where(constant, 1.0, differences)
+    segments_steps = numpy.where(
+        constant, lengths / steps_start,
+        lengths / safe_differences * numpy.log(steps_end / steps_start))
+
+    # The accumulated number of steps at every sample
+    number_steps = numpy.zeros(len(arc_lengths))
+    numpy.cumsum(segments_steps, out=number_steps[1:])
+
+    # The new samples are located at every integer number of steps, the last sample is kept
+    targets = numpy.arange(1, int(numpy.ceil(number_steps[-1])), dtype=float)
+    targets = targets[targets < number_steps[-1] - 1e-6]
+    if len(targets) == 0:
+        return targets
+
+    # Invert the number of steps in the segment of every target
+    segments = numpy.clip(numpy.searchsorted(number_steps, targets, side='right') - 1,
+                          0, len(lengths) - 1)
+    remaining_steps = targets - number_steps[segments]
+    steps_at_targets = steps_start[segments] * numpy.exp(
+        remaining_steps * safe_differences[segments] / numpy.maximum(lengths[segments], 1e-12))
+    offsets = numpy.where(
+        constant[segments], remaining_steps * steps_start[segments],
+        (steps_at_targets - steps_start[segments]) * lengths[segments] /
+        safe_differences[segments])
+
+    # Return the arc lengths
+    return arc_lengths[segments] + offsets
+
+
+####################################################################################################
+# @resample_section_at_arc_lengths
+####################################################################################################
+def resample_section_at_arc_lengths(section,
+                                    arc_lengths,
+                                    points,
+                                    radii,
+                                    new_arc_lengths):
+    """Replaces the inner samples of a section by new samples located at given arc lengths, where
+    the points and radii are linearly interpolated along the section. The first and last samples
+    are kept to preserve the connectivity of the section to its parent and children.
+
+    :param section:
+        A given section to resample.
+    :param arc_lengths:
+        An array of the N arc lengths of the samples of the section.
+    :param points:
+        An Nx3 array of the points of the samples of the section.
+    :param radii:
+        An array of the N radii of the samples of the section.
+    :param new_arc_lengths:
+        An array of the arc lengths of the new inner samples.
+    """
+
+    # Interpolate the points and the radii in one shot
+    new_points = numpy.column_stack([numpy.interp(new_arc_lengths, arc_lengths, points[:, i])
+                                     for i in range(3)])
+    new_radii = numpy.interp(new_arc_lengths, arc_lengths, radii)
+
+    # Every new sample gets the type of the sample at the start of its segment
+    segments = numpy.clip(numpy.searchsorted(arc_lengths, new_arc_lengths, side='right') - 1,
+                          0, len(arc_lengths) - 2)
+
+    # Create the new samples, the id of the sample is set to -1 (auxiliary sample)
+    samples = [section.samples[0]]
+    for point, radius, segment in zip(new_points.tolist(), new_radii.tolist(), segments.tolist()):
+        samples.append(nmv.skeleton.Sample(
+            point=Vector(point), radius=radius, id=-1, section=section,
+            type=section.samples[segment].type))
+    samples.append(section.samples[-1])
+
+    # Update the samples list
+    section.samples = samples
+
+    # After resampling the section, update the logical indexes of the samples
+    section.reorder_samples()
+
+
+####################################################################################################
+# @resample_section_at_fixed_step_vectorized
+####################################################################################################
+def resample_section_at_fixed_step_vectorized(section,
+                                              sampling_step=1.0):
+    """Resamples the section at a given sampling step along its arc length. If the section length
+    is smaller than the sampling step, a convenient sampling step will be computed and used.
+
+    This is a drop-in replacement of resample_section_at_fixed_step.
+
+    :param section:
+        A given section to resample.
+    :param sampling_step:
+        User-defined sampling step, by default 1.0 micron.
+    """
+
+    # If the section has no samples, report this as an error and ignore this filter
+    if len(section.samples) == 0:
+        nmv.logger.error('Section [%s: %d] has NO samples, cannot be re-sampled' %
+                         (section.get_type_string(), section.id))
+        return
+
+    # If the section has ONLY one sample, report this as an error and ignore this filter
+    elif len(section.samples) == 1:
+        nmv.logger.error('Section [%s: %d] has only ONE sample, cannot be re-sampled' %
+                         (section.get_type_string(), section.id))
+        return
+
+    # Parametrize the section by its arc length
+    points, radii = get_section_samples_arrays(section)
+    arc_lengths = compute_arc_lengths(points)
+    section_length = arc_lengths[-1]
+
+    # A section with coincident samples cannot be re-sampled
+    if section_length <= 0.0:
+        return
+
+    # If the section length is less than the sampling step, then use a step that would match it
+    if section_length < sampling_step:
+        sampling_step = section_length / len(section.samples)
+
+    # Resample the section
+    resample_section_at_arc_lengths(section, arc_lengths, points, radii,
+                                    compute_fixed_step_arc_lengths(section_length, sampling_step))
+
+
+####################################################################################################
+# @resample_section_with_radius_scale_vectorized
+####################################################################################################
+def resample_section_with_radius_scale_vectorized(section,
+                                                  radius_scale):
+    """Resamples the section adaptively along its arc length, where the sampling step at any point
+    is its radius scaled by a given factor.
+
+    :param section:
+        A given section to resample.
+    :param radius_scale:
+        The ratio between the sampling step and the radius.
+    """
+
+    # If the section has no samples, report this as an error and ignore this filter
+    if len(section.samples) == 0:
+        nmv.logger.error('Section [%s: %d] has NO samples, cannot be re-sampled' %
+                         (section.get_type_string(), section.id))
+        return
+
+    # If the section has ONLY one sample, report this as an error and ignore this filter
+    elif len(section.samples) == 1:
+        nmv.logger.error('Section [%s: %d] has only ONE sample, cannot be re-sampled' %
+                         (section.get_type_string(), section.id))
+        return
+
+    # Like the adaptive resampling, the sections with two samples are not re-sampled
+    elif len(section.samples) == 2:
+        return
+
+    # Parametrize the section by its arc length
+    points, radii = get_section_samples_arrays(section)
+    arc_lengths = compute_arc_lengths(points)
+
+    # A section with coincident samples cannot be re-sampled
+    if arc_lengths[-1] <= 0.0:
+        return
+
+    # Resample the section
+    resample_section_at_arc_lengths(section, arc_lengths, points, radii,
+                                    compute_adaptive_arc_lengths(arc_lengths, radii, radius_scale))
+
+
+####################################################################################################
+# @resample_section_adaptively_vectorized
+####################################################################################################
+def resample_section_adaptively_vectorized(section):
+    """Resamples the section adaptively along its arc length, where the sampling step at any point
+    is its radius.
+
+    This is a drop-in replacement of resample_section_adaptively.
+
+    :param section:
+        A given section to resample.
+    """
+
+    # The step is the radius
+    resample_section_with_radius_scale_vectorized(section, radius_scale=1.0)
+
+
+####################################################################################################
+# @resample_section_adaptively_relaxed_vectorized
+####################################################################################################
+def resample_section_adaptively_relaxed_vectorized(section):
+    """Resamples the section adaptively along its arc length, where the sampling step at any point
+    is its diameter.
+
+    This is a drop-in replacement of resample_section_adaptively_relaxed.
+
+    :param section:
+        A given section to resample.
+    """
+
+    # The step is the diameter
+    resample_section_with_radius_scale_vectorized(section, radius_scale=2.0)
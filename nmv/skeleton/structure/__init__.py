@@ -19,5 +19,6 @@ from .sample import *
 from .section import *
 from .soma import *
 from .morphology import *
+from .array_morphology import *
 from .spine import *
 
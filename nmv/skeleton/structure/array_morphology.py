@@ -0,0 +1,575 @@
+####################################################################################################
+# Copyright (c) 2016 - 2019, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import numpy
+
+# Blender imports
+from mathutils import Vector
+
+# Internal imports
+import nmv
+import nmv.bbox
+import nmv.skeleton
+from nmv.analysis.core import analysis_kernels
+from nmv.analysis.core import morphology_arrays
+
+
+####################################################################################################
+# ArraySample
+####################################################################################################
+class ArraySample:
+    """A lightweight view on a single sample of an ArrayMorphology.
+
+    The view does not store any data, it only references a row in the arrays of the morphology,
+    and it has the same attributes of the nmv.skeleton.Sample.
+    """
+
+    __slots__ = ('morphology', 'index')
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 morphology,
+                 index):
+        """Constructor
+
+        :param morphology:
+            The ArrayMorphology the sample belongs to.
+        :param index:
+            The index of the sample in the arrays of the morphology.
+        """
+
+        # A reference to the morphology
+        self.morphology = morphology
+
+        # The index of the sample (row) in the arrays of the morphology
+        self.index = index
+
+    @property
+    def point(self):
+        """Sample position in the cartesian space, Vector((x, y, z))."""
+        return Vector(self.morphology.points[self.index])
+
+    @property
+    def radius(self):
+        """Sample radius in microns."""
+        return float(self.morphology.radii[self.index])
+
+    @property
+    def id(self):
+        """Sample index as reported by the reader."""
+        return int(self.morphology.samples_ids[self.index])
+
+    @property
+    def morphology_index(self):
+        """Sample index as reported in the morphology file."""
+        return int(self.morphology.samples_morphology_indices[self.index])
+
+    @property
+    def type(self):
+        """Sample type."""
+        return int(self.morphology.samples_types[self.index])
+
+    @property
+    def parent_id(self):
+        """The index of the parent sample, as reported in the morphology file."""
+        return int(self.morphology.samples_parents_ids[self.index])
+
+    @property
+    def section(self):
+        """The section where the sample belongs."""
+        return ArraySection(self.morphology, self.morphology.get_sample_section_index(self.index))
+
+
+####################################################################################################
+# ArraySection
+####################################################################################################
+class ArraySection:
+    """A lightweight view on a single section of an ArrayMorphology.
+
+    The view does not store any data, it only references a section in the arrays of the
+    morphology, and it has the same read-only interface of the nmv.skeleton.Section.
+    """
+
+    __slots__ = ('morphology', 'index')
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 morphology,
+                 index):
+        """Constructor
+
+        :param morphology:
+            The ArrayMorphology the section belongs to.
+        :param index:
+            The index of the section in the arrays of the morphology.
+        """
+
+        # A reference to the morphology
+        self.morphology = morphology
+
+        # The index of the section in the arrays of the morphology
+        self.index = index
+
+    def __eq__(self, other):
+        return isinstance(other, ArraySection) and \
+               other.morphology is self.morphology and other.index == self.index
+
+    def __hash__(self):
+        return hash((id(self.morphology), self.index))
+
+    @property
+    def id(self):
+        """Section index as reported by the reader."""
+        return int(self.morphology.sections_ids[self.index])
+
+    @property
+    def type(self):
+        """Section type, AXON (2), DENDRITE (3), APICAL_DENDRITE (4)."""
+        return int(self.morphology.sections_types[self.index])
+
+    @property
+    def points(self):
+        """A view on the points of the samples of the section."""
+        return self.morphology.get_section_points(self.index)
+
+    @property
+    def radii(self):
+        """A view on the radii of the samples of the section."""
+        return self.morphology.get_section_radii(self.index)
+
+    @property
+    def samples(self):
+        """A list of views on the samples of the section."""
+        return [ArraySample(self.morphology, i) for i in range(
+            self.morphology.sections_offsets[self.index],
+            self.morphology.sections_offsets[self.index + 1])]
+
+    @property
+    def parent(self):
+        """The parent section, or None if the section is a root."""
+        parent_index = self.morphology.sections_parents[self.index]
+        if parent_index < 0:
+            return None
+        return ArraySection(self.morphology, int(parent_index))
+
+    @property
+    def parent_id(self):
+        """The index of the parent section, or None if the section is a root."""
+        parent = self.parent
+        if parent is None:
+            return None
+        return parent.id
+
+    @property
+    def children(self):
+        """A list of the children sections."""
+        return [ArraySection(self.morphology, i)
+                for i in self.morphology.get_section_children_indices(self.index)]
+
+    @property
+    def children_ids(self):
+        """A list of the indices of the children sections."""
+        return [child.id for child in self.children]
+
+    @property
+    def branching_order(self):
+        """The branching order of the section, the root sections have a branching order of 1."""
+        order = 1
+        parent_index = self.morphology.sections_parents[self.index]
+        while parent_index >= 0:
+            order += 1
+            parent_index = self.morphology.sections_parents[parent_index]
+        return order
+
+    def is_root(self):
+        """Checks if the section is root or not."""
+        return self.morphology.sections_parents[self.index] < 0
+
+    def is_leaf(self):
+        """Checks if the section is leaf (last branch in a tree) in the tree or not."""
+        return len(self.morphology.get_section_children_indices(self.index)) == 0
+
+    def has_children(self):
+        """Checks if the section has children sections or not."""
+        return not self.is_leaf()
+
+    def has_parent(self):
+        """Checks if the section has a parent section or not."""
+        return not self.is_root()
+
+    def is_axon(self):
+        """Checks if this section belongs to the axon or not."""
+        return str(self.type) == '2'
+
+    def is_basal_dendrite(self):
+        """Checks if this section belongs to a basal dendrite or not."""
+        return str(self.type) == '3'
+
+    def is_apical_dendrite(self):
+        """Checks if this section belongs to an apical dendrite or not."""
+        return str(self.type) == '4'
+
+    def compute_length(self):
+        """Computes the length of the section."""
+        return float(self.morphology.compute_sections_lengths()[self.index])
+
+
+####################################################################################################
+# ArrayMorphology
+####################################################################################################
+class ArrayMorphology(morphology_arrays.MorphologyArrays):
+    """A compact representation of the morphological skeleton that stores all the samples and the
+    sections in contiguous NumPy arrays (structure of arrays) rather than in a graph of objects.
+
+    The arrays are laid out by the Blender-free MorphologyArrays of the analysis core, so an
+    ArrayMorphology can be analyzed by the kernels of the core directly. This class adds the
+    views on the sections and the samples, the soma and the conversions to and from the
+    nmv.skeleton.Morphology.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 points,
+                 radii,
+                 sections_offsets,
+                 sections_types,
+                 sections_parents,
+                 sections_ids=None,
+                 samples_ids=None,
+                 samples_morphology_indices=None,
+                 samples_types=None,
+                 samples_parents_ids=None,
+                 axon_root=None,
+                 dendrites_roots=None,
+                 apical_dendrite_root=None,
+                 soma=None,
+                 gid=None,
+                 mtype=None,
+                 label=None,
+                 number_stems=0):
+        """Constructor
+
+        :param points:
+            An Nx3 array of the positions of all the samples.
+        :param radii:
+            An array of the radii of all the samples.
+        :param sections_offsets:
+            An array of S+1 offsets, the samples of the section i are in the range
+            [sections_offsets[i], sections_offsets[i + 1]).
+        :param sections_types:
+            An array of the types of the sections.
+        :param sections_parents:
+            An array of the indices of the parent sections in the arrays, -1 for root sections.
+        :param sections_ids:
+            An array of the indices of the sections as reported by the reader, by default the
+            indices of the sections in the arrays.
+        :param samples_ids:
+            An array of the indices of the samples as reported by the reader, by default the
+            indices of the samples along their sections.
+        :param samples_morphology_indices:
+            An array of the indices of the samples in the morphology file, by default -1.
+        :param samples_types:
+            An array of the types of the samples, by default the types of their sections.
+        :param samples_parents_ids:
+            An array of the indices of the parent samples in the morphology file, by default -1.
+        :param axon_root:
+            The index of the root section of the axon, if available.
+        :param dendrites_roots:
+            A list of the indices of the root sections of the basal dendrites, if available.
+        :param apical_dendrite_root:
+            The index of the root section of the apical dendrite, if available.
+        :param soma:
+            Morphology soma.
+        :param gid:
+            Morphology GID, if available.
+        :param mtype:
+            Morphology type, if available.
+        :param label:
+            A given label to the morphology.
+        :param number_stems:
+            Number of stems as reported in the morphology file.
+        """
+
+        # The samples and the sections arrays
+        morphology_arrays.MorphologyArrays.__init__(
+            self, points=points, radii=radii, sections_offsets=sections_offsets,
+            sections_types=sections_types, sections_parents=sections_parents,
+            sections_ids=sections_ids, samples_ids=samples_ids,
+            samples_morphology_indices=samples_morphology_indices, samples_types=samples_types,
+            samples_parents_ids=samples_parents_ids, axon_root=axon_root,
+            dendrites_roots=dendrites_roots, apical_dendrite_root=apical_dendrite_root,
+            label=label, number_stems=number_stems)
+
+        # Morphology soma
+        self.soma = soma
+
+        # Morphology GID
+        self.gid = gid
+
+        # Morphology type
+        self.mtype = mtype
+
+        # Morphology label (will be morphology name or gid)
+        if gid is not None:
+            self.label = str(gid)
+
+        # The lengths of the sections, computed on demand
+        self.sections_lengths = None
+
+    ################################################################################################
+    # @get_section
+    ################################################################################################
+    def get_section(self,
+                    index):
+        """Returns a view on a section.
+
+        :param index:
+            The index of the section in the arrays.
+        :return:
+            An ArraySection view.
+        """
+        return ArraySection(self, index)
+
+    @property
+    def soma(self):
+        """Morphology soma."""
+        return self._soma
+
+    @soma.setter
+    def soma(self, soma):
+        """Sets the soma of the morphology and its data in the arrays of the analysis core."""
+        self._soma = soma
+        self.has_soma = soma is not None
+        self.soma_mean_radius = None if soma is None else soma.mean_radius
+        self.soma_profile_points = list() if soma is None else \
+            [[point[0], point[1], point[2]] for point in soma.profile_points]
+        self.soma_arbors_profile_points = list() if soma is None else \
+            [[point[0], point[1], point[2]] for point in soma.arbors_profile_points]
+
+    @property
+    def axon(self):
+        """A view on the root section of the axon, or None."""
+        if self.axon_root is None:
+            return None
+        return ArraySection(self, self.axon_root)
+
+    @property
+    def dendrites(self):
+        """A list of views on the root sections of the basal dendrites, or None."""
+        if self.dendrites_roots is None:
+            return None
+        return [ArraySection(self, root) for root in self.dendrites_roots]
+
+    @property
+    def apical_dendrite(self):
+        """A view on the root section of the apical dendrite, or None."""
+        if self.apical_dendrite_root is None:
+            return None
+        return ArraySection(self, self.apical_dendrite_root)
+
+    ################################################################################################
+    # @compute_sections_lengths
+    ################################################################################################
+    def compute_sections_lengths(self):
+        """Computes the lengths of all the sections at once.
+
+        :return:
+            An array of the lengths of the sections.
+        """
+
+        if self.sections_lengths is not None:
+            return self.sections_lengths
+
+        # The lengths of the segments with the kernels of the analysis core
+        first_samples, segments_sections = analysis_kernels.get_segments_samples(
+            self.sections_offsets)
+        self.sections_lengths = analysis_kernels.sum_segments_per_section(
+            segments_sections, analysis_kernels.compute_segments_lengths(
+                self.points, first_samples), self.get_number_sections())
+        return self.sections_lengths
+
+    ################################################################################################
+    # @compute_bounding_box
+    ################################################################################################
+    def compute_bounding_box(self):
+        """Computes the bounding box of the morphology.
+
+        :return:
+            A reference to the bounding box of the morphology, or None if it has no samples.
+        """
+
+        if len(self.radii) == 0:
+            return None
+
+        p_min = self.points.min(axis=0)
+        p_max = self.points.max(axis=0)
+        return nmv.bbox.BoundingBox(p_min=Vector(p_min), p_max=Vector(p_max))
+
+    ################################################################################################
+    # @from_morphology
+    ################################################################################################
+    @staticmethod
+    def from_morphology(morphology):
+        """Converts a nmv.skeleton.Morphology into an ArrayMorphology.
+
+        :param morphology:
+            A given morphology.
+        :return:
+            A reference to the ArrayMorphology.
+        """
+
+        points = list()
+        radii = list()
+        samples_ids = list()
+        samples_morphology_indices = list()
+        samples_types = list()
+        samples_parents_ids = list()
+        sections_offsets = [0]
+        sections_types = list()
+        sections_parents = list()
+        sections_ids = list()
+
+        def add_arbor(root):
+
+            # Returns the index of the root section of the arbor
+            root_index = len(sections_types)
+
+            # Depth-first traversal with the children in order, [section, parent index]
+            stack = [[root, -1]]
+            while len(stack) > 0:
+                section, parent_index = stack.pop()
+                section_index = len(sections_types)
+                for sample in section.samples:
+                    points.append((sample.point[0], sample.point[1], sample.point[2]))
+                    radii.append(sample.radius)
+                    samples_ids.append(sample.id)
+                    samples_morphology_indices.append(sample.morphology_index)
+                    samples_types.append(sample.type)
+                    samples_parents_ids.append(sample.parent_id)
+                sections_offsets.append(len(radii))
+                sections_types.append(section.type)
+                sections_parents.append(parent_index)
+                sections_ids.append(section.id)
+                for child in reversed(section.children):
+                    stack.append([child, section_index])
+            return root_index
+
+        axon_root = None
+        if morphology.axon is not None:
+            axon_root = add_arbor(morphology.axon)
+
+        dendrites_roots = None
+        if morphology.dendrites is not None:
+            dendrites_roots = [add_arbor(dendrite) for dendrite in morphology.dendrites]
+
+        apical_dendrite_root = None
+        if morphology.apical_dendrite is not None:
+            apical_dendrite_root = add_arbor(morphology.apical_dendrite)
+
+        array_morphology = ArrayMorphology(
+            points=numpy.array(points, dtype=numpy.float64).reshape((-1, 3)), radii=radii,
+            sections_offsets=sections_offsets, sections_types=sections_types,
+            sections_parents=sections_parents, sections_ids=sections_ids,
+            samples_ids=samples_ids, samples_morphology_indices=samples_morphology_indices,
+            samples_types=samples_types, samples_parents_ids=samples_parents_ids,
+            axon_root=axon_root, dendrites_roots=dendrites_roots,
+            apical_dendrite_root=apical_dendrite_root, soma=morphology.soma,
+            gid=morphology.gid, mtype=morphology.mtype, label=morphology.label,
+            number_stems=morphology.number_stems)
+
+        # Keep the label, even if the GID is given
+        array_morphology.label = morphology.label
+        return array_morphology
+
+    ################################################################################################
+    # @build_sections
+    ################################################################################################
+    def build_sections(self):
+        """Builds the nmv.skeleton.Section objects of all the sections in the arrays.
+
+        :return:
+            A list of sections, with the same order of the sections in the arrays.
+        """
+
+        # Convert the arrays into lists in bulk
+        points = self.points.tolist()
+        radii = self.radii.tolist()
+        samples_ids = self.samples_ids.tolist()
+        samples_morphology_indices = self.samples_morphology_indices.tolist()
+        samples_types = self.samples_types.tolist()
+        samples_parents_ids = self.samples_parents_ids.tolist()
+        offsets = self.sections_offsets.tolist()
+        sections_ids = self.sections_ids.tolist()
+        sections_types = self.sections_types.tolist()
+        sections_parents = self.sections_parents.tolist()
+
+        sections = list()
+        for i in range(len(sections_ids)):
+            samples = [nmv.skeleton.Sample(
+                point=Vector(points[j]), radius=radii[j], id=samples_ids[j],
+                morphology_id=samples_morphology_indices[j], type=samples_types[j],
+                parent_id=samples_parents_ids[j]) for j in range(offsets[i], offsets[i + 1])]
+            sections.append(nmv.skeleton.Section(
+                id=sections_ids[i], samples=samples, type=sections_types[i]))
+
+        # Link the parents and the children
+        for i, section in enumerate(sections):
+            if sections_parents[i] >= 0:
+                parent = sections[sections_parents[i]]
+                section.parent = parent
+                section.parent_id = parent.id
+                parent.children.append(section)
+                parent.children_ids.append(section.id)
+
+        return sections
+
+    ################################################################################################
+    # @to_morphology
+    ################################################################################################
+    def to_morphology(self):
+        """Converts the ArrayMorphology into a nmv.skeleton.Morphology.
+
+        :return:
+            A reference to the nmv.skeleton.Morphology.
+        """
+
+        sections = self.build_sections()
+
+        axon = None
+        if self.axon_root is not None:
+            axon = sections[self.axon_root]
+
+        dendrites = None
+        if self.dendrites_roots is not None:
+            dendrites = [sections[root] for root in self.dendrites_roots]
+
+        apical_dendrite = None
+        if self.apical_dendrite_root is not None:
+            apical_dendrite = sections[self.apical_dendrite_root]
+
+        morphology = nmv.skeleton.Morphology(
+            soma=self.soma, axon=axon, dendrites=dendrites, apical_dendrite=apical_dendrite,
+            gid=self.gid, mtype=self.mtype, label=self.label)
+        morphology.number_stems = self.number_stems
+        return morphology
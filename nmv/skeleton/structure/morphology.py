@@ -84,14 +84,14 @@ class Morphology:
         # A linear list of all the samples of the apical, used to query radii based on distance
         self.apical_dendrite_samples = list()
 
-        # A copy of the original axon, needed for comparison
-        self.original_axon = copy.deepcopy(axon)
+        # A compact (array-based) snapshot of the original arbors, needed for comparison.
+        # NOTE: The snapshot is not taken when the morphology is constructed, but only when the
+        # original arbors are requested or when @save_original_arbors is called, see
+        # @original_axon, @original_dendrites and @origin_apical_dendrite
+        self.original_arbors = None
 
-        # A copy of the original basal dendrites list, needed for comparison
-        self.original_dendrites = copy.deepcopy(dendrites)
-
-        # A copy of the original apical dendrite, needed for comparison
-        self.origin_apical_dendrite = copy.deepcopy(apical_dendrite)
+        # The original arbors materialized from the snapshot when they are requested
+        self.original_morphology = None
 
         # Morphology GID
         self.gid = gid
@@ -140,6 +140,9 @@ class Morphology:
         # The color of the soma, see @create_morphology_color_palette
         self.soma_color = None
 
+        # The analysis data of the arbors, keyed by their prefixes, see @build_analysis_cache
+        self.analysis_cache = None
+
     ################################################################################################
     # @build_samples_lists_recursively
     ################################################################################################
@@ -175,11 +178,119 @@ class Morphology:
                 for basal in self.dendrites:
                     basal_list = list()
                     self.build_samples_lists_recursively(basal, basal_list)
-                    self.basal_dendrites_samples.append(copy.deepcopy(basal_list))
+                    self.basal_dendrites_samples.append(basal_list)
 
         if self.apical_dendrite is not None:
             self.build_samples_lists_recursively(self.apical_dendrite, self.apical_dendrite_samples)
 
+    ################################################################################################
+    # @save_original_arbors
+    ################################################################################################
+    def save_original_arbors(self):
+        """Takes a compact snapshot of the current arbors to be used as the original ones.
+
+        The snapshot is taken only once, therefore this function must be called before modifying
+        the arbors of the morphology in place if the original arbors are needed later.
+        """
+
+        if self.original_arbors is None:
+            self.original_arbors = nmv.skeleton.ArrayMorphology.from_morphology(self)
+
+    ################################################################################################
+    # @get_original_morphology
+    ################################################################################################
+    def get_original_morphology(self):
+        """Returns a morphology that contains the original arbors, which is materialized from the
+        snapshot only once when it is requested for the first time.
+
+        NOTE: The snapshot is taken lazily, by this function or by @save_original_arbors, and not
+        when the morphology is constructed. If the arbors are modified in place before, the
+        "original" arbors are the modified ones. Therefore, a function that modifies the arbors of
+        a morphology in place, rather than those of a @clone, must call @save_original_arbors
+        first if the original arbors are needed afterwards.
+
+        :return:
+            A reference to the morphology that contains the original arbors.
+        """
+
+        if self.original_morphology is None:
+            self.save_original_arbors()
+            self.original_morphology = self.original_arbors.to_morphology()
+
+        return self.original_morphology
+
+    @property
+    def original_axon(self):
+        """A copy of the original axon, needed for comparison.
+
+        The original arbors are the arbors at the time of the first request, or of the call to
+        @save_original_arbors, see @get_original_morphology.
+        """
+        return self.get_original_morphology().axon
+
+    @property
+    def original_dendrites(self):
+        """A copy of the original basal dendrites list, needed for comparison.
+
+        The original arbors are the arbors at the time of the first request, or of the call to
+        @save_original_arbors, see @get_original_morphology.
+        """
+        return self.get_original_morphology().dendrites
+
+    @property
+    def origin_apical_dendrite(self):
+        """A copy of the original apical dendrite, needed for comparison.
+
+        The original arbors are the arbors at the time of the first request, or of the call to
+        @save_original_arbors, see @get_original_morphology.
+        """
+        return self.get_original_morphology().apical_dendrite
+
+    ################################################################################################
+    # @clone
+    ################################################################################################
+    def clone(self):
+        """Returns an independent copy of the morphology that can be modified in place without
+        affecting this one.
+
+        This is much cheaper than copy.deepcopy, since only the arbors (sections and samples) and
+        the soma are copied, and the rest of the members are shared or rebuilt.
+
+        :return:
+            A reference to the cloned morphology.
+        """
+
+        # Copy all the members by reference
+        morphology = copy.copy(self)
+
+        # Clone the arbors
+        if self.axon is not None:
+            morphology.axon = self.axon.clone()
+        if self.dendrites is not None:
+            morphology.dendrites = [dendrite.clone() for dendrite in self.dendrites]
+        if self.apical_dendrite is not None:
+            morphology.apical_dendrite = self.apical_dendrite.clone()
+
+        # The soma and the bounding boxes are small, copy them
+        morphology.soma = copy.deepcopy(self.soma)
+        morphology.bounding_box = copy.deepcopy(self.bounding_box)
+        morphology.relaxed_bounding_box = copy.deepcopy(self.relaxed_bounding_box)
+        morphology.unified_bounding_box = copy.deepcopy(self.unified_bounding_box)
+
+        # Rebuild the samples lists from the cloned arbors
+        morphology.axon_samples = list()
+        morphology.basal_dendrites_samples = list()
+        morphology.apical_dendrite_samples = list()
+        morphology.build_samples_lists()
+
+        # The snapshot of the original arbors is immutable and can be shared, but the arbors
+        # materialized from it are not. If this morphology has no snapshot yet, the original
+        # arbors of the clone are taken from the clone itself when they are requested
+        morphology.original_morphology = None
+
+        # Return a reference to the cloned morphology
+        return morphology
+
     ################################################################################################
     # @has_axon
     ################################################################################################
@@ -15,6 +15,9 @@
 # If not, see <http://www.gnu.org/licenses/>.
 ####################################################################################################
 
+# System imports
+import copy
+
 # Internal imports
 import nmv.enums
 
@@ -122,6 +125,62 @@ class Section:
         # The Y-coordinate of the dendrogram of this section
         self.dendrogram_y = None
 
+        # The analysis data collected by the fused analysis pass of the arbor
+        # NOTE: This variable is only set to the root sections, see @build_analysis_cache.
+        self.analysis_data = None
+
+    ################################################################################################
+    # @clone
+    ################################################################################################
+    def clone(self):
+        """Returns an independent copy of the section and all its children sections.
+
+        This is much cheaper than copy.deepcopy, since only the sections, the samples and their
+        points are copied, and the rest of the members are shared. The parent of the cloned section
+        is the same parent of this section.
+
+        :return:
+            A reference to the cloned section.
+        """
+
+        cloned_root = None
+
+        # Clone the tree iteratively to avoid the recursion limit on deep arbors
+        stack = [[self, None]]
+        while len(stack) > 0:
+            section, cloned_parent = stack.pop()
+
+            # Copy all the members by reference, and then copy the mutable ones
+            cloned_section = copy.copy(section)
+            cloned_section.children_ids = list(section.children_ids)
+            cloned_section.children = list()
+
+            # The clone can be modified, so it does not share the analysis data of the section
+            cloned_section.analysis_data = None
+
+            # Clone the samples
+            if section.samples is not None:
+                cloned_section.samples = list()
+                for sample in section.samples:
+                    cloned_sample = copy.copy(sample)
+                    cloned_sample.point = sample.point.copy()
+                    cloned_sample.section = cloned_section
+                    cloned_section.samples.append(cloned_sample)
+
+            # Link the section to its cloned parent
+            if cloned_parent is None:
+                cloned_root = cloned_section
+            else:
+                cloned_section.parent = cloned_parent
+                cloned_parent.children.append(cloned_section)
+
+            # Clone the children in order
+            for child in reversed(section.children):
+                stack.append([child, cloned_section])
+
+        # Return a reference to the cloned section
+        return cloned_root
+
     ################################################################################################
     # @get_type_string
     ################################################################################################
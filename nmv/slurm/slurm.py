@@ -16,56 +16,63 @@
 ####################################################################################################
 
 # System imports
-import sys, os, subprocess, time
+import sys, os, math, subprocess
 
 # Add other modules
 sys.path.append("%s/../consts" % os.path.dirname(os.path.realpath(__file__)))
 sys.path.append("%s/../file" % os.path.dirname(os.path.realpath(__file__)))
+sys.path.append("%s/../file/readers/circuit" % os.path.dirname(os.path.realpath(__file__)))
 sys.path.append("%s/../interface" % os.path.dirname(os.path.realpath(__file__)))
+sys.path.append("%s/../scheduler" % os.path.dirname(os.path.realpath(__file__)))
 
 # Internal modules
 import arguments_parser
+import circuit_access
+import cost_model
 import file_ops
 import paths_consts
 import slurm_configuration
+import submission_controller
 
 
 ####################################################################################################
 # @squeue
 ####################################################################################################
-def squeue():
-    """Return a list of all the current jobs on the cluster.
+def squeue(user_name=None):
+    """Returns a list of the current jobs of a user on the cluster.
 
-    :
+    :param user_name:
+        The user name of the user, by default the current user.
     :return:
-        A list of all the current jobs on the cluster.
+        A list of [job_id, state, number_tasks] entries, or None if squeue failed.
     """
 
-    # Get the current processes running on the cluster
-    result = str(subprocess.check_output(['squeue']))
-    return result.splitlines()  # Works only with python3.5
+    user_name = user_name or submission_controller.get_default_user_name()
+    try:
+        output = subprocess.check_output(
+            ['squeue', '-u', user_name, '-h', '-o', submission_controller.SQUEUE_FORMAT],
+            universal_newlines=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return submission_controller.parse_squeue_output(output)
 
 
 ####################################################################################################
 # @get_current_number_jobs_for_user
 ####################################################################################################
 def get_current_number_jobs_for_user(user_name):
-    """Get the current number of jobs running on the cluster for a specific user identified by his
-    user name.
+    """Get the current number of jobs running on the cluster for a specific user identified by the
+    user name, where every task of a job array is a job.
 
     :param user_name:
         The user name of the user.
     :return:
-        The current number of jobs running on the cluster for a specific user identified by his
-        user name.
+        The current number of jobs running on the cluster for a specific user identified by the
+        user name, or None if squeue failed.
     """
-    number_jobs = 0
-    jobs = squeue()
 
-    for job in jobs:
-        if user_name in job:
-            number_jobs += 1
-    return number_jobs
+    return submission_controller.SubmissionController(
+        user_name=user_name).get_number_jobs_in_flight()
 
 
 ####################################################################################################
@@ -97,6 +104,15 @@ def create_batch_job_config_string(slurm_config):
     # Job name
     b += "#SBATCH --job-name=\"%s%s\"%s" % (slurm_config.job_name, str(slurm_config.job_number), sl)
 
+    # Job array, every task of the array has its own index
+    log_suffix = str(slurm_config.job_number)
+    if slurm_config.array_size > 0:
+        array_throttle = ''
+        if 0 < slurm_config.array_throttle < slurm_config.array_size:
+            array_throttle = '%%%d' % slurm_config.array_throttle
+        b += "#SBATCH --array=0-%d%s%s" % (slurm_config.array_size - 1, array_throttle, sl)
+        log_suffix = '%A_%a'
+
     # Number of nodes required to execute the job
     b += "#SBATCH --nodes=%s%s" % (slurm_config.num_nodes, sl)
 
@@ -122,8 +138,8 @@ def create_batch_job_config_string(slurm_config):
     # b += "#SBATCH --reservation=%s%s" % ("viz_team", sl)
 
     """ Logs """
-    std_out = "%s/slurm-stdout_%s.log" % (slurm_config.logs_directory, str(slurm_config.job_number))
-    std_err = "%s/slurm-stderr_%s.log" % (slurm_config.logs_directory, str(slurm_config.job_number))
+    std_out = "%s/slurm-stdout_%s.log" % (slurm_config.logs_directory, log_suffix)
+    std_err = "%s/slurm-stderr_%s.log" % (slurm_config.logs_directory, log_suffix)
     b += "#SBATCH --output=%s%s" % (std_out, sl)
     b += "#SBATCH --error=%s%s" % (std_err, dl)
 
@@ -240,15 +256,12 @@ def create_batch_job_script_for_multiple_gids(arguments,
     # Generate the batch job configuration string
     batch_job_config_string = create_batch_job_config_string(slurm_config)
 
-    # Add the shell command to run blender
-    # Setup the shell command
-    shell_command = ""
+    # Add the shell commands to run blender for all the GIDs
+    shell_command = ''
     for gid in gids:
 
         # Get all the shell commands that are given for a specific GID
-        shell_commands = arguments_parser.create_executable_for_single_gid(arguments, gid) + '\n'
-
-        shell_command = ''
+        shell_commands = arguments_parser.create_executable_for_single_gid(arguments, gid)
         for command in shell_commands:
             shell_command += command + '\n'
 
@@ -310,71 +323,299 @@ def create_batch_job_script_for_morphology_file(arguments,
 
 
 ####################################################################################################
-# @submit_batch_jobs
+# @get_session_time_in_seconds
 ####################################################################################################
-def submit_batch_jobs(user_name,
-                      slurm_jobs_directory):
-    """Submits all the batch jobs found in the jobs directory.
+def get_session_time_in_seconds(session_time):
+    """Converts a SLURM time limit to seconds.
 
-    This function takes into account the maximum limit imposed by the cluster (500 jobs per user).
+    The accepted formats are those of sbatch: minutes, minutes:seconds, hours:minutes:seconds,
+    days-hours, days-hours:minutes and days-hours:minutes:seconds.
 
-    :param user_name:
-        The user name of the current user.
-    :param slurm_jobs_directory:
-        The directory where the batch jobs are created. .
+    :param session_time:
+        The time limit string.
+    :return:
+        The time limit in seconds.
     """
 
-    # Get all the scripts in the slurm jobs directory to submit them
-    scripts = file_ops.get_files_in_directory(slurm_jobs_directory, file_extension='.sh')
+    # Days
+    days = None
+    if '-' in session_time:
+        days, session_time = session_time.split('-', 1)
+        days = int(days)
+
+    fields = [int(field) for field in session_time.split(':')]
+
+    # Hours, minutes and seconds after the days
+    if days is not None:
+        fields = fields + [0] * (3 - len(fields))
+        hours, minutes, seconds = fields
+
+    # Minutes, minutes:seconds or hours:minutes:seconds
+    elif len(fields) == 1:
+        hours, minutes, seconds = 0, fields[0], 0
+    elif len(fields) == 2:
+        hours, minutes, seconds = 0, fields[0], fields[1]
+    else:
+        hours, minutes, seconds = fields[:3]
+
+    return (((days or 0) * 24 + hours) * 60 + minutes) * 60 + seconds
+
+
+####################################################################################################
+# @get_number_neurons_per_array_task
+####################################################################################################
+def get_number_neurons_per_array_task(arguments,
+                                      number_neurons,
+                                      slurm_config):
+    """Gets the number of neurons that are processed by every task of a job array.
+
+    If the number is not given by the user, it is derived from the estimated time of the requested
+    tasks of a single neuron, such that the neurons of an array task fill a fraction of its session
+    time. In both cases, the neurons are packed further if the array would have more tasks than
+    the cluster allows.
+
+    :param arguments:
+        Command line arguments.
+    :param number_neurons:
+        The total number of neurons.
+    :param slurm_config:
+        SLURM configuration parameters.
+    :return:
+        The number of neurons per array task.
+    """
+
+    # Given by the user
+    if arguments.neurons_per_array_task > 0:
+        number_neurons_per_task = arguments.neurons_per_array_task
+
+    # Estimated from the number of requested tasks per neuron
+    else:
+        neuron_time = max(1, len(arguments_parser.get_requested_cli_interfaces(arguments))) * \
+            slurm_config.estimated_task_time
+        session_time = get_session_time_in_seconds(slurm_config.session_time)
+        number_neurons_per_task = max(
+            1, int(slurm_config.session_time_usage * session_time // neuron_time))
+
+    # Do not exceed the maximum size of the array
+    minimum_number_neurons_per_task = int(math.ceil(number_neurons /
+                                                    float(slurm_config.max_array_size)))
+    if number_neurons_per_task < minimum_number_neurons_per_task:
+        print('WARNING: Packing %d neurons per array task to fit in %d array tasks' %
+              (minimum_number_neurons_per_task, slurm_config.max_array_size))
+        number_neurons_per_task = minimum_number_neurons_per_task
+
+    return max(1, min(number_neurons_per_task, number_neurons))
+
+
+####################################################################################################
+# @create_batch_job_array
+####################################################################################################
+def create_batch_job_array(arguments,
+                           neurons_shell_commands,
+                           slurm_config=None,
+                           neurons_costs=None):
+    """Creates a job array where every task runs the shell commands of several neurons.
+
+    The commands of every array task are written to a script in the array tasks directory, and
+    the array script runs the script of its task index.
+
+    :param arguments:
+        Command line arguments.
+    :param neurons_shell_commands:
+        A list of the shell commands of every neuron.
+    :param slurm_config:
+        SLURM configuration parameters, the default configuration if None.
+    :param neurons_costs:
+        A list of the estimated costs of the neurons, to balance the total costs of the array
+        tasks. If None, the neurons are packed in their order.
+    :return:
+        The path to the array script.
+    """
+
+    # Create slurm configuration
+    if slurm_config is None:
+        slurm_config = slurm_configuration.SlurmConfiguration()
+
+    # Pack the neurons into the array tasks, with balanced costs or in their order
+    number_neurons_per_task = get_number_neurons_per_array_task(
+        arguments, len(neurons_shell_commands), slurm_config)
+    if neurons_costs is not None:
+        number_tasks = int(math.ceil(len(neurons_shell_commands) /
+                                     float(number_neurons_per_task)))
+        array_tasks = [[neurons_shell_commands[i] for i in task_neurons] for task_neurons in
+                       cost_model.pack_into_bins(neurons_costs, number_tasks)]
+    else:
+        array_tasks = [neurons_shell_commands[i:i + number_neurons_per_task]
+                       for i in range(0, len(neurons_shell_commands), number_neurons_per_task)]
+    print('Packing [%d] neurons into [%d] array tasks, [%d] neurons per task' %
+          (len(neurons_shell_commands), len(array_tasks), number_neurons_per_task))
+
+    # Write the script of every array task
+    array_tasks_directory = '%s/%s' % (arguments.output_directory,
+                                       paths_consts.Paths.SLURM_ARRAY_TASKS_FOLDER)
+    file_ops.create_directory(array_tasks_directory)
+    for task_index, task_neurons in enumerate(array_tasks):
+        task_string = '#!/bin/bash\n'
+        for shell_commands in task_neurons:
+            for command in shell_commands:
+                task_string += command + '\n'
+        file_ops.write_batch_job_string_to_file(
+            array_tasks_directory, 'task-%d' % task_index, task_string)
+
+    # Update slurm configuration data, the running tasks of the array are limited like the jobs
+    slurm_config.job_number = 'Array'
+    slurm_config.array_size = len(array_tasks)
+    slurm_config.array_throttle = arguments.slurm_max_jobs
+
+    # Execution directory, same as output directory
+    slurm_config.execution_directory = '%s' % arguments.output_directory
+
+    # Log directory
+    slurm_config.logs_directory = '%s/%s' % (arguments.output_directory,
+                                             paths_consts.Paths.SLURM_LOGS_FOLDER)
+
+    # Generate the batch job configuration string, and run the task of the array index
+    batch_job_config_string = create_batch_job_config_string(slurm_config)
+    batch_job_config_string += 'bash %s/task-${SLURM_ARRAY_TASK_ID}.sh\n' % array_tasks_directory
+
+    # Write the batch job script to file in the slurm jobs directory
+    slurm_jobs_directory = '%s/%s' % (arguments.output_directory,
+                                      paths_consts.Paths.SLURM_JOBS_FOLDER)
+    file_ops.write_batch_job_string_to_file(
+        slurm_jobs_directory, 'neurons-array', batch_job_config_string)
+    return '%s/neurons-array.sh' % slurm_jobs_directory
+
+
+####################################################################################################
+# @get_submission_controller
+####################################################################################################
+def get_submission_controller(arguments):
+    """Creates the submission controller of a run from the command line arguments.
+
+    :param arguments:
+        Command line arguments.
+    :return:
+        A submission_controller.SubmissionController that writes the submission log of the run.
+    """
 
-    # Use an index to keep track on the number of jobs submitted to the cluster.
-    script_index = 0
+    return submission_controller.SubmissionController(
+        user_name=arguments.slurm_user, max_jobs_in_flight=arguments.slurm_max_jobs,
+        submission_log='%s/%s' % (arguments.output_directory,
+                                  paths_consts.Paths.SLURM_SUBMISSION_LOG))
 
-    # Submit the jobs taking into account the maximum number of jobs dedicated per user
-    while True:
 
-        # Just sleep for a second
-        time.sleep(1)
+####################################################################################################
+# @submit_batch_job_array
+####################################################################################################
+def submit_batch_job_array(script_full_path,
+                           controller=None):
+    """Submits a job array script with a single sbatch call.
+
+    :param script_full_path:
+        The path to the array script.
+    :param controller:
+        A submission_controller.SubmissionController, a default one without a log if None.
+    :return:
+        The ID of the job array, or None if the submission failed.
+    """
+
+    if controller is None:
+        controller = submission_controller.SubmissionController()
+
+    # The number of running tasks is limited by the array itself
+    job_id = controller.submit_script(script_full_path)
+    if job_id is not None:
+        print('Submitted the job array [%s]' % job_id)
+    return job_id
 
-        # Get the number of jobs active for that user
-        number_active_jobs = get_current_number_jobs_for_user(user_name=user_name)
 
-        # If the number of jobs is greater than 500, then wait a second and try again
-        if number_active_jobs >= 500:
-            print('Waiting for resources ...')
-            continue
+####################################################################################################
+# @submit_batch_jobs
+####################################################################################################
+def submit_batch_jobs(user_name,
+                      slurm_jobs_directory,
+                      max_jobs_in_flight=submission_controller.DEFAULT_MAX_JOBS_IN_FLIGHT,
+                      submission_log=None,
+                      scripts_costs=None):
+    """Submits all the batch jobs found in the jobs directory.
 
-        # Otherwise, you can submit some jobs
-        else:
+    The number of pending and running jobs of the user never exceeds the given maximum, see
+    submission_controller.SubmissionController.
 
-            # Get the number of jobs that are available to submit
-            number_available_jobs = 500 - number_active_jobs
+    :param user_name:
+        The user name of the jobs, by default the current user.
+    :param slurm_jobs_directory:
+        The directory where the batch jobs are created.
+    :param max_jobs_in_flight:
+        The maximum number of jobs of the user on the cluster.
+    :param submission_log:
+        The path to the submission log, where the ID of every job is written.
+    :param scripts_costs:
+        A dictionary of the estimated costs of the scripts, keyed by their file names, to submit
+        the most expensive scripts first. If None, the scripts are submitted in their order.
+    :return:
+        A list of [script, job_id] pairs, where the job ID is None if the submission failed.
+    """
 
-            # Submit as many jobs as you can
-            for i in range(number_available_jobs):
+    # Get all the scripts in the slurm jobs directory to submit them
+    scripts = sorted(file_ops.get_files_in_directory(slurm_jobs_directory, file_extension='.sh'))
+    if scripts_costs is not None:
+        scripts = [scripts[i] for i in cost_model.get_longest_first_order(
+            [scripts_costs.get(script, 0.0) for script in scripts])]
+    scripts = ['%s/%s' % (slurm_jobs_directory, script) for script in scripts]
 
-                # Make sure that we still have some jobs to submit, otherwise break
-                if script_index >= len(scripts):
-                    return
+    # 'chmod' the scripts to be able to execute them
+    for script in scripts:
+        os.chmod(script, os.stat(script).st_mode | 0o111)
 
-                # Get the script full path
-                script_full_path = '%s/%s' % (slurm_jobs_directory, scripts[script_index])
+    controller = submission_controller.SubmissionController(
+        user_name=user_name, max_jobs_in_flight=max_jobs_in_flight,
+        submission_log=submission_log)
+    return controller.submit_scripts(scripts)
 
-                # 'chmod' the script to be able to execute it
-                shell_command = 'chmod +x %s' % script_full_path
 
-                # Execute the command
-                subprocess.call(shell_command, shell=True)
+####################################################################################################
+# @report_submitted_jobs_states
+####################################################################################################
+def report_submitted_jobs_states(output_directory):
+    """Reports the state of every script submitted by a run from the accounting of the cluster.
 
-                # Format the shell command
-                shell_command = 'sbatch %s' % script_full_path
+    The states of the tasks of a job array are counted per state.
 
-                # Execute the command
-                print('Submitting [%s]' % shell_command)
-                subprocess.call(shell_command, shell=True)
+    :param output_directory:
+        The output directory of the run, where the submission log is written.
+    :return:
+        True if all the submitted jobs are completed, otherwise False.
+    """
 
-                # Increment the script index
-                script_index += 1
+    # The submitted scripts
+    submission_log = '%s/%s' % (output_directory, paths_consts.Paths.SLURM_SUBMISSION_LOG)
+    entries = submission_controller.read_submission_log(submission_log)
+    if len(entries) == 0:
+        print('ERROR: No submitted jobs are found in [%s]' % submission_log)
+        return False
+
+    # The states of the jobs and of the tasks of the job arrays
+    states = submission_controller.get_submitted_jobs_states(submission_log)
+    if states is None:
+        return False
+
+    # A line per script, with the states of its job or of the tasks of its job array
+    number_completed_scripts = 0
+    for _, job_id, script in entries:
+        job_states = [state for task_id, state in states.items()
+                      if task_id == job_id or task_id.startswith('%s_' % job_id)]
+        if len(job_states) == 0:
+            job_states = ['UNKNOWN']
+        if all(state == 'COMPLETED' for state in job_states):
+            number_completed_scripts += 1
+        states_string = ', '.join(['%s %d' % (state, job_states.count(state))
+                                   for state in sorted(set(job_states))])
+        print('%-16s %-40s %s' % (job_id, states_string, script))
+
+    print('%d out of %d submitted scripts are completed' %
+          (number_completed_scripts, len(entries)))
+    return number_completed_scripts == len(entries)
 
 
 ####################################################################################################
@@ -390,16 +631,38 @@ def run_gid_jobs_on_cluster(arguments,
         GID list for all the neurons.
     """
 
+    # The estimated costs of the neurons from their morphologies in the circuit
+    costs = None
+    circuit = circuit_access.get_circuit(arguments.blue_config)
+    if arguments.load_balancing == 'cost' and circuit is not None:
+        costs = cost_model.estimate_morphology_files_costs(
+            [circuit.get_morphology_uri(int(gid)) for gid in gids], arguments,
+            arguments_parser.get_requested_cli_interfaces(arguments))
+
+    # Submit all the GIDs as a single job array
+    if arguments.slurm_array:
+        array_script = create_batch_job_array(
+            arguments, [arguments_parser.create_executable_for_single_gid(arguments, gid)
+                        for gid in gids], neurons_costs=costs)
+        submit_batch_job_array(array_script, get_submission_controller(arguments))
+        return
+
     for gid in gids:
 
         # Create the batch jobs for the all the GIDs in the target
         create_batch_job_script_for_gid(arguments=arguments, gid=gid)
 
     # Submit the jobs
-    # TODO: Add an option for the user
     slurm_jobs_directory = '%s/%s' % (arguments.output_directory,
                                       paths_consts.Paths.SLURM_JOBS_FOLDER)
-    submit_batch_jobs(user_name='abdellah', slurm_jobs_directory=slurm_jobs_directory)
+    scripts_costs = None
+    if costs is not None:
+        scripts_costs = {'%s.sh' % gid: cost for gid, cost in zip(gids, costs)}
+    submit_batch_jobs(user_name=arguments.slurm_user, slurm_jobs_directory=slurm_jobs_directory,
+                      max_jobs_in_flight=arguments.slurm_max_jobs,
+                      submission_log='%s/%s' % (arguments.output_directory,
+                                                paths_consts.Paths.SLURM_SUBMISSION_LOG),
+                      scripts_costs=scripts_costs)
 
 
 ####################################################################################################
@@ -415,13 +678,37 @@ def run_morphology_files_jobs_on_cluster(arguments,
         A list of morphology files.
     """
 
+    # The estimated costs of the morphology files, to process the most expensive ones first
+    costs = None
+    if arguments.load_balancing == 'cost':
+        costs = cost_model.estimate_morphology_files_costs(
+            ['%s/%s' % (arguments.morphology_directory, morphology_file)
+             for morphology_file in morphology_files], arguments,
+            arguments_parser.get_requested_cli_interfaces(arguments))
+
+    # Submit all the morphology files as a single job array
+    if arguments.slurm_array:
+        array_script = create_batch_job_array(
+            arguments, [arguments_parser.create_executable_for_single_morphology_file(
+                arguments, morphology_file) for morphology_file in morphology_files],
+            neurons_costs=costs)
+        submit_batch_job_array(array_script, get_submission_controller(arguments))
+        return
+
     for morphology_file in morphology_files:
         # Create the batch jobs for the all the GIDs in the target
         create_batch_job_script_for_morphology_file(
             arguments=arguments, morphology_file=morphology_file)
 
     # Submit the jobs
-    # TODO: Add an option for the user
     slurm_jobs_directory = '%s/%s' % (arguments.output_directory,
                                       paths_consts.Paths.SLURM_JOBS_FOLDER)
-    submit_batch_jobs(user_name='abdellah', slurm_jobs_directory=slurm_jobs_directory)
+    scripts_costs = None
+    if costs is not None:
+        scripts_costs = {'%s.sh' % morphology_file: cost
+                         for morphology_file, cost in zip(morphology_files, costs)}
+    submit_batch_jobs(user_name=arguments.slurm_user, slurm_jobs_directory=slurm_jobs_directory,
+                      max_jobs_in_flight=arguments.slurm_max_jobs,
+                      submission_log='%s/%s' % (arguments.output_directory,
+                                                paths_consts.Paths.SLURM_SUBMISSION_LOG),
+                      scripts_costs=scripts_costs)
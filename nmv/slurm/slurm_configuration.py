@@ -63,3 +63,18 @@ class SlurmConfiguration:
 
         # Logs directory, where the logs will be written
         self.logs_directory = ''
+
+        # The number of tasks of a job array, zero for a single job
+        self.array_size = 0
+
+        # The maximum number of running tasks of a job array, zero for no limit
+        self.array_throttle = 0
+
+        # The maximum number of tasks of a job array, the MaxArraySize of the cluster minus one
+        self.max_array_size = 1000
+
+        # The estimated time to run a single task (mesh, skeleton, ...) on a neuron, in seconds
+        self.estimated_task_time = 120
+
+        # The fraction of the session time that is filled with neurons in every array task
+        self.session_time_usage = 0.8
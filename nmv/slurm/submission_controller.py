@@ -0,0 +1,347 @@
+####################################################################################################
+# Copyright (c) 2016 - 2019, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+import time
+import getpass
+import subprocess
+
+
+# The default maximum number of jobs of a user that are pending or running on the cluster
+DEFAULT_MAX_JOBS_IN_FLIGHT = 500
+
+# The format of the squeue output, the job ID and the state of every job
+SQUEUE_FORMAT = '%i %T'
+
+
+####################################################################################################
+# @get_default_user_name
+####################################################################################################
+def get_default_user_name():
+    """Gets the name of the current user, from $USER or from the system.
+
+    :return:
+        The user name.
+    """
+
+    return os.environ.get('USER') or getpass.getuser()
+
+
+####################################################################################################
+# @get_number_array_tasks
+####################################################################################################
+def get_number_array_tasks(job_id):
+    """Gets the number of tasks of a job from its ID in the squeue output.
+
+    The pending tasks of a job array are listed in a single line, for example 1234_[0-99%10] or
+    1234_[3,5-7], while a single job or a running array task, for example 1234 or 1234_5, is a
+    single task.
+
+    :param job_id:
+        The job ID as listed by squeue.
+    :return:
+        The number of tasks of the job.
+    """
+
+    if '_[' not in job_id:
+        return 1
+
+    # Remove the array throttle
+    indices = job_id.split('_[', 1)[1].rstrip(']').split('%')[0]
+
+    number_tasks = 0
+    for index_range in indices.split(','):
+        if '-' in index_range:
+            first, last = index_range.split('-', 1)
+            number_tasks += int(last) - int(first) + 1
+        elif len(index_range) > 0:
+            number_tasks += 1
+    return number_tasks
+
+
+####################################################################################################
+# @parse_squeue_output
+####################################################################################################
+def parse_squeue_output(output):
+    """Parses the output of squeue with the SQUEUE_FORMAT and without a header.
+
+    :param output:
+        The output of squeue.
+    :return:
+        A list of [job_id, state, number_tasks] entries.
+    """
+
+    jobs = list()
+    for line in output.splitlines():
+        fields = line.split()
+        if len(fields) < 2:
+            continue
+        jobs.append([fields[0], fields[1], get_number_array_tasks(fields[0])])
+    return jobs
+
+
+####################################################################################################
+# @read_submission_log
+####################################################################################################
+def read_submission_log(submission_log):
+    """Reads the submission log of a run.
+
+    :param submission_log:
+        The path to the submission log.
+    :return:
+        A list of [time, job_id, script] entries.
+    """
+
+    entries = list()
+    if not os.path.isfile(submission_log):
+        return entries
+    with open(submission_log, 'r') as f:
+        for line in f:
+            fields = line.rstrip('\n').split('\t')
+            if len(fields) == 3:
+                entries.append(fields)
+    return entries
+
+
+####################################################################################################
+# @get_submitted_jobs_states
+####################################################################################################
+def get_submitted_jobs_states(submission_log,
+                              sacct_command='sacct'):
+    """Gets the states of all the jobs in the submission log of a run from the accounting of the
+    cluster, to find the completed and the failed jobs.
+
+    :param submission_log:
+        The path to the submission log.
+    :param sacct_command:
+        The sacct executable.
+    :return:
+        A dictionary of the states of the jobs, and of the tasks of the job arrays, keyed by their
+        IDs, for example {'1234': 'COMPLETED', '1235_0': 'FAILED'}, or None if sacct failed.
+    """
+
+    job_ids = [job_id for _, job_id, _ in read_submission_log(submission_log)]
+    if len(job_ids) == 0:
+        return dict()
+
+    try:
+        output = subprocess.check_output(
+            [sacct_command, '-n', '-P', '-X', '-o', 'JobID,State', '-j', ','.join(job_ids)],
+            universal_newlines=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print('ERROR: Cannot query the states of the submitted jobs: %s' % str(e))
+        return None
+
+    states = dict()
+    for line in output.splitlines():
+        fields = line.split('|')
+        if len(fields) >= 2:
+            states[fields[0]] = fields[1].split()[0] if len(fields[1]) > 0 else ''
+    return states
+
+
+####################################################################################################
+# @SubmissionController
+####################################################################################################
+class SubmissionController:
+    """Submits batch jobs to SLURM while keeping the number of jobs of the user that are pending
+    or running on the cluster below a maximum.
+
+    The jobs are counted with a single squeue call that only lists the jobs of the user. As many
+    jobs as there are free slots are submitted at once, and when there are no free slots, or the
+    scheduler does not respond, the controller waits with an exponential backoff. The failed
+    submissions are retried with the same backoff. Every submitted job is appended to the
+    submission log with its ID, to track it later with sacct.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 user_name=None,
+                 max_jobs_in_flight=DEFAULT_MAX_JOBS_IN_FLIGHT,
+                 submission_log=None,
+                 initial_backoff=1.0,
+                 maximum_backoff=60.0,
+                 maximum_submission_attempts=5,
+                 squeue_command='squeue',
+                 sbatch_command='sbatch'):
+        """Constructor
+
+        :param user_name:
+            The user name of the jobs, by default the current user.
+        :param max_jobs_in_flight:
+            The maximum number of jobs, or array tasks, of the user on the cluster.
+        :param submission_log:
+            The path to the submission log, None to skip it.
+        :param initial_backoff:
+            The first waiting time in seconds when there are no free slots.
+        :param maximum_backoff:
+            The maximum waiting time in seconds.
+        :param maximum_submission_attempts:
+            The maximum number of times the submission of a script is attempted.
+        :param squeue_command:
+            The squeue executable.
+        :param sbatch_command:
+            The sbatch executable.
+        """
+
+        # User
+        self.user_name = user_name or get_default_user_name()
+        self.max_jobs_in_flight = max(1, max_jobs_in_flight)
+
+        # Log
+        self.submission_log = submission_log
+
+        # Backoff
+        self.initial_backoff = initial_backoff
+        self.maximum_backoff = maximum_backoff
+        self.maximum_submission_attempts = max(1, maximum_submission_attempts)
+
+        # Scheduler commands
+        self.squeue_command = squeue_command
+        self.sbatch_command = sbatch_command
+
+    ################################################################################################
+    # @get_number_jobs_in_flight
+    ################################################################################################
+    def get_number_jobs_in_flight(self):
+        """Gets the number of jobs, and array tasks, of the user that are on the cluster.
+
+        :return:
+            The number of jobs, or None if squeue failed.
+        """
+
+        try:
+            output = subprocess.check_output(
+                [self.squeue_command, '-u', self.user_name, '-h', '-o', SQUEUE_FORMAT],
+                universal_newlines=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print('WARNING: Cannot query the jobs of [%s]: %s' % (self.user_name, str(e)))
+            return None
+
+        return sum(number_tasks for _, _, number_tasks in parse_squeue_output(output))
+
+    ################################################################################################
+    # @log_submission
+    ################################################################################################
+    def log_submission(self,
+                       job_id,
+                       script_full_path):
+        """Appends a submitted job to the submission log.
+
+        :param job_id:
+            The ID of the job.
+        :param script_full_path:
+            The path to the script of the job.
+        """
+
+        if self.submission_log is None:
+            return
+        with open(self.submission_log, 'a') as f:
+            f.write('%s\t%s\t%s\n' % (time.strftime('%Y-%m-%dT%H:%M:%S'), job_id,
+                                      script_full_path))
+
+    ################################################################################################
+    # @submit_script
+    ################################################################################################
+    def submit_script(self,
+                      script_full_path):
+        """Submits a single batch script.
+
+        :param script_full_path:
+            The path to the script.
+        :return:
+            The ID of the job, or None if the submission failed.
+        """
+
+        print('Submitting [%s]' % script_full_path)
+        try:
+            output = subprocess.check_output(
+                [self.sbatch_command, '--parsable', script_full_path], universal_newlines=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print('ERROR: Cannot submit [%s]: %s' % (script_full_path, str(e)))
+            return None
+
+        # The parsable output is the job ID, followed by the cluster name if any
+        job_id = output.strip().split(';')[0]
+        self.log_submission(job_id, script_full_path)
+        return job_id
+
+    ################################################################################################
+    # @submit_scripts
+    ################################################################################################
+    def submit_scripts(self,
+                       scripts,
+                       jobs_per_script=1):
+        """Submits a list of batch scripts without exceeding the maximum number of jobs in flight.
+
+        :param scripts:
+            A list of the paths to the scripts.
+        :param jobs_per_script:
+            The number of jobs, or array tasks, of every script.
+        :return:
+            A list of [script, job_id] pairs, where the job ID is None if all the attempts to
+            submit the script failed.
+        """
+
+        # The IDs of the jobs of the scripts, and the number of submission attempts of every one
+        job_ids = [None] * len(scripts)
+        attempts = [0] * len(scripts)
+
+        # The indices of the scripts that are not submitted yet, the failed ones come first
+        pending_scripts = list(range(len(scripts)))
+        backoff = self.initial_backoff
+        while len(pending_scripts) > 0:
+
+            # Wait if the scheduler does not respond or the user has no free slots
+            number_jobs_in_flight = self.get_number_jobs_in_flight()
+            if number_jobs_in_flight is None or \
+                    number_jobs_in_flight + jobs_per_script > self.max_jobs_in_flight:
+                print('Waiting for resources [%s] jobs in flight, retrying in %2.1f seconds' %
+                      (str(number_jobs_in_flight), backoff))
+                time.sleep(backoff)
+                backoff = min(2 * backoff, self.maximum_backoff)
+                continue
+
+            # Submit a batch of scripts that fills the free slots
+            number_scripts = max(1, (self.max_jobs_in_flight - number_jobs_in_flight) //
+                                 max(1, jobs_per_script))
+            failed_scripts = list()
+            for script_index in pending_scripts[:number_scripts]:
+                job_ids[script_index] = self.submit_script(scripts[script_index])
+                attempts[script_index] += 1
+                if job_ids[script_index] is None and \
+                        attempts[script_index] < self.maximum_submission_attempts:
+                    failed_scripts.append(script_index)
+            pending_scripts = failed_scripts + pending_scripts[number_scripts:]
+
+            # Retry the failed submissions with the backoff
+            if len(failed_scripts) > 0:
+                print('Retrying [%d] failed submissions in %2.1f seconds' %
+                      (len(failed_scripts), backoff))
+                time.sleep(backoff)
+                backoff = min(2 * backoff, self.maximum_backoff)
+                continue
+            backoff = self.initial_backoff
+
+            # Let the scheduler register the batch before counting the jobs again
+            if len(pending_scripts) > 0:
+                time.sleep(self.initial_backoff)
+
+        return [[script, job_id] for script, job_id in zip(scripts, job_ids)]
@@ -0,0 +1,220 @@
+####################################################################################################
+# Copyright (c) 2016 - 2019, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import sys, os, time
+
+sys.path.append(('%s/../../' %(os.path.dirname(os.path.realpath(__file__)))))
+
+# System imports
+import argparse
+
+# NeuroMorphoVis imports
+import nmv
+import nmv.analysis
+import nmv.file
+import nmv.skeleton
+
+
+####################################################################################################
+# @parse_command_line_arguments
+####################################################################################################
+def parse_command_line_arguments(arguments=None):
+    """Parses the input arguments.
+
+    :param arguments:
+        Command line arguments.
+    :return:
+        Arguments list.
+    """
+
+    # add all the options
+    description = 'Comparing the per-section analysis loops and the vectorized arbor geometry ' \
+                  'on the largest arbor of a morphology, typically the axon'
+    parser = argparse.ArgumentParser(description=description)
+
+    arg_help = 'An input morphology'
+    parser.add_argument('--morphology',
+                        action='store', dest='morphology', help=arg_help)
+
+    arg_help = 'The number of times each implementation is executed'
+    parser.add_argument('--repetitions',
+                        action='store', dest='repetitions', type=int, default=5, help=arg_help)
+
+    # Parse the arguments
+    return parser.parse_args()
+
+
+####################################################################################################
+# @collect_per_section
+####################################################################################################
+def collect_per_section(arbor):
+    """Collects the fused analysis data by applying every section operation to the arbor, where the
+    samples of every section are visited in a loop.
+
+    :param arbor:
+        A given arbor.
+    :return:
+        The collected data.
+    """
+
+    analysis_data = dict()
+    for operation in nmv.analysis.get_fused_section_operations():
+        analysis_data[operation] = list()
+        nmv.skeleton.ops.apply_operation_to_arbor(*[arbor, operation, analysis_data[operation]])
+    return analysis_data
+
+
+####################################################################################################
+# @collect_vectorized
+####################################################################################################
+def collect_vectorized(arbor):
+    """Collects the fused analysis data from the stacked arrays of the arbor.
+
+    :param arbor:
+        A given arbor.
+    :return:
+        The collected data.
+    """
+
+    analysis_data = {operation: list() for operation in
+                     nmv.analysis.get_fused_section_operations()}
+    nmv.analysis.collect_arbor_analysis_data(arbor, analysis_data)
+    return analysis_data
+
+
+####################################################################################################
+# @compute_section_geometry_per_section
+####################################################################################################
+def compute_section_geometry_per_section(arbor):
+    """Computes the length, surface area and volume of every section with the per-section analysis
+    kernels.
+
+    :param arbor:
+        A given arbor.
+    :return:
+        A list of [length, surface area, volume] per section.
+    """
+
+    sections, _ = nmv.analysis.get_arbor_sections(arbor)
+    return [[nmv.analysis.compute_section_length(section),
+             nmv.analysis.compute_section_surface_area_from_segments(section),
+             nmv.analysis.compute_section_volume_from_segments(section)]
+            for section in sections]
+
+
+####################################################################################################
+# @get_maximum_relative_difference
+####################################################################################################
+def get_maximum_relative_difference(data_1,
+                                    data_2):
+    """Gets the maximum relative difference between the numeric values of two analysis data.
+
+    :param data_1:
+        The first analysis data.
+    :param data_2:
+        The second analysis data.
+    :return:
+        The maximum relative difference.
+    """
+
+    difference = 0.0
+    for operation in data_1:
+        if len(data_1[operation]) != len(data_2[operation]):
+            return float('inf')
+        for value_1, value_2 in zip(data_1[operation], data_2[operation]):
+            if isinstance(value_1, (int, float)):
+                difference = max(difference,
+                                 abs(value_1 - value_2) / max(abs(value_1), 1e-12))
+    return difference
+
+
+####################################################################################################
+# @time_function
+####################################################################################################
+def time_function(function,
+                  arbor,
+                  repetitions):
+    """Gets the minimum execution time of a function over a number of repetitions.
+
+    :param function:
+        The function.
+    :param arbor:
+        The argument of the function.
+    :param repetitions:
+        The number of repetitions.
+    :return:
+        The minimum time in seconds and the result of the function.
+    """
+
+    best = None
+    result = None
+    for i in range(repetitions):
+        start = time.time()
+        result = function(arbor)
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+####################################################################################################
+# @ Main
+####################################################################################################
+if __name__ == "__main__":
+
+    # Get all arguments after the '--'
+    args = sys.argv
+    sys.argv = args[args.index("--") + 0:]
+
+    # Parse the command line arguments
+    args = parse_command_line_arguments()
+
+    # Load the morphology file
+    loading_flag, morphology_object = \
+        nmv.file.readers.read_morphology_from_file_naively(args.morphology)
+
+    # Select the largest arbor
+    arbors = list()
+    if morphology_object.apical_dendrite is not None:
+        arbors.append(morphology_object.apical_dendrite)
+    if morphology_object.dendrites is not None:
+        arbors.extend(morphology_object.dendrites)
+    if morphology_object.axon is not None:
+        arbors.append(morphology_object.axon)
+    arbor = max(arbors, key=lambda a: len(nmv.analysis.get_arbor_samples_arrays(
+        nmv.analysis.get_arbor_sections(a)[0])[1]))
+    sections, _ = nmv.analysis.get_arbor_sections(arbor)
+    print('Arbor: %s, %d sections, %d samples' % (
+        arbor.get_type_prefix(), len(sections), sum(len(s.samples) for s in sections)))
+
+    # The fused analysis data
+    per_section_time, per_section_data = time_function(
+        collect_per_section, arbor, args.repetitions)
+    vectorized_time, vectorized_data = time_function(
+        collect_vectorized, arbor, args.repetitions)
+    print('Analysis data: per-section %.4f s, vectorized %.4f s, speedup %.1fx, '
+          'maximum relative difference %g' % (
+            per_section_time, vectorized_time, per_section_time / vectorized_time,
+            get_maximum_relative_difference(per_section_data, vectorized_data)))
+
+    # The lengths, areas and volumes of the sections only
+    per_section_time, per_section_geometry = time_function(
+        compute_section_geometry_per_section, arbor, args.repetitions)
+    vectorized_time, arbor_geometry = time_function(
+        nmv.analysis.compute_arbor_geometry, arbor, args.repetitions)
+    print('Sections geometry: per-section %.4f s, vectorized %.4f s, speedup %.1fx' % (
+        per_section_time, vectorized_time, per_section_time / vectorized_time))
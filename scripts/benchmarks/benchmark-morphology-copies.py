@@ -0,0 +1,106 @@
+####################################################################################################
+# Copyright (c) 2016 - 2019, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import sys, os, time, copy, resource
+
+sys.path.append(('%s/../../' %(os.path.dirname(os.path.realpath(__file__)))))
+
+# System imports
+import argparse
+
+# NeuroMorphoVis imports
+import nmv
+import nmv.file
+
+
+####################################################################################################
+# @parse_command_line_arguments
+####################################################################################################
+def parse_command_line_arguments(arguments=None):
+    """Parses the input arguments.
+
+    :param arguments:
+        Command line arguments.
+    :return:
+        Arguments list.
+    """
+
+    # add all the options
+    description = 'Measuring the peak memory of loading a morphology and copying it for builders'
+    parser = argparse.ArgumentParser(description=description)
+
+    arg_help = 'An input morphology'
+    parser.add_argument('--morphology',
+                        action='store', dest='morphology', help=arg_help)
+
+    arg_help = 'How the builders copy the morphology, clone or deepcopy. ' \
+               'Run each mode in a separate process, since the peak memory never decreases'
+    parser.add_argument('--copy-mode',
+                        action='store', dest='copy_mode', default='clone', help=arg_help)
+
+    arg_help = 'The number of copies, i.e. the number of builders in the pipeline'
+    parser.add_argument('--copies',
+                        action='store', dest='copies', type=int, default=3, help=arg_help)
+
+    # Parse the arguments
+    return parser.parse_args()
+
+
+####################################################################################################
+# @get_peak_rss
+####################################################################################################
+def get_peak_rss():
+    """Returns the peak resident set size of the process in MB (Linux).
+
+    :return:
+        The peak RSS in MB.
+    """
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+####################################################################################################
+# @ Main
+####################################################################################################
+if __name__ == "__main__":
+
+    # Get all arguments after the '--'
+    args = sys.argv
+    sys.argv = args[args.index("--") + 0:]
+
+    # Parse the command line arguments
+    args = parse_command_line_arguments()
+
+    print('Peak RSS before loading: %.1f MB' % get_peak_rss())
+
+    # Load the morphology file
+    start = time.time()
+    loading_flag, morphology_object = \
+        nmv.file.readers.read_morphology_from_file_naively(args.morphology)
+    print('Loading: %.2f s, Peak RSS: %.1f MB' % (time.time() - start, get_peak_rss()))
+
+    # Copy the morphology as the builders do
+    copies = list()
+    start = time.time()
+    for i in range(args.copies):
+        if args.copy_mode == 'deepcopy':
+            copies.append(copy.deepcopy(morphology_object))
+        else:
+            copies.append(morphology_object.clone())
+    print('%d copies (%s): %.2f s, Peak RSS: %.1f MB' %
+          (args.copies, args.copy_mode, time.time() - start, get_peak_rss()))
@@ -0,0 +1,148 @@
+####################################################################################################
+# Copyright (c) 2016 - 2019, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import sys, os, time
+
+sys.path.append(('%s/../../' %(os.path.dirname(os.path.realpath(__file__)))))
+
+# System imports
+import argparse
+
+# NeuroMorphoVis imports
+import nmv
+import nmv.builders
+import nmv.consts
+import nmv.file
+import nmv.geometry
+import nmv.options
+import nmv.scene
+
+
+# The skeleton builders to benchmark
+SKELETON_BUILDERS = [
+    ['Connected sections', nmv.builders.ConnectedSectionsBuilder],
+    ['Disconnected sections', nmv.builders.DisconnectedSectionsBuilder]]
+
+
+####################################################################################################
+# @parse_command_line_arguments
+####################################################################################################
+def parse_command_line_arguments(arguments=None):
+    """Parses the input arguments.
+
+    :param arguments:
+        Command line arguments.
+    :return:
+        Arguments list.
+    """
+
+    # add all the options
+    description = 'Comparing the point-by-point and the bulk (foreach_set) construction of the ' \
+                  'curves of the skeleton builders, typically on a morphology with a large axon'
+    parser = argparse.ArgumentParser(description=description)
+
+    arg_help = 'An input morphology'
+    parser.add_argument('--morphology',
+                        action='store', dest='morphology', help=arg_help)
+
+    arg_help = 'The number of times each builder is executed'
+    parser.add_argument('--repetitions',
+                        action='store', dest='repetitions', type=int, default=3, help=arg_help)
+
+    # Parse the arguments
+    return parser.parse_args()
+
+
+####################################################################################################
+# @time_skeleton_builder
+####################################################################################################
+def time_skeleton_builder(builder,
+                          morphology_object,
+                          options,
+                          bulk_curve_construction,
+                          repetitions):
+    """Builds the skeleton of a morphology several times in an empty scene and returns the best
+    time.
+
+    :param builder:
+        The class of the skeleton builder.
+    :param morphology_object:
+        A given morphology.
+    :param options:
+        The options of NeuroMorphoVis.
+    :param bulk_curve_construction:
+        Write the points of the curves in bulk, otherwise point by point.
+    :param repetitions:
+        The number of times the skeleton is built.
+    :return:
+        The best time in seconds and the number of points of the curves of the last run.
+    """
+
+    nmv.geometry.ops.poly_line_ops.BULK_CURVE_CONSTRUCTION = bulk_curve_construction
+
+    best_time = None
+    number_points = 0
+    for i in range(repetitions):
+        nmv.scene.ops.clear_scene()
+        skeleton_builder = builder(morphology=morphology_object, options=options)
+        start = time.time()
+        skeleton_objects = skeleton_builder.draw_morphology_skeleton()
+        elapsed = time.time() - start
+        if best_time is None or elapsed < best_time:
+            best_time = elapsed
+
+        # Count the points of the curves
+        number_points = 0
+        for skeleton_object in skeleton_objects:
+            if skeleton_object is not None and skeleton_object.type == 'CURVE':
+                number_points += sum(len(spline.points)
+                                     for spline in skeleton_object.data.splines)
+    return best_time, number_points
+
+
+####################################################################################################
+# @ Main
+####################################################################################################
+if __name__ == "__main__":
+
+    # Get all arguments after the '--'
+    args = sys.argv
+    sys.argv = args[args.index("--") + 0:]
+
+    # Parse the command line arguments
+    args = parse_command_line_arguments()
+
+    # Load the morphology file
+    loading_flag, morphology_object = \
+        nmv.file.readers.read_morphology_from_file_naively(args.morphology)
+
+    # Default options, where the whole axon is built
+    options = nmv.options.NeuroMorphoVisOptions()
+    options.morphology.axon_branch_order = nmv.consts.Arbors.MAX_BRANCHING_ORDER
+
+    print('%-24s %10s %14s %12s %8s' %
+          ('Builder', 'Points', 'Points [s]', 'Bulk [s]', 'Speedup'))
+    for name, builder in SKELETON_BUILDERS:
+        points_time, points = time_skeleton_builder(
+            builder, morphology_object, options, False, args.repetitions)
+        bulk_time, bulk_points = time_skeleton_builder(
+            builder, morphology_object, options, True, args.repetitions)
+        print('%-24s %10d %14.4f %12.4f %7.2fx%s' %
+              (name, bulk_points, points_time, bulk_time, points_time / max(bulk_time, 1e-9),
+               '' if points == bulk_points else ' (different number of points)'))
+    nmv.geometry.ops.poly_line_ops.BULK_CURVE_CONSTRUCTION = True
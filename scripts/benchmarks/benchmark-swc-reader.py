@@ -0,0 +1,284 @@
+####################################################################################################
+# Copyright (c) 2016 - 2019, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import sys, os, time, tempfile, shutil
+
+sys.path.append(('%s/../../' %(os.path.dirname(os.path.realpath(__file__)))))
+
+# System imports
+import argparse
+
+# NeuroMorphoVis imports
+import nmv
+import nmv.file
+from nmv.analysis.core import morphology_arrays
+
+
+####################################################################################################
+# @parse_command_line_arguments
+####################################################################################################
+def parse_command_line_arguments(arguments=None):
+    """Parses the input arguments.
+
+    :param arguments:
+        Command line arguments.
+    :return:
+        Arguments list.
+    """
+
+    # add all the options
+    description = 'Benchmarking the line-by-line and the vectorized SWC parsers, and verifying ' \
+                  'the sections built from the samples tree'
+    parser = argparse.ArgumentParser(description=description)
+
+    arg_help = 'A directory containing the .swc morphologies'
+    default = '%s/../../data/morphologies/swc' % os.path.dirname(os.path.realpath(__file__))
+    parser.add_argument('--input-directory',
+                        action='store', dest='input_directory', default=default, help=arg_help)
+
+    arg_help = 'The number of times each morphology is parsed'
+    parser.add_argument('--repetitions',
+                        action='store', dest='repetitions', type=int, default=5, help=arg_help)
+
+    # Parse the arguments
+    return parser.parse_args()
+
+
+####################################################################################################
+# @time_samples_reader
+####################################################################################################
+def time_samples_reader(morphology_file,
+                        use_vectorized_parser,
+                        repetitions):
+    """Parses the samples of a given SWC file several times and returns the best time.
+
+    :param morphology_file:
+        A given .swc morphology file.
+    :param use_vectorized_parser:
+        Use the vectorized parser, otherwise the line-by-line one.
+    :param repetitions:
+        The number of times the file is parsed.
+    :return:
+        The best time in seconds and the reader of the last run.
+    """
+
+    best_time = None
+    reader = None
+    for i in range(repetitions):
+        reader = nmv.file.readers.SWCReader(
+            morphology_file, use_vectorized_parser=use_vectorized_parser)
+        start = time.time()
+        if use_vectorized_parser:
+            reader.read_samples_vectorized()
+        else:
+            reader.read_samples()
+        elapsed = time.time() - start
+        if best_time is None or elapsed < best_time:
+            best_time = elapsed
+    return best_time, reader
+
+
+####################################################################################################
+# @verify_samples_lists
+####################################################################################################
+def verify_samples_lists(reference_samples_list,
+                         samples_list):
+    """Verifies that two samples lists are identical within a float tolerance.
+
+    :param reference_samples_list:
+        The samples list constructed by the line-by-line parser.
+    :param samples_list:
+        The samples list constructed by the vectorized parser.
+    :return:
+        True if both lists are identical, otherwise False.
+    """
+
+    if len(reference_samples_list) != len(samples_list):
+        return False
+
+    for reference_sample, sample in zip(reference_samples_list, samples_list):
+        if reference_sample is None or sample is None:
+            if reference_sample is not sample:
+                return False
+            continue
+        for i in [0, 1, 6]:
+            if reference_sample[i] != sample[i]:
+                return False
+        for i in range(2, 6):
+            if abs(reference_sample[i] - sample[i]) > 1e-4:
+                return False
+    return True
+
+
+####################################################################################################
+# @build_sections
+####################################################################################################
+def build_sections(morphology_file,
+                   use_samples_tree):
+    """Builds the sections of a given SWC file and returns the indices of their samples.
+
+    :param morphology_file:
+        A given .swc morphology file.
+    :param use_samples_tree:
+        Build the sections from the samples tree, otherwise from the connected paths.
+    :return:
+        The sections_samples_indices_list of the reader.
+    """
+
+    reader = nmv.file.readers.SWCReader(morphology_file, use_samples_tree=use_samples_tree)
+    reader.read_samples_vectorized()
+    if use_samples_tree:
+        reader.build_sections_from_samples_tree()
+    else:
+        reader.build_connected_paths_from_samples()
+        reader.build_sections_from_paths()
+    return reader.sections_samples_indices_list
+
+
+####################################################################################################
+# @verify_sections
+####################################################################################################
+def verify_sections(morphology_file):
+    """Verifies that the samples tree and the connected paths build identical sections.
+
+    :param morphology_file:
+        A given .swc morphology file.
+    :return:
+        True if both lists of sections are identical, otherwise False.
+    """
+
+    return build_sections(morphology_file, True) == build_sections(morphology_file, False)
+
+
+####################################################################################################
+# @write_out_of_order_morphology
+####################################################################################################
+def write_out_of_order_morphology(morphology_file,
+                                  output_file):
+    """Writes a copy of a given SWC file where the samples of a branch are moved to the end of the
+    file and renumbered, so the first sample of the branch, which is the only child of its parent,
+    is listed far from its parent.
+
+    :param morphology_file:
+        A given .swc morphology file.
+    :param output_file:
+        The path to the reordered copy.
+    :return:
+        True if the copy is written, or False if the morphology has no branch that can be moved.
+    """
+
+    values = morphology_arrays.parse_swc_samples(morphology_file)
+    if values is None or len(values) == 0:
+        return False
+    indices = values[:, 0].astype(int).tolist()
+    parents = values[:, 6].astype(int).tolist()
+    types = dict(zip(indices, values[:, 1].astype(int).tolist()))
+    samples_parents = dict(zip(indices, parents))
+
+    # The children of every sample
+    children = dict()
+    for index, parent in zip(indices, parents):
+        children.setdefault(parent, list()).append(index)
+
+    # Find a sample that continues the section of its parent, and whose branch does not end the
+    # file and ends with a sample that continues the one before it, to keep the file consecutive
+    branch = None
+    for index, parent in zip(indices, parents):
+        if parent != index - 1 or len(children[parent]) != 1 or parent <= 1 or \
+                types[index] == nmv.consts.Arbors.SWC_SOMA_SAMPLE_TYPE or \
+                types[parent] == nmv.consts.Arbors.SWC_SOMA_SAMPLE_TYPE:
+            continue
+        branch = list()
+        samples = [index]
+        while len(samples) > 0:
+            sample = samples.pop()
+            branch.append(sample)
+            samples.extend(children.get(sample, list()))
+        last_sample = max(branch)
+        if last_sample != index and last_sample < max(indices) and \
+                samples_parents[last_sample] == last_sample - 1:
+            break
+        branch = None
+    if branch is None:
+        return False
+
+    # Move the branch to the end of the file and renumber the samples
+    branch = set(branch)
+    order = [index for index in indices if index not in branch] + \
+            [index for index in indices if index in branch]
+    new_indices = {index: i + 1 for i, index in enumerate(order)}
+    rows = dict(zip(indices, values.tolist()))
+    with open(output_file, 'w') as swc_file:
+        for index in order:
+            row = rows[index]
+            swc_file.write('%d %d %f %f %f %f %d\n' % (
+                new_indices[index], int(row[1]), row[2], row[3], row[4], row[5],
+                new_indices.get(int(row[6]), int(row[6]))))
+    return True
+
+
+####################################################################################################
+# @ Main
+####################################################################################################
+if __name__ == "__main__":
+
+    # Get all arguments after the '--'
+    args = sys.argv
+    sys.argv = args[args.index("--") + 0:]
+
+    # Parse the command line arguments
+    args = parse_command_line_arguments()
+
+    # Get the morphologies
+    morphology_files = nmv.file.ops.get_files_in_directory(args.input_directory, '.swc')
+
+    # A directory for the reordered copies of the morphologies
+    reordered_directory = tempfile.mkdtemp()
+
+    print('%-40s %10s %12s %12s %8s %6s %9s %10s' %
+          ('Morphology', 'Samples', 'Lines [s]', 'Bulk [s]', 'Speedup', 'Same', 'Sections',
+           'Reordered'))
+
+    total_line_time = 0.0
+    total_bulk_time = 0.0
+    for morphology_file in sorted(morphology_files):
+        path = '%s/%s' % (args.input_directory, morphology_file)
+
+        line_time, line_reader = time_samples_reader(path, False, args.repetitions)
+        bulk_time, bulk_reader = time_samples_reader(path, True, args.repetitions)
+        total_line_time += line_time
+        total_bulk_time += bulk_time
+
+        # Verify the sections of the morphology and of a copy with a branch listed out of order
+        reordered_path = '%s/%s' % (reordered_directory, morphology_file)
+        reordered_sections = 'N/A'
+        if write_out_of_order_morphology(path, reordered_path):
+            reordered_sections = str(verify_sections(reordered_path))
+
+        print('%-40s %10d %12.5f %12.5f %7.2fx %6s %9s %10s' %
+              (morphology_file, len(bulk_reader.parsed_samples_list) - 1, line_time, bulk_time,
+               line_time / max(bulk_time, 1e-9),
+               verify_samples_lists(line_reader.samples_list, bulk_reader.samples_list),
+               verify_sections(path), reordered_sections))
+
+    print('%-40s %10s %12.5f %12.5f %7.2fx' %
+          ('Total', '', total_line_time, total_bulk_time,
+           total_line_time / max(total_bulk_time, 1e-9)))
+
+    # Clean the reordered copies
+    shutil.rmtree(reordered_directory)
@@ -50,14 +50,78 @@ def parse_command_line_arguments(arguments=None):
     parser.add_argument('--morphology',
                         action='store', dest='morphology', help=arg_help)
 
+    arg_help = 'An input directory, where all the morphologies (.h5 and .swc) will be resampled. ' \
+               'Used if no --morphology is given'
+    parser.add_argument('--input-directory',
+                        action='store', dest='input_directory', help=arg_help)
+
     arg_help = 'Output directory where the resampled morphology will be written'
     parser.add_argument('--output-directory',
                         action='store', dest='output_directory', help=arg_help)
-                        
+
+    arg_options = ['fixed-step', 'adaptive', 'relaxed']
+    arg_help = 'The resampling method. Options: %s. Default adaptive' % arg_options
+    parser.add_argument('--resampling-method',
+                        action='store', dest='resampling_method', default='adaptive',
+                        choices=arg_options, help=arg_help)
+
+    arg_help = 'The sampling step in microns, used only with the fixed-step method. Default 1.0'
+    parser.add_argument('--sampling-step',
+                        action='store', dest='sampling_step', type=float, default=1.0,
+                        help=arg_help)
+
     # Parse the arguments
     return parser.parse_args()
 
 
+####################################################################################################
+# @resample_morphology_file
+####################################################################################################
+def resample_morphology_file(morphology_file,
+                             output_directory,
+                             resampling_method,
+                             sampling_step):
+    """Resamples a morphology file and writes the resampled morphology to an .SWC file.
+
+    :param morphology_file:
+        The path to the morphology file.
+    :param output_directory:
+        Output directory where the resampled morphology will be written.
+    :param resampling_method:
+        The resampling method, fixed-step, adaptive or relaxed.
+    :param sampling_step:
+        The sampling step of the fixed-step method.
+    :return:
+        True if the morphology was resampled and written, otherwise False.
+    """
+
+    # Load the morphology file
+    loading_flag, morphology_object = \
+        nmv.file.readers.read_morphology_from_file_naively(morphology_file)
+
+    # Verify the loading operation
+    if not loading_flag:
+        print('ERROR: Invalid Morphology File [%s]' % morphology_file)
+        return False
+
+    # Resample the morphology skeleton, all the samples of a section are resampled at once
+    if resampling_method == 'fixed-step':
+        nmv.skeleton.ops.apply_operation_to_morphology(
+            *[morphology_object, nmv.skeleton.ops.resample_section_at_fixed_step_vectorized,
+              sampling_step])
+    elif resampling_method == 'relaxed':
+        nmv.skeleton.ops.apply_operation_to_morphology(
+            *[morphology_object,
+              nmv.skeleton.ops.resample_section_adaptively_relaxed_vectorized])
+    else:
+        nmv.skeleton.ops.apply_operation_to_morphology(
+            *[morphology_object, nmv.skeleton.ops.resample_section_adaptively_vectorized])
+
+    # Export the morphology skeleton
+    nmv.file.write_morphology_to_swc_file(morphology_object, output_directory)
+    return True
+
+
 ####################################################################################################
 # @ Main
 ####################################################################################################
@@ -70,18 +134,21 @@ if __name__ == "__main__":
     # Parse the command line arguments
     args = parse_command_line_arguments()
 
-    # Load the morphology file 
-    loading_flag, morphology_object = \
-        nmv.file.readers.read_morphology_from_file_naively(args.morphology)
-
-    # Verify the loading operation
-    if not loading_flag:
-        print({'ERROR'}, 'Invalid Morphology File')
-        exit(0)
-
-    # Resample the morphology skeleton
-    nmv.skeleton.ops.apply_operation_to_morphology(
-        *[morphology_object, nmv.skeleton.ops.resample_section_adaptively])
-
-    # Export the morphology skeleton
-    nmv.file.write_morphology_to_swc_file(morphology_object, args.output_directory)
+    # A single morphology or all the morphologies in the input directory
+    if args.morphology is not None:
+        morphology_files = [args.morphology]
+    elif args.input_directory is not None:
+        morphology_files = ['%s/%s' % (args.input_directory, morphology_file) for morphology_file
+                            in nmv.file.get_morphology_files_in_directory(args.input_directory)]
+    else:
+        print('ERROR: Please set an input morphology with --morphology, or an input directory '
+              'with --input-directory')
+        exit(1)
+
+    # Resample the morphologies one by one
+    for i, morphology_file in enumerate(morphology_files):
+        print('Resampling [%d/%d]: %s' % (i + 1, len(morphology_files), morphology_file))
+        resample_morphology_file(morphology_file=morphology_file,
+                                 output_directory=args.output_directory,
+                                 resampling_method=args.resampling_method,
+                                 sampling_step=args.sampling_step)
@@ -25,9 +25,15 @@ INPUT_MORPHOLOGY='/bbp/projects/2019-resampling-morphologies/input/000061cbfa9d8
 # Output directory 
 OUTPUT_DIRECTORY='/bbp/projects/2019-resampling-morphologies/output'
 
+# Resampling method (fixed-step, adaptive or relaxed)
+RESAMPLING_METHOD='adaptive'
+
+# To resample all the morphologies in a directory, use --input-directory instead of --morphology
+
 ####################################################################################################
 $BLENDER -b --verbose 0 --python resample-morphology.py --                                         \
     --morphology=$INPUT_MORPHOLOGY                                                            	   \
+    --resampling-method=$RESAMPLING_METHOD                                                         \
     --output-directory=$OUTPUT_DIRECTORY                                                           
     
 